@@ -77,16 +77,27 @@ class TablePresenter:
         "Cumartesi": 6, "Pazar": 7
     }
 
+    BREAK_TOLERANCE = 15  # минут: перемена 10 минут, обед и «окна» длиннее
+
     def _merge_times(self, times: List[str]) -> str:
-        """Объединяет ['10:45-11:30', '11:40-12:25'] -> '10:45-12:25'"""
-        if not times: return ""
-        unique_times = sorted(list(set(times)))
-        if not unique_times: return ""
-        
-        # Берем начало самого раннего и конец самого позднего
-        start = unique_times[0].split('-')[0]
-        end = unique_times[-1].split('-')[-1]
-        return f"{start}-{end}"
+        """Объединяет ['10:45-11:30', '11:40-12:25'] -> '10:45-12:25',
+        но ['08:00-08:45', '14:00-14:45'] остаются двумя блоками."""
+        spans = []
+        for t in set(times):
+            m = re.match(r'^(\d{2}):(\d{2})-(\d{2}):(\d{2})$', t.strip())
+            if m:
+                h1, m1, h2, m2 = map(int, m.groups())
+                spans.append([h1 * 60 + m1, h2 * 60 + m2])
+        spans.sort()
+
+        # Склеиваем только соседние пары (перерыв не длиннее BREAK_TOLERANCE)
+        blocks = []
+        for start, end in spans:
+            if blocks and start - blocks[-1][1] <= self.BREAK_TOLERANCE:
+                blocks[-1][1] = max(blocks[-1][1], end)
+            else:
+                blocks.append([start, end])
+        return ", ".join(f"{s // 60:02d}:{s % 60:02d}-{e // 60:02d}:{e % 60:02d}" for s, e in blocks)
 
     def _clean_name(self, name: str) -> str:
         """Убирает UNS-XXX из названия"""
@@ -0,0 +1,77 @@
+"""
+benchmarks/bench_compact_timetable.py
+=======================================
+Resident memory of the full timetable: list[TimetableEntry] vs
+CompactTimetable, measured with tracemalloc.
+
+Entries are built the way the parser builds them — every row gets its own
+string objects — so the list-of-dataclasses figure is what a worker holds
+after list_all().
+
+Run from the repo root:
+    python -m benchmarks.bench_compact_timetable [entries]
+"""
+from __future__ import annotations
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import replace
+
+from benchmarks.bench_timeslot import synthetic_timetable
+from src.contexts.timetable.application.read_models.compact_timetable import CompactTimetable
+from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot
+
+
+def _fresh(s: str) -> str:
+    return s.encode().decode()
+
+
+def parsed_like(n: int) -> list:
+    rng = random.Random(0)
+    teachers = [f"Teacher {i}" for i in range(800)]
+    names = [f"Course name {i}" for i in range(2000)]
+    return [
+        replace(
+            e,
+            course_code=CourseCode(_fresh(e.course_code.value)),
+            course_name=_fresh(rng.choice(names)),
+            teacher_name=_fresh(rng.choice(teachers)),
+            time_slot=TimeSlot(_fresh(e.time_slot.raw)),
+            room_name=_fresh(e.room_name),
+        )
+        for e in synthetic_timetable(n, rng)
+    ]
+
+
+def _traced(build) -> tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def main(n: int = 100_000) -> None:
+    entries, list_bytes = _traced(lambda: parsed_like(n))
+    table, compact_bytes = _traced(lambda: CompactTimetable.from_entries(entries))
+    assert table.to_entries() == entries
+
+    t0 = time.perf_counter()
+    for row in table:
+        row.teacher_name
+    scan = time.perf_counter() - t0
+
+    print(f"{n} entries")
+    print(f"list[TimetableEntry]  {list_bytes / 2**20:8.1f} MiB  ({list_bytes / n:.0f} B/row)")
+    print(f"CompactTimetable      {compact_bytes / 2**20:8.1f} MiB  ({compact_bytes / n:.0f} B/row)"
+          f"   {list_bytes / compact_bytes:.1f}x smaller")
+    print(f"row-view scan of teacher_name: {scan * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,89 @@
+"""
+benchmarks/bench_event_bus.py
+===============================
+Events per second through an event bus with 10 subscribers: a serial bus
+that awaits every handler inside publish() (what FakeEventBus does) vs
+InMemoryEventBus. "end-to-end" is publish + drain, i.e. until every
+handler has seen every event; "publish" is the time the publishing use
+case is held up. The second table adds one subscriber that sleeps 1 ms
+per event — a notification handler talking to a remote API.
+
+Run from the repo root:
+    python -m benchmarks.bench_event_bus [events]
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+from src.infrastructure.messaging.in_memory_bus import InMemoryEventBus
+from src.shared_kernel.domain.events import DomainEvent
+
+SUBSCRIBERS = 10
+
+
+@dataclass(frozen=True)
+class EntryChanged(DomainEvent):
+    n: int = 0
+
+
+class _SerialBus:
+    def __init__(self) -> None:
+        self._handlers = defaultdict(list)
+
+    def subscribe(self, event_type, handler) -> None:
+        self._handlers[event_type].append(handler)
+
+    async def publish(self, event) -> None:
+        for handler in self._handlers[type(event)]:
+            await handler(event)
+
+    async def drain(self) -> None:
+        pass
+
+
+async def _measure(bus, events: list[EntryChanged], slow: bool) -> tuple[float, float]:
+    handled = 0
+
+    async def handler(event):
+        nonlocal handled
+        handled += 1
+
+    async def sleepy(event):
+        await asyncio.sleep(0.001)
+
+    for _ in range(SUBSCRIBERS):
+        bus.subscribe(EntryChanged, handler)
+    if slow:
+        bus.subscribe(EntryChanged, sleepy)
+    t0 = time.perf_counter()
+    for event in events:
+        await bus.publish(event)
+    published = time.perf_counter() - t0
+    await bus.drain()
+    total = time.perf_counter() - t0
+    assert handled == SUBSCRIBERS * len(events)
+    return published, total
+
+
+def main(n: int = 100_000) -> None:
+    buses = (
+        ("serial", _SerialBus),
+        ("InMemoryEventBus", lambda: InMemoryEventBus(queue_size=n)),
+        ("  queue_size=1024", lambda: InMemoryEventBus(queue_size=1024)),
+        ("  workers=4", lambda: InMemoryEventBus(queue_size=1024, workers=4)),
+    )
+    for slow, count in ((False, n), (True, min(n, 2000))):
+        events = [EntryChanged(n=i) for i in range(count)]
+        title = f"{count} events, {SUBSCRIBERS} subscribers" + (" + one 1 ms subscriber" if slow else "")
+        print(f"{title}\n  {'':<20}{'end-to-end ev/s':>16}{'publish µs/ev':>15}")
+        for label, make in buses:
+            published, total = asyncio.run(_measure(make(), events, slow))
+            print(f"  {label:<20}{count / total:16,.0f}{published / count * 1e6:15.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
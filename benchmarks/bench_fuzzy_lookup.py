@@ -0,0 +1,75 @@
+"""
+benchmarks/bench_fuzzy_lookup.py
+==================================
+Fuzzy teacher-name lookup: FuzzyNameIndex (symmetric-delete neighbourhoods)
+vs computing the edit distance to every distinct name word, over a few thousand synthetic
+Turkish/Kyrgyz names queried with typos and in Cyrillic.
+
+Run from the repo root:
+    python -m benchmarks.bench_fuzzy_lookup [names]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from src.contexts.timetable.application.read_models.fuzzy_lookup import (
+    FuzzyNameIndex,
+    _Pattern,
+    default_max_distance,
+)
+from src.contexts.timetable.domain.services import transliteration_key
+
+_SYLLABLES = ["a", "ai", "bek", "nur", "gul", "mir", "lan", "ka", "ya", "yıl", "dız", "as", "an",
+              "şa", "hin", "de", "mir", "tok", "to", "gu", "lov", "er", "ke", "çe", "lik", "öz"]
+_SUFFIXES = ["", "ov", "ova", "bekov", "uulu", "kızı", "er", "han"]
+_CYRILLIC = str.maketrans("abdegiklmnorstuvyz", "абдегиклмнорстувыз")
+
+
+def synthetic_names(n: int, rng: random.Random) -> list[str]:
+    def word() -> str:
+        return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+    names: set[str] = set()
+    while len(names) < n:
+        names.add(f"{word()} {word()}{rng.choice(_SUFFIXES)}")
+    return sorted(names)
+
+
+def typo(word: str, rng: random.Random) -> str:
+    i = rng.randrange(len(word))
+    return word[:i] + rng.choice("aeiouknr") + word[i + 1:]
+
+
+def main(n: int = 3000, queries: int = 500) -> None:
+    rng = random.Random(0)
+    names = synthetic_names(n, rng)
+    t0 = time.perf_counter()
+    index = FuzzyNameIndex()
+    index.rebuild(names)
+    print(f"{n} names, {len(index._neighbourhoods)} distinct words — build {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    picks = [rng.choice(names).split()[-1] for _ in range(queries)]
+    typed = [typo(transliteration_key(p), rng) for p in picks]
+    cyrillic = [transliteration_key(p).translate(_CYRILLIC) for p in picks]
+    words = list(index._names_by_word)
+
+    t0 = time.perf_counter()
+    for q in typed:
+        pattern = _Pattern(q)
+        k = default_max_distance(q)
+        [w for w in words if pattern.distance(w) <= k]
+    scan = (time.perf_counter() - t0) / queries
+
+    for label, batch in (("one typo", typed), ("Cyrillic", cyrillic)):
+        found = 0
+        t0 = time.perf_counter()
+        for q, pick in zip(batch, picks):
+            found += any(pick in m.name for m in index.lookup(q))
+        per_query = (time.perf_counter() - t0) / queries
+        print(f"{label:<9} index {per_query * 1e6:7.0f} µs/query   "
+              f"linear scan {scan * 1e6:7.0f} µs   recall {found / queries:.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
@@ -0,0 +1,77 @@
+"""
+benchmarks/bench_http_cache.py
+================================
+Repeated GETs of one read-mostly endpoint through HttpClientFactory, with
+and without the on-disk response cache. The loopback origin sleeps
+`latency` seconds per response to stand in for the university servers.
+
+  fresh         Cache-Control: max-age — served from disk
+  revalidated   max-age=0 + ETag — a 304 instead of the body (saves the
+                transfer, not the round trip; invisible on loopback)
+  uncached      cache disabled — the full response every time
+
+Run from the repo root:
+    python -m benchmarks.bench_http_cache [requests] [latency-ms]
+"""
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import replace
+
+from src.infrastructure.config.settings import HttpClientSettings
+from src.infrastructure.http_client.factory import HttpClientFactory
+
+_BODY = b'{"menu": "' + b"x" * 60_000 + b'"}'
+
+
+def _origin(latency: float, cache_control: str):
+    async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while head := await reader.readuntil(b"\r\n\r\n"):
+                await asyncio.sleep(latency)
+                if b'if-none-match: "v1"' in head.lower():
+                    writer.write(b'HTTP/1.1 304 Not Modified\r\nETag: "v1"\r\nContent-Length: 0\r\n\r\n')
+                else:
+                    writer.write(b'HTTP/1.1 200 OK\r\nETag: "v1"\r\nCache-Control: %s\r\nContent-Length: %d\r\n\r\n%s'
+                                 % (cache_control.encode(), len(_BODY), _BODY))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+    return serve
+
+
+async def _run(mode: str, n: int, latency: float) -> float:
+    cache_control = "max-age=3600" if mode == "fresh" else "max-age=0"
+    server = await asyncio.start_server(_origin(latency, cache_control), "127.0.0.1", 0)
+    url = "http://127.0.0.1:%d/api/yemek" % server.sockets[0].getsockname()[1]
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = replace(HttpClientSettings(), cache_dir="" if mode == "uncached" else tmp)
+        factory = HttpClientFactory(settings)
+        client = factory.client("cafeteria")
+        samples = []
+        for _ in range(n):
+            t0 = time.perf_counter()
+            resp = await client.get(url)
+            assert len(resp.content) == len(_BODY)
+            samples.append(time.perf_counter() - t0)
+        await factory.aclose()
+    server.close()
+    await server.wait_closed()
+    return statistics.median(samples[1:])
+
+
+def main(n: int = 200, latency_ms: float = 20.0) -> None:
+    print(f"{n} GETs of a {len(_BODY) // 1000} kB response, origin latency {latency_ms:.0f} ms")
+    for mode in ("uncached", "revalidated", "fresh"):
+        median = asyncio.run(_run(mode, n, latency_ms / 1000))
+        print(f"  {mode:<12} {median * 1000:8.2f} ms median")
+
+
+if __name__ == "__main__":
+    main(*(float(a) if i else int(a) for i, a in enumerate(sys.argv[1:])))
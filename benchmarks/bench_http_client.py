@@ -0,0 +1,77 @@
+"""
+benchmarks/bench_http_client.py
+=================================
+Sequential GETs against a local keep-alive origin: a new httpx.AsyncClient
+per call (what backup/main.py and ad-hoc adapters do) vs one client from
+the shared HttpClientFactory pool. Loopback, plain HTTP — a real origin
+adds an RTT per handshake and a TLS handshake on top, so this is the
+floor of what pooling saves.
+
+Run from the repo root:
+    python -m benchmarks.bench_http_client [requests]
+"""
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+from src.infrastructure.config.settings import HttpClientSettings
+from src.infrastructure.http_client.factory import HttpClientFactory
+from src.infrastructure.http_client.timing import HttpMetrics
+
+_BODY = b"<table>" + b"x" * 4000 + b"</table>"
+_RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(_BODY), _BODY)
+
+
+async def _serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(_RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _run(n: int) -> None:
+    server = await asyncio.start_server(_serve, "127.0.0.1", 0)
+    url = "http://127.0.0.1:%d/dept/1" % server.sockets[0].getsockname()[1]
+
+    fresh = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        async with httpx.AsyncClient() as client:
+            (await client.get(url)).raise_for_status()
+        fresh.append(time.perf_counter() - t0)
+
+    metrics = HttpMetrics()
+    factory = HttpClientFactory(HttpClientSettings(), hooks=[metrics])
+    pooled = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        (await factory.client("timetable").get(url)).raise_for_status()
+        pooled.append(time.perf_counter() - t0)
+    await factory.aclose()
+    server.close()
+    await server.wait_closed()
+
+    stats = metrics.stats("timetable", "127.0.0.1")
+    print(f"{n} sequential GETs, µs per request (median / p95)")
+    for label, samples in (("client per call", fresh), ("shared pool", pooled)):
+        samples.sort()
+        print(f"  {label:<16}{statistics.median(samples) * 1e6:8.0f}{samples[int(len(samples) * .95)] * 1e6:8.0f}")
+    print(f"  pool: {stats.new_connections} connection(s) opened, reuse {stats.reuse_ratio:.1%}, "
+          f"mean ttfb {stats.mean_ttfb * 1e6:.0f} µs")
+
+
+def main(n: int = 500) -> None:
+    asyncio.run(_run(n))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,103 @@
+"""
+benchmarks/bench_lesson_blocks.py
+===================================
+Rendering a teacher's week and a room's day: regrouping raw rows per
+request (the TablePresenter way — collect the rows, group by (day, course,
+teacher, room), merge each group's slots) vs reading the LessonBlockIndex
+built once with the snapshot. `first` is a freshly mapped index's first
+render (blocks decoded), `blocks` a repeat render.
+
+The synthetic timetable has Manas periods (45 minutes, 10-minute breaks)
+and lessons of one to three consecutive periods.
+
+Run from the repo root:
+    python -m benchmarks.bench_lesson_blocks [lessons]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from src.contexts.timetable.application.read_models.compact_timetable import CompactTimetable, TimetableRow
+from src.contexts.timetable.application.read_models.lesson_blocks import LessonBlock, LessonBlockIndex
+from src.contexts.timetable.application.read_models.snapshot import TimetableSnapshot
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.services import coalesce_time_slots, room_id_for
+from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot, WeekDay
+from src.shared_kernel.domain.identity import DepartmentId
+
+_PERIODS = [TimeSlot.from_minutes(8 * 60 + 55 * i, 8 * 60 + 55 * i + 45) for i in range(10)]
+
+
+def synthetic_lessons(n: int, rng: random.Random) -> list[TimetableEntry]:
+    teachers = [f"Teacher {i}" for i in range(600)]
+    rooms = [f"B-{i}" for i in range(100, 400)]
+    departments = [DepartmentId(uuid4()) for _ in range(40)]
+    at = datetime(2024, 9, 1)
+    entries = []
+    for _ in range(n):
+        code, room = f"UNS-{rng.randint(100, 499)}", rng.choice(rooms)
+        day, teacher, dept = rng.choice(list(WeekDay)[:6]), rng.choice(teachers), rng.choice(departments)
+        first = rng.randrange(len(_PERIODS) - 2)
+        for period in _PERIODS[first:first + rng.randint(1, 3)]:
+            entries.append(TimetableEntry.create(
+                course_code=CourseCode(code), course_name=f"Course {code}", day=day, time_slot=period,
+                room_id=room_id_for(room), teacher_name=teacher, department_id=dept,
+                scraped_at=at, room_name=room,
+            ))
+    return entries
+
+
+def _regroup(rows: list[TimetableRow]) -> list[LessonBlock]:
+    groups: dict[tuple, list[TimetableRow]] = {}
+    for row in rows:
+        groups.setdefault((row.day, row.course_code, row.teacher_name, row.room_id), []).append(row)
+    blocks = []
+    for group in groups.values():
+        for slot in coalesce_time_slots(r.time_slot for r in group):
+            members = [r for r in group if slot.start_minutes <= r.time_slot.start_minutes < slot.end_minutes]
+            first = members[0]
+            blocks.append(LessonBlock(
+                first.day, slot, first.course_code, first.course_name, first.teacher_name,
+                first.room_id, first.room_name, tuple(r.id for r in members),
+            ))
+    return blocks
+
+
+def _timed(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def main(n: int = 10_000, repeat: int = 50) -> None:
+    entries = synthetic_lessons(n, random.Random(0))
+    snap = TimetableSnapshot.build(1, datetime.now(), entries)
+    rows: CompactTimetable = snap.rows
+    build = _timed(lambda: LessonBlockIndex.build(rows), 3)
+    teacher, room = entries[0].teacher_name, entries[0].room_id
+
+    print(f"{len(entries)} rows, {len(snap.blocks)} lesson blocks — ms per view")
+    print(f"  build at ingest          {build:8.2f}   (once per snapshot)")
+    print(f"{'':<26}{'regroup':>8}{'first':>10}{'blocks':>10}")
+    views = {
+        "teacher's week": (lambda: _regroup(rows.rows_for_teacher(teacher)),
+                           lambda blocks: blocks.for_teacher(teacher)),
+        "room, Monday": (lambda: _regroup([r for r in rows.rows_for_room(room) if r.day == WeekDay.MONDAY]),
+                         lambda blocks: [b for b in blocks.for_room(room) if b.day == WeekDay.MONDAY]),
+        "all of Monday": (lambda: _regroup([r for r in rows if r.day == WeekDay.MONDAY]),
+                          lambda blocks: blocks.for_day(WeekDay.MONDAY)),
+    }
+    for label, (regroup, render) in views.items():
+        assert sorted(regroup(), key=repr) == sorted(render(snap.blocks), key=repr)
+        first = _timed(lambda: render(LessonBlockIndex(rows, *snap.blocks.export())), repeat)
+        print(f"  {label:<24}{_timed(regroup, repeat):8.2f}{first:10.2f}"
+              f"{_timed(lambda: render(snap.blocks), repeat):10.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,97 @@
+"""
+benchmarks/bench_mapped_snapshot.py
+=====================================
+Memory and startup of N uvicorn-like workers serving the timetable.
+
+  private — each worker rebuilds its own TimetableSnapshot from the entries
+            (what a per-worker DB reload + indexing costs)
+  mapped  — each worker maps the snapshot file written once by the parent
+  idle    — imports only; the interpreter's own share, for reference
+
+Every worker answers a few searches and free-room queries, touching all
+columns and postings, then waits at a barrier so all N are alive when
+they read /proc/self/smaps_rollup. PSS (proportional set size) splits
+shared pages between the processes mapping them, so the summed PSS is what
+the workers really cost together. Linux only.
+
+Run from the repo root:
+    python -m benchmarks.bench_mapped_snapshot [entries]
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.bench_search_index import synthetic_timetable
+from src.contexts.timetable.adapters.outbound.db.mapped_snapshot import map_snapshot, write_mapped_snapshot
+from src.contexts.timetable.application.read_models.snapshot import TimetableSnapshot
+from src.contexts.timetable.domain.value_objects import TimeSlot, WeekDay
+
+_QUERIES = ["şahin", "matematik", "b-2", "uns-3", "ay"]
+
+
+def _pss_kib() -> int:
+    for line in Path("/proc/self/smaps_rollup").read_text().splitlines():
+        if line.startswith("Pss:"):
+            return int(line.split()[1])
+    raise RuntimeError("no Pss line in smaps_rollup")
+
+
+def _worker(mode: str, path: str, barrier, results) -> None:
+    if mode == "idle":
+        barrier.wait()
+        results.put((0.0, _pss_kib()))
+        barrier.wait()
+        return
+    t0 = time.perf_counter()
+    mapped = map_snapshot(path)
+    snap = mapped if mode == "mapped" else TimetableSnapshot.build(
+        mapped.version, mapped.built_at, mapped.rows.to_entries())
+    startup = time.perf_counter() - t0
+
+    for q in _QUERIES:
+        snap.search.search(q)
+    for day in list(WeekDay)[:6]:
+        snap.occupancy.free_rooms(day, TimeSlot("10:00-10:45"))
+    for row in snap.rows:                       # touch every column page
+        row.teacher_name, row.day
+
+    barrier.wait()
+    results.put((startup, _pss_kib()))
+    barrier.wait()
+
+
+def _run(mode: str, path: str, workers: int) -> tuple[float, int]:
+    ctx = mp.get_context("spawn")
+    barrier, results = ctx.Barrier(workers), ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(mode, path, barrier, results)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    reports = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return max(s for s, _ in reports), sum(k for _, k in reports)
+
+
+def main(n: int = 50_000) -> None:
+    entries = synthetic_timetable(n, random.Random(0))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "timetable.mtts")
+        t0 = time.perf_counter()
+        write_mapped_snapshot(path, TimetableSnapshot.build(1, datetime.now(), entries))
+        print(f"{n} entries — file {Path(path).stat().st_size / 2**20:.1f} MiB, "
+              f"written in {time.perf_counter() - t0:.2f} s")
+        print(f"{'workers':<9}{'mode':<9}{'startup s':>10}{'total PSS MiB':>15}{'per worker':>12}")
+        for workers in (1, 2, 4, 8):
+            for mode in ("idle", "private", "mapped"):
+                startup, pss = _run(mode, path, workers)
+                print(f"{workers:<9}{mode:<9}{startup:10.2f}{pss / 1024:15.1f}{pss / 1024 / workers:12.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
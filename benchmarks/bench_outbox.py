@@ -0,0 +1,86 @@
+"""
+benchmarks/bench_outbox.py
+============================
+SqliteOutbox throughput on a temporary database: writing events (publish(),
+one autocommitted row each, vs 100 per transaction, as an aggregate save
+with several events does), then relaying the backlog to an InMemoryEventBus
+with one no-op subscriber at several batch sizes.
+
+Run from the repo root:
+    python -m benchmarks.bench_outbox [events]
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import UUID, uuid4
+
+from src.infrastructure.messaging.in_memory_bus import InMemoryEventBus
+from src.infrastructure.messaging.outbox import SqliteOutbox
+from src.shared_kernel.domain.events import DomainEvent
+
+
+@dataclass(frozen=True)
+class AssignmentCreated(DomainEvent):
+    assignment_id: UUID | None = None
+    course_code: str = ""
+    title: str = ""
+
+
+def _events(n: int) -> list[AssignmentCreated]:
+    return [AssignmentCreated(assignment_id=uuid4(), course_code="MAT-101", title=f"Homework {i}") for i in range(n)]
+
+
+async def _write(outbox: SqliteOutbox, events: list[AssignmentCreated], per_tx: int) -> float:
+    t0 = time.perf_counter()
+    if per_tx == 1:
+        for event in events:
+            await outbox.publish(event)
+        return time.perf_counter() - t0
+    for i in range(0, len(events), per_tx):
+        async with outbox.transaction() as tx:
+            for event in events[i:i + per_tx]:
+                tx.add(event)
+    return time.perf_counter() - t0
+
+
+async def _run(n: int, directory: Path) -> None:
+    print(f"{n} events")
+    for per_tx in (1, 100):
+        outbox = SqliteOutbox(directory / f"write-{per_tx}.sqlite3", InMemoryEventBus(), relay=False)
+        seconds = await _write(outbox, _events(n), per_tx)
+        await outbox.aclose()
+        label = "publish()" if per_tx == 1 else f"{per_tx} per transaction"
+        print(f"  write, {label:<20}       {n / seconds:10,.0f} ev/s")
+
+    for batch in (50, 500, 5000):
+        bus = InMemoryEventBus(queue_size=batch)
+        handled = 0
+
+        async def handler(event):
+            nonlocal handled
+            handled += 1
+
+        bus.subscribe(AssignmentCreated, handler)
+        outbox = SqliteOutbox(directory / f"relay-{batch}.sqlite3", bus, batch_size=batch, relay=False)
+        await _write(outbox, _events(n), 1000)
+        await outbox.drain()
+        assert handled == n
+        s = outbox.stats
+        print(f"  relay, batch {batch:>5}                {s.events_per_second:10,.0f} ev/s"
+              f"   ({s.batches} batches)")
+        await outbox.aclose()
+        await bus.aclose()
+
+
+def main(n: int = 20_000) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(_run(n, Path(directory)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
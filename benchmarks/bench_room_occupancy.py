@@ -0,0 +1,54 @@
+"""
+benchmarks/bench_room_occupancy.py
+====================================
+Free-room queries: RoomOccupancyIndex bitsets vs a find_free_room_ids scan,
+on the same synthetic timetable as bench_timeslot.
+
+Run from the repo root:
+    python -m benchmarks.bench_room_occupancy [entries]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from benchmarks.bench_timeslot import synthetic_timetable
+from src.contexts.timetable.application.read_models.room_occupancy import RoomOccupancyIndex
+from src.contexts.timetable.domain.services import find_free_room_ids
+from src.contexts.timetable.domain.value_objects import TimeSlot, WeekDay
+
+
+def main(n: int = 50_000, repeat: int = 200) -> None:
+    entries = synthetic_timetable(n, random.Random(0))
+    query = TimeSlot("10:30-11:15")
+
+    t0 = time.perf_counter()
+    index = RoomOccupancyIndex()
+    index.rebuild(entries)
+    build = time.perf_counter() - t0
+    assert index.free_rooms(WeekDay.MONDAY, query) == find_free_room_ids(entries, WeekDay.MONDAY, query)
+
+    t0 = time.perf_counter()
+    for _ in range(5):
+        find_free_room_ids(entries, WeekDay.MONDAY, query)
+    scan = (time.perf_counter() - t0) / 5
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        index.free_rooms(WeekDay.MONDAY, query)
+    bitset = (time.perf_counter() - t0) / repeat
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        index.free_rooms_between(WeekDay.MONDAY, 10 * 60 + 45, 14 * 60)
+    whole_range = (time.perf_counter() - t0) / repeat
+
+    print(f"{n} entries — index build {build * 1000:.1f} ms")
+    print(f"find_free_room_ids scan   {scan * 1e6:10.1f} µs")
+    print(f"index free_rooms          {bitset * 1e6:10.1f} µs   ({scan / bitset:.0f}x)")
+    print(f"index 10:45–14:00 range   {whole_range * 1e6:10.1f} µs")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,74 @@
+"""
+benchmarks/bench_room_schedule.py
+===================================
+RoomScheduleView.free_slots and saved-timetable pinning: interval indexes
+vs the scans they replaced (an any() over every entry per candidate slot;
+list membership and list rebuilding per pin).
+
+Run from the repo root:
+    python -m benchmarks.bench_room_schedule [entries-per-room]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from dataclasses import replace
+from uuid import uuid4
+
+from benchmarks.bench_timeslot import synthetic_timetable
+from src.contexts.timetable.domain.entities import RoomScheduleView, StudentSavedTimetable
+from src.contexts.timetable.domain.errors import TimetableClash
+from src.contexts.timetable.domain.value_objects import TimeSlot, WeekDay
+from src.shared_kernel.domain.identity import StudentId
+
+
+def _scan_free_slots(entries, day, slots):
+    return [s for s in slots if not any(e.day == day and e.time_slot.overlaps(s) for e in entries)]
+
+
+def _timed(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+
+def main(n: int = 400, repeat: int = 2000) -> None:
+    rng = random.Random(0)
+    room = synthetic_timetable(1, rng)[0].room_id
+    entries = tuple(replace(e, room_id=room) for e in synthetic_timetable(n, rng))
+    slots = [TimeSlot.from_minutes(m, m + 45) for m in range(8 * 60, 20 * 60, 15)]
+
+    t0 = time.perf_counter()
+    view = RoomScheduleView(room_id=room, entries=entries)
+    build = (time.perf_counter() - t0) * 1e6
+    assert view.free_slots(WeekDay.MONDAY, slots) == _scan_free_slots(entries, WeekDay.MONDAY, slots)
+
+    scan = _timed(lambda: _scan_free_slots(entries, WeekDay.MONDAY, slots), repeat // 20)
+    indexed = _timed(lambda: view.free_slots(WeekDay.MONDAY, slots), repeat)
+    print(f"room with {n} entries, {len(slots)} candidate slots (µs per free_slots call)")
+    print(f"  any() scan  {scan:10.1f}")
+    print(f"  DaySchedule {indexed:10.1f}   (view built in {build:.0f} µs)")
+
+    pins = [(uuid4(), day, TimeSlot.from_minutes(m, m + 45))
+            for day in list(WeekDay)[:5]
+            for m in range(8 * 60, 20 * 60, 50)]
+
+    def pin_all() -> None:
+        saved = StudentSavedTimetable.create(StudentId(uuid4()))
+        for entry_id, day, slot in pins:
+            saved.pin(entry_id, day, slot)
+        try:
+            saved.pin(uuid4(), WeekDay.MONDAY, TimeSlot("08:30-09:00"))
+        except TimetableClash:
+            pass
+        for entry_id, _, _ in pins:
+            saved.unpin(entry_id)
+
+    per_op = _timed(pin_all, repeat // 20) / (2 * len(pins) + 1)
+    print(f"{len(pins)} pins: {per_op:.2f} µs per pin/unpin, clash-checked")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 400)
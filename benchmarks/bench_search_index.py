@@ -0,0 +1,87 @@
+"""
+benchmarks/bench_search_index.py
+==================================
+Search-bar queries: TimetableSearchIndex vs a matches_search_query scan
+over a synthetic timetable with Turkish and Kyrgyz names.
+
+Run from the repo root:
+    python -m benchmarks.bench_search_index [entries]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from src.contexts.timetable.application.read_models.search_index import TimetableSearchIndex
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.services import matches_search_query, room_id_for
+from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot, WeekDay
+from src.shared_kernel.domain.identity import DepartmentId
+
+_FIRST = ["Ayşe", "İsmail", "Çağrı", "Gülşen", "Ömer", "Айбек", "Нургүл", "Мирлан", "Şükrü", "Elif"]
+_LAST = ["Kaya", "Yıldız", "Öztürk", "Şahin", "Токтогулов", "Асанова", "Demir", "Çelik", "Эсенов"]
+_COURSES = ["Matematik", "Fizik", "Kimya", "Türk Dili", "Кыргыз тили", "İşletme", "Programlama",
+            "Veri Yapıları", "Algoritmalar", "İktisat", "Tarih", "Felsefe", "Biyoloji", "Mantık"]
+
+QUERIES = ("yildiz", "токтогулов", "UNS-21", "programlama", "B-2", "kaya fizik", "öz", "İşlet")
+
+
+def synthetic_timetable(n: int, rng: random.Random) -> list[TimetableEntry]:
+    teachers = [f"{rng.choice(_FIRST)} {rng.choice(_LAST)}{i}" for i in range(800)]
+    courses = [(f"UNS-{rng.randint(100, 499)}", f"{rng.choice(_COURSES)} {rng.randint(1, 4)}")
+               for _ in range(2000)]
+    rooms = [f"B-{i}" for i in range(100, 400)]
+    departments = [DepartmentId(uuid4()) for _ in range(190)]
+    at = datetime(2024, 9, 1)
+    entries = []
+    for _ in range(n):
+        code, name = rng.choice(courses)
+        room = rng.choice(rooms)
+        h = rng.randint(8, 18)
+        entries.append(TimetableEntry.create(
+            course_code=CourseCode(code), course_name=name, day=rng.choice(list(WeekDay)[:6]),
+            time_slot=TimeSlot(f"{h:02d}:00-{h:02d}:45"), room_id=room_id_for(room),
+            teacher_name=rng.choice(teachers), department_id=rng.choice(departments),
+            scraped_at=at, room_name=room,
+        ))
+    return entries
+
+
+def main(n: int = 100_000, repeat: int = 50) -> None:
+    entries = synthetic_timetable(n, random.Random(0))
+    t0 = time.perf_counter()
+    index = TimetableSearchIndex()
+    index.rebuild(entries)
+    print(f"{n} entries — index build {time.perf_counter() - t0:.2f} s")
+
+    t0 = time.perf_counter()
+    index.rebuild(entries)
+    print(f"unchanged re-scrape      {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    print(f"{'query':<14}{'scan ms':>10}{'index ms':>10}{'limit=20 ms':>13}{'hits':>8}")
+    for q in QUERIES:
+        t0 = time.perf_counter()
+        scan = [e for e in entries if matches_search_query(e, q)]
+        scan_t = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            hits = index.search(q)
+        full_t = (time.perf_counter() - t0) / repeat
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            index.search(q, limit=20)
+        top_t = (time.perf_counter() - t0) / repeat
+        print(f"{q:<14}{scan_t * 1000:10.1f}{full_t * 1000:10.3f}{top_t * 1000:13.3f}{len(hits):8}")
+
+    for prefix in ("ka", "prog", "ток", "uns-2"):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            index.suggest(prefix, k=10)
+        print(f"suggest({prefix!r:<8}) {(time.perf_counter() - t0) / repeat * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
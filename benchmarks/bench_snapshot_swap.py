@@ -0,0 +1,110 @@
+"""
+benchmarks/bench_snapshot_swap.py
+===================================
+Reader latency while the next timetable version is built.
+
+A reader coroutine answers free-room and search queries against
+`publisher.current` in a loop while a refresh runs:
+
+  inline  — the snapshot is built on the event loop (what a projector
+            rebuilding its index in a handler does)
+  swapped — TimetableSnapshotPublisher.refresh(): built in steps that yield
+            to the loop, then one attribute swap
+  patched — TimetableSnapshotPublisher.patch(): after a scrape that changed
+            one department, the current version copied and that
+            department re-applied
+
+`build` is how long the writer took to publish the next version.
+
+Run from the repo root:
+    python -m benchmarks.bench_snapshot_swap [entries]
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+from dataclasses import replace
+from datetime import datetime
+
+from benchmarks.bench_timeslot import synthetic_timetable
+from src.contexts.timetable.adapters.outbound.db.in_memory import InMemoryTimetableRepository
+from src.contexts.timetable.application.read_models.snapshot import (
+    TimetableSnapshot,
+    TimetableSnapshotPublisher,
+)
+from src.contexts.timetable.domain.services import department_id_for
+from src.contexts.timetable.domain.value_objects import TimeSlot, WeekDay
+
+
+class _Clock:
+    def now(self) -> datetime:
+        return datetime.now()
+
+
+async def _measure(publisher: TimetableSnapshotPublisher, refresh) -> tuple[float, float, float, float]:
+    latencies: list[float] = []
+    took = 0.0
+    done = asyncio.Event()
+    slot = TimeSlot("10:30-11:15")
+
+    async def reader() -> None:
+        while not done.is_set():
+            t0 = time.perf_counter()
+            snap = publisher.current
+            snap.occupancy.free_rooms(WeekDay.MONDAY, slot)
+            snap.search.search("course", limit=20)
+            await asyncio.sleep(0.001)
+            latencies.append(time.perf_counter() - t0 - 0.001)
+
+    async def writer() -> None:
+        nonlocal took
+        await asyncio.sleep(0.05)
+        t0 = time.perf_counter()
+        await refresh()
+        took = time.perf_counter() - t0
+        await asyncio.sleep(0.05)
+        done.set()
+
+    await asyncio.gather(reader(), writer())
+    latencies.sort()
+    return (statistics.median(latencies) * 1000,
+            latencies[int(len(latencies) * 0.99)] * 1000,
+            latencies[-1] * 1000,
+            took * 1000)
+
+
+async def main(n: int) -> None:
+    repo = InMemoryTimetableRepository()
+    by_department: dict = {}
+    rng = random.Random(0)
+    for e in synthetic_timetable(n, rng):          # ~190 departments, as on the live site
+        department_id = department_id_for(rng.randint(1, 188))
+        by_department.setdefault(department_id, []).append(replace(e, department_id=department_id))
+    await repo.replace_departments({d: es for d, es in by_department.items()})
+    publisher = TimetableSnapshotPublisher(repo, _Clock())
+    await publisher.refresh()
+
+    async def inline() -> None:
+        snap = TimetableSnapshot.build(publisher.current.version + 1, datetime.now(), await repo.list_all())
+        publisher.publish(snap)
+
+    changed = next(iter(by_department))
+
+    async def patched() -> None:
+        entries = by_department[changed]
+        by_department[changed] = entries[1:] + [replace(entries[0], course_name="Renamed course")]
+        await repo.replace_department(changed, by_department[changed])
+        await publisher.patch([changed])
+
+    print(f"{n} entries — reader latency during a refresh (ms)")
+    print(f"{'':<8}{'p50':>8}{'p99':>8}{'max':>9}{'build':>9}")
+    for label, refresh in (("inline", inline), ("swapped", publisher.refresh), ("patched", patched)):
+        p50, p99, worst, took = await _measure(publisher, refresh)
+        print(f"{label:<8}{p50:8.3f}{p99:8.3f}{worst:9.1f}{took:9.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000))
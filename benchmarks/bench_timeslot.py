@@ -0,0 +1,97 @@
+"""
+benchmarks/bench_timeslot.py
+==============================
+The pre-parsed integer TimeSlot vs the previous regex-per-call
+implementation, on a 50k-entry synthetic timetable: a bare overlaps() scan,
+and find_free_room_ids (which also pays for str(room_id) per entry).
+
+Run from the repo root:
+    python -m benchmarks.bench_timeslot [entries]
+"""
+from __future__ import annotations
+
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from uuid import uuid4
+
+from src.shared_kernel.domain.identity import DepartmentId
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.services import find_free_room_ids, room_id_for
+from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot, WeekDay
+
+_TIME_RE = re.compile(r"^(\d{2}:\d{2})-(\d{2}:\d{2})$")
+
+
+@dataclass(frozen=True)
+class LegacyTimeSlot:
+    """TimeSlot as it was: every accessor re-runs the regex."""
+    raw: str
+
+    def start(self) -> str:
+        m = _TIME_RE.match(self.raw.strip())
+        return m.group(1) if m else ""
+
+    def end(self) -> str:
+        m = _TIME_RE.match(self.raw.strip())
+        return m.group(2) if m else ""
+
+    def is_valid(self) -> bool:
+        return bool(_TIME_RE.match(self.raw.strip()))
+
+    def overlaps(self, other: "LegacyTimeSlot") -> bool:
+        if not (self.is_valid() and other.is_valid()):
+            return False
+        return self.start() < other.end() and other.start() < self.end()
+
+
+def synthetic_timetable(n: int, rng: random.Random) -> list[TimetableEntry]:
+    rooms = [f"B-{i}" for i in range(100, 400)]
+    days = list(WeekDay)[:6]
+    dept = DepartmentId(uuid4())
+    at = datetime(2024, 9, 1)
+    entries = []
+    for _ in range(n):
+        h = rng.randint(8, 18)
+        room = rng.choice(rooms)
+        entries.append(TimetableEntry.create(
+            course_code=CourseCode(f"UNS-{rng.randint(100, 499)}"), course_name="Course",
+            day=rng.choice(days), time_slot=TimeSlot(f"{h:02d}:00-{h:02d}:45"),
+            room_id=room_id_for(room), teacher_name="Teacher", department_id=dept,
+            scraped_at=at, room_name=room,
+        ))
+    return entries
+
+
+def _overlap_scan(entries, query) -> None:
+    for e in entries:
+        e.time_slot.overlaps(query)
+
+
+def _free_rooms(entries, query) -> None:
+    find_free_room_ids(entries, WeekDay.MONDAY, query)
+
+
+def _bench(fn, entries, query, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(entries, query)
+    return (time.perf_counter() - t0) / repeat
+
+
+def main(n: int = 50_000, repeat: int = 5) -> None:
+    entries = synthetic_timetable(n, random.Random(0))
+    legacy = [replace(e, time_slot=LegacyTimeSlot(e.time_slot.raw)) for e in entries]
+
+    print(f"{n} entries, ms per query")
+    for label, fn in (("overlaps() scan", _overlap_scan), ("find_free_room_ids", _free_rooms)):
+        old = _bench(fn, legacy, LegacyTimeSlot("10:30-11:15"), repeat)
+        new = _bench(fn, entries, TimeSlot("10:30-11:15"), repeat)
+        print(f"{label:<20} regex {old * 1000:8.2f}   integer {new * 1000:8.2f}   ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,60 @@
+"""
+benchmarks/bench_timetable_parser.py
+======================================
+Pages/sec of the bs4 ManasParser vs the single-pass StreamingManasParser.
+
+Run from the repo root:
+    python -m benchmarks.bench_timetable_parser [pages]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import datetime
+
+from src.contexts.timetable.adapters.outbound.http.manas_parser import ManasParser
+from src.contexts.timetable.adapters.outbound.http.streaming_parser import StreamingManasParser
+from src.contexts.timetable.domain.value_objects import WeekDay
+
+
+def synthetic_page(rng: random.Random, periods: int = 12) -> str:
+    """A department-printer page: 6 days × *periods* rows, ~2 courses per cell."""
+    days = [d.turkish for d in WeekDay][:6]
+    out = ["<html><body><table><tr><td></td>", *(f"<td>{d}</td>" for d in days), "</tr>"]
+    for p in range(periods):
+        out.append(f"<tr><td>{8 + p:02d}:00-{8 + p:02d}:45</td>")
+        for _ in days:
+            out.append("<td>")
+            for _ in range(rng.randint(0, 3)):
+                out.append(
+                    f"<div>UNS-{rng.randint(100, 499)} Ders Adı {rng.randint(1, 40)}<br>"
+                    f"Dr. Öğretmen {rng.randint(1, 80)}<br>B-{rng.randint(100, 400)}</div>"
+                )
+            out.append("</td>")
+        out.append("</tr>")
+    out.append("</table></body></html>")
+    return "".join(out)
+
+
+def _pages_per_sec(parser, pages: list[str]) -> float:
+    at = datetime.now()
+    t0 = time.perf_counter()
+    for i, page in enumerate(pages):
+        parser.parse(page, i, at)
+    return len(pages) / (time.perf_counter() - t0)
+
+
+def main(n: int = 188) -> None:
+    rng = random.Random(0)
+    pages = [synthetic_page(rng) for _ in range(n)]
+    kb = sum(len(p) for p in pages) / n / 1024
+    print(f"{n} synthetic pages, {kb:.1f} KiB each")
+    bs4_rate = _pages_per_sec(ManasParser(), pages)
+    streaming_rate = _pages_per_sec(StreamingManasParser(), pages)
+    print(f"bs4 ManasParser        {bs4_rate:8.1f} pages/s")
+    print(f"StreamingManasParser   {streaming_rate:8.1f} pages/s   ({streaming_rate / bs4_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 188)
@@ -0,0 +1,99 @@
+"""
+benchmarks/bench_unix_socket_bus.py
+=====================================
+UnixSocketEventBus between two real processes: a child "api" process
+answers every RoomScheduleUpdated with a TimetableScraped carrying the
+same number. Latency is half the round trip of one event at a time
+(publish → peer handler → publish → our handler); the burst figure is
+round trips per second with everything in flight.
+
+Run from the repo root:
+    python -m benchmarks.bench_unix_socket_bus [events]
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import time
+
+from src.contexts.timetable.domain.events import RoomScheduleUpdated, TimetableScraped
+from src.infrastructure.messaging.in_memory_bus import InMemoryEventBus
+from src.infrastructure.messaging.unix_socket_bus import UnixSocketEventBus
+
+# Events defined in this module would be named "__main__:..." here and
+# "__mp_main__:..." in the child, so the benchmark uses real domain events.
+
+
+def _echo(socket_dir: str, n: int, ready) -> None:
+    async def run():
+        bus = UnixSocketEventBus(socket_dir, InMemoryEventBus(), name="api", queue_size=n, discovery_interval=0.05)
+
+        async def on_ping(event: RoomScheduleUpdated) -> None:
+            await bus.publish(TimetableScraped(department_count=event.affected_entry_count))
+
+        bus.subscribe(RoomScheduleUpdated, on_ping)
+        await bus.start()
+        ready.set()
+        await asyncio.sleep(3600)
+
+    asyncio.run(run())
+
+
+async def _run(n: int, socket_dir: str) -> None:
+    # the burst is published without yielding, so the peer queue must hold all of it
+    bus = UnixSocketEventBus(
+        socket_dir, InMemoryEventBus(queue_size=n), name="jobs", queue_size=n, discovery_interval=0.05,
+    )
+    arrived: asyncio.Queue[int] = asyncio.Queue()
+
+    async def on_pong(event: TimetableScraped) -> None:
+        arrived.put_nowait(event.department_count)
+
+    bus.subscribe(TimetableScraped, on_pong)
+    await bus.start()
+    while len(bus.peers()) < 1:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.2)                    # the child discovers us too
+
+    samples = []
+    for i in range(min(n, 2000)):
+        t0 = time.perf_counter()
+        await bus.publish(RoomScheduleUpdated(room_id="B-204", affected_entry_count=i))
+        await arrived.get()
+        samples.append((time.perf_counter() - t0) / 2)
+
+    t0 = time.perf_counter()
+    for i in range(n):
+        await bus.publish(RoomScheduleUpdated(room_id="B-204", affected_entry_count=i))
+    for _ in range(n):
+        await arrived.get()
+    burst = time.perf_counter() - t0
+    await bus.aclose()
+
+    samples.sort()
+    print(f"two processes, {len(samples)} sequential events then a burst of {n}")
+    print(f"  one-way latency   median {statistics.median(samples) * 1e6:6.0f} µs   "
+          f"p99 {samples[int(len(samples) * .99)] * 1e6:6.0f} µs")
+    print(f"  burst             {n / burst:,.0f} round trips/s")
+    print(f"  frames sent {bus.stats.sent}, dropped {bus.stats.dropped}")
+
+
+def main(n: int = 20_000) -> None:
+    with tempfile.TemporaryDirectory(prefix="ev", dir="/tmp") as socket_dir:
+        ctx = multiprocessing.get_context("spawn")
+        ready = ctx.Event()
+        child = ctx.Process(target=_echo, args=(socket_dir, n, ready), daemon=True)
+        child.start()
+        ready.wait(10)
+        try:
+            asyncio.run(_run(n, socket_dir))
+        finally:
+            child.terminate()
+            child.join()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
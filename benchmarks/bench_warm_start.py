@@ -0,0 +1,106 @@
+"""
+benchmarks/bench_warm_start.py
+================================
+Time to first answered timetable request in a fresh process.
+
+  cold — no persisted snapshot: the publisher rebuilds from the repository
+         (filled with synthetic entries first, standing in for the DB read;
+         that part is reported separately)
+  warm — TimetableSnapshotPublisher(warm_start=load_snapshot): the last
+         persisted snapshot is mapped and checksum-verified on first access
+
+Each mode spawns a new interpreter; `spawn` runs from process creation
+until the child has answered one search and one free-room query,
+`in-process` from the child's first import of the application onwards.
+`python -c pass` is listed as the interpreter floor. Target for warm:
+under 200 ms.
+
+Run from the repo root:
+    python -m benchmarks.bench_warm_start [entries]
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime
+
+# the child imports only what a server would; helpers load in main()
+
+
+class _Clock:
+    def now(self) -> datetime:
+        return datetime.now()
+
+
+def _child(mode: str, path: str, n: int) -> None:
+    started = time.perf_counter()
+    from src.contexts.timetable.adapters.outbound.db.in_memory import InMemoryTimetableRepository
+    from src.contexts.timetable.adapters.outbound.db.mapped_snapshot import load_snapshot
+    from src.contexts.timetable.application.read_models.snapshot import TimetableSnapshotPublisher
+    from src.contexts.timetable.domain.value_objects import TimeSlot, WeekDay
+
+    async def run() -> float:
+        repo = InMemoryTimetableRepository()
+        loaded = 0.0
+        if mode == "cold":
+            from benchmarks.bench_search_index import synthetic_timetable
+            t0 = time.perf_counter()
+            entries = synthetic_timetable(n, random.Random(0))
+            await repo.replace_department(entries[0].department_id, entries)
+            loaded = time.perf_counter() - t0
+            publisher = TimetableSnapshotPublisher(repo, _Clock())
+        else:
+            publisher = TimetableSnapshotPublisher(repo, _Clock(), warm_start=lambda: load_snapshot(path))
+        snap = await publisher.ready()
+        snap.search.search("şahin", limit=20)
+        snap.occupancy.free_rooms(WeekDay.MONDAY, TimeSlot("10:00-10:45"))
+        return loaded
+
+    loaded = asyncio.run(run())
+    print(f"{loaded:.4f} {time.perf_counter() - started:.4f}", flush=True)
+
+
+def _spawn(args: list[str]) -> tuple[float, float, float]:
+    import subprocess
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, *args], stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    elapsed = time.perf_counter() - t0
+    proc.wait()
+    loaded, in_process = (float(x) for x in line.split()) if " " in line else (0.0, 0.0)
+    return elapsed, loaded, in_process
+
+
+def main(n: int = 50_000, repeat: int = 11) -> None:
+    import statistics
+    import tempfile
+    from pathlib import Path
+
+    from benchmarks.bench_search_index import synthetic_timetable
+    from src.contexts.timetable.adapters.outbound.db.mapped_snapshot import write_mapped_snapshot
+    from src.contexts.timetable.application.read_models.snapshot import TimetableSnapshot
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "timetable.mtts")
+        write_mapped_snapshot(path, TimetableSnapshot.build(1, datetime.now(), synthetic_timetable(n, random.Random(0))))
+        runs = {
+            "python -c pass": ["-c", "print(0)"],
+            "cold": ["-m", "benchmarks.bench_warm_start", "--child", "cold", path, str(n)],
+            "warm": ["-m", "benchmarks.bench_warm_start", "--child", "warm", path, str(n)],
+        }
+        print(f"{n} entries — time to first answered request (ms, median of {repeat})")
+        print(f"{'':<16}{'spawn':>8}{'in-process':>12}")
+        for label, args in runs.items():
+            results = [_spawn(args) for _ in range(repeat)]
+            total, loaded, in_process = (statistics.median(r[i] for r in results) * 1000 for i in range(3))
+            note = f"   (of which {loaded:.0f} ms filling the repository)" if loaded else ""
+            print(f"{label:<16}{total:8.0f}{in_process:12.0f}{note}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        _child(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
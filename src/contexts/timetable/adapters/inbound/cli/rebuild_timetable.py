@@ -0,0 +1,114 @@
+"""
+src/contexts/timetable/adapters/inbound/cli/rebuild_timetable.py
+=================================================================
+Rebuild the timetable read model from stored page snapshots, offline.
+
+    python -m src.contexts.timetable.adapters.inbound.cli.rebuild_timetable \\
+        [--snapshot-dir DIR] [--as-of 2024-09-01T12:00] [--workers N] \\
+        [--mapped-snapshot PATH]
+
+Until a persistent TimetableRepository exists the rebuilt entries live in
+memory only, so the command publishes them the way the read side consumes
+them: it builds a TimetableSnapshot and writes the mapped snapshot file
+uvicorn workers serve, one version above the file it replaces. Workers pick
+it up on their next check. Stop the scrape job first: its next refresh
+publishes from its own repository again.
+
+`--mapped-snapshot ""` only reports counts and wall time, which also makes
+the command the parser benchmark over real pages.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from src.infrastructure.clock import SystemClock
+from src.infrastructure.config.settings import Settings, TimetableSettings
+from src.contexts.timetable.adapters.outbound.db.in_memory import InMemoryTimetableRepository
+from src.contexts.timetable.adapters.outbound.db.mapped_snapshot import (
+    MappedSnapshotError,
+    read_version,
+    write_mapped_snapshot,
+)
+from src.contexts.timetable.adapters.outbound.db.page_snapshots import FileSystemPageSnapshotStore
+from src.contexts.timetable.adapters.outbound.http.parse_executor import build_parse_executor
+from src.contexts.timetable.application.use_cases.rebuild_from_snapshots import (
+    RebuildResult,
+    RebuildTimetableFromSnapshotsUseCase,
+)
+from src.contexts.timetable.application.read_models.snapshot import TimetableSnapshot
+from src.contexts.timetable.domain.entities import TimetableEntry
+
+
+def _parse_args(argv: list[str] | None, settings: Settings) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Rebuild the timetable from stored HTML snapshots.")
+    p.add_argument("--snapshot-dir", default=settings.timetable.snapshot_dir)
+    p.add_argument("--as-of", type=datetime.fromisoformat, default=None,
+                   help="use the newest page per department scraped at or before this time (UTC if no offset)")
+    p.add_argument("--workers", type=int, default=settings.timetable.parse_workers,
+                   help="parse processes (0 = inline)")
+    p.add_argument("--mapped-snapshot", default=settings.timetable.mapped_snapshot_path,
+                   help='snapshot file workers serve ("" = do not publish)')
+    return p.parse_args(argv)
+
+
+async def rebuild(
+    snapshot_dir: str,
+    as_of: datetime | None,
+    workers: int,
+    mapped_snapshot: str = "",
+    break_tolerance: int = TimetableSettings.lesson_break_tolerance_minutes,
+    entry_filter: Callable[[TimetableEntry], bool] | None = None,
+) -> tuple[RebuildResult, int | None]:
+    """Rebuild, then publish to *mapped_snapshot*; returns the published version, if any."""
+    repo = InMemoryTimetableRepository()
+    parser = build_parse_executor(workers)
+    try:
+        use_case = RebuildTimetableFromSnapshotsUseCase(
+            snapshots=FileSystemPageSnapshotStore(snapshot_dir),
+            parser=parser,
+            repo=repo,
+            entry_filter=entry_filter,
+        )
+        result = await use_case.execute(as_of)
+    finally:
+        parser.close()
+    if not mapped_snapshot:
+        return result, None
+    snapshot = TimetableSnapshot.build(
+        _next_version(mapped_snapshot), SystemClock().now(), await repo.list_all(),
+        break_tolerance=break_tolerance, memberships=await repo.memberships(),
+    )
+    await asyncio.to_thread(write_mapped_snapshot, mapped_snapshot, snapshot)
+    return result, snapshot.version
+
+
+def _next_version(path: str) -> int:
+    try:
+        return read_version(Path(path)) + 1
+    except (FileNotFoundError, MappedSnapshotError):
+        return 1
+
+
+def main(argv: list[str] | None = None) -> None:
+    settings = Settings.from_env()
+    args = _parse_args(argv, settings)
+    started = time.perf_counter()
+    result, version = asyncio.run(rebuild(
+        args.snapshot_dir, args.as_of, args.workers, args.mapped_snapshot,
+        break_tolerance=settings.timetable.lesson_break_tolerance_minutes,
+    ))
+    print(
+        f"Rebuilt {result.course_count} entries from {result.department_count} department pages "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    if version is not None:
+        print(f"Published snapshot version {version} to {args.mapped_snapshot}")
+
+
+if __name__ == "__main__":
+    main()
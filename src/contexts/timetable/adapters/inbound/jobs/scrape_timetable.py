@@ -0,0 +1,38 @@
+"""
+src/contexts/timetable/adapters/inbound/jobs/scrape_timetable.py
+=================================================================
+Scheduler entry point for the timetable scrape.
+
+Replaces the __main__ block of backup/main.py. Triggered by
+SchedulerSettings.timetable_scrape_cron (every scrape_interval_hours) for
+the explicit start_id..end_id range, or once per degree shard by
+SchedulerSettings.timetable_shard_crons.
+"""
+from __future__ import annotations
+
+from src.infrastructure.config.settings import TimetableSettings
+from src.contexts.timetable.application.use_cases.scrape_timetable import (
+    ScrapeTimetableCommand,
+    ScrapeTimetableUseCase,
+)
+from src.contexts.timetable.domain.events import TimetableScraped
+from src.contexts.timetable.domain.value_objects import DegreeLevel, DepartmentRange
+
+
+class TimetableScrapeJob:
+    def __init__(self, use_case: ScrapeTimetableUseCase, settings: TimetableSettings) -> None:
+        self._use_case = use_case
+        self._settings = settings
+
+    def shards(self) -> list[DegreeLevel]:
+        return [DegreeLevel.from_key(k) for k in self._settings.degree_levels]
+
+    async def run(self, shard: DegreeLevel | None = None) -> TimetableScraped:
+        if shard is None:
+            department_range = DepartmentRange(self._settings.start_id, self._settings.end_id)
+        else:
+            department_range = shard.department_range
+        return await self._use_case.execute(ScrapeTimetableCommand(
+            department_range=department_range,
+            incremental=self._settings.incremental,
+        ))
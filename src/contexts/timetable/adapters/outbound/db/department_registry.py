@@ -0,0 +1,82 @@
+"""
+src/contexts/timetable/adapters/outbound/db/department_registry.py
+===================================================================
+DepartmentRegistryStore kept in a small JSON file, so a restarted scrape
+owner still knows which printer IDs are dead and when each was probed.
+
+    {"departments": {"111": {"last_seen_alive": null,
+                             "last_probed": "2026-01-05T06:00:00+00:00",
+                             "empty_streak": 3}}}
+
+Only what was learned is stored; dead_after and probe_interval come from
+the settings each time the file is loaded. save() replaces the file
+atomically; a missing or unreadable file loads as an empty registry — the
+IDs are simply learned again.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.contexts.timetable.domain.entities import DepartmentLiveness, DepartmentRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class FileDepartmentRegistryStore:
+    def __init__(self, path: str | Path, dead_after: int = 2, probe_interval: timedelta = timedelta(hours=72)) -> None:
+        self._path = Path(path)
+        self._dead_after = dead_after
+        self._probe_interval = probe_interval
+
+    async def load(self) -> DepartmentRegistry:
+        return await asyncio.to_thread(self._load)
+
+    async def save(self, registry: DepartmentRegistry) -> None:
+        await asyncio.to_thread(self._save, registry)
+
+    def _load(self) -> DepartmentRegistry:
+        registry = DepartmentRegistry(dead_after=self._dead_after, probe_interval=self._probe_interval)
+        try:
+            stored = json.loads(self._path.read_text("utf-8"))["departments"]
+            for key, d in stored.items():
+                registry.departments[int(key)] = DepartmentLiveness(
+                    int(key),
+                    last_seen_alive=_time(d["last_seen_alive"]),
+                    last_probed=_time(d["last_probed"]),
+                    empty_streak=int(d["empty_streak"]),
+                )
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            logger.warning("%s: unreadable department registry (%s); starting empty", self._path, exc)
+            registry.departments.clear()
+        return registry
+
+    def _save(self, registry: DepartmentRegistry) -> None:
+        data = {"departments": {
+            str(d.department_id): {
+                "last_seen_alive": d.last_seen_alive.isoformat() if d.last_seen_alive else None,
+                "last_probed": d.last_probed.isoformat() if d.last_probed else None,
+                "empty_streak": d.empty_streak,
+            }
+            for d in registry.departments.values()
+        }}
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self._path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp, self._path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def _time(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value is not None else None
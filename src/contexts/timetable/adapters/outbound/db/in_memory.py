@@ -0,0 +1,134 @@
+"""
+src/contexts/timetable/adapters/outbound/db/in_memory.py
+=========================================================
+Process-local TimetableRepository, PageFingerprintStore and
+DepartmentRegistryStore.
+
+Used by tests and by single-process deployments until the SQL repository
+lands. Entries are held per department so an incremental scrape can replace
+only the departments whose pages changed, and keyed by their natural-key ID
+within it so an unchanged row keeps its stored object across scrapes. A
+row several departments list is stored under each of them and read once;
+which departments list it is kept alongside (memberships).
+
+Nothing survives a restart, so the scrape owner passes a `seed`: the
+departments of the snapshot it warm-starts from. They are loaded on first
+access, before the first scrape diffs against them — otherwise a
+department that fails in that scrape would vanish from the next snapshot
+instead of keeping its previous entries.
+"""
+from __future__ import annotations
+
+from typing import Callable, Iterator, Mapping
+from uuid import UUID
+
+from src.shared_kernel.domain.identity import DepartmentId, RoomId
+from src.contexts.timetable.domain.entities import DepartmentRegistry, TimetableEntry
+from src.contexts.timetable.domain.value_objects import PageFingerprint
+
+
+class InMemoryTimetableRepository:
+    def __init__(self, seed: Callable[[], Mapping[DepartmentId, list[TimetableEntry]]] | None = None) -> None:
+        self._by_department: dict[DepartmentId, dict[UUID, TimetableEntry]] = {}
+        # row ID → departments listing it, in the order they started to
+        self._members: dict[UUID, list[DepartmentId]] = {}
+        self._seed = seed
+
+    async def replace_department(self, department_id: DepartmentId, entries: list[TimetableEntry]) -> int:
+        self._load_seed()
+        return self._upsert(department_id, entries)
+
+    async def replace_departments(self, batch: Mapping[DepartmentId, list[TimetableEntry]]) -> int:
+        self._load_seed()
+        return sum(self._upsert(department_id, entries) for department_id, entries in batch.items())
+
+    def _load_seed(self) -> None:
+        if self._seed is not None:
+            seed, self._seed = self._seed, None
+            for department_id, entries in seed().items():
+                self._upsert(department_id, entries)
+
+    def _upsert(self, department_id: DepartmentId, entries: list[TimetableEntry]) -> int:
+        current = self._by_department.get(department_id, {})
+        rows: dict[UUID, TimetableEntry] = {}
+        touched = 0
+        for e in entries:
+            stored = current.get(e.id)
+            if stored is None and e.id not in rows:
+                self._members.setdefault(e.id, []).append(department_id)
+            if stored is not None and stored.same_content(e):
+                rows[e.id] = stored
+            else:
+                rows[e.id] = e
+                touched += 1
+        for entry_id in current:
+            if entry_id not in rows:
+                touched += 1
+                members = self._members[entry_id]
+                members.remove(department_id)
+                if not members:
+                    del self._members[entry_id]
+        if rows:
+            self._by_department[department_id] = rows
+        else:
+            self._by_department.pop(department_id, None)
+        return touched
+
+    async def list_all(self) -> list[TimetableEntry]:
+        self._load_seed()
+        return list(self._unique())
+
+    async def list_by_department(self, department_id: DepartmentId) -> list[TimetableEntry]:
+        self._load_seed()
+        return list(self._by_department.get(department_id, {}).values())
+
+    async def list_by_room(self, room_id: RoomId) -> list[TimetableEntry]:
+        self._load_seed()
+        return [e for e in self._unique() if e.room_id == room_id]
+
+    async def list_by_ids(self, entry_ids: list[UUID]) -> list[TimetableEntry]:
+        self._load_seed()
+        return [
+            self._by_department[self._members[i][0]][i]
+            for i in entry_ids if i in self._members
+        ]
+
+    async def memberships(self) -> dict[UUID, frozenset[DepartmentId]]:
+        self._load_seed()
+        return {entry_id: frozenset(members) for entry_id, members in self._members.items()}
+
+    async def count(self) -> int:
+        self._load_seed()
+        return len(self._members)
+
+    def _unique(self) -> Iterator[TimetableEntry]:
+        """Every stored row once; a shared row comes from the first department listing it."""
+        for department_id, rows in self._by_department.items():
+            for entry_id, entry in rows.items():
+                if self._members[entry_id][0] == department_id:
+                    yield entry
+
+
+class InMemoryFingerprintStore:
+    def __init__(self) -> None:
+        self._fingerprints: dict[int, PageFingerprint] = {}
+
+    async def get(self, department_id: int) -> PageFingerprint | None:
+        return self._fingerprints.get(department_id)
+
+    async def put(self, department_id: int, fingerprint: PageFingerprint) -> None:
+        self._fingerprints[department_id] = fingerprint
+
+    async def delete(self, department_id: int) -> None:
+        self._fingerprints.pop(department_id, None)
+
+
+class InMemoryDepartmentRegistryStore:
+    def __init__(self, registry: DepartmentRegistry | None = None) -> None:
+        self._registry = registry or DepartmentRegistry()
+
+    async def load(self) -> DepartmentRegistry:
+        return self._registry
+
+    async def save(self, registry: DepartmentRegistry) -> None:
+        self._registry = registry
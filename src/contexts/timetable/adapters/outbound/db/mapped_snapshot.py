@@ -0,0 +1,390 @@
+"""
+src/contexts/timetable/adapters/outbound/db/mapped_snapshot.py
+===============================================================
+One timetable snapshot on disk, shared read-only by every uvicorn worker.
+
+The scrape process writes the file after each published snapshot
+(MappedSnapshotExporter); workers mmap it (MappedSnapshotReader) instead of
+loading the database and building their own indexes. The bulky parts —
+the compact columns, the packed entry IDs, the search postings, the lesson
+blocks — are memoryviews straight over the mapping, so the page cache holds
+ONE copy no matter how many workers there are. Per worker remain the
+dictionaries (a few thousand strings), the occupancy bitsets (one int per
+bucket) and, on first use, the fuzzy name indexes.
+
+Layout (little-endian):
+
+    header    magic b"MTTS", format u16, reserved u16, version u64,
+              meta length u64, CRC-32 of everything after the header u32, pad
+    meta      JSON, space-padded to 8 bytes: built_at, dictionaries, search
+              vocabulary, occupancy room ids, lesson-block break tolerance,
+              and {section: [offset from the end of meta, length, typecode]}
+    sections  8-byte aligned raw arrays: ids, one per column, department
+              offsets / rows, search offsets / postings / row_values,
+              occupancy bitsets, lesson block offsets / rows / starts / ends
+
+The writer fills a temporary file and os.replace()s it, so a reader sees
+either the old file or the new one. The checksum catches the rest (a
+truncated copy, a bad disk): map_snapshot() refuses such a file, and
+load_snapshot() turns that into None so the caller rebuilds from the
+repository instead. Verifying costs one zlib.crc32 pass over the file, a
+few milliseconds for a full timetable. Workers stat the file at most once
+per `check_interval` and remap when its identity (inode, mtime, size)
+differs from the file they mapped — whatever its version, so a scrape owner
+restarted from an empty data directory, or a restored backup, is picked
+up. Under an event loop the remap runs in a thread and `current` keeps
+returning the previous snapshot until it is done; the old mapping stays
+valid for requests still holding it and is released with them. A reader
+registered on the event bus also remaps as soon as the scrape owner's
+TimetableSnapshotPublished arrives, so a worker never serves a version it
+has been told is stale.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+import zlib
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Sequence
+from uuid import UUID
+
+from src.contexts.timetable.application.ports.outbound import EventBus
+from src.contexts.timetable.application.read_models.columnar_search import ColumnarSearchIndex
+from src.contexts.timetable.application.read_models.compact_timetable import (
+    COLUMNS,
+    DAYS,
+    CompactTimetable,
+)
+from src.contexts.timetable.application.read_models.fuzzy_lookup import FuzzyNameIndex
+from src.contexts.timetable.application.read_models.lesson_blocks import LessonBlockIndex
+from src.contexts.timetable.application.read_models.room_occupancy import RoomOccupancyIndex
+from src.contexts.timetable.application.read_models.snapshot import TimetableSnapshot
+from src.contexts.timetable.domain.events import TimetableSnapshotPublished
+from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot
+from src.shared_kernel.domain.identity import DepartmentId, RoomId
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MTTS"
+FORMAT = 4
+_HEADER = struct.Struct("<4sHHQQI4x")
+_ALIGN = 8
+
+
+class MappedSnapshotError(Exception):
+    """The file is not a mapped timetable snapshot this code can read."""
+
+
+class MappedTimetableSnapshot:
+    """A TimetableSnapshot look-alike backed by a shared mapping."""
+
+    def __init__(
+        self,
+        version: int,
+        built_at: datetime,
+        rows: CompactTimetable,
+        occupancy: RoomOccupancyIndex,
+        search: ColumnarSearchIndex,
+        blocks: LessonBlockIndex,
+    ) -> None:
+        self.version = version
+        self.built_at = built_at
+        self.rows = rows
+        self.occupancy = occupancy
+        self.search = search
+        self.blocks = blocks
+        self._teachers: FuzzyNameIndex | None = None
+        self._courses: FuzzyNameIndex | None = None
+
+    @property
+    def etag(self) -> str:
+        return f'"timetable-{self.version}"'
+
+    @property
+    def teachers(self) -> FuzzyNameIndex:
+        if self._teachers is None:
+            self._teachers = _fuzzy_index(self.rows, "teacher")
+        return self._teachers
+
+    @property
+    def courses(self) -> FuzzyNameIndex:
+        if self._courses is None:
+            self._courses = _fuzzy_index(self.rows, "course_name")
+        return self._courses
+
+
+def _fuzzy_index(rows: CompactTimetable, column: str) -> FuzzyNameIndex:
+    strings = rows.dictionary("strings")
+    index = FuzzyNameIndex()
+    index.rebuild(strings[code] for code in rows.column(column))
+    return index
+
+
+# ── writing ─────────────────────────────────────────────────────────────
+
+
+def write_mapped_snapshot(path: str | Path, snapshot: TimetableSnapshot) -> None:
+    """Serialise *snapshot* to *path*, atomically replacing any previous file."""
+    dictionaries, columns, ids = snapshot.rows.export()
+    search = ColumnarSearchIndex.build(snapshot.rows)
+    vocabulary, offsets, postings, row_values = search.export()
+    resolution, room_ids, busy = snapshot.occupancy.export()
+    width = (len(room_ids) + 7) // 8
+    break_tolerance, block_offsets, block_rows, block_starts, block_ends = snapshot.blocks.export()
+
+    sections: list[tuple[str, str, bytes]] = [("ids", "B", bytes(ids))]
+    sections += [(f"col:{name}", typecode, _pack(typecode, columns[name])) for name, (_, typecode) in COLUMNS.items()]
+    department_offsets, department_rows = snapshot.rows.department_index()
+    sections += [
+        ("departments:offsets", "I", _pack("I", department_offsets)),
+        ("departments:rows", "I", _pack("I", department_rows)),
+        ("search:offsets", "I", _pack("I", offsets)),
+        ("search:postings", "I", _pack("I", postings)),
+        ("search:row_values", "I", _pack("I", row_values)),
+        ("occupancy", "B", b"".join(
+            bits.to_bytes(width, "little") for day in DAYS for bits in busy[day]
+        )),
+        ("blocks:offsets", "I", _pack("I", block_offsets)),
+        ("blocks:rows", "I", _pack("I", block_rows)),
+        ("blocks:starts", "h", _pack("h", block_starts)),
+        ("blocks:ends", "h", _pack("h", block_ends)),
+    ]
+
+    layout, offset = {}, 0
+    for name, typecode, data in sections:
+        layout[name] = [offset, len(data), typecode]
+        offset += _align(len(data))
+    meta = json.dumps({
+        "built_at": snapshot.built_at.isoformat(),
+        "dictionaries": _encode_dictionaries(dictionaries),
+        "search_vocabulary": vocabulary,
+        "search_folded": search.folded_vocabulary(),
+        "occupancy": {"resolution": resolution, "room_ids": room_ids,
+                      "buckets": len(busy[DAYS[0]]), "width": width},
+        "blocks": {"break_tolerance": break_tolerance},
+        "sections": layout,
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    meta += b" " * (_align(len(meta)) - len(meta))
+    checksum = zlib.crc32(meta)
+    for _, _, data in sections:
+        checksum = zlib.crc32(data + _padding(data), checksum)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT, 0, snapshot.version, len(meta), checksum))
+            f.write(meta)
+            for _, _, data in sections:
+                f.write(data)
+                f.write(_padding(data))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _pack(typecode: str, values: Sequence[int]) -> bytes:
+    return (values if isinstance(values, array) else array(typecode, values)).tobytes()
+
+
+def _align(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+def _padding(data: bytes) -> bytes:
+    return b"\0" * (_align(len(data)) - len(data))
+
+
+def _encode_dictionaries(dictionaries: dict[str, list]) -> dict[str, list]:
+    return {
+        "strings": dictionaries["strings"],
+        "course_codes": [c.value for c in dictionaries["course_codes"]],
+        "time_slots": [s.raw for s in dictionaries["time_slots"]],
+        "room_ids": [str(r) for r in dictionaries["room_ids"]],
+        "department_ids": [str(d) for d in dictionaries["department_ids"]],
+        "scraped_ats": [t.isoformat() for t in dictionaries["scraped_ats"]],
+    }
+
+
+def _decode_dictionaries(encoded: dict[str, list]) -> dict[str, list]:
+    return {
+        "strings": encoded["strings"],
+        "course_codes": [CourseCode(c) for c in encoded["course_codes"]],
+        "time_slots": [TimeSlot(s) for s in encoded["time_slots"]],
+        "room_ids": [RoomId(UUID(r)) for r in encoded["room_ids"]],
+        "department_ids": [DepartmentId(UUID(d)) for d in encoded["department_ids"]],
+        "scraped_ats": [datetime.fromisoformat(t) for t in encoded["scraped_ats"]],
+    }
+
+
+# ── reading ─────────────────────────────────────────────────────────────
+
+
+def read_version(path: str | Path) -> int:
+    with open(path, "rb") as f:
+        return _parse_header(f.read(_HEADER.size))[0]
+
+
+def _parse_header(data: bytes) -> tuple[int, int, int]:
+    if len(data) < _HEADER.size:
+        raise MappedSnapshotError("truncated header")
+    magic, fmt, _, version, meta_len, checksum = _HEADER.unpack_from(data)
+    if magic != MAGIC or fmt != FORMAT:
+        raise MappedSnapshotError(f"not a format-{FORMAT} timetable snapshot")
+    return version, meta_len, checksum
+
+
+def map_snapshot(path: str | Path, verify: bool = True) -> MappedTimetableSnapshot:
+    """Map *path* read-only and wrap it; nothing bulky is copied.
+
+    Raises MappedSnapshotError for a foreign file or, with *verify*, for a
+    checksum mismatch.
+    """
+    with open(path, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapping)
+    version, meta_len, checksum = _parse_header(view[:_HEADER.size])
+    if verify and zlib.crc32(view[_HEADER.size:]) != checksum:
+        raise MappedSnapshotError(f"{path}: checksum mismatch")
+    meta = json.loads(bytes(view[_HEADER.size:_HEADER.size + meta_len]))
+
+    start = _HEADER.size + meta_len
+
+    def section(name: str) -> memoryview:
+        offset, length, typecode = meta["sections"][name]
+        offset += start
+        return view[offset:offset + length].cast(typecode)
+
+    rows = CompactTimetable.from_export(
+        _decode_dictionaries(meta["dictionaries"]),
+        {name: section(f"col:{name}") for name in COLUMNS},
+        section("ids"),
+        (section("departments:offsets"), section("departments:rows")),
+    )
+    search = ColumnarSearchIndex(
+        rows,
+        meta["search_vocabulary"],
+        section("search:offsets"),
+        section("search:postings"),
+        section("search:row_values"),
+        meta["search_folded"],
+    )
+    occ = meta["occupancy"]
+    raw, width, buckets = section("occupancy"), occ["width"], occ["buckets"]
+    busy = {
+        day: [
+            int.from_bytes(raw[(d * buckets + b) * width:(d * buckets + b + 1) * width], "little")
+            for b in range(buckets)
+        ]
+        for d, day in enumerate(DAYS)
+    }
+    occupancy = RoomOccupancyIndex.from_export(occ["resolution"], occ["room_ids"], busy)
+    blocks = LessonBlockIndex(
+        rows,
+        meta["blocks"]["break_tolerance"],
+        section("blocks:offsets"),
+        section("blocks:rows"),
+        section("blocks:starts"),
+        section("blocks:ends"),
+    )
+    return MappedTimetableSnapshot(
+        version, datetime.fromisoformat(meta["built_at"]), rows, occupancy, search, blocks,
+    )
+
+
+def load_snapshot(path: str | Path) -> MappedTimetableSnapshot | None:
+    """The verified snapshot at *path*, or None if it is missing or unusable."""
+    try:
+        return map_snapshot(path)
+    except FileNotFoundError:
+        return None
+    except (MappedSnapshotError, ValueError) as exc:
+        logger.warning("ignoring timetable snapshot %s: %s", path, exc)
+        return None
+
+
+class MappedSnapshotReader:
+    """A worker's handle on the shared snapshot file; remaps when it changes."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        check_interval: float = 1.0,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._path = Path(path)
+        self._interval = check_interval
+        self._monotonic = monotonic
+        self._checked_at = float("-inf")
+        self._current: MappedTimetableSnapshot | None = None
+        self._identity: tuple[int, ...] | None = None     # of the file last loaded, or rejected
+        self._lock = asyncio.Lock()
+        self._reloading: asyncio.Task | None = None
+
+    @property
+    def current(self) -> MappedTimetableSnapshot | None:
+        """The newest snapshot on disk, or None until the scrape job wrote one."""
+        now = self._monotonic()
+        if now - self._checked_at >= self._interval:
+            self._checked_at = now
+            if self._reloading is None and _identity(self._path) != self._identity:
+                try:
+                    loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    self._load_if_changed()             # no loop to block: a script or a test
+                else:
+                    self._reloading = loop.create_task(self._reload())
+                    self._reloading.add_done_callback(self._reloaded)
+        return self._current
+
+    def register(self, bus: EventBus) -> None:
+        bus.subscribe(TimetableSnapshotPublished, self.on_snapshot_published)
+
+    async def on_snapshot_published(self, event: TimetableSnapshotPublished) -> None:
+        await self._reload()
+
+    async def _reload(self) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._load_if_changed)
+
+    def _reloaded(self, task: asyncio.Task) -> None:
+        self._reloading = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("remapping %s failed", self._path, exc_info=task.exception())
+
+    def _load_if_changed(self) -> None:
+        identity = _identity(self._path)
+        if identity is None or identity == self._identity:
+            return
+        self._identity = identity                       # a bad file is not retried until it is replaced
+        self._current = load_snapshot(self._path) or self._current
+
+
+def _identity(path: Path) -> tuple[int, ...] | None:
+    """What changes whenever the file is replaced; None if there is no file."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class MappedSnapshotExporter:
+    """Writes every snapshot the publisher installs; register with add_listener()."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+
+    async def on_snapshot(self, snapshot: TimetableSnapshot) -> None:
+        await asyncio.to_thread(write_mapped_snapshot, self._path, snapshot)
+
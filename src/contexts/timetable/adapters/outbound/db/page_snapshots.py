@@ -0,0 +1,164 @@
+"""
+src/contexts/timetable/adapters/outbound/db/page_snapshots.py
+==============================================================
+Content-addressed, gzip-compressed store of raw department-printer HTML.
+
+Layout under *root*:
+    blobs/ab/ab12…ef.gz   one file per distinct page body (sha256 of the text)
+    index.sqlite3         pages(department_id, scraped_at, content_hash)
+
+Identical pages — the common case between 6-hourly scrapes — are stored
+once; each scrape only adds an index row. Because incremental scrapes do not
+download unchanged pages, the snapshot "as of T" is the newest indexed page
+per department at or before T.
+
+scraped_at is stored as UTC microseconds since the epoch, so times from
+clocks in different zones order correctly; a naive datetime is taken to be
+UTC, as the Clock port promises, and refs come back as aware UTC datetimes.
+A department that answered 404 gets a tombstone row (content_hash ''):
+latest() leaves the department out from then until its next page, so a
+rebuild does not bring back a department that has since gone. Indexes
+written before scraped_at became an integer are converted on open.
+
+File and SQLite work runs in threads: zlib releases the GIL, so concurrent
+load() calls decode in parallel.
+"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from src.contexts.timetable.application.ports.outbound import PageSnapshotRef
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    department_id INTEGER NOT NULL,
+    scraped_at    INTEGER NOT NULL,   -- UTC microseconds since the epoch
+    content_hash  TEXT    NOT NULL,   -- '' is a tombstone: the page was missing
+    PRIMARY KEY (department_id, scraped_at)
+)
+"""
+_SCHEMA_VERSION = 1
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class FileSystemPageSnapshotStore:
+    def __init__(self, root: str | Path, compresslevel: int = 6) -> None:
+        self._root = Path(root)
+        self._blobs = self._root / "blobs"
+        self._index = self._root / "index.sqlite3"
+        self._level = compresslevel
+        self._blobs.mkdir(parents=True, exist_ok=True)
+        self._open_index()
+
+    def _open_index(self) -> None:
+        with closing(sqlite3.connect(self._index, isolation_level=None)) as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                if db.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                    old = db.execute("SELECT name FROM sqlite_master WHERE name = 'pages'").fetchall()
+                    rows = db.execute("SELECT * FROM pages").fetchall() if old else []
+                    db.execute("DROP TABLE IF EXISTS pages")
+                    db.execute(_SCHEMA)
+                    db.executemany(
+                        "INSERT OR REPLACE INTO pages VALUES (?, ?, ?)",
+                        [(d, _epoch(datetime.fromisoformat(t)), h) for d, t, h in rows],
+                    )
+                    db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def _query(self, sql: str, args: tuple = ()) -> list[tuple]:
+        db = sqlite3.connect(self._index)
+        try:
+            with db:
+                return db.execute(sql, args).fetchall()
+        finally:
+            db.close()
+
+    def _blob_path(self, content_hash: str) -> Path:
+        return self._blobs / content_hash[:2] / f"{content_hash}.gz"
+
+    # ── PageSnapshotStore ───────────────────────────────────────────────
+
+    async def put(self, department_id: int, scraped_at: datetime, body: str) -> PageSnapshotRef:
+        return await asyncio.to_thread(self._put, department_id, scraped_at, body)
+
+    async def put_missing(self, department_id: int, scraped_at: datetime) -> None:
+        await asyncio.to_thread(self._put_missing, department_id, scraped_at)
+
+    async def latest(self, as_of: datetime | None = None) -> list[PageSnapshotRef]:
+        return await asyncio.to_thread(self._latest, as_of)
+
+    async def history(self, department_id: int) -> list[PageSnapshotRef]:
+        return await asyncio.to_thread(self._history, department_id)
+
+    async def load(self, content_hash: str) -> str:
+        return await asyncio.to_thread(self._load, content_hash)
+
+    # ── blocking implementations ────────────────────────────────────────
+
+    def _put(self, department_id: int, scraped_at: datetime, body: str) -> PageSnapshotRef:
+        data = body.encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(content_hash)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(data, compresslevel=self._level, mtime=0))
+            os.replace(tmp, path)
+        at = _epoch(scraped_at)
+        self._query("INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", (department_id, at, content_hash))
+        return PageSnapshotRef(department_id, _datetime(at), content_hash)
+
+    def _put_missing(self, department_id: int, scraped_at: datetime) -> None:
+        # only over a stored page: a department that was never seen, or is already gone, needs no row
+        self._query(
+            "INSERT OR REPLACE INTO pages SELECT ?, ?, ''"
+            " WHERE (SELECT content_hash FROM pages WHERE department_id = ?"
+            "        ORDER BY scraped_at DESC LIMIT 1) != ''",
+            (department_id, _epoch(scraped_at), department_id),
+        )
+
+    def _latest(self, as_of: datetime | None) -> list[PageSnapshotRef]:
+        # SQLite returns the bare columns of the MAX() row within each group.
+        sql = "SELECT department_id, MAX(scraped_at), content_hash FROM pages"
+        args: tuple = ()
+        if as_of is not None:
+            sql += " WHERE scraped_at <= ?"
+            args = (_epoch(as_of),)
+        sql += " GROUP BY department_id ORDER BY department_id"
+        rows = self._query(sql, args)
+        return [PageSnapshotRef(d, _datetime(t), h) for d, t, h in rows if h]
+
+    def _history(self, department_id: int) -> list[PageSnapshotRef]:
+        rows = self._query(
+            "SELECT department_id, scraped_at, content_hash FROM pages"
+            " WHERE department_id = ? AND content_hash != '' ORDER BY scraped_at",
+            (department_id,),
+        )
+        return [PageSnapshotRef(d, _datetime(t), h) for d, t, h in rows]
+
+    def _load(self, content_hash: str) -> str:
+        return gzip.decompress(self._blob_path(content_hash).read_bytes()).decode("utf-8")
+
+
+def _epoch(at: datetime) -> int:
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=UTC)
+    return (at - _EPOCH) // _MICROSECOND
+
+
+def _datetime(epoch: int) -> datetime:
+    return _EPOCH + epoch * _MICROSECOND
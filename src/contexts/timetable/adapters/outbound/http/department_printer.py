@@ -0,0 +1,58 @@
+"""
+src/contexts/timetable/adapters/outbound/http/department_printer.py
+====================================================================
+DepartmentPageSource over http://timetable.manas.edu.kg/department-printer/{id}.
+
+Conditional requests: the previous PageFingerprint's ETag / Last-Modified are
+sent back as If-None-Match / If-Modified-Since so an unchanged page costs a
+304 with no body instead of a full download.
+"""
+from __future__ import annotations
+
+import httpx
+
+from src.contexts.timetable.application.ports.outbound import DepartmentPage
+from src.contexts.timetable.domain.errors import (
+    DepartmentPageMissing,
+    ScrapeFailure,
+    TransientScrapeFailure,
+)
+from src.contexts.timetable.domain.value_objects import PageFingerprint
+
+
+class ManasDepartmentPrinterClient:
+    def __init__(self, client: httpx.AsyncClient, base_url: str) -> None:
+        self._client = client
+        self._base_url = base_url.rstrip("/")
+
+    async def fetch(self, department_id: int, previous: PageFingerprint | None) -> DepartmentPage:
+        headers: dict[str, str] = {}
+        if previous is not None:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+
+        try:
+            resp = await self._client.get(f"{self._base_url}/{department_id}", headers=headers)
+        except httpx.TransportError as exc:
+            raise TransientScrapeFailure(department_id, f"{type(exc).__name__}: {exc}") from exc
+        except httpx.HTTPError as exc:
+            raise ScrapeFailure(department_id, f"{type(exc).__name__}: {exc}") from exc
+
+        if resp.status_code == 304 and previous is not None:
+            return DepartmentPage(department_id, body="", fingerprint=previous, not_modified=True)
+        if resp.status_code == 404:
+            raise DepartmentPageMissing(department_id, "HTTP 404")
+        if resp.status_code == 429 or resp.status_code >= 500:
+            raise TransientScrapeFailure(department_id, f"HTTP {resp.status_code}")
+        if resp.status_code != 200:
+            raise ScrapeFailure(department_id, f"HTTP {resp.status_code}")
+
+        body = resp.text
+        fingerprint = PageFingerprint.of(
+            body,
+            etag=resp.headers.get("ETag", ""),
+            last_modified=resp.headers.get("Last-Modified", ""),
+        )
+        return DepartmentPage(department_id, body=body, fingerprint=fingerprint)
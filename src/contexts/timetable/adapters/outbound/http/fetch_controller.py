@@ -0,0 +1,145 @@
+"""
+src/contexts/timetable/adapters/outbound/http/fetch_controller.py
+==================================================================
+Adaptive concurrency + retry decorator for any DepartmentPageSource.
+
+Replaces the fixed asyncio.Semaphore(20) and the silent `except: pass` of
+backup/main.py:
+
+  AimdLimiter         — in-flight limit grows by ~1 per window of fast,
+                        successful responses and halves on an error or a
+                        response slower than the target latency.
+  RetryPolicy         — full-jitter exponential backoff, bounded per department.
+  AdaptiveFetchController
+                      — wraps a DepartmentPageSource; retries
+                        TransientScrapeFailure, raises ScrapeFailure once the
+                        department's retry budget is spent.
+
+A retrying department sleeps OUTSIDE its slot so backoff never holds
+capacity other departments could use.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from src.contexts.timetable.application.ports.outbound import DepartmentPage, DepartmentPageSource
+from src.contexts.timetable.domain.errors import ScrapeFailure, TransientScrapeFailure
+from src.contexts.timetable.domain.value_objects import PageFingerprint
+
+
+class AimdLimiter:
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        target_latency: float,
+        backoff: float = 0.5,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 1 <= minimum <= maximum:
+            raise ValueError(f"need 1 <= minimum ({minimum}) <= maximum ({maximum})")
+        self._min = minimum
+        self._max = maximum
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._target = target_latency
+        self._backoff = backoff
+        self._monotonic = monotonic
+        self._last_decrease = float("-inf")
+        self._in_flight = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < int(self._limit))
+            self._in_flight += 1
+
+    async def release(self) -> None:
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        if latency > self._target:
+            self._decrease()
+        else:
+            self._limit = min(self._max, self._limit + 1 / self._limit)
+
+    def on_failure(self) -> None:
+        self._decrease()
+
+    def _decrease(self) -> None:
+        # A burst of failures from requests that were already in flight is
+        # one congestion signal, not many: back off at most once per window.
+        now = self._monotonic()
+        if now - self._last_decrease < self._target:
+            return
+        self._last_decrease = now
+        self._limit = max(self._min, self._limit * self._backoff)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+
+    def delay(self, retry: int, rand: Callable[[], float] = random.random) -> float:
+        """Full-jitter backoff before the *retry*-th retry (1-based)."""
+        return rand() * min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+
+
+class AdaptiveFetchController:
+    def __init__(
+        self,
+        inner: DepartmentPageSource,
+        limiter: AimdLimiter,
+        retry: RetryPolicy,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rand: Callable[[], float] = random.random,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._inner = inner
+        self._limiter = limiter
+        self._retry = retry
+        self._sleep = sleep
+        self._rand = rand
+        self._monotonic = monotonic
+
+    async def fetch(self, department_id: int, previous: PageFingerprint | None) -> DepartmentPage:
+        retries = 0
+        while True:
+            await self._limiter.acquire()
+            started = self._monotonic()
+            try:
+                page = await self._inner.fetch(department_id, previous)
+            except TransientScrapeFailure as exc:
+                self._limiter.on_failure()
+                last = exc
+            except ScrapeFailure:
+                self._limiter.on_success(self._monotonic() - started)  # origin answered promptly
+                raise
+            else:
+                self._limiter.on_success(self._monotonic() - started)
+                return page
+            finally:
+                await self._limiter.release()
+
+            retries += 1
+            if retries > self._retry.max_retries:
+                raise ScrapeFailure(
+                    department_id, f"gave up after {retries} attempts: {last.reason}",
+                ) from last
+            await self._sleep(self._retry.delay(retries, self._rand))
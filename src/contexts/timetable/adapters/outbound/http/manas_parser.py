@@ -0,0 +1,101 @@
+"""
+src/contexts/timetable/adapters/outbound/http/manas_parser.py
+==============================================================
+BeautifulSoup parser for the department-printer HTML format.
+
+Ported from backup/main.py ManasParser. Page layout:
+    <table>
+      <tr><td></td><td>Pazartesi</td><td>Salı</td>…</tr>        ← header: days
+      <tr><td>08:00-08:45</td><td><div>CODE Name<br>Teacher<br>Room</div>…</td>…</tr>
+    </table>
+
+parse_rows() yields plain ParsedRow tuples; parse() turns them into
+TimetableEntry objects. Cells whose day header is not a Turkish weekday
+are dropped there.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import NamedTuple
+
+from bs4 import BeautifulSoup
+
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.services import department_id_for, room_id_for
+from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot, WeekDay
+
+
+class ParsedRow(NamedTuple):
+    day: str
+    time_slot: str
+    course_code: str
+    course_name: str
+    teacher_name: str
+    room: str
+
+
+_DAYS = {d.turkish: d for d in WeekDay}
+
+
+def rows_to_entries(rows: list[ParsedRow], department_id: int, scraped_at: datetime) -> list[TimetableEntry]:
+    dept = department_id_for(department_id)
+    entries = []
+    for r in rows:
+        day = _DAYS.get(r.day)
+        if day is None:
+            continue
+        entries.append(TimetableEntry.create(
+            course_code=CourseCode(r.course_code),
+            course_name=r.course_name,
+            day=day,
+            time_slot=TimeSlot(r.time_slot),
+            room_id=room_id_for(r.room),
+            teacher_name=r.teacher_name,
+            department_id=dept,
+            scraped_at=scraped_at,
+            room_name=r.room,
+        ))
+    return entries
+
+
+def split_cell_lines(lines: list[str]) -> tuple[str, str, str, str]:
+    """['CODE Name', teacher, room] → (code, name, teacher, room)."""
+    parts = lines[0].split(" ", 1)
+    code = parts[0]
+    name = parts[1] if len(parts) > 1 else ""
+    teacher = lines[1] if len(lines) > 1 else "?"
+    room = lines[2] if len(lines) > 2 else "?"
+    return code, name, teacher, room
+
+
+class ManasParser:
+    def parse_rows(self, html: str) -> list[ParsedRow]:
+        soup = BeautifulSoup(html, "html.parser")
+        rows: list[ParsedRow] = []
+
+        for table in soup.find_all("table"):
+            header = table.find("tr")
+            if not header:
+                continue
+            tds = header.find_all("td")
+            if len(tds) < 2:
+                continue
+            days = [td.get_text(strip=True) for td in tds[1:]]
+
+            for tr in table.find_all("tr")[1:]:
+                cols = tr.find_all("td")
+                if not cols:
+                    continue
+                time_slot = cols[0].get_text(strip=True)
+
+                for i, cell in enumerate(cols[1:]):
+                    if i >= len(days):
+                        break
+                    for div in cell.find_all("div"):
+                        lines = div.get_text(separator="\n", strip=True).split("\n")
+                        if lines:
+                            rows.append(ParsedRow(days[i], time_slot, *split_cell_lines(lines)))
+        return rows
+
+    def parse(self, html: str, department_id: int, scraped_at: datetime) -> list[TimetableEntry]:
+        return rows_to_entries(self.parse_rows(html), department_id, scraped_at)
@@ -0,0 +1,106 @@
+"""
+src/contexts/timetable/adapters/outbound/http/parse_executor.py
+================================================================
+TimetableParser implementations that decide WHERE parsing runs.
+
+Parsing a department page is pure CPU. Done inside the scrape coroutine it
+stalls the event loop — and with it every in-flight download and every
+FastAPI handler in the process.
+
+  ProcessPoolParseExecutor — ships the HTML to a ProcessPoolExecutor worker;
+                             only compact ParsedRow tuples come back and are
+                             turned into TimetableEntry objects on the loop.
+  InlineParseExecutor      — parses on the calling thread (tests, workers=0).
+
+build_parse_executor(settings.parse_workers) picks one.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Protocol
+
+from src.contexts.timetable.adapters.outbound.http.manas_parser import ParsedRow, rows_to_entries
+from src.contexts.timetable.adapters.outbound.http.streaming_parser import StreamingManasParser
+from src.contexts.timetable.domain.entities import TimetableEntry
+
+logger = logging.getLogger(__name__)
+
+class RowParser(Protocol):
+    def parse_rows(self, html: str) -> list[ParsedRow]: ...
+
+
+# One parser instance per worker process, created on first use.
+_worker_parsers: dict[type, RowParser] = {}
+
+
+def _parse_in_worker(parser_cls: type, html: str) -> list[ParsedRow]:
+    parser = _worker_parsers.get(parser_cls)
+    if parser is None:
+        parser = _worker_parsers[parser_cls] = parser_cls()
+    return parser.parse_rows(html)
+
+
+class InlineParseExecutor:
+    def __init__(self, parser: RowParser | None = None) -> None:
+        self._parser = parser or StreamingManasParser()
+
+    async def parse(self, html: str, department_id: int, scraped_at: datetime) -> list[TimetableEntry]:
+        return rows_to_entries(self._parser.parse_rows(html), department_id, scraped_at)
+
+    def close(self) -> None:
+        pass
+
+
+class ProcessPoolParseExecutor:
+    """Parse in a lazily started process pool.
+
+    *parser_cls* must be importable at module level (it is pickled by
+    reference) and constructible without arguments.
+
+    A worker that dies (killed by the OOM killer, a crash in a C extension)
+    breaks the whole pool: every pending and later call raises
+    BrokenProcessPool. The first call to see that replaces the pool, and
+    each failed call is retried once on the new one; a page that breaks the
+    pool twice raises, and the scrape fails just that department.
+    """
+
+    def __init__(self, max_workers: int, parser_cls: type = StreamingManasParser) -> None:
+        self._max_workers = max_workers
+        self._parser_cls = parser_cls
+        self._pool: ProcessPoolExecutor | None = None
+
+    async def parse(self, html: str, department_id: int, scraped_at: datetime) -> list[TimetableEntry]:
+        try:
+            rows = await self._run(html)
+        except BrokenProcessPool:
+            logger.warning("department %d: parse worker died; retrying on a new pool", department_id)
+            rows = await self._run(html)
+        return rows_to_entries(rows, department_id, scraped_at)
+
+    async def _run(self, html: str) -> list[ParsedRow]:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._max_workers)
+        pool = self._pool
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, _parse_in_worker, self._parser_cls, html)
+        except BrokenProcessPool:
+            if self._pool is pool:                  # not yet replaced by another call that saw it break
+                self._pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+def build_parse_executor(workers: int) -> InlineParseExecutor | ProcessPoolParseExecutor:
+    """workers <= 0 parses inline; otherwise a pool of that many processes."""
+    if workers <= 0:
+        return InlineParseExecutor()
+    return ProcessPoolParseExecutor(max_workers=workers)
@@ -0,0 +1,253 @@
+"""
+src/contexts/timetable/adapters/outbound/http/streaming_parser.py
+==================================================================
+Single-pass department-printer parser on the stdlib HTMLParser event model.
+
+Drop-in replacement for ManasParser: same ParsedRow output, same
+TimetableEntry output, but no tree is built. Rows are emitted as soon as
+the </tr> of their row is seen.
+
+Mirrors BeautifulSoup's get_text(separator="\\n", strip=True) semantics:
+text nodes are split at every tag, comment, declaration and processing
+instruction, each node is stripped and empty ones dropped. Comments,
+declarations, processing instructions and <script>/<style> content are
+not text; neither is text anywhere inside a <template>, although the
+tables, rows, cells and divs in it still count, as find_all() sees them.
+A CDATA section is a text node of its own, even inside a <template>.
+
+Malformed markup nests the way bs4's html.parser builder nests it: a start
+tag never closes anything, an end tag closes the innermost open element of
+its name and everything inside it, and an end tag with nothing to close is
+ignored. So an unclosed header <tr> takes in the next row, and an unclosed
+<td> the cells after it. Only a stack of open elements is kept, plus a
+small record per open table, row, cell and div; a cell's text counts for
+every cell and div it sits in. A nested table is parsed as its own table
+and its rows also belong to the enclosing one, exactly as
+find_all("table") / find_all("tr") see them; its rows come out after the
+enclosing table's.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from html import unescape
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import Iterable, Iterator
+
+from src.contexts.timetable.adapters.outbound.http.manas_parser import (
+    ParsedRow,
+    rows_to_entries,
+    split_cell_lines,
+)
+from src.contexts.timetable.domain.entities import TimetableEntry
+
+_SKIP_CONTENT = frozenset({"script", "style", "template"})   # bs4 keeps their text out of get_text()
+# bs4's void elements: never pushed, so their end tags match nothing
+_VOID = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem",
+    "meta", "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame",
+    "image", "isindex", "nextid", "spacer",
+})
+
+
+class _Div:
+    __slots__ = ("texts",)
+
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+
+
+class _Cell:
+    __slots__ = ("texts", "divs")
+
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+        self.divs: list[_Div] = []
+
+
+class _Row:
+    __slots__ = ("cells", "closed")
+
+    def __init__(self) -> None:
+        self.cells: list[_Cell] = []
+        self.closed = False
+
+
+class _Table:
+    __slots__ = ("header", "body", "emitted", "days", "closed")
+
+    def __init__(self) -> None:
+        self.header: _Row | None = None
+        self.body: list[_Row] = []
+        self.emitted = 0
+        self.days: list[str] | None = None
+        self.closed = False
+
+
+class _DepartmentPrinterHandler(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.rows: list[ParsedRow] = []
+        self._pending: list[str] = []
+        self._skip_depth = 0
+
+        # every open element, innermost last, as bs4 would nest it
+        self._stack: list[tuple[str, object]] = []
+        self._open_tables: list[_Table] = []
+        self._open_rows: list[_Row] = []
+        self._open_cells: list[_Cell] = []
+        self._open_divs: list[_Div] = []
+        self._tables: list[_Table | None] = []     # in start order, None once emitted
+        self._next_table = 0
+
+    # ── text ────────────────────────────────────────────────────────────
+
+    def handle_data(self, data: str) -> None:
+        if self._open_cells and not self._skip_depth:
+            self._pending.append(data)
+
+    def handle_entityref(self, name: str) -> None:
+        self.handle_data(html5.get(name + ";", "&" + name))
+
+    def handle_charref(self, name: str) -> None:
+        self.handle_data(unescape(f"&#{name};"))
+
+    def handle_comment(self, data: str) -> None:
+        self._flush()
+
+    def handle_decl(self, decl: str) -> None:
+        self._flush()
+
+    def handle_pi(self, data: str) -> None:
+        self._flush()
+
+    def unknown_decl(self, data: str) -> None:
+        self._flush()
+        if data.upper().startswith("CDATA[") and self._open_cells:
+            self._pending.append(data[len("CDATA["):])     # bs4's CData, text even in a <template>
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        text = "".join(self._pending).strip()
+        self._pending.clear()
+        if text:
+            for cell in self._open_cells:
+                cell.texts.append(text)
+            for div in self._open_divs:
+                div.texts.append(text)
+
+    # ── structure ───────────────────────────────────────────────────────
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        self._flush()
+        if tag in _VOID:
+            return
+        record: object = None
+        if tag in _SKIP_CONTENT:
+            self._skip_depth += 1
+        elif tag == "table":
+            record = _Table()
+            self._tables.append(record)
+            self._open_tables.append(record)
+        elif tag == "tr" and self._open_tables:
+            record = _Row()
+            for table in self._open_tables:
+                if table.header is None:
+                    table.header = record
+                else:
+                    table.body.append(record)
+            self._open_rows.append(record)
+        elif tag == "td" and self._open_rows:
+            record = _Cell()
+            for row in self._open_rows:
+                row.cells.append(record)
+            self._open_cells.append(record)
+        elif tag == "div" and self._open_cells:
+            record = _Div()
+            for cell in self._open_cells:
+                cell.divs.append(record)
+            self._open_divs.append(record)
+        self._stack.append((tag, record))
+
+    def handle_endtag(self, tag: str) -> None:
+        self._flush()
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth][0] == tag:
+                break
+        else:
+            return                          # nothing open to close, as in bs4
+        while len(self._stack) > depth:
+            self._pop()
+        self._emit()
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+        while self._stack:
+            self._pop()
+        self._emit()
+
+    def _pop(self) -> None:
+        tag, record = self._stack.pop()
+        if tag in _SKIP_CONTENT:
+            self._skip_depth -= 1
+        elif record is None:
+            pass
+        elif tag == "table":
+            self._open_tables.pop().closed = True
+        elif tag == "tr":
+            self._open_rows.pop().closed = True
+        elif tag == "td":
+            self._open_cells.pop()
+        elif tag == "div":
+            self._open_divs.pop()
+
+    # ── output ──────────────────────────────────────────────────────────
+
+    def _emit(self) -> None:
+        """Emit every row that is complete and not preceded by an incomplete one."""
+        while self._next_table < len(self._tables):
+            table = self._tables[self._next_table]
+            header = table.header
+            if header is not None and header.closed:
+                if table.days is None and len(header.cells) >= 2:
+                    table.days = ["".join(c.texts) for c in header.cells[1:]]
+                if table.days is not None:
+                    while table.emitted < len(table.body) and table.body[table.emitted].closed:
+                        self._emit_row(table.days, table.body[table.emitted])
+                        table.emitted += 1
+            if not table.closed:
+                return
+            self._tables[self._next_table] = None      # done; let its rows be collected
+            self._next_table += 1
+
+    def _emit_row(self, days: list[str], row: _Row) -> None:
+        if not row.cells:
+            return
+        time_slot = "".join(row.cells[0].texts)
+        for day, cell in zip(days, row.cells[1:]):
+            for div in cell.divs:
+                lines = "\n".join(div.texts).split("\n")
+                self.rows.append(ParsedRow(day, time_slot, *split_cell_lines(lines)))
+
+
+def iter_rows(chunks: Iterable[str]) -> Iterator[ParsedRow]:
+    """Feed HTML chunks and yield rows as soon as their cell closes."""
+    handler = _DepartmentPrinterHandler()
+    for chunk in chunks:
+        handler.feed(chunk)
+        if handler.rows:
+            yield from handler.rows
+            handler.rows.clear()
+    handler.close()
+    yield from handler.rows
+
+
+class StreamingManasParser:
+    def parse_rows(self, html: str) -> list[ParsedRow]:
+        return list(iter_rows((html,)))
+
+    def parse(self, html: str, department_id: int, scraped_at: datetime) -> list[TimetableEntry]:
+        return rows_to_entries(self.parse_rows(html), department_id, scraped_at)
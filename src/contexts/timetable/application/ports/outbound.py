@@ -0,0 +1,141 @@
+"""
+src/contexts/timetable/application/ports/outbound.py
+=====================================================
+Outbound ports for the Timetable context.
+
+The scrape pipeline is split at the points where the implementation is
+expected to change independently:
+  DepartmentPageSource  — HTTP download (conditional requests, retries)
+  TimetableParser       — HTML → TimetableEntry (CPU-bound; may run off-loop)
+  TimetableRepository   — per-department storage of parsed entries
+  PageFingerprintStore  — what each page looked like last cycle
+  DepartmentRegistryStore — which printer IDs are live / dead
+  PageSnapshotStore     — raw HTML kept for offline re-parse and replay
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Mapping, Protocol
+from uuid import UUID
+
+from src.shared_kernel.domain.identity import DepartmentId, RoomId
+from src.shared_kernel.ports.event_bus import EventBus  # noqa: F401 (re-export)
+from src.shared_kernel.ports.system import Clock  # noqa: F401 (re-export)
+from src.contexts.timetable.domain.entities import DepartmentRegistry, TimetableEntry
+from src.contexts.timetable.domain.value_objects import PageFingerprint
+
+
+@dataclass(frozen=True)
+class DepartmentPage:
+    """Result of fetching one department-printer page.
+
+    not_modified=True means the server answered 304 to our conditional
+    request: body is empty and the previous fingerprint still holds.
+    """
+    department_id: int
+    body: str
+    fingerprint: PageFingerprint
+    not_modified: bool = False
+
+
+class DepartmentPageSource(Protocol):
+    async def fetch(self, department_id: int, previous: PageFingerprint | None) -> DepartmentPage:
+        """Download one page, conditionally when *previous* is given.
+
+        Raises ScrapeFailure when the page could not be retrieved.
+        """
+        ...
+
+
+class TimetableParser(Protocol):
+    """Async so implementations can hand the CPU work to another process."""
+    async def parse(self, html: str, department_id: int, scraped_at: datetime) -> list[TimetableEntry]: ...
+
+
+class TimetableRepository(Protocol):
+    async def replace_department(self, department_id: DepartmentId, entries: list[TimetableEntry]) -> int:
+        """Make *entries* the department's full content, upserting by entry ID.
+
+        Rows whose content is unchanged (TimetableEntry.same_content) are
+        left untouched — same object, same storage. Returns how many rows
+        were inserted, updated or deleted.
+        """
+        ...
+
+    async def replace_departments(self, batch: Mapping[DepartmentId, list[TimetableEntry]]) -> int:
+        """replace_department for several departments in one write."""
+        ...
+
+    async def list_by_ids(self, entry_ids: list[UUID]) -> list[TimetableEntry]:
+        """Entries still present for *entry_ids*, in the given order; unknown IDs are skipped."""
+        ...
+
+    async def list_all(self) -> list[TimetableEntry]:
+        """Every entry once.
+
+        A row several departments list (a shared UNS course) has one ID and
+        is returned once, not once per department.
+        """
+        ...
+
+    async def list_by_department(self, department_id: DepartmentId) -> list[TimetableEntry]: ...
+
+    async def memberships(self) -> dict[UUID, frozenset[DepartmentId]]:
+        """Every stored row ID → the departments that list it.
+
+        list_all() returns a shared row once, under one department_id; this
+        is where the others are kept.
+        """
+        ...
+
+    async def list_by_room(self, room_id: RoomId) -> list[TimetableEntry]:
+        """Like list_all(), one entry per ID."""
+        ...
+
+    async def count(self) -> int:
+        """len(list_all())."""
+        ...
+
+
+class PageFingerprintStore(Protocol):
+    async def get(self, department_id: int) -> PageFingerprint | None: ...
+    async def put(self, department_id: int, fingerprint: PageFingerprint) -> None: ...
+    async def delete(self, department_id: int) -> None:
+        """Forget the page, so its next fetch is unconditional and parsed in full."""
+        ...
+
+
+class DepartmentRegistryStore(Protocol):
+    async def load(self) -> DepartmentRegistry: ...
+    async def save(self, registry: DepartmentRegistry) -> None: ...
+
+
+@dataclass(frozen=True)
+class PageSnapshotRef:
+    department_id: int
+    scraped_at: datetime
+    content_hash: str
+
+
+class PageSnapshotStore(Protocol):
+    async def put(self, department_id: int, scraped_at: datetime, body: str) -> PageSnapshotRef:
+        """Store *body* (deduplicated by hash) and index it under department/time."""
+        ...
+
+    async def put_missing(self, department_id: int, scraped_at: datetime) -> None:
+        """Record that the department's page was gone (HTTP 404) at *scraped_at*."""
+        ...
+
+    async def latest(self, as_of: datetime | None = None) -> list[PageSnapshotRef]:
+        """Newest page per department scraped at or before *as_of* (default: now).
+
+        A department whose newest record by then is put_missing() is left out.
+        """
+        ...
+
+    async def history(self, department_id: int) -> list[PageSnapshotRef]:
+        """Every stored page of the department, oldest first."""
+        ...
+
+    async def load(self, content_hash: str) -> str: ...
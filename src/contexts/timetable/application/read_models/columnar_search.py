@@ -0,0 +1,174 @@
+"""
+src/contexts/timetable/application/read_models/columnar_search.py
+==================================================================
+ColumnarSearchIndex — TimetableSearchIndex semantics over flat arrays.
+
+TimetableSearchIndex keeps its postings in Python sets of Python ints, so
+every uvicorn worker would hold its own copy. This index stores the same
+information as three integer arrays that can live in a shared read-only
+mapping (see adapters/outbound/db/mapped_snapshot.py):
+
+  vocabulary  — distinct searchable field values (code, name, teacher,
+                room, day), the only per-process Python objects
+  offsets     — CSR offsets: value v's rows are postings[offsets[v]:offsets[v+1]]
+  postings    — row numbers of the CompactTimetable, ascending per value
+  row_values  — FIELDS value numbers per row, for checking non-driver terms
+
+A query term selects values the same way TimetableSearchIndex does — word
+prefix below three characters (a small prefix table), substring from three
+(a scan of the folded vocabulary). The snapshot file carries the folded
+vocabulary; a worker only builds the prefix table, once, on first use.
+Rows are then enumerated from the most selective term and checked against
+the rest.
+"""
+from __future__ import annotations
+
+import heapq
+import re
+from array import array
+from itertools import islice
+from typing import Sequence
+
+from src.contexts.timetable.application.read_models.compact_timetable import DAYS, CompactTimetable
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.services import fold_search_text
+
+FIELDS = 5  # code, name, teacher, room, day — as in search_index._fields
+_WORD_RE = re.compile(r"\w+")
+_SHORT = 3
+_DAY_NAMES = frozenset(d.turkish for d in DAYS)
+
+
+class ColumnarSearchIndex:
+    def __init__(
+        self,
+        table: CompactTimetable,
+        vocabulary: list[str],
+        offsets: Sequence[int],
+        postings: Sequence[int],
+        row_values: Sequence[int],
+        folded: list[str] | None = None,
+    ) -> None:
+        self._table = table
+        self._vocabulary = vocabulary
+        self._offsets = offsets
+        self._postings = postings
+        self._row_values = row_values
+        self._folded = folded
+        self._words: list[tuple[str, ...]] | None = None
+        self._prefixes: dict[str, set[int]] = {}
+
+    @classmethod
+    def build(cls, table: CompactTimetable) -> "ColumnarSearchIndex":
+        strings = table.dictionary("strings")
+        codes = table.dictionary("course_codes")
+        room_ids = table.dictionary("room_ids")
+        columns = [table.column(name) for name in
+                   ("course_code", "course_name", "teacher", "room_name", "room_id", "day")]
+
+        numbers: dict[str, int] = {}
+        rows_of: list[list[int]] = []
+        row_values = array("I")
+        for i, (code, name, teacher, room_name, room_id, day) in enumerate(zip(*columns)):
+            fields = (
+                codes[code].value,
+                strings[name],
+                strings[teacher],
+                strings[room_name] or str(room_ids[room_id]),
+                DAYS[day].turkish,
+            )
+            for raw in fields:
+                v = numbers.get(raw)
+                if v is None:
+                    v = numbers[raw] = len(rows_of)
+                    rows_of.append([])
+                if not rows_of[v] or rows_of[v][-1] != i:
+                    rows_of[v].append(i)
+                row_values.append(v)
+
+        offsets, postings = array("I", [0]), array("I")
+        for rows in rows_of:
+            postings.extend(rows)
+            offsets.append(len(postings))
+        return cls(table, list(numbers), offsets, postings, row_values)
+
+    def export(self) -> tuple[list[str], Sequence[int], Sequence[int], Sequence[int]]:
+        """(vocabulary, offsets, postings, row_values)."""
+        return self._vocabulary, self._offsets, self._postings, self._row_values
+
+    def folded_vocabulary(self) -> list[str]:
+        """fold_search_text of each vocabulary value; persist it to skip folding at startup."""
+        self._fold()
+        return self._folded
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    # ── queries ─────────────────────────────────────────────────────────
+
+    def search(self, query: str, limit: int | None = None) -> list[TimetableEntry]:
+        """Entries whose fields contain every term of *query*, in row order.
+
+        With *limit*, stops as soon as that many matches are found.
+        """
+        terms = fold_search_text(query).split()
+        if not terms:
+            return [row.to_entry() for row in islice(self._table, limit)]
+
+        selections = [self._matching_values(t) for t in terms]
+        if not all(selections):
+            return []
+        selections.sort(key=self._selection_size)
+        driver, rest = selections[0], selections[1:]
+
+        offsets, postings, row_values = self._offsets, self._postings, self._row_values
+        matched: set[int] = set()
+        for v in driver:
+            for row in postings[offsets[v]:offsets[v + 1]]:
+                if row in matched:
+                    continue
+                fields = row_values[row * FIELDS:(row + 1) * FIELDS]
+                if all(any(f in selected for f in fields) for selected in rest):
+                    matched.add(row)
+                    if limit is not None and len(matched) >= limit:
+                        return self._entries(matched)
+        return self._entries(matched)
+
+    def suggest(self, prefix: str, k: int = 10) -> list[str]:
+        """Top-*k* field values with a word starting with *prefix*, most used first."""
+        words = fold_search_text(prefix).split()
+        if not words:
+            return []
+        *required, last = words
+        self._fold()
+        found = [
+            v for v, value_words in enumerate(self._words)
+            if any(w.startswith(last) for w in value_words)
+            and self._vocabulary[v] not in _DAY_NAMES
+            and all(r in self._folded[v] for r in required)
+        ]
+        offsets = self._offsets
+        best = heapq.nsmallest(k, found, key=lambda v: (offsets[v] - offsets[v + 1], self._vocabulary[v]))
+        return [self._vocabulary[v] for v in best]
+
+    def _entries(self, rows: set[int]) -> list[TimetableEntry]:
+        return [self._table[r].to_entry() for r in sorted(rows)]
+
+    def _selection_size(self, values: set[int]) -> int:
+        return sum(self._offsets[v + 1] - self._offsets[v] for v in values)
+
+    def _matching_values(self, term: str) -> set[int]:
+        self._fold()
+        if len(term) < _SHORT:
+            return self._prefixes.get(term, set())
+        return {v for v, folded in enumerate(self._folded) if term in folded}
+
+    def _fold(self) -> None:
+        if self._words is None:
+            if self._folded is None:
+                self._folded = [fold_search_text(raw) for raw in self._vocabulary]
+            self._words = [tuple(_WORD_RE.findall(f)) for f in self._folded]
+            for v, words in enumerate(self._words):
+                for word in words:
+                    for n in range(1, _SHORT):
+                        self._prefixes.setdefault(word[:n], set()).add(v)
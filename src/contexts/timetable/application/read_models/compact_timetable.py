@@ -0,0 +1,507 @@
+"""
+src/contexts/timetable/application/read_models/compact_timetable.py
+====================================================================
+CompactTimetable — the whole scraped timetable in a few flat arrays.
+
+A TimetableEntry is a __dict__-backed dataclass holding a UUID, value-object
+wrappers and free-text strings that repeat across thousands of rows: every
+section of a course carries the same course name, every slot of a teacher
+the same teacher name, every row of a scrape the same scraped_at. Here each
+repeating field is dictionary-encoded — the distinct values are stored once
+and rows hold small integer codes in array('I') columns. Entry IDs are packed
+as 16 raw bytes each.
+
+    table = CompactTimetable.from_entries(entries)
+    row = table[i]                  # TimetableRow: slotted view, decodes on access
+    row.teacher_name, row.day
+    row.to_entry() == entries[i]    # lossless round-trip
+
+Dictionaries keep the value objects themselves (CourseCode, RoomId,
+DepartmentId, TimeSlot, datetime), so decoded rows compare equal to the
+originals — invalid or oddly spaced TimeSlot strings included.
+
+A row several departments list (a shared UNS course) is stored once, under
+the department_id of the entry it came from. Each department also keeps
+the list of its rows, shared ones included, so rows_for_department() finds
+a shared course under every department listing it — pass the repository's
+memberships() to from_entries().
+
+patched() derives the next version of a table without changing it: the
+columns are copied at C speed, and only the rows a scrape removed, rewrote
+or added are touched. Removed rows are refilled with added ones or with
+rows moved down from the end, so the table stays dense.
+"""
+from __future__ import annotations
+
+from array import array
+from dataclasses import replace
+from datetime import datetime
+from typing import Collection, Generic, Hashable, Iterable, Iterator, Mapping, Sequence, TypeVar
+from uuid import UUID
+
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot, WeekDay
+from src.shared_kernel.domain.identity import DepartmentId, RoomId
+
+V = TypeVar("V", bound=Hashable)
+
+_DAYS = list(WeekDay)
+_DAY_INDEX = {d: i for i, d in enumerate(_DAYS)}
+
+
+class _Dictionary(Generic[V]):
+    """Distinct values ↔ dense integer codes."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self, values: list[V] | None = None) -> None:
+        self.values: list[V] = list(values or ())
+        self._codes: dict[V, int] = {v: i for i, v in enumerate(self.values)}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: V) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code_of(self, value: V) -> int | None:
+        return self._codes.get(value)
+
+    def copy(self) -> "_Dictionary[V]":
+        other: _Dictionary[V] = _Dictionary()
+        other.values = list(self.values)
+        other._codes = dict(self._codes)
+        return other
+
+
+# export name → (attribute, array typecode)
+COLUMNS: dict[str, tuple[str, str]] = {
+    "course_code": ("_course_code_col", "I"),
+    "course_name": ("_course_name_col", "I"),
+    "day": ("_day_col", "B"),
+    "time_slot": ("_time_slot_col", "I"),
+    "room_id": ("_room_id_col", "I"),
+    "room_name": ("_room_name_col", "I"),
+    "teacher": ("_teacher_col", "I"),
+    "department": ("_department_col", "I"),
+    "scraped_at": ("_scraped_at_col", "I"),
+}
+_DICTIONARIES: dict[str, str] = {
+    "strings": "_strings",
+    "course_codes": "_course_codes",
+    "time_slots": "_time_slots",
+    "room_ids": "_room_ids",
+    "department_ids": "_department_ids",
+    "scraped_ats": "_scraped_ats",
+}
+DAYS = _DAYS
+
+
+class TimetableRow:
+    """Read-only view of one row; fields are decoded on access."""
+
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table: "CompactTimetable", i: int) -> None:
+        self._table = table
+        self._i = i
+
+    @property
+    def id(self) -> UUID:
+        return UUID(bytes=bytes(self._table._ids[self._i * 16:(self._i + 1) * 16]))
+
+    @property
+    def course_code(self) -> CourseCode:
+        return self._table._course_codes.values[self._table._course_code_col[self._i]]
+
+    @property
+    def course_name(self) -> str:
+        return self._table._strings.values[self._table._course_name_col[self._i]]
+
+    @property
+    def day(self) -> WeekDay:
+        return _DAYS[self._table._day_col[self._i]]
+
+    @property
+    def time_slot(self) -> TimeSlot:
+        return self._table._time_slots.values[self._table._time_slot_col[self._i]]
+
+    @property
+    def room_id(self) -> RoomId:
+        return self._table._room_ids.values[self._table._room_id_col[self._i]]
+
+    @property
+    def room_name(self) -> str:
+        return self._table._strings.values[self._table._room_name_col[self._i]]
+
+    @property
+    def teacher_name(self) -> str:
+        return self._table._strings.values[self._table._teacher_col[self._i]]
+
+    @property
+    def department_id(self) -> DepartmentId:
+        return self._table._department_ids.values[self._table._department_col[self._i]]
+
+    @property
+    def scraped_at(self) -> datetime:
+        return self._table._scraped_ats.values[self._table._scraped_at_col[self._i]]
+
+    def to_entry(self) -> TimetableEntry:
+        return TimetableEntry(
+            id=self.id,
+            course_code=self.course_code,
+            course_name=self.course_name,
+            day=self.day,
+            time_slot=self.time_slot,
+            room_id=self.room_id,
+            teacher_name=self.teacher_name,
+            department_id=self.department_id,
+            scraped_at=self.scraped_at,
+            room_name=self.room_name,
+        )
+
+    def __repr__(self) -> str:
+        return f"TimetableRow({self._i}, {self.course_code.value!r}, {self.day.name}, {self.time_slot.raw!r})"
+
+
+class CompactTimetable:
+    def __init__(self) -> None:
+        # free text shares one dictionary: a room label and a course name
+        # never collide in meaning, only in storage
+        self._strings: _Dictionary[str] = _Dictionary()
+        self._course_codes: _Dictionary[CourseCode] = _Dictionary()
+        self._time_slots: _Dictionary[TimeSlot] = _Dictionary()
+        self._room_ids: _Dictionary[RoomId] = _Dictionary()
+        self._department_ids: _Dictionary[DepartmentId] = _Dictionary()
+        self._scraped_ats: _Dictionary[datetime] = _Dictionary()
+
+        self._ids = bytearray()
+        self._course_code_col = array("I")
+        self._course_name_col = array("I")
+        self._day_col = array("B")
+        self._time_slot_col = array("I")
+        self._room_id_col = array("I")
+        self._room_name_col = array("I")
+        self._teacher_col = array("I")
+        self._department_col = array("I")
+        self._scraped_at_col = array("I")
+        # department code → its rows, ascending; a shared row is listed under each department
+        self._department_rows: dict[int, Sequence[int]] = {}
+        # row → department codes listing it, for rows listed by more than one
+        self._shared: dict[int, tuple[int, ...]] | None = {}
+        # packed entry ID → row; on an imported table built on first row_of()
+        self._row_of: dict[bytes, int] | None = {}
+
+    # ── export / import (see adapters/outbound/db/mapped_snapshot.py) ───────
+
+    def export(self) -> tuple[dict[str, list], dict[str, Sequence[int]], bytes | bytearray | memoryview]:
+        """(dictionaries, columns, packed ids) — the table's whole state."""
+        dictionaries = {name: getattr(self, attr).values for name, attr in _DICTIONARIES.items()}
+        columns = {name: getattr(self, attr) for name, (attr, _) in COLUMNS.items()}
+        return dictionaries, columns, self._ids
+
+    def department_index(self) -> tuple[Sequence[int], Sequence[int]]:
+        """(offsets, rows): department code d lists rows[offsets[d]:offsets[d + 1]]."""
+        offsets, rows = array("I", [0]), array("I")
+        for code in range(len(self._department_ids)):
+            rows.extend(self._department_rows.get(code, ()))
+            offsets.append(len(rows))
+        return offsets, rows
+
+    @classmethod
+    def from_export(
+        cls,
+        dictionaries: Mapping[str, list],
+        columns: Mapping[str, Sequence[int]],
+        ids: bytes | bytearray | memoryview,
+        department_index: tuple[Sequence[int], Sequence[int]] | None = None,
+    ) -> "CompactTimetable":
+        """Rebuild a table from export() and department_index(). Columns may
+        be read-only memoryviews over a shared mapping — such a table can be
+        read but not appended to. Without *department_index* every row is
+        listed under its own department only."""
+        table = cls()
+        for name, attr in _DICTIONARIES.items():
+            setattr(table, attr, _Dictionary(dictionaries[name]))
+        for name, (attr, _) in COLUMNS.items():
+            setattr(table, attr, columns[name])
+        table._ids = ids
+        if department_index is None:
+            for i, code in enumerate(table._department_col):
+                table._department_rows.setdefault(code, []).append(i)
+        else:
+            offsets, rows = department_index
+            table._department_rows = {
+                code: rows[offsets[code]:offsets[code + 1]]
+                for code in range(len(offsets) - 1) if offsets[code + 1] > offsets[code]
+            }
+            table._shared = None
+        table._row_of = None
+        return table
+
+    def column(self, name: str) -> Sequence[int]:
+        return getattr(self, COLUMNS[name][0])
+
+    def dictionary(self, name: str) -> list:
+        return getattr(self, _DICTIONARIES[name]).values
+
+    def code_of(self, name: str, value: Hashable) -> int | None:
+        """*value*'s code in dictionary *name*, or None if no row holds it."""
+        return getattr(self, _DICTIONARIES[name]).code_of(value)
+
+    @classmethod
+    def from_entries(
+        cls,
+        entries: Iterable[TimetableEntry],
+        memberships: Mapping[UUID, Collection[DepartmentId]] | None = None,
+    ) -> "CompactTimetable":
+        table = cls()
+        table.extend(entries, memberships)
+        return table
+
+    def extend(
+        self,
+        entries: Iterable[TimetableEntry],
+        memberships: Mapping[UUID, Collection[DepartmentId]] | None = None,
+    ) -> None:
+        """Append *entries*, each listed under the departments *memberships* gives for its ID."""
+        for e in entries:
+            self.append(e, memberships.get(e.id, ()) if memberships else ())
+
+    def append(self, e: TimetableEntry, departments: Collection[DepartmentId] = ()) -> None:
+        """Append one row, listed under *departments* (default: its own department_id)."""
+        row = len(self)
+        codes = tuple(self._department_ids.encode(d) for d in departments or (e.department_id,))
+        for code in codes:
+            self._department_rows.setdefault(code, []).append(row)
+        if len(codes) > 1:
+            self._shared_rows()[row] = codes
+        if self._row_of is not None:
+            self._row_of[e.id.bytes] = row
+        self._ids += e.id.bytes
+        self._course_code_col.append(self._course_codes.encode(e.course_code))
+        self._course_name_col.append(self._strings.encode(e.course_name))
+        self._day_col.append(_DAY_INDEX[e.day])
+        self._time_slot_col.append(self._time_slots.encode(e.time_slot))
+        self._room_id_col.append(self._room_ids.encode(e.room_id))
+        self._room_name_col.append(self._strings.encode(e.room_name))
+        self._teacher_col.append(self._strings.encode(e.teacher_name))
+        self._department_col.append(self._department_ids.encode(e.department_id))
+        self._scraped_at_col.append(self._scraped_ats.encode(e.scraped_at))
+
+    def patched(
+        self,
+        removed: Collection[int],
+        written: Mapping[int, tuple[TimetableEntry, Collection[DepartmentId]]],
+        added: Sequence[tuple[TimetableEntry, Collection[DepartmentId]]],
+    ) -> tuple["CompactTimetable", list[int], dict[int, int]]:
+        """The next version of this table; this one is left as it was.
+
+        *removed* rows are dropped, *written* rows get a new entry and
+        departments, each (entry, departments) of *added* becomes a row.
+        Returns the new table, the rows now holding the written and added
+        entries, and old → new row numbers of the other rows that moved.
+        """
+        table = self._copy()
+        lists: dict[int, set[int]] = {}       # department code → rows, for the departments touched
+
+        def listing(code: int) -> set[int]:
+            rows = lists.get(code)
+            if rows is None:
+                rows = lists[code] = set(table._department_rows.get(code, ()))
+            return rows
+
+        def unlist(i: int) -> None:
+            for code in table._department_codes(i):
+                listing(code).discard(i)
+            table._shared_rows().pop(i, None)
+
+        def place(i: int, e: TimetableEntry, departments: Collection[DepartmentId]) -> None:
+            codes = tuple(table._department_ids.encode(d) for d in departments or (e.department_id,))
+            for code in codes:
+                listing(code).add(i)
+            if len(codes) > 1:
+                table._shared_rows()[i] = codes
+            table._write(i, e)
+
+        for i in removed:
+            unlist(i)
+            table._forget(i)
+        fresh: set[int] = set()
+        for i, (e, departments) in written.items():
+            unlist(i)
+            place(i, e, departments)
+            fresh.add(i)
+        holes = sorted(removed, reverse=True)
+        for e, departments in added:
+            if holes:
+                i = holes.pop()
+            else:
+                i = len(table)
+                table._grow()
+            place(i, e, departments)
+            fresh.add(i)
+
+        moved: dict[int, int] = {}
+        n, left = len(table), set(holes)
+        for hole in reversed(holes):                       # ascending
+            while n - 1 in left:
+                left.discard(n - 1)
+                n -= 1
+            if hole >= n:
+                break
+            n -= 1
+            for code in table._department_codes(n):
+                listing(code).discard(n)
+                listing(code).add(hole)
+            shared = table._shared_rows().pop(n, None)
+            if shared:
+                table._shared_rows()[hole] = shared
+            table._move(n, hole)
+            left.discard(hole)
+            if n in fresh:
+                fresh.discard(n)
+                fresh.add(hole)
+            else:
+                moved[n] = hole
+        table._truncate(n)
+
+        for code, rows in lists.items():
+            if rows:
+                table._department_rows[code] = sorted(rows)
+            else:
+                table._department_rows.pop(code, None)
+        return table, sorted(fresh), moved
+
+    def _copy(self) -> "CompactTimetable":
+        table = CompactTimetable()
+        for attr in _DICTIONARIES.values():
+            setattr(table, attr, getattr(self, attr).copy())
+        for attr, typecode in COLUMNS.values():
+            setattr(table, attr, array(typecode, getattr(self, attr)))
+        table._ids = bytearray(self._ids)
+        table._department_rows = {code: list(rows) for code, rows in self._department_rows.items()}
+        table._shared = dict(self._shared_rows())
+        table._row_of = dict(self._rows_by_id())
+        return table
+
+    def _write(self, i: int, e: TimetableEntry) -> None:
+        self._forget(i)
+        self._ids[i * 16:(i + 1) * 16] = e.id.bytes
+        self._rows_by_id()[e.id.bytes] = i
+        self._course_code_col[i] = self._course_codes.encode(e.course_code)
+        self._course_name_col[i] = self._strings.encode(e.course_name)
+        self._day_col[i] = _DAY_INDEX[e.day]
+        self._time_slot_col[i] = self._time_slots.encode(e.time_slot)
+        self._room_id_col[i] = self._room_ids.encode(e.room_id)
+        self._room_name_col[i] = self._strings.encode(e.room_name)
+        self._teacher_col[i] = self._strings.encode(e.teacher_name)
+        self._department_col[i] = self._department_ids.encode(e.department_id)
+        self._scraped_at_col[i] = self._scraped_ats.encode(e.scraped_at)
+
+    def _forget(self, i: int) -> None:
+        """Drop row *i*'s ID from the ID → row map."""
+        row_of = self._rows_by_id()
+        key = bytes(self._ids[i * 16:(i + 1) * 16])
+        if row_of.get(key) == i:
+            del row_of[key]
+
+    def _move(self, src: int, dst: int) -> None:
+        self._forget(dst)
+        key = bytes(self._ids[src * 16:(src + 1) * 16])
+        self._ids[dst * 16:(dst + 1) * 16] = key
+        self._rows_by_id()[key] = dst
+        for attr, _ in COLUMNS.values():
+            column = getattr(self, attr)
+            column[dst] = column[src]
+
+    def _grow(self) -> None:
+        self._ids += bytes(16)
+        for attr, _ in COLUMNS.values():
+            getattr(self, attr).append(0)
+
+    def _truncate(self, n: int) -> None:
+        del self._ids[n * 16:]
+        for attr, _ in COLUMNS.values():
+            del getattr(self, attr)[n:]
+
+    def __len__(self) -> int:
+        return len(self._day_col)
+
+    def row_of(self, entry_id: UUID) -> int | None:
+        """The row holding *entry_id*, if any."""
+        return self._rows_by_id().get(entry_id.bytes)
+
+    def _rows_by_id(self) -> dict[bytes, int]:
+        if self._row_of is None:
+            ids = self._ids
+            self._row_of = {bytes(ids[i * 16:(i + 1) * 16]): i for i in range(len(self))}
+        return self._row_of
+
+    def department_rows(self, department_id: DepartmentId) -> Sequence[int]:
+        """Row numbers the department lists, ascending."""
+        code = self._department_ids.code_of(department_id)
+        return () if code is None else self._department_rows.get(code, ())
+
+    def departments_of(self, i: int) -> tuple[DepartmentId, ...]:
+        """Every department listing row *i*."""
+        values = self._department_ids.values
+        return tuple(values[code] for code in self._department_codes(i))
+
+    def _department_codes(self, i: int) -> tuple[int, ...]:
+        return self._shared_rows().get(i) or (self._department_col[i],)
+
+    def _shared_rows(self) -> dict[int, tuple[int, ...]]:
+        if self._shared is None:
+            members: dict[int, list[int]] = {}
+            for code, rows in self._department_rows.items():
+                for i in rows:
+                    members.setdefault(i, []).append(code)
+            self._shared = {i: tuple(codes) for i, codes in members.items() if len(codes) > 1}
+        return self._shared
+
+    def __getitem__(self, i: int) -> TimetableRow:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return TimetableRow(self, i)
+
+    def __iter__(self) -> Iterator[TimetableRow]:
+        return (TimetableRow(self, i) for i in range(len(self)))
+
+    def to_entries(self) -> list[TimetableEntry]:
+        return [row.to_entry() for row in self]
+
+    def entries_by_department(self) -> dict[DepartmentId, list[TimetableEntry]]:
+        """Each department's entries, a shared row under every department listing it."""
+        entries = self.to_entries()
+        by_department: dict[DepartmentId, list[TimetableEntry]] = {}
+        for code, rows in self._department_rows.items():
+            department_id = self._department_ids.values[code]
+            by_department[department_id] = [
+                e if e.department_id == department_id else replace(e, department_id=department_id)
+                for e in (entries[i] for i in rows)
+            ]
+        return by_department
+
+    # ── column scans ────────────────────────────────────────────────────
+
+    def rows_for_teacher(self, teacher_name: str) -> list[TimetableRow]:
+        return self._rows_where(self._teacher_col, self._strings.code_of(teacher_name))
+
+    def rows_for_room(self, room_id: RoomId) -> list[TimetableRow]:
+        return self._rows_where(self._room_id_col, self._room_ids.code_of(room_id))
+
+    def rows_for_department(self, department_id: DepartmentId) -> list[TimetableRow]:
+        """Every row the department lists, shared rows included."""
+        return [TimetableRow(self, i) for i in self.department_rows(department_id)]
+
+    def _rows_where(self, column: array, code: int | None) -> list[TimetableRow]:
+        if code is None:
+            return []
+        return [TimetableRow(self, i) for i, c in enumerate(column) if c == code]
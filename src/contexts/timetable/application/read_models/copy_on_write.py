@@ -0,0 +1,76 @@
+"""
+src/contexts/timetable/application/read_models/copy_on_write.py
+================================================================
+SetMap — key → set of items, copied in O(keys) and patched in O(changes).
+
+The snapshot's indexes are dicts of sets (postings, trigrams, deletion
+variants). The next version is patched from the previous one, which readers
+may still hold, so it must not touch the previous version's sets. copy()
+copies only the outer dict — at C speed — and both maps then share every
+set until one of them changes it: the first add()/discard() of a key
+replaces its set with a private copy.
+"""
+from __future__ import annotations
+
+from typing import AbstractSet, Generic, Hashable, Iterator, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V", bound=Hashable)
+
+_EMPTY: frozenset = frozenset()
+
+
+class SetMap(Generic[K, V]):
+    __slots__ = ("_sets", "_owned")
+
+    def __init__(self) -> None:
+        self._sets: dict[K, set[V]] = {}
+        self._owned: set[K] = set()        # keys whose set no other map shares
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._sets
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._sets)
+
+    def get(self, key: K) -> AbstractSet[V]:
+        """The key's items (empty if none) — read only."""
+        return self._sets.get(key, _EMPTY)
+
+    def add(self, key: K, item: V) -> bool:
+        """Add *item* under *key*; True if the key is new."""
+        items = self._sets.get(key)
+        if items is None:
+            self._sets[key] = {item}
+            self._owned.add(key)
+            return True
+        if item not in items:
+            self._own(key, items).add(item)
+        return False
+
+    def discard(self, key: K, item: V) -> bool:
+        """Remove *item* from under *key*; True if the key disappeared."""
+        items = self._sets.get(key)
+        if items is None or item not in items:
+            return False
+        if len(items) == 1:
+            del self._sets[key]
+            self._owned.discard(key)
+            return True
+        self._own(key, items).discard(item)
+        return False
+
+    def copy(self) -> "SetMap[K, V]":
+        other: SetMap[K, V] = SetMap()
+        other._sets = dict(self._sets)
+        self._owned = set()                # the sets are shared from now on
+        return other
+
+    def _own(self, key: K, items: set[V]) -> set[V]:
+        if key not in self._owned:
+            items = self._sets[key] = set(items)
+            self._owned.add(key)
+        return items
@@ -0,0 +1,218 @@
+"""
+src/contexts/timetable/application/read_models/fuzzy_lookup.py
+================================================================
+FuzzyNameIndex — typo- and script-tolerant teacher / course name lookup.
+
+Students type names from memory — "Asanov", "Асанов", "Asanow", "Asnaov".
+Every distinct name is reduced to its transliteration_key and split into
+words. Words are indexed by their deletion variants (symmetric delete), so
+a lookup touches only the handful of words that share a variant with the
+query, and confirms each with the bit-parallel Myers/Hyyrö Levenshtein
+distance. A BK-tree over the same words was tried first: in pure Python each
+distance costs microseconds and a k=2 query still visits a fifth of the
+tree, which missed the sub-millisecond target by an order of magnitude.
+
+A multi-word query matches a name when every query word is within distance
+k of some word of the name; matches are ranked by total distance, then by
+how many entries use the name.
+
+Names carry a use count: remove() undoes one add(), and a name leaves the
+index with its last use. copy() shares the word sets copy-on-write
+(copy_on_write.SetMap), so the next snapshot version copies this index and
+applies only the names a scrape added or removed.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+from src.contexts.timetable.application.read_models.copy_on_write import SetMap
+from src.contexts.timetable.domain.services import transliteration_key
+
+
+@dataclass(frozen=True)
+class FuzzyMatch:
+    name: str
+    distance: int
+
+
+def default_max_distance(word: str) -> int:
+    """Typos allowed for a word of this length: 0 up to 3 letters, 1 up to 5, else 2."""
+    return 0 if len(word) <= 3 else 1 if len(word) <= 5 else 2
+
+
+class _Pattern:
+    """Bit-parallel Levenshtein distance from one fixed word (Hyyrö 2001)."""
+
+    __slots__ = ("word", "_peq", "_full", "_last")
+
+    def __init__(self, word: str) -> None:
+        self.word = word
+        peq: dict[str, int] = {}
+        for i, ch in enumerate(word):
+            peq[ch] = peq.get(ch, 0) | (1 << i)
+        self._peq = peq
+        self._full = (1 << len(word)) - 1
+        self._last = 1 << (len(word) - 1) if word else 0
+
+    def distance(self, other: str) -> int:
+        if not self.word:
+            return len(other)
+        peq, full, last = self._peq, self._full, self._last
+        pv, mv, score = full, 0, len(self.word)
+        for ch in other:
+            eq = peq.get(ch, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | ~(xh | pv)
+            mh = pv & xh
+            if ph & last:
+                score += 1
+            elif mh & last:
+                score -= 1
+            ph = (ph << 1) | 1
+            mh <<= 1
+            pv = (mh | ~(xv | ph)) & full
+            mv = ph & xv
+        return score
+
+
+class DeletionNeighbourhoodIndex:
+    """Words reachable within k edits, via shared deletion variants (symmetric delete).
+
+    If lev(a, b) <= k, deleting at most k characters from each gives a common
+    string. Every word is stored under all of its <= max_distance deletion
+    variants; a lookup generates the query's variants, collects the words
+    under them and confirms each candidate with the exact distance.
+    """
+
+    def __init__(self, max_distance: int = 2) -> None:
+        self.max_distance = max_distance
+        self._variants: SetMap[str, str] = SetMap()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def copy(self) -> "DeletionNeighbourhoodIndex":
+        other = DeletionNeighbourhoodIndex(self.max_distance)
+        other._variants = self._variants.copy()
+        other._size = self._size
+        return other
+
+    def add(self, word: str) -> None:
+        if word in self._variants.get(word):
+            return
+        self._size += 1
+        for variant in _deletions(word, self.max_distance):
+            self._variants.add(variant, word)
+
+    def discard(self, word: str) -> None:
+        if word not in self._variants.get(word):
+            return
+        self._size -= 1
+        for variant in _deletions(word, self.max_distance):
+            self._variants.discard(variant, word)
+
+    def within(self, word: str, k: int) -> list[tuple[int, str]]:
+        k = min(k, self.max_distance)
+        candidates: set[str] = set()
+        for variant in _deletions(word, k):
+            candidates.update(self._variants.get(variant))
+        pattern = _Pattern(word)
+        found = []
+        for candidate in candidates:
+            if abs(len(candidate) - len(word)) <= k:
+                d = pattern.distance(candidate)
+                if d <= k:
+                    found.append((d, candidate))
+        return found
+
+
+def _deletions(word: str, k: int) -> set[str]:
+    variants = {word}
+    frontier = {word}
+    for _ in range(k):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+class FuzzyNameIndex:
+    def __init__(self) -> None:
+        self._neighbourhoods = DeletionNeighbourhoodIndex()
+        self._names_by_word: SetMap[str, str] = SetMap()
+        self._name_words: dict[str, frozenset[str]] = {}
+        self._weights: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._name_words)
+
+    def names(self) -> frozenset[str]:
+        return frozenset(self._name_words)
+
+    def rebuild(self, names: Iterable[str]) -> None:
+        """Index *names*; repeats raise a name's weight in the ranking."""
+        self._neighbourhoods = DeletionNeighbourhoodIndex()
+        self._names_by_word = SetMap()
+        self._name_words = {}
+        self._weights = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        if not name.strip():
+            return
+        self._weights[name] = self._weights.get(name, 0) + 1
+        if name in self._name_words:
+            return
+        words = frozenset(transliteration_key(name).split())
+        self._name_words[name] = words
+        for word in words:
+            if self._names_by_word.add(word, name):
+                self._neighbourhoods.add(word)
+
+    def remove(self, name: str) -> None:
+        """Undo one add(name)."""
+        weight = self._weights.get(name)
+        if weight is None:
+            return
+        if weight > 1:
+            self._weights[name] = weight - 1
+            return
+        del self._weights[name]
+        for word in self._name_words.pop(name):
+            if self._names_by_word.discard(word, name):
+                self._neighbourhoods.discard(word)
+
+    def copy(self) -> "FuzzyNameIndex":
+        """An independent index with the same names; changing either leaves the other as it was."""
+        other = FuzzyNameIndex()
+        other._neighbourhoods = self._neighbourhoods.copy()
+        other._names_by_word = self._names_by_word.copy()
+        other._name_words = dict(self._name_words)
+        other._weights = dict(self._weights)
+        return other
+
+    def lookup(self, query: str, max_distance: int | None = None, limit: int = 10) -> list[FuzzyMatch]:
+        """Names matching every word of *query* within *max_distance* edits per word."""
+        words = transliteration_key(query).split()
+        if not words:
+            return []
+        best: dict[str, int] | None = None
+        for word in words:
+            k = default_max_distance(word) if max_distance is None else max_distance
+            per_name: dict[str, int] = {}
+            for d, hit in self._neighbourhoods.within(word, k):
+                for name in self._names_by_word.get(hit):
+                    if d < per_name.get(name, k + 1):
+                        per_name[name] = d
+            if best is None:
+                best = per_name
+            else:
+                best = {n: best[n] + d for n, d in per_name.items() if n in best}
+            if not best:
+                return []
+        ranked = sorted(best.items(), key=lambda item: (item[1], -self._weights[item[0]], item[0]))
+        return [FuzzyMatch(name, d) for name, d in ranked[:limit]]
+
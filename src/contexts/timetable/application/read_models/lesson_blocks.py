@@ -0,0 +1,308 @@
+"""
+src/contexts/timetable/application/read_models/lesson_blocks.py
+================================================================
+LessonBlockIndex — consecutive periods of one lesson, coalesced at ingest.
+
+The timetable prints a two-hour lesson as two or three 45-minute rows. A
+view wants one "08:00-09:40" line per lesson, not one per period, and it
+must not glue the 08:00 and the 14:00 lesson of the same course into an
+"08:00-14:45" block. Blocks are built once per snapshot:
+
+  group   rows by (day, course code, teacher, room) — the same lesson listed
+          under several departments falls into one group
+  merge   within a group, periods that overlap or are at most
+          `break_tolerance` minutes apart (coalesce_time_slots semantics)
+
+and stored as CSR arrays over CompactTimetable row numbers, ordered by
+(day, start, course code), so they can live in the mapped snapshot file:
+
+  offsets  — block b's rows are rows[offsets[b]:offsets[b+1]]
+  rows     — row numbers, ascending start within a block
+  starts   — block start, minutes since midnight (-1: unparsable time)
+  ends     — block end
+
+A view renders `for_day()` / `for_teacher()` / `for_room()` in O(blocks it
+shows) instead of regrouping every raw slot per request: days by bisection,
+teachers / rooms / courses through a block list per value built on the
+first such query, and each LessonBlock is decoded once and then reused.
+Rows whose time does not parse ("Online") are never merged: one block per
+distinct time text.
+
+patched() derives the next version from a CompactTimetable.patched() table:
+only the groups holding a changed or moved row are coalesced again, and
+their blocks are spliced into the ordered arrays by bisection. The rows of
+dropped blocks stay behind in the rows array until export() compacts it.
+"""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Collection, Iterator, Mapping, Sequence
+from uuid import UUID
+
+from src.contexts.timetable.application.read_models.compact_timetable import DAYS, CompactTimetable
+from src.contexts.timetable.domain.services import DEFAULT_BREAK_TOLERANCE
+from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot, WeekDay
+from src.shared_kernel.domain.identity import RoomId
+
+_DAY_INDEX = {d: i for i, d in enumerate(DAYS)}
+_UNTIMED = 24 * 60   # sort key: unparsable times after the day's lessons
+
+_GroupKey = tuple[int, int, int, int]   # (day, course code, teacher, room) codes
+
+
+@dataclass(frozen=True, slots=True)
+class LessonBlock:
+    day: WeekDay
+    time_slot: TimeSlot
+    course_code: CourseCode
+    course_name: str
+    teacher_name: str
+    room_id: RoomId
+    room_name: str
+    entry_ids: tuple[UUID, ...]
+
+
+class LessonBlockIndex:
+    def __init__(
+        self,
+        table: CompactTimetable,
+        break_tolerance: int,
+        offsets: Sequence[int],
+        rows: Sequence[int],
+        starts: Sequence[int],
+        ends: Sequence[int],
+    ) -> None:
+        self._table = table
+        self.break_tolerance = break_tolerance
+        self._offsets: Sequence[int] | None = offsets
+        self._rows = rows
+        # block b's rows are rows[firsts[b]:lasts[b]]
+        self._firsts: Sequence[int] = offsets[:-1]
+        self._lasts: Sequence[int] = offsets[1:]
+        self._starts = starts
+        self._ends = ends
+        # group key → its rows, ascending; built ones only — needed by patched()
+        self._groups: dict[_GroupKey, list[int]] | None = None
+        self._decoded: dict[int, LessonBlock] = {}
+        self._by_value: dict[str, dict[int, list[int]]] = {}
+
+    @classmethod
+    def build(cls, table: CompactTimetable, break_tolerance: int = DEFAULT_BREAK_TOLERANCE) -> "LessonBlockIndex":
+        groups: dict[_GroupKey, list[int]] = {}
+        for i, key in enumerate(zip(
+            table.column("day"), table.column("course_code"), table.column("teacher"), table.column("room_id"),
+        )):
+            groups.setdefault(key, []).append(i)
+
+        blocks: list[list] = []
+        for key, members in groups.items():
+            blocks.extend(_coalesce(table, key, members, break_tolerance))
+        blocks.sort(key=_block_order)
+
+        offsets, rows, starts, ends = array("I", [0]), array("I"), array("h"), array("h")
+        for _, start, _, end, members in blocks:
+            rows.extend(members)
+            offsets.append(len(rows))
+            starts.append(start)
+            ends.append(end)
+        index = cls(table, break_tolerance, offsets, rows, starts, ends)
+        index._groups = groups
+        return index
+
+    def patched(
+        self, table: CompactTimetable, stale: Collection[int], fresh: Collection[int], moved: Mapping[int, int],
+    ) -> "LessonBlockIndex":
+        """This index over *table*, the next version of the table it was built on.
+
+        *stale* rows of the old table were removed or rewritten, *fresh* rows
+        of the new one were written or added, and *moved* maps old → new row
+        numbers of unchanged rows (see CompactTimetable.patched).
+        """
+        if self._groups is None:
+            raise ValueError("only a built index can be patched")
+        old = self._table
+        groups = dict(self._groups)
+        changed: dict[_GroupKey, set[int]] = {}
+
+        def members(key: _GroupKey) -> set[int]:
+            rows = changed.get(key)
+            if rows is None:
+                rows = changed[key] = set(groups.get(key, ()))
+            return rows
+
+        for r in stale:
+            members(_group_key(old, r)).discard(r)
+        for r, to in moved.items():
+            rows = members(_group_key(old, r))
+            rows.discard(r)
+            rows.add(to)
+        for r in fresh:
+            members(_group_key(table, r)).add(r)
+
+        dropped: set[int] = set()
+        for key in changed:
+            for block in _coalesce(old, key, self._groups.get(key, ()), self.break_tolerance):
+                dropped.add(bisect_left(range(len(self)), _block_order(block), key=self._order_of))
+        inserted: list[tuple[int, tuple, list]] = []
+        for key, rows in changed.items():
+            if rows:
+                groups[key] = sorted(rows)
+                for block in _coalesce(table, key, groups[key], self.break_tolerance):
+                    order = _block_order(block)
+                    inserted.append((bisect_left(range(len(self)), order, key=self._order_of), order, block))
+            else:
+                groups.pop(key, None)
+        inserted.sort(key=lambda item: item[:2])
+
+        pool = array("I", self._rows)
+        firsts, lasts, starts, ends = array("I"), array("I"), array("h"), array("h")
+        kept = 0
+
+        def keep(upto: int) -> None:
+            firsts.extend(self._firsts[kept:upto])
+            lasts.extend(self._lasts[kept:upto])
+            starts.extend(self._starts[kept:upto])
+            ends.extend(self._ends[kept:upto])
+
+        edits = sorted(dropped | {at for at, _, _ in inserted})
+        j = 0
+        for at in edits:
+            keep(at)
+            kept = at
+            while j < len(inserted) and inserted[j][0] == at:
+                _, start, _, end, rows = inserted[j][2]
+                firsts.append(len(pool))
+                pool.extend(rows)
+                lasts.append(len(pool))
+                starts.append(start)
+                ends.append(end)
+                j += 1
+            if at in dropped:
+                kept = at + 1
+        keep(len(self))
+
+        index = LessonBlockIndex(table, self.break_tolerance, array("I", [0]), pool, starts, ends)
+        index._offsets = None
+        index._firsts, index._lasts = firsts, lasts
+        index._groups = groups
+        return index
+
+    def export(self) -> tuple[int, Sequence[int], Sequence[int], Sequence[int], Sequence[int]]:
+        """(break_tolerance, offsets, rows, starts, ends)."""
+        if self._offsets is None:
+            offsets, rows = array("I", [0]), array("I")
+            for first, last in zip(self._firsts, self._lasts):
+                rows.extend(self._rows[first:last])
+                offsets.append(len(rows))
+            return self.break_tolerance, offsets, rows, self._starts, self._ends
+        return self.break_tolerance, self._offsets, self._rows, self._starts, self._ends
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[LessonBlock]:
+        return (self._block(b) for b in range(len(self)))
+
+    # ── queries ─────────────────────────────────────────────────────────
+
+    def for_day(self, day: WeekDay) -> list[LessonBlock]:
+        d = _DAY_INDEX[day]
+        lo = bisect_left(range(len(self)), d, key=self._day_of)
+        hi = bisect_left(range(lo, len(self)), d + 1, key=self._day_of) + lo
+        return [self._block(b) for b in range(lo, hi)]
+
+    def for_teacher(self, teacher_name: str) -> list[LessonBlock]:
+        return self._blocks_where("teacher", self._table.code_of("strings", teacher_name))
+
+    def for_room(self, room_id: RoomId) -> list[LessonBlock]:
+        return self._blocks_where("room_id", self._table.code_of("room_ids", room_id))
+
+    def for_course(self, course_code: CourseCode) -> list[LessonBlock]:
+        return self._blocks_where("course_code", self._table.code_of("course_codes", course_code))
+
+    def _blocks_where(self, column: str, code: int | None) -> list[LessonBlock]:
+        by_value = self._by_value.get(column)
+        if by_value is None:
+            col, firsts, rows = self._table.column(column), self._firsts, self._rows
+            by_value = self._by_value[column] = {}
+            for b in range(len(self)):
+                by_value.setdefault(col[rows[firsts[b]]], []).append(b)
+        return [self._block(b) for b in by_value.get(code, ())]
+
+    def _day_of(self, b: int) -> int:
+        return self._table.column("day")[self._rows[self._firsts[b]]]
+
+    def _order_of(self, b: int) -> tuple:
+        table, first = self._table, self._rows[self._firsts[b]]
+        start = self._starts[b]
+        code = table.dictionary("course_codes")[table.column("course_code")[first]].value
+        return table.column("day")[first], start if start >= 0 else _UNTIMED, code, first
+
+    def _block(self, b: int) -> LessonBlock:
+        block = self._decoded.get(b)
+        if block is None:
+            block = self._decoded[b] = self._decode(b)
+        return block
+
+    def _decode(self, b: int) -> LessonBlock:
+        table = self._table
+        members = self._rows[self._firsts[b]:self._lasts[b]]
+        first = members[0]
+        strings = table.dictionary("strings")
+        start, end = self._starts[b], self._ends[b]
+        if start >= 0:
+            slot = TimeSlot.from_minutes(start, end)
+        else:
+            slot = table.dictionary("time_slots")[table.column("time_slot")[first]]
+        return LessonBlock(
+            day=DAYS[table.column("day")[first]],
+            time_slot=slot,
+            course_code=table.dictionary("course_codes")[table.column("course_code")[first]],
+            course_name=strings[table.column("course_name")[first]],
+            teacher_name=strings[table.column("teacher")[first]],
+            room_id=table.dictionary("room_ids")[table.column("room_id")[first]],
+            room_name=strings[table.column("room_name")[first]],
+            entry_ids=tuple(table[r].id for r in members),
+        )
+
+
+def _group_key(table: CompactTimetable, r: int) -> _GroupKey:
+    return (table.column("day")[r], table.column("course_code")[r],
+            table.column("teacher")[r], table.column("room_id")[r])
+
+
+def _coalesce(table: CompactTimetable, key: _GroupKey, members: Sequence[int], break_tolerance: int) -> list[list]:
+    """One group's blocks as [day, start, course code, end, rows]."""
+    if not members:
+        return []
+    day, code = key[0], key[1]
+    slot_col, slots = table.column("time_slot"), table.dictionary("time_slots")
+    code_value = table.dictionary("course_codes")[code].value
+    blocks: list[list] = []
+    untimed: dict[int, list[int]] = {}
+    timed = []
+    for r in members:
+        slot = slots[slot_col[r]]
+        if slot.is_valid():
+            timed.append((slot.start_minutes, slot.end_minutes, r))
+        else:
+            untimed.setdefault(slot_col[r], []).append(r)
+    timed.sort()
+    current: list | None = None
+    for start, end, r in timed:
+        if current is not None and start - current[3] <= break_tolerance:
+            current[3] = max(current[3], end)
+            current[4].append(r)
+        else:
+            current = [day, start, code_value, end, [r]]
+            blocks.append(current)
+    for untimed_rows in untimed.values():
+        blocks.append([day, -1, code_value, -1, untimed_rows])
+    return blocks
+
+
+def _block_order(block: list) -> tuple:
+    day, start, code, _, rows = block
+    return day, start if start >= 0 else _UNTIMED, code, rows[0]
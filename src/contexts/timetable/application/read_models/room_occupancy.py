@@ -0,0 +1,228 @@
+"""
+src/contexts/timetable/application/read_models/room_occupancy.py
+=================================================================
+RoomOccupancyIndex — "which rooms are free on <day> at <time>?" (TODO #10)
+
+find_free_room_ids scans every TimetableEntry per question. This index
+keeps, for each day and each fixed-resolution time bucket, ONE integer
+bitset over room positions: bit r set ⇔ room r is busy in that bucket.
+
+    busy(day, range) = OR of the bucket bitsets the range covers
+    free(day, range) = all_rooms & ~busy
+
+A query is a handful of big-int ORs over a few hundred bits — independent
+of how many entries the timetable has — plus walking the set bits of the
+answer. Slot bounds are rounded outwards to bucket edges, so with the
+default 5-minute buckets Manas slots (08:00-08:45, 08:55-09:40, …) are exact.
+
+Each room also keeps how many entries occupy each of its bucket spans, so
+apply() moves single entries in and out in O(entries moved) — the next
+snapshot version copy()s this index and applies what a scrape changed.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.value_objects import TimeSlot, WeekDay
+from src.shared_kernel.domain.identity import RoomId
+
+_MINUTES_PER_DAY = 24 * 60
+
+
+class RoomOccupancyIndex:
+    def __init__(self, resolution_minutes: int = 5) -> None:
+        if _MINUTES_PER_DAY % resolution_minutes:
+            raise ValueError("resolution must divide a day evenly")
+        self._res = resolution_minutes
+        self._buckets = _MINUTES_PER_DAY // resolution_minutes
+        self._room_ids: list[str] = []             # bit position → str(RoomId)
+        self._position: dict[str, int] = {}
+        self._ordered = True                       # positions follow sorted room ids
+        self._all = 0
+        self._busy: dict[WeekDay, list[int]] = {d: [0] * self._buckets for d in WeekDay}
+        # per room, per day: bucket mask — needed to clear a room when patching;
+        # None on an imported index until first needed
+        self._room_masks: dict[int, dict[WeekDay, int]] | None = {}
+        # per room: (day, first bucket, last bucket) → entries occupying it;
+        # None on an imported index, which cannot apply() single entries
+        self._room_spans: dict[int, dict[tuple[WeekDay, int, int], int]] | None = {}
+
+    def copy(self) -> "RoomOccupancyIndex":
+        """An independent index with the same content; changing either leaves the other as it was."""
+        other = RoomOccupancyIndex(self._res)
+        other._room_ids = list(self._room_ids)
+        other._position = dict(self._position)
+        other._ordered = self._ordered
+        other._all = self._all
+        other._busy = {d: list(b) for d, b in self._busy.items()}
+        # the per-room dicts are replaced, never changed in place
+        other._room_masks = None if self._room_masks is None else dict(self._room_masks)
+        other._room_spans = None if self._room_spans is None else dict(self._room_spans)
+        return other
+
+    # ── export / import ─────────────────────────────────────────────────
+
+    def export(self) -> tuple[int, list[str], dict[WeekDay, list[int]]]:
+        """(resolution, room ids by bit position, per-day bucket bitsets)."""
+        return self._res, list(self._room_ids), {d: list(b) for d, b in self._busy.items()}
+
+    @classmethod
+    def from_export(
+        cls, resolution_minutes: int, room_ids: list[str], busy: dict[WeekDay, list[int]],
+    ) -> "RoomOccupancyIndex":
+        index = cls(resolution_minutes)
+        index._room_ids = list(room_ids)
+        index._position = {r: i for i, r in enumerate(index._room_ids)}
+        index._ordered = index._room_ids == sorted(index._room_ids)
+        index._all = (1 << len(room_ids)) - 1
+        index._busy = {d: list(busy[d]) for d in WeekDay}
+        index._room_masks = None
+        index._room_spans = None
+        return index
+
+    def _masks(self) -> dict[int, dict[WeekDay, int]]:
+        if self._room_masks is None:
+            masks: dict[int, dict[WeekDay, int]] = {}
+            for day, buckets in self._busy.items():
+                for b, rooms in enumerate(buckets):
+                    for pos in _bits(rooms):
+                        per_day = masks.setdefault(pos, {})
+                        per_day[day] = per_day.get(day, 0) | (1 << b)
+            self._room_masks = masks
+        return self._room_masks
+
+    # ── building ────────────────────────────────────────────────────────
+
+    def rebuild(self, entries: list[TimetableEntry]) -> None:
+        self._room_ids = sorted({str(e.room_id) for e in entries})
+        self._position = {r: i for i, r in enumerate(self._room_ids)}
+        self._ordered = True
+        self._all = (1 << len(self._room_ids)) - 1
+        self._busy = {d: [0] * self._buckets for d in WeekDay}
+        self._room_masks = {}
+        self._room_spans = {}
+        by_room: dict[int, list[TimetableEntry]] = {}
+        for e in entries:
+            by_room.setdefault(self._position[str(e.room_id)], []).append(e)
+        for pos, room_entries in by_room.items():
+            self._set_room(pos, room_entries)
+
+    def patch_room(self, room_id: RoomId | str, entries: list[TimetableEntry]) -> None:
+        """Replace one room's occupancy with *entries* (all of that room's entries)."""
+        pos = self._room_position(str(room_id))
+        self._clear_room(pos)
+        self._set_room(pos, entries)
+
+    def apply(self, removed: Iterable[TimetableEntry], added: Iterable[TimetableEntry]) -> None:
+        """Take *removed* entries out of their rooms and put *added* ones in."""
+        if self._room_spans is None:
+            raise ValueError("an imported index can only patch whole rooms")
+        deltas: dict[str, dict[tuple[WeekDay, int, int], int]] = {}
+        for sign, entries in ((-1, removed), (1, added)):
+            for e in entries:
+                key = self._span_key(e)
+                if key is not None:
+                    delta = deltas.setdefault(str(e.room_id), {})
+                    delta[key] = delta.get(key, 0) + sign
+        for room, delta in deltas.items():
+            pos = self._room_position(room)
+            spans = dict(self._room_spans.get(pos, {}))
+            for key, n in delta.items():
+                n += spans.get(key, 0)
+                if n > 0:
+                    spans[key] = n
+                else:
+                    spans.pop(key, None)
+            self._clear_room(pos)
+            self._set_spans(pos, spans)
+
+    def _room_position(self, key: str) -> int:
+        pos = self._position.get(key)
+        if pos is None:
+            pos = len(self._room_ids)
+            self._room_ids.append(key)
+            self._position[key] = pos
+            self._all |= 1 << pos
+            self._ordered = self._ordered and (pos == 0 or self._room_ids[pos - 1] < key)
+        return pos
+
+    def _span_key(self, e: TimetableEntry) -> tuple[WeekDay, int, int] | None:
+        span = self._span(e.time_slot.start_minutes, e.time_slot.end_minutes)
+        return None if span is None else (e.day, *span)
+
+    def _set_room(self, pos: int, entries: list[TimetableEntry]) -> None:
+        spans: dict[tuple[WeekDay, int, int], int] = {}
+        for e in entries:
+            key = self._span_key(e)
+            if key is not None:
+                spans[key] = spans.get(key, 0) + 1
+        self._set_spans(pos, spans)
+
+    def _set_spans(self, pos: int, spans: dict[tuple[WeekDay, int, int], int]) -> None:
+        masks: dict[WeekDay, int] = {}
+        for day, first, last in spans:
+            masks[day] = masks.get(day, 0) | _range_mask(first, last)
+        bit = 1 << pos
+        for day, mask in masks.items():
+            busy = self._busy[day]
+            for b in _bits(mask):
+                busy[b] |= bit
+        self._masks()[pos] = masks
+        if self._room_spans is not None:
+            self._room_spans[pos] = spans
+
+    def _clear_room(self, pos: int) -> None:
+        keep = ~(1 << pos)
+        for day, mask in self._masks().pop(pos, {}).items():
+            busy = self._busy[day]
+            for b in _bits(mask):
+                busy[b] &= keep
+
+    def _span(self, start: int, end: int) -> tuple[int, int] | None:
+        """Bucket range [first, last) covering minutes [start, end)."""
+        if start < 0 or end <= start:
+            return None
+        return start // self._res, min(self._buckets, -(-end // self._res))
+
+    # ── queries ─────────────────────────────────────────────────────────
+
+    def free_rooms(self, day: WeekDay, slot: TimeSlot) -> list[str]:
+        """Rooms with no entry overlapping *slot* on *day* (like find_free_room_ids)."""
+        if not slot.is_valid():
+            return self._decode(self._all)
+        return self.free_rooms_between(day, slot.start_minutes, slot.end_minutes)
+
+    def free_rooms_between(self, day: WeekDay, start_minutes: int, end_minutes: int) -> list[str]:
+        """Rooms free for the whole of [start, end), e.g. 10:45–14:00 → (645, 840)."""
+        span = self._span(start_minutes, end_minutes)
+        if span is None:
+            return self._decode(self._all)
+        busy = 0
+        buckets = self._busy[day]
+        for b in range(*span):
+            busy |= buckets[b]
+        return self._decode(self._all & ~busy)
+
+    def is_free(self, room_id: RoomId | str, day: WeekDay, slot: TimeSlot) -> bool:
+        pos = self._position.get(str(room_id))
+        span = self._span(slot.start_minutes, slot.end_minutes)
+        if pos is None or span is None:
+            return True
+        return not self._masks().get(pos, {}).get(day, 0) & _range_mask(*span)
+
+    def _decode(self, bitset: int) -> list[str]:
+        rooms = [self._room_ids[b] for b in _bits(bitset)]
+        return rooms if self._ordered else sorted(rooms)
+
+
+def _range_mask(first: int, last: int) -> int:
+    return ((1 << (last - first)) - 1) << first
+
+
+def _bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
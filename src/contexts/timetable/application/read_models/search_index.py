@@ -0,0 +1,278 @@
+"""
+src/contexts/timetable/application/read_models/search_index.py
+================================================================
+TimetableSearchIndex — backs the student, teacher and room search bars (TODO #6–8).
+
+matches_search_query folds five fields into a haystack for every entry on
+every keystroke. A timetable, though, is a few thousand distinct field
+values (course codes, course names, teachers, rooms, days) repeated across
+many entries, so the index works on those values:
+
+  vocabulary   — distinct field value → folded text
+  postings     — field value → entry docs
+  trigrams     — trigram → values, for substring terms of 3+ characters
+  word prefixes— 1–2 character word prefix → values, for short terms
+  words        — folded word → values, sorted, for prefix autocomplete
+
+A query is split into terms. Each term selects the values containing it
+(trigram candidates confirmed with `in`); an entry matches when every term
+selects one of its fields. Entries are enumerated from the most selective
+term's postings and checked against the others, so `limit` stops early.
+Folding is fold_search_text, so "İSMAİL", "ismail" and "Ismail" are the
+same query.
+
+Incremental: replace_department() re-indexes one department. A row several
+departments list (a shared UNS course) is indexed under each of them but is
+one document, counted once per department: it leaves the index with the
+last department that drops it, and search returns it once.
+
+copy() is cheap — outer dicts only, the posting sets are shared copy-on-write
+(copy_on_write.SetMap) — so the next snapshot version copies this one and
+re-indexes just the departments a scrape changed.
+"""
+from __future__ import annotations
+
+import heapq
+import re
+from bisect import bisect_left
+from itertools import islice
+from typing import AbstractSet
+from uuid import UUID
+
+from src.contexts.timetable.application.read_models.copy_on_write import SetMap
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.services import fold_search_text
+from src.contexts.timetable.domain.value_objects import WeekDay
+from src.shared_kernel.domain.identity import DepartmentId
+
+_WORD_RE = re.compile(r"\w+")
+_SHORT = 3  # terms shorter than this match word prefixes, longer ones substrings
+_DAY_NAMES = frozenset(d.turkish for d in WeekDay)
+
+
+def _natural_key(e: TimetableEntry) -> tuple:
+    return (str(e.course_code), e.course_name, e.teacher_name, str(e.room_id),
+            e.room_name, e.day.order, e.time_slot.raw)
+
+
+def _fields(e: TimetableEntry) -> tuple[str, ...]:
+    return (str(e.course_code), e.course_name, e.teacher_name,
+            e.room_name or str(e.room_id), e.day.turkish)
+
+
+def _trigrams(text: str) -> set[str]:
+    return {chunk[i:i + 3] for chunk in text.split() for i in range(len(chunk) - 2)}
+
+
+class _Value:
+    """Immutable, so versions of the index share them."""
+    __slots__ = ("raw", "folded", "words")
+
+    def __init__(self, raw: str) -> None:
+        self.raw = raw
+        self.folded = fold_search_text(raw)
+        self.words = frozenset(_WORD_RE.findall(self.folded))
+
+
+class TimetableSearchIndex:
+    def __init__(self) -> None:
+        self._next_doc = 0
+        self._docs: dict[int, tuple[TimetableEntry, tuple[_Value, ...]]] = {}
+        self._doc_of: dict[UUID, int] = {}
+        self._refs: dict[int, int] = {}                  # doc → departments listing it
+        self._departments: dict[DepartmentId, tuple[tuple, list[int]]] = {}  # → (signature, docs)
+        self._values: dict[str, _Value] = {}
+        self._postings: SetMap[str, int] = SetMap()      # value.raw → docs
+        self._trigrams: SetMap[str, _Value] = SetMap()
+        self._prefixes: SetMap[str, _Value] = SetMap()
+        self._words: SetMap[str, _Value] = SetMap()
+        self._sorted_words: list[str] | None = []
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def copy(self) -> "TimetableSearchIndex":
+        """An independent index with the same content; changing either leaves the other as it was."""
+        other = TimetableSearchIndex()
+        other._next_doc = self._next_doc
+        other._docs = dict(self._docs)
+        other._doc_of = dict(self._doc_of)
+        other._refs = dict(self._refs)
+        other._departments = dict(self._departments)
+        other._values = dict(self._values)
+        other._postings = self._postings.copy()
+        other._trigrams = self._trigrams.copy()
+        other._prefixes = self._prefixes.copy()
+        other._words = self._words.copy()
+        other._sorted_words = self._sorted_words           # replaced, never changed in place
+        return other
+
+    # ── building ────────────────────────────────────────────────────────
+
+    def rebuild(self, entries: list[TimetableEntry]) -> None:
+        by_department: dict[DepartmentId, list[TimetableEntry]] = {}
+        for e in entries:
+            by_department.setdefault(e.department_id, []).append(e)
+        for department_id in list(self._departments):
+            if department_id not in by_department:
+                self.replace_department(department_id, [])
+        for department_id, dept_entries in by_department.items():
+            self.replace_department(department_id, dept_entries)
+
+    def replace_department(self, department_id: DepartmentId, entries: list[TimetableEntry]) -> bool:
+        """Index *entries* as the department's full content. Returns True if postings changed."""
+        ordered = sorted(entries, key=_natural_key)
+        signature = tuple(_natural_key(e) for e in ordered)
+        current = self._departments.get(department_id)
+        if current is not None and current[0] == signature:
+            for doc, entry in zip(current[1], ordered):
+                self._docs[doc] = (entry, self._docs[doc][1])
+            return False
+
+        previous = {self._docs[doc][0].id: doc for doc in current[1]} if current is not None else {}
+        docs = []
+        for e in ordered:
+            doc = previous.pop(e.id, None)
+            if doc is not None and _fields(e) == _fields(self._docs[doc][0]):
+                self._docs[doc] = (e, self._docs[doc][1])       # unchanged text: postings stay
+                docs.append(doc)
+                continue
+            if doc is not None:
+                self._remove_doc(doc)
+            docs.append(self._add_doc(e))
+        for doc in previous.values():
+            self._remove_doc(doc)
+        if docs:
+            self._departments[department_id] = (signature, docs)
+        else:
+            self._departments.pop(department_id, None)
+        return True
+
+    def update_entry(self, entry: TimetableEntry) -> None:
+        """Return *entry* for its document from now on; its indexed text is unchanged."""
+        doc = self._doc_of.get(entry.id)
+        if doc is not None:
+            self._docs[doc] = (entry, self._docs[doc][1])
+
+    def _add_doc(self, entry: TimetableEntry) -> int:
+        doc = self._doc_of.get(entry.id)
+        if doc is None:
+            doc = self._doc_of[entry.id] = self._next_doc
+            self._next_doc += 1
+            self._refs[doc] = 0
+        elif _fields(entry) != _fields(self._docs[doc][0]):
+            self._unindex(doc)                     # the latest department's text wins
+        self._refs[doc] += 1
+        if doc in self._docs:
+            self._docs[doc] = (entry, self._docs[doc][1])
+        else:
+            self._index(doc, entry)
+        return doc
+
+    def _remove_doc(self, doc: int) -> None:
+        self._refs[doc] -= 1
+        if not self._refs[doc]:
+            del self._refs[doc]
+            del self._doc_of[self._docs[doc][0].id]
+            self._unindex(doc)
+
+    def _index(self, doc: int, entry: TimetableEntry) -> None:
+        values = tuple(self._value(raw) for raw in _fields(entry))
+        for value in values:
+            self._postings.add(value.raw, doc)
+        self._docs[doc] = (entry, values)
+
+    def _value(self, raw: str) -> _Value:
+        value = self._values.get(raw)
+        if value is None:
+            value = self._values[raw] = _Value(raw)
+            for gram in _trigrams(value.folded):
+                self._trigrams.add(gram, value)
+            for word in value.words:
+                for n in range(1, _SHORT):
+                    self._prefixes.add(word[:n], value)
+                if self._words.add(word, value):
+                    self._sorted_words = None
+        return value
+
+    def _unindex(self, doc: int) -> None:
+        _, values = self._docs.pop(doc)
+        for value in values:
+            if self._postings.discard(value.raw, doc) and self._values.pop(value.raw, None) is not None:
+                for gram in _trigrams(value.folded):
+                    self._trigrams.discard(gram, value)
+                for word in value.words:
+                    for n in range(1, _SHORT):
+                        self._prefixes.discard(word[:n], value)
+                    if self._words.discard(word, value):
+                        self._sorted_words = None
+
+    # ── queries ─────────────────────────────────────────────────────────
+
+    def search(self, query: str, limit: int | None = None) -> list[TimetableEntry]:
+        """Entries whose fields contain every term of *query*, in index order.
+
+        With *limit*, stops as soon as that many matches are found — which
+        ones is unspecified, so pair it with a query the user is still typing.
+        """
+        terms = fold_search_text(query).split()
+        if not terms:
+            return [entry for entry, _ in islice(self._docs.values(), limit)]
+
+        selections = [self._matching_values(t) for t in terms]
+        if not all(selections):
+            return []
+        postings = self._postings
+        selections.sort(key=lambda values: sum(len(postings.get(v.raw)) for v in values))
+        driver, rest = selections[0], selections[1:]
+
+        matched: set[int] = set()
+        for value in driver:
+            for doc in postings.get(value.raw):
+                if doc in matched:
+                    continue
+                fields = self._docs[doc][1]
+                if all(any(f in selected for f in fields) for selected in rest):
+                    matched.add(doc)
+                    if limit is not None and len(matched) >= limit:
+                        return self._entries(matched)
+        return self._entries(matched)
+
+    def _entries(self, docs: set[int]) -> list[TimetableEntry]:
+        return [self._docs[d][0] for d in sorted(docs)]
+
+    def _matching_values(self, term: str) -> AbstractSet[_Value]:
+        if len(term) < _SHORT:
+            return self._prefixes.get(term)
+        postings = sorted((self._trigrams.get(g) for g in _trigrams(term)), key=len)
+        candidates = set(postings[0])
+        for p in postings[1:]:
+            candidates &= p
+        return {v for v in candidates if term in v.folded}
+
+    def suggest(self, prefix: str, k: int = 10) -> list[str]:
+        """Top-*k* field values with a word starting with *prefix*, most used first.
+
+        Earlier words of a multi-word prefix must appear in the suggestion.
+        Day names are not suggested.
+        """
+        words = fold_search_text(prefix).split()
+        if not words:
+            return []
+        *required, last = words
+        if self._sorted_words is None:
+            self._sorted_words = sorted(self._words)
+        vocabulary = self._sorted_words
+        found: set[_Value] = set()
+        for i in range(bisect_left(vocabulary, last), len(vocabulary)):
+            word = vocabulary[i]
+            if not word.startswith(last):
+                break
+            found.update(self._words.get(word))
+        found = {
+            v for v in found
+            if v.raw not in _DAY_NAMES and all(r in v.folded for r in required)
+        }
+        postings = self._postings
+        return [v.raw for v in heapq.nsmallest(k, found, key=lambda v: (-len(postings.get(v.raw)), v.raw))]
+
@@ -0,0 +1,356 @@
+"""
+src/contexts/timetable/application/read_models/snapshot.py
+===========================================================
+Versioned, immutable timetable snapshots published RCU-style.
+
+A TimetableSnapshot bundles everything the read side serves — the compact
+rows, the room occupancy bitsets, the search index, the coalesced lesson
+blocks and the fuzzy name indexes — built from ONE repository read and
+tagged with a version number. Once published it is never mutated. A row
+several departments list is one row, listed and indexed under each of them
+(TimetableRepository.memberships).
+
+TimetableSnapshotPublisher builds the next snapshot off to the side and
+then swaps a single attribute. After a scrape it patches: TimetableScraped
+names the departments whose rows changed, and the next version is the
+current one copied (flat arrays and outer dicts, at C speed; inner sets
+shared copy-on-write) with just those departments' rows re-applied —
+O(changed rows) Python work instead of re-indexing every row. A full
+build from list_all() runs for refresh(), for the first version after a
+warm start (a mapped snapshot has no patchable indexes) and every
+`rebuild_every` patches, which compacts what patching leaves behind. The build runs on the event loop in steps of
+a few hundred entries, yielding between steps, so requests keep being
+served with sub-millisecond stalls. (A worker thread was measured first:
+with the GIL every reader query then waited up to the 5 ms switch
+interval.) Readers take `publisher.current` once per request and use only
+that object: they never lock, never wait for a scrape, and never see half
+of one version and half of the next.
+
+    snap = publisher.current
+    rooms = snap.occupancy.free_rooms(day, slot)
+    response.headers["ETag"] = snap.etag
+
+Versions only increase; `etag` is derived from the version, so HTTP caches
+and per-version memo caches can key on it. Refreshes are serialised among
+writers only. Listeners added with add_listener() are awaited after each
+refresh — the scrape process uses one to write the snapshot file that
+uvicorn workers map (adapters/outbound/db/mapped_snapshot.py). Then, once
+registered on a bus, the publisher announces the version with
+TimetableSnapshotPublished, which workers answer by remapping the file.
+
+Warm start: with a `warm_start` loader (mapped_snapshot.load_snapshot) the
+first access to `current` maps the last persisted snapshot instead of
+querying the repository, and versions continue from the persisted one. The
+loader returns None for a missing or corrupt file; `ready()` then rebuilds
+from the repository.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Awaitable, Callable, Collection, Generator, Mapping
+from uuid import UUID
+
+from src.contexts.timetable.application.ports.outbound import Clock, EventBus, TimetableRepository
+from src.contexts.timetable.application.read_models.compact_timetable import CompactTimetable
+from src.contexts.timetable.application.read_models.fuzzy_lookup import FuzzyNameIndex
+from src.contexts.timetable.application.read_models.lesson_blocks import LessonBlockIndex
+from src.contexts.timetable.application.read_models.room_occupancy import RoomOccupancyIndex
+from src.contexts.timetable.application.read_models.search_index import TimetableSearchIndex
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.events import TimetableScraped, TimetableSnapshotPublished
+from src.contexts.timetable.domain.services import DEFAULT_BREAK_TOLERANCE, department_id_for
+from src.shared_kernel.domain.identity import DepartmentId, RoomId
+
+
+@dataclass(frozen=True)
+class TimetableSnapshot:
+    version: int
+    built_at: datetime
+    rows: CompactTimetable
+    occupancy: RoomOccupancyIndex
+    search: TimetableSearchIndex
+    blocks: LessonBlockIndex
+    teachers: FuzzyNameIndex
+    courses: FuzzyNameIndex
+    patches: int = 0                  # versions patched since the last full build
+
+    @property
+    def etag(self) -> str:
+        return f'"timetable-{self.version}"'
+
+    @classmethod
+    def build(
+        cls, version: int, built_at: datetime, entries: list[TimetableEntry],
+        break_tolerance: int = DEFAULT_BREAK_TOLERANCE,
+        memberships: Mapping[UUID, Collection[DepartmentId]] | None = None,
+    ) -> "TimetableSnapshot":
+        return _finish(cls.build_steps(
+            version, built_at, entries, break_tolerance=break_tolerance, memberships=memberships,
+        ))
+
+    @classmethod
+    def build_steps(
+        cls, version: int, built_at: datetime, entries: list[TimetableEntry], step: int = 100,
+        break_tolerance: int = DEFAULT_BREAK_TOLERANCE,
+        memberships: Mapping[UUID, Collection[DepartmentId]] | None = None,
+    ) -> Generator[None, None, "TimetableSnapshot"]:
+        """Build in pieces of about *step* entries, yielding between them.
+
+        *entries* holds each row once; *memberships* (row ID → departments)
+        lists a shared row under every department, not just its own.
+        """
+        memberships = memberships or {}
+        rows = CompactTimetable()
+        by_room: dict[RoomId, list[TimetableEntry]] = {}
+        by_department: dict[DepartmentId, list[TimetableEntry]] = {}
+        teachers, courses = FuzzyNameIndex(), FuzzyNameIndex()
+        for i in range(0, len(entries), step):
+            chunk = entries[i:i + step]
+            rows.extend(chunk, memberships)
+            for e in chunk:
+                by_room.setdefault(e.room_id, []).append(e)
+                for department_id in memberships.get(e.id) or (e.department_id,):
+                    by_department.setdefault(department_id, []).append(e)
+                teachers.add(e.teacher_name)
+                courses.add(e.course_name)
+            yield
+
+        occupancy = RoomOccupancyIndex()
+        done = 0
+        for room_id in sorted(by_room, key=str):          # sorted: keeps free-room output ordered
+            occupancy.patch_room(room_id, by_room[room_id])
+            done += len(by_room[room_id])
+            if done >= step:
+                done = 0
+                yield
+
+        search = TimetableSearchIndex()
+        for department_id, dept_entries in by_department.items():
+            search.replace_department(department_id, dept_entries)
+            yield
+
+        blocks = LessonBlockIndex.build(rows, break_tolerance)
+        yield
+
+        return cls(
+            version=version,
+            built_at=built_at,
+            rows=rows,
+            occupancy=occupancy,
+            search=search,
+            blocks=blocks,
+            teachers=teachers,
+            courses=courses,
+        )
+
+    @classmethod
+    def patch(
+        cls, previous: "TimetableSnapshot", version: int, built_at: datetime,
+        departments: Mapping[DepartmentId, list[TimetableEntry]],
+    ) -> "TimetableSnapshot":
+        return _finish(cls.patch_steps(previous, version, built_at, departments))
+
+    @classmethod
+    def patch_steps(
+        cls, previous: "TimetableSnapshot", version: int, built_at: datetime,
+        departments: Mapping[DepartmentId, list[TimetableEntry]], step: int = 100,
+    ) -> Generator[None, None, "TimetableSnapshot"]:
+        """Build *version* from *previous* and the full new content of the changed *departments*.
+
+        Touches only the rows those departments list, before or now; every
+        other department's rows are taken over as they are. *previous* is
+        left as it was.
+        """
+        old = previous.rows
+        listed: dict[UUID, list[DepartmentId]] = {}
+        latest: dict[UUID, TimetableEntry] = {}
+        for department_id, entries in departments.items():
+            for e in entries:
+                listed.setdefault(e.id, []).append(department_id)
+                latest[e.id] = e
+        candidates = {r for department_id in departments for r in old.department_rows(department_id)}
+        added: list[tuple[TimetableEntry, list[DepartmentId]]] = []
+        for entry_id, members in listed.items():
+            r = old.row_of(entry_id)
+            if r is None:
+                added.append((latest[entry_id], members))
+            else:
+                candidates.add(r)
+        yield
+
+        removed: list[int] = []
+        written: dict[int, tuple[TimetableEntry, list[DepartmentId]]] = {}
+        final = {e.id: e for e, _ in added}           # each touched ID → the entry its row holds
+        leaving: list[TimetableEntry] = []
+        joining = [e for e, _ in added]
+        for n, r in enumerate(candidates, 1):
+            before = old[r].to_entry()
+            previous_members = old.departments_of(r)
+            members = [d for d in previous_members if d not in departments] + listed.get(before.id, [])
+            if not members:
+                removed.append(r)
+                leaving.append(before)
+                continue
+            after = latest.get(before.id, before)
+            if after.department_id not in members:
+                after = replace(after, department_id=members[0])
+            final[after.id] = after
+            if not after.same_content(before) or set(members) != set(previous_members):
+                written[r] = (after, members)
+                leaving.append(before)
+                joining.append(after)
+            if n % step == 0:
+                yield
+
+        rows, fresh, moved = old.patched(removed, written, added)
+        yield
+        occupancy = previous.occupancy.copy()
+        occupancy.apply(leaving, joining)
+        teachers, courses = previous.teachers.copy(), previous.courses.copy()
+        for e in leaving:
+            teachers.remove(e.teacher_name)
+            courses.remove(e.course_name)
+        for e in joining:
+            teachers.add(e.teacher_name)
+            courses.add(e.course_name)
+        yield
+
+        search = previous.search.copy()
+        yield
+        for department_id, entries in departments.items():
+            search.replace_department(department_id, [final[e.id] for e in entries])
+            yield
+        for entry_id, e in final.items():
+            if entry_id not in listed:          # kept by unchanged departments only; text unchanged
+                search.update_entry(e)
+
+        blocks = previous.blocks.patched(rows, [*removed, *written], fresh, moved)
+        yield
+
+        return cls(
+            version=version,
+            built_at=built_at,
+            rows=rows,
+            occupancy=occupancy,
+            search=search,
+            blocks=blocks,
+            teachers=teachers,
+            courses=courses,
+            patches=previous.patches + 1,
+        )
+
+    @classmethod
+    def empty(cls, built_at: datetime) -> "TimetableSnapshot":
+        return cls.build(0, built_at, [])
+
+
+def _finish(steps: Generator[None, None, TimetableSnapshot]) -> TimetableSnapshot:
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+
+class TimetableSnapshotPublisher:
+    def __init__(
+        self,
+        repo: TimetableRepository,
+        clock: Clock,
+        initial: TimetableSnapshot | None = None,
+        warm_start: Callable[[], TimetableSnapshot | None] | None = None,
+        break_tolerance: int = DEFAULT_BREAK_TOLERANCE,
+        rebuild_every: int = 50,
+    ) -> None:
+        self._repo = repo
+        self._clock = clock
+        self._current = initial
+        self._warm_start = warm_start
+        self._break_tolerance = break_tolerance
+        self._rebuild_every = rebuild_every
+        self._writer = asyncio.Lock()
+        self._listeners: list[Callable[[TimetableSnapshot], Awaitable[None]]] = []
+        self._bus: EventBus | None = None
+
+    @property
+    def current(self) -> TimetableSnapshot:
+        if self._current is None:
+            loaded = self._warm_start() if self._warm_start else None
+            self._current = loaded or TimetableSnapshot.empty(self._clock.now())
+            self._warm_start = None
+        return self._current
+
+    async def ready(self) -> TimetableSnapshot:
+        """`current`, rebuilt from the repository if nothing could be warm-started."""
+        if self.current.version == 0:
+            await self.refresh()
+        return self.current
+
+    def register(self, bus: EventBus) -> None:
+        self._bus = bus
+        bus.subscribe(TimetableScraped, self.on_timetable_scraped)
+
+    def add_listener(self, listener: Callable[[TimetableSnapshot], Awaitable[None]]) -> None:
+        self._listeners.append(listener)
+
+    async def on_timetable_scraped(self, event: TimetableScraped) -> None:
+        if self.current.version == 0:
+            await self.refresh()
+        elif event.changed_department_ids:
+            await self.patch([department_id_for(i) for i in event.changed_department_ids])
+        elif event.changed_count:
+            await self.refresh()
+
+    async def refresh(self) -> TimetableSnapshot:
+        """Build the next version from the repository and publish it."""
+        async with self._writer:
+            return await self._refresh()
+
+    async def patch(self, department_ids: Collection[DepartmentId]) -> TimetableSnapshot:
+        """Publish the next version: the current one with *department_ids* re-read from the repository.
+
+        Falls back to a full refresh when the current version cannot be
+        patched (a mapped warm start) or has been patched `rebuild_every` times.
+        """
+        async with self._writer:
+            previous = self.current
+            if (
+                not isinstance(previous, TimetableSnapshot) or previous.version == 0
+                or previous.blocks.break_tolerance != self._break_tolerance
+                or previous.patches >= self._rebuild_every
+            ):
+                return await self._refresh()
+            departments = {d: await self._repo.list_by_department(d) for d in department_ids}
+            return await self._install(
+                TimetableSnapshot.patch_steps(previous, previous.version + 1, self._clock.now(), departments)
+            )
+
+    async def _refresh(self) -> TimetableSnapshot:
+        entries = await self._repo.list_all()
+        return await self._install(TimetableSnapshot.build_steps(
+            self.current.version + 1, self._clock.now(), entries,
+            break_tolerance=self._break_tolerance, memberships=await self._repo.memberships(),
+        ))
+
+    async def _install(self, steps: Generator[None, None, TimetableSnapshot]) -> TimetableSnapshot:
+        while True:
+            try:
+                next(steps)
+            except StopIteration as done:
+                snapshot = done.value
+                break
+            await asyncio.sleep(0)
+        self._current = snapshot
+        for listener in self._listeners:
+            await listener(snapshot)
+        if self._bus is not None:
+            await self._bus.publish(TimetableSnapshotPublished(version=snapshot.version))
+        return snapshot
+
+    def publish(self, snapshot: TimetableSnapshot) -> None:
+        """Install an externally built snapshot (e.g. loaded from disk) if it is newer."""
+        if snapshot.version > self.current.version:
+            self._current = snapshot
+
@@ -0,0 +1,336 @@
+"""
+src/contexts/timetable/application/use_cases/scrape_timetable.py
+=================================================================
+Port of backup/main.py AsyncTimetableService.run into the Timetable context.
+
+The scrape is a pipeline of stages joined by bounded queues:
+
+    ids ─▶ fetch ×F ─▶ [pages] ─▶ parse/filter/dedupe ×P ─▶ [entries] ─▶ persist ×1
+
+Queues hold at most `queue_size` items, so a slow parser back-pressures the
+fetchers instead of buffering every raw page, and the persister writes a
+batch as soon as `batch_size` entries are waiting — or sooner when nothing
+else is queued. Each batch is in the repository long before the slowest
+department finishes, but the published snapshot — what the API serves —
+only changes once the whole scrape is done and TimetableScraped reaches the
+snapshot publisher. Fingerprints are stored only after their entries are
+written, so a crash mid-scrape never marks an unwritten page as
+"unchanged".
+
+Dedupe runs per department (deduplicate_entries): storage is replaced per
+department, and the same UNS course legitimately appears under many
+departments — the repository lists such a row once (see
+TimetableRepository.list_all).
+
+Concurrency and retries belong to the DepartmentPageSource (see
+AdaptiveFetchController); a ScrapeFailure reaching this use case is final
+for this cycle. So is a parser exception: it is logged and only that
+department fails. Either way the department keeps its previous entries and
+fingerprint and is listed in TimetableScraped.failed_department_ids.
+
+Incremental mode: every department page carries a PageFingerprint from the
+previous cycle. The source sends it back as If-None-Match /
+If-Modified-Since; a 304, or a 200 whose body hashes to the same value,
+means the page is unchanged — the parser is never called and the stored
+entries for that department are left as they are.
+
+Change events: before a batch is written, each department's new rows are
+diffed against its stored rows (diff_entries). A row many departments
+share has one ID, so the diff is restated for the timetable as a whole
+(shared_row_changes) and reported once per scrape. After the pipeline the
+use case publishes one TimetableEntryChanged per added/removed/moved/renamed
+row, then one RoomScheduleUpdated per affected room — notifications for
+consumers outside the read side — then TimetableScraped. Its
+changed_department_ids name the departments whose rows were replaced, so
+the snapshot publisher re-reads just those and patches the read side with
+O(changes) work instead of reloading everything.
+
+Dead departments: with a DepartmentRegistryStore the use case only requests
+IDs the registry says are due (live, or dead but due a low-frequency
+probe), and feeds back what each page looked like. Scraping a degree
+shard then costs what its live pages cost.
+
+Missing departments: a 404 is final, not a failure. A department that
+answers 404 while it still has stored rows goes through the persist stage
+with no entries, so its rows are removed, reported as REMOVED changes and
+its ID is listed in changed_department_ids; its fingerprint is forgotten so
+the page is parsed in full if it ever comes back. A page that parses to no
+entries (how a department usually goes dead) is an ordinary empty write.
+The page store records the 404 too, so an offline rebuild leaves the
+department out as well.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable
+from uuid import UUID
+
+from src.contexts.timetable.application.ports.outbound import (
+    Clock,
+    DepartmentPageSource,
+    DepartmentRegistryStore,
+    EventBus,
+    PageFingerprintStore,
+    PageSnapshotStore,
+    TimetableParser,
+    TimetableRepository,
+)
+from src.contexts.timetable.domain.entities import DepartmentRegistry, TimetableEntry
+from src.contexts.timetable.domain.errors import DepartmentPageMissing, ScrapeFailure
+from src.contexts.timetable.domain.events import (
+    RoomScheduleUpdated,
+    TimetableEntryChanged,
+    TimetableScraped,
+)
+from src.contexts.timetable.domain.services import (
+    ChangeKind,
+    EntryChange,
+    deduplicate_entries,
+    department_id_for,
+    diff_entries,
+    shared_row_changes,
+)
+from src.contexts.timetable.domain.value_objects import DepartmentRange, PageFingerprint
+from src.shared_kernel.domain.identity import RoomId
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()  # end-of-stream marker between stages
+
+# (department ID, fingerprint to store, entries) — fingerprint None: the page is gone
+_Write = tuple[int, PageFingerprint | None, list[TimetableEntry]]
+
+
+@dataclass(frozen=True)
+class ScrapeTimetableCommand:
+    department_range: DepartmentRange
+    incremental: bool = True
+
+
+class _Outcome(Enum):
+    CHANGED = "changed"
+    SKIPPED = "skipped"
+    MISSING = "missing"
+    FAILED = "failed"
+
+
+class _Run:
+    """Per-execute() state shared by the stages."""
+
+    def __init__(self, cmd: ScrapeTimetableCommand, ids: list[int], registry: DepartmentRegistry, queue_size: int):
+        self.incremental = cmd.incremental
+        self.registry = registry
+        self.outcomes: dict[int, _Outcome] = {}
+        self.cleared: set[int] = set()     # MISSING departments whose stored rows were removed
+        self.changes: list[EntryChange] = []
+        # IDs already reported this run: a shared row changing in N departments is one change
+        self.added_ids: set[UUID] = set()
+        self.removed_ids: set[UUID] = set()
+        self.renamed_ids: set[UUID] = set()
+        self.ids: asyncio.Queue[int] = asyncio.Queue()
+        for i in ids:
+            self.ids.put_nowait(i)
+        self.pages: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.parsed: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+
+class ScrapeTimetableUseCase:
+    def __init__(
+        self,
+        source: DepartmentPageSource,
+        parser: TimetableParser,
+        repo: TimetableRepository,
+        fingerprints: PageFingerprintStore,
+        bus: EventBus,
+        clock: Clock,
+        entry_filter: Callable[[TimetableEntry], bool] | None = None,
+        registry: DepartmentRegistryStore | None = None,
+        snapshots: PageSnapshotStore | None = None,
+        fetch_workers: int = 20,
+        parse_workers: int = 4,
+        queue_size: int = 16,
+        batch_size: int = 500,
+    ) -> None:
+        self._source = source
+        self._parser = parser
+        self._repo = repo
+        self._fingerprints = fingerprints
+        self._bus = bus
+        self._clock = clock
+        self._entry_filter = entry_filter
+        self._registry_store = registry
+        self._snapshots = snapshots
+        self._fetch_workers = fetch_workers
+        self._parse_workers = parse_workers
+        self._queue_size = queue_size
+        self._batch_size = batch_size
+
+    async def execute(self, cmd: ScrapeTimetableCommand) -> TimetableScraped:
+        now = self._clock.now()
+        registry = await self._registry_store.load() if self._registry_store else DepartmentRegistry()
+        all_ids = cmd.department_range.ids()
+        ids = registry.due(all_ids, now)
+        run = _Run(cmd, ids, registry, self._queue_size)
+
+        async with asyncio.TaskGroup() as tg:
+            fetchers = [
+                tg.create_task(self._fetch_stage(run))
+                for _ in range(max(1, min(self._fetch_workers, len(ids))))
+            ]
+            parsers = [tg.create_task(self._parse_stage(run)) for _ in range(self._parse_workers)]
+            tg.create_task(self._persist_stage(run))
+            tg.create_task(_close_after(fetchers, run.pages, len(parsers)))
+            tg.create_task(_close_after(parsers, run.parsed, 1))
+
+        if self._registry_store:
+            await self._registry_store.save(registry)
+
+        await self._publish_changes(run.changes)
+        kinds = Counter(c.kind for c in run.changes)
+        outcomes = [run.outcomes[i] for i in ids]
+        event = TimetableScraped(
+            department_count=len(ids),
+            course_count=await self._repo.count(),
+            fetched_count=sum(o in (_Outcome.CHANGED, _Outcome.SKIPPED) for o in outcomes),
+            skipped_count=sum(o is _Outcome.SKIPPED for o in outcomes),
+            changed_count=sum(o is _Outcome.CHANGED for o in outcomes),
+            changed_department_ids=tuple(
+                i for i in ids if run.outcomes[i] is _Outcome.CHANGED or i in run.cleared
+            ),
+            failed_department_ids=tuple(i for i in ids if run.outcomes[i] is _Outcome.FAILED),
+            dead_count=len(all_ids) - len(ids),
+            added_count=kinds[ChangeKind.ADDED],
+            removed_count=kinds[ChangeKind.REMOVED],
+            moved_count=kinds[ChangeKind.MOVED],
+            renamed_count=kinds[ChangeKind.RENAMED],
+        )
+        await self._bus.publish(event)
+        return event
+
+    # ── stages ──────────────────────────────────────────────────────────
+
+    async def _fetch_stage(self, run: _Run) -> None:
+        while not run.ids.empty():
+            department_id = run.ids.get_nowait()
+            previous = await self._fingerprints.get(department_id) if run.incremental else None
+            try:
+                page = await self._source.fetch(department_id, previous)
+            except DepartmentPageMissing:
+                run.registry.record_empty(department_id, self._clock.now())
+                run.outcomes[department_id] = _Outcome.MISSING
+                if self._snapshots is not None:
+                    await self._snapshots.put_missing(department_id, self._clock.now())
+                if await self._repo.list_by_department(department_id_for(department_id)):
+                    await run.parsed.put((department_id, None, []))
+                continue
+            except ScrapeFailure as exc:
+                logger.warning("%s", exc)
+                run.outcomes[department_id] = _Outcome.FAILED
+                continue
+
+            if page.not_modified or page.fingerprint.same_content(previous):
+                run.registry.record_unchanged(department_id, self._clock.now())
+                run.outcomes[department_id] = _Outcome.SKIPPED
+                continue
+            await run.pages.put(page)
+
+    async def _parse_stage(self, run: _Run) -> None:
+        while (page := await run.pages.get()) is not _DONE:
+            scraped_at = self._clock.now()
+            if self._snapshots is not None:
+                await self._snapshots.put(page.department_id, scraped_at, page.body)
+            try:
+                entries = await self._parser.parse(page.body, page.department_id, scraped_at)
+            except Exception:
+                # no fingerprint is stored, so the page is fetched and parsed again next cycle
+                logger.exception("department %d: parse failed; keeping its previous entries", page.department_id)
+                run.outcomes[page.department_id] = _Outcome.FAILED
+                continue
+            if entries:
+                run.registry.record_alive(page.department_id, scraped_at)
+            else:
+                run.registry.record_empty(page.department_id, scraped_at)
+            if self._entry_filter is not None:
+                entries = [e for e in entries if self._entry_filter(e)]
+            await run.parsed.put((page.department_id, page.fingerprint, deduplicate_entries(entries)))
+
+    async def _persist_stage(self, run: _Run) -> None:
+        batch: list[_Write] = []
+        pending = 0
+        while (item := await run.parsed.get()) is not _DONE:
+            batch.append(item)
+            pending += len(item[2])
+            if pending >= self._batch_size or run.parsed.empty():
+                await self._flush(run, batch)
+                batch, pending = [], 0
+        if batch:
+            await self._flush(run, batch)
+
+    async def _flush(self, run: _Run, batch: list[_Write]) -> None:
+        writes = {department_id_for(department_id): entries for department_id, _, entries in batch}
+        changes: list[EntryChange] = []
+        for department_id, entries in writes.items():
+            changes += diff_entries(await self._repo.list_by_department(department_id), entries)
+        existed = await self._stored_ids([c.after.id for c in changes if c.after is not None])
+        await self._repo.replace_departments(writes)
+        remains = await self._stored_ids([c.before.id for c in changes if c.before is not None])
+        for change in shared_row_changes(changes, existed | run.added_ids, remains | run.removed_ids):
+            if change.kind is ChangeKind.RENAMED:
+                if change.after.id in run.renamed_ids:
+                    continue
+                run.renamed_ids.add(change.after.id)
+            else:
+                if change.after is not None:
+                    run.added_ids.add(change.after.id)
+                if change.before is not None:
+                    run.removed_ids.add(change.before.id)
+            run.changes.append(change)
+        for department_id, fingerprint, _ in batch:
+            if fingerprint is None:
+                await self._fingerprints.delete(department_id)
+                run.cleared.add(department_id)
+            else:
+                await self._fingerprints.put(department_id, fingerprint)
+                run.outcomes[department_id] = _Outcome.CHANGED
+
+    async def _stored_ids(self, entry_ids: list[UUID]) -> set[UUID]:
+        return {e.id for e in await self._repo.list_by_ids(entry_ids)} if entry_ids else set()
+
+    async def _publish_changes(self, changes: list[EntryChange]) -> None:
+        per_room: Counter[RoomId] = Counter()
+        for change in changes:
+            await self._bus.publish(_change_event(change))
+            per_room.update(change.room_ids())
+        for room_id, count in per_room.items():
+            await self._bus.publish(RoomScheduleUpdated(room_id=str(room_id), affected_entry_count=count))
+
+
+def _change_event(change: EntryChange) -> TimetableEntryChanged:
+    now = change.after or change.before
+    old = change.before if change.kind is ChangeKind.MOVED else None
+    return TimetableEntryChanged(
+        change=change.kind.value,
+        entry_id=str(now.id),
+        department_id=str(now.department_id),
+        course_code=str(now.course_code),
+        course_name=now.course_name,
+        teacher_name=now.teacher_name,
+        day=now.day.name,
+        time_slot=str(now.time_slot),
+        room_id=str(now.room_id),
+        previous_entry_id=str(old.id) if old else "",
+        previous_day=old.day.name if old else "",
+        previous_time_slot=str(old.time_slot) if old else "",
+        previous_room_id=str(old.room_id) if old else "",
+    )
+
+
+async def _close_after(producers: list[asyncio.Task], queue: asyncio.Queue, consumers: int) -> None:
+    """Once every producer is done, tell each consumer the stream ended."""
+    await asyncio.gather(*producers)
+    for _ in range(consumers):
+        await queue.put(_DONE)
@@ -10,14 +10,22 @@ Replaced with:
   RoomScheduleView       — READ MODEL only, never persisted (rooms don't
                            "save" a timetable; their schedule is computed
                            from scraped TimetableEntry objects at query time)
+
+Both saved timetables share their pin logic (_PinnedEntries) and keep the
+pins in a DisjointSchedule (schedule.py): pin() rejects an entry
+overlapping one already pinned with TimetableClash.
+pinned_slots records each pin's day and slot so the check survives a
+reload; pins made without times are kept but cannot be clash-checked.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import datetime
-from uuid import UUID, uuid4
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4, uuid5
 
 from src.shared_kernel.domain.identity import DepartmentId, RoomId, StudentId, TeacherId
+from src.contexts.timetable.domain.errors import TimetableClash
+from src.contexts.timetable.domain.schedule import DaySchedule, DisjointSchedule
 from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot, WeekDay
 
 
@@ -25,12 +33,20 @@ from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot, We
 # Core scrape aggregate
 # ---------------------------------------------------------------------------
 
+# Entry IDs are uuid5(natural key): the same row gets the same ID every
+# scrape, so pinned entry_ids and ID-keyed caches survive re-scrapes.
+_ENTRY_NAMESPACE = UUID("0b8f7e52-3c1d-5a9e-b6f4-7d2e1c9a8f30")
+
+
 @dataclass
 class TimetableEntry:
     """One parsed course slot from the Manas timetable HTML.
 
     Aggregate root. Scraped, deduplicated, and stored by the scrape use case.
-    Natural key: (course_code, day, time_slot, room_id, teacher_name).
+    Natural key: (course_code, day, time_slot, room_id, teacher_name); the
+    ID is derived from it, so a UNS course listed under several departments
+    has one ID. It is stored once per department and read once
+    (TimetableRepository.list_all, shared_row_changes).
     """
     id: UUID
     course_code: CourseCode
@@ -41,6 +57,7 @@ class TimetableEntry:
     teacher_name: str
     department_id: DepartmentId
     scraped_at: datetime
+    room_name: str = ""  # label as printed ("B-204"); room_id is derived from it
 
     @classmethod
     def create(
@@ -53,9 +70,10 @@ class TimetableEntry:
         teacher_name: str,
         department_id: DepartmentId,
         scraped_at: datetime,
+        room_name: str = "",
     ) -> "TimetableEntry":
         return cls(
-            id=uuid4(),
+            id=cls.natural_id(course_code, day, time_slot, room_id, teacher_name),
             course_code=course_code,
             course_name=course_name,
             day=day,
@@ -64,15 +82,91 @@ class TimetableEntry:
             teacher_name=teacher_name,
             department_id=department_id,
             scraped_at=scraped_at,
+            room_name=room_name,
+        )
+
+    @staticmethod
+    def natural_id(
+        course_code: CourseCode, day: WeekDay, time_slot: TimeSlot, room_id: RoomId, teacher_name: str,
+    ) -> UUID:
+        key = "\x1f".join((str(course_code), day.name, str(time_slot), str(room_id), teacher_name))
+        return uuid5(_ENTRY_NAMESPACE, key)
+
+    def natural_key(self) -> tuple[str, WeekDay, str, str, str]:
+        return (str(self.course_code), self.day, str(self.time_slot), str(self.room_id), self.teacher_name)
+
+    def same_content(self, other: "TimetableEntry") -> bool:
+        """Equal apart from scraped_at — re-scraping an unchanged row is not a change."""
+        return (
+            self.id == other.id
+            and self.course_code == other.course_code
+            and self.course_name == other.course_name
+            and self.day == other.day
+            and self.time_slot == other.time_slot
+            and self.room_id == other.room_id
+            and self.room_name == other.room_name
+            and self.teacher_name == other.teacher_name
+            and self.department_id == other.department_id
         )
 
 
+# ---------------------------------------------------------------------------
+# Pins shared by both saved-timetable aggregates
+# ---------------------------------------------------------------------------
+
+class _PinnedEntries:
+    """pin / unpin / clash for StudentSavedTimetable and TeacherSavedTimetable.
+
+    entry_ids holds each pin once, in no particular order: unpin moves the
+    last pin into the gap. With the position index and the DisjointSchedule
+    pin and unpin are O(log n) and never scan the list.
+    """
+    entry_ids: list[UUID]
+    pinned_slots: dict[UUID, tuple[WeekDay, TimeSlot]]
+    _positions: dict[UUID, int]
+    _schedule: DisjointSchedule[UUID]
+
+    def __post_init__(self) -> None:
+        self.entry_ids = list(dict.fromkeys(self.entry_ids))
+        self._positions = {entry_id: i for i, entry_id in enumerate(self.entry_ids)}
+        self._schedule = DisjointSchedule[UUID]()
+        for entry_id, (day, slot) in self.pinned_slots.items():
+            self._schedule.add(day, slot, entry_id)
+
+    def pin(self, entry_id: UUID, day: WeekDay | None = None, time_slot: TimeSlot | None = None) -> None:
+        """Pin an entry; with *day* and *time_slot*, refuse one that clashes."""
+        if entry_id in self._positions:
+            return
+        if day is not None and time_slot is not None:
+            other = self._schedule.add(day, time_slot, entry_id)
+            if other is not None:
+                raise TimetableClash(entry_id, other)
+            self.pinned_slots[entry_id] = (day, time_slot)
+        self._positions[entry_id] = len(self.entry_ids)
+        self.entry_ids.append(entry_id)
+
+    def unpin(self, entry_id: UUID) -> None:
+        i = self._positions.pop(entry_id, None)
+        if i is None:
+            return
+        self._schedule.remove(entry_id)
+        self.pinned_slots.pop(entry_id, None)
+        last = self.entry_ids.pop()
+        if last != entry_id:
+            self.entry_ids[i] = last
+            self._positions[last] = i
+
+    def clash(self, day: WeekDay, time_slot: TimeSlot) -> UUID | None:
+        """The pinned entry a new pin at *day*/*time_slot* would overlap, if any."""
+        return self._schedule.clash(day, time_slot)
+
+
 # ---------------------------------------------------------------------------
 # FIX 3A — Student aggregate (persisted)
 # ---------------------------------------------------------------------------
 
 @dataclass
-class StudentSavedTimetable:
+class StudentSavedTimetable(_PinnedEntries):
     """A student's personally pinned timetable selection.
 
     Students search the full timetable, pick their courses, save here.
@@ -83,25 +177,19 @@ class StudentSavedTimetable:
     label: str
     entry_ids: list[UUID] = field(default_factory=list)
     saved_at: datetime = field(default_factory=datetime.now)
+    pinned_slots: dict[UUID, tuple[WeekDay, TimeSlot]] = field(default_factory=dict)
 
     @classmethod
     def create(cls, student_id: StudentId, label: str = "My Timetable") -> "StudentSavedTimetable":
         return cls(id=uuid4(), student_id=student_id, label=label)
 
-    def pin(self, entry_id: UUID) -> None:
-        if entry_id not in self.entry_ids:
-            self.entry_ids.append(entry_id)
-
-    def unpin(self, entry_id: UUID) -> None:
-        self.entry_ids = [e for e in self.entry_ids if e != entry_id]
-
 
 # ---------------------------------------------------------------------------
 # FIX 3B — Teacher aggregate (persisted)
 # ---------------------------------------------------------------------------
 
 @dataclass
-class TeacherSavedTimetable:
+class TeacherSavedTimetable(_PinnedEntries):
     """A teacher's personally saved class schedule.
 
     Teachers search by their own name, find their slots, pin them here.
@@ -113,18 +201,12 @@ class TeacherSavedTimetable:
     label: str
     entry_ids: list[UUID] = field(default_factory=list)
     saved_at: datetime = field(default_factory=datetime.now)
+    pinned_slots: dict[UUID, tuple[WeekDay, TimeSlot]] = field(default_factory=dict)
 
     @classmethod
     def create(cls, teacher_id: TeacherId, label: str = "My Classes") -> "TeacherSavedTimetable":
         return cls(id=uuid4(), teacher_id=teacher_id, label=label)
 
-    def pin(self, entry_id: UUID) -> None:
-        if entry_id not in self.entry_ids:
-            self.entry_ids.append(entry_id)
-
-    def unpin(self, entry_id: UUID) -> None:
-        self.entry_ids = [e for e in self.entry_ids if e != entry_id]
-
 
 # ---------------------------------------------------------------------------
 # FIX 3C — Room schedule is a READ MODEL, never persisted
@@ -140,12 +222,84 @@ class RoomScheduleView:
     """
     room_id: RoomId
     entries: tuple[TimetableEntry, ...]  # immutable — this is a snapshot
+    _days: dict[WeekDay, DaySchedule] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        by_day: dict[WeekDay, list[TimeSlot]] = {}
+        for e in self.entries:
+            by_day.setdefault(e.day, []).append(e.time_slot)
+        object.__setattr__(self, "_days", {d: DaySchedule(slots) for d, slots in by_day.items()})
 
     def is_free_at(self, day: WeekDay, slot: TimeSlot) -> bool:
-        return not any(
-            e.day == day and e.time_slot.overlaps(slot)
-            for e in self.entries
-        )
+        schedule = self._days.get(day)
+        return schedule is None or schedule.is_free(slot)
 
     def free_slots(self, day: WeekDay, all_slots: list[TimeSlot]) -> list[TimeSlot]:
-        return [s for s in all_slots if self.is_free_at(day, s)]
+        schedule = self._days.get(day)
+        return list(all_slots) if schedule is None else schedule.free_slots(all_slots)
+
+
+# ---------------------------------------------------------------------------
+# Department registry — which department-printer IDs actually serve pages
+# ---------------------------------------------------------------------------
+
+@dataclass
+class DepartmentLiveness:
+    department_id: int
+    last_seen_alive: datetime | None = None
+    last_probed: datetime | None = None
+    empty_streak: int = 0     # consecutive scrapes that found no courses / 404
+
+
+@dataclass
+class DepartmentRegistry:
+    """Learns which printer IDs are dead (e.g. 111) so scrapes skip them.
+
+    An ID becomes dead after *dead_after* consecutive empty scrapes and is
+    then re-probed only once per *probe_interval*. One page with courses
+    makes it live again.
+    """
+    departments: dict[int, DepartmentLiveness] = field(default_factory=dict)
+    dead_after: int = 2
+    probe_interval: timedelta = timedelta(hours=72)
+
+    def _get(self, department_id: int) -> DepartmentLiveness:
+        d = self.departments.get(department_id)
+        if d is None:
+            d = self.departments[department_id] = DepartmentLiveness(department_id)
+        return d
+
+    def is_dead(self, department_id: int) -> bool:
+        d = self.departments.get(department_id)
+        return d is not None and d.empty_streak >= self.dead_after
+
+    def due(self, ids: list[int], now: datetime) -> list[int]:
+        """IDs to request this cycle: all live ones plus dead ones due a probe."""
+        return [
+            i for i in ids
+            if not self.is_dead(i)
+            or self.departments[i].last_probed is None
+            or now - self.departments[i].last_probed >= self.probe_interval
+        ]
+
+    def live_ids(self, ids: list[int]) -> list[int]:
+        return [i for i in ids if not self.is_dead(i)]
+
+    def record_alive(self, department_id: int, now: datetime) -> None:
+        d = self._get(department_id)
+        d.last_seen_alive = d.last_probed = now
+        d.empty_streak = 0
+
+    def record_empty(self, department_id: int, now: datetime) -> None:
+        d = self._get(department_id)
+        d.last_probed = now
+        d.empty_streak += 1
+
+    def record_unchanged(self, department_id: int, now: datetime) -> None:
+        """Page answered but did not change: still empty, or still alive."""
+        d = self._get(department_id)
+        d.last_probed = now
+        if d.empty_streak:
+            d.empty_streak += 1
+        else:
+            d.last_seen_alive = now
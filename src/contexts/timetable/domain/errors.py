@@ -14,9 +14,28 @@ class SavedTimetableNotFound(DomainError):
     pass
 
 
+class TimetableClash(DomainError):
+    """Pinning an entry that overlaps one already pinned on the same day."""
+
+    def __init__(self, entry_id: object, clashes_with: object) -> None:
+        super().__init__(f"Entry {entry_id} overlaps pinned entry {clashes_with}")
+        self.entry_id = entry_id
+        self.clashes_with = clashes_with
+
+
 class ScrapeFailure(DomainError):
     def __init__(self, department_id: object, reason: str) -> None:
         super().__init__(f"Scrape failed for dept {department_id}: {reason}")
+        self.department_id = department_id
+        self.reason = reason
+
+
+class TransientScrapeFailure(ScrapeFailure):
+    """Timeout, connection error, 429 or 5xx — worth retrying."""
+
+
+class DepartmentPageMissing(ScrapeFailure):
+    """404 — the printer ID does not exist (dead end such as 111)."""
 
 
 class InvalidDepartmentRange(DomainError):
@@ -12,13 +12,66 @@ from src.shared_kernel.domain.events import DomainEvent
 
 @dataclass(frozen=True)
 class TimetableScraped(DomainEvent):
-    """Fired after a full scrape cycle completes successfully."""
+    """Fired after a full scrape cycle completes successfully.
+
+    fetched_count: departments that answered (200 or 304)
+    skipped_count: answered but unchanged since the last cycle — not parsed
+    changed_count: parsed and stored because the page content changed
+    changed_department_ids: those departments — the read side re-reads only these
+    failed_department_ids: gave up after retries — previous entries kept
+    dead_count:    known-dead IDs in the range not requested this cycle
+    added/removed/moved/renamed_count: row changes vs the previous scrape,
+                   each also published as a TimetableEntryChanged
+    """
     department_count: int = 0
     course_count: int = 0
+    fetched_count: int = 0
+    skipped_count: int = 0
+    changed_count: int = 0
+    changed_department_ids: tuple[int, ...] = ()
+    failed_department_ids: tuple[int, ...] = ()
+    dead_count: int = 0
+    added_count: int = 0
+    removed_count: int = 0
+    moved_count: int = 0
+    renamed_count: int = 0
+
+
+@dataclass(frozen=True)
+class TimetableSnapshotPublished(DomainEvent):
+    """Fired by the scrape owner once a new read-side version is installed.
+
+    Published after every snapshot listener has run, so the mapped snapshot
+    file of this version is already in place when the event arrives.
+    """
+    version: int = 0
 
 
 @dataclass(frozen=True)
 class RoomScheduleUpdated(DomainEvent):
-    """Fired when a room's schedule changes after a scrape."""
+    """Fired when a room's schedule changes after a scrape — once per room per scrape."""
     room_id: str = ""
     affected_entry_count: int = 0
+
+
+@dataclass(frozen=True)
+class TimetableEntryChanged(DomainEvent):
+    """One row differs from the previous scrape.
+
+    change: "added" | "removed" | "moved" | "renamed". A moved row has a new
+    ID (room/time are part of the natural key); previous_* describe the old
+    row, so subscribers can re-point pins and tell students what moved.
+    """
+    change: str = ""
+    entry_id: str = ""
+    department_id: str = ""
+    course_code: str = ""
+    course_name: str = ""
+    teacher_name: str = ""
+    day: str = ""
+    time_slot: str = ""
+    room_id: str = ""
+    previous_entry_id: str = ""
+    previous_day: str = ""
+    previous_time_slot: str = ""
+    previous_room_id: str = ""
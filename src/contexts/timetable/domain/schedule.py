@@ -0,0 +1,107 @@
+"""
+src/contexts/timetable/domain/schedule.py
+==========================================
+Per-day interval structures behind RoomScheduleView and the saved-timetable
+aggregates. Times are TimeSlot minutes; a slot that does not parse
+("Online", "") occupies no time, exactly as TimeSlot.overlaps() treats it.
+
+  DaySchedule       — static, overlaps allowed (a double-booked room).
+                      Starts sorted, plus the running maximum of the ends:
+                      the intervals starting before a query's end are a
+                      prefix, and the prefix's max end says whether any of
+                      them reaches past the query's start. O(log n).
+  DisjointSchedule  — dynamic, kept overlap-free (a student's pins). Sorted
+                      by (start, end), so ends are sorted too — zero-length
+                      slots included — and only the nearest earlier
+                      interval can clash. O(log n) search per
+                      pin/unpin; the insert itself is a list memmove.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import Generic, Hashable, Iterable, TypeVar
+
+from src.contexts.timetable.domain.value_objects import TimeSlot, WeekDay
+
+K = TypeVar("K", bound=Hashable)
+
+
+class DaySchedule:
+    """Immutable busy intervals of one day."""
+
+    __slots__ = ("_starts", "_max_ends")
+
+    def __init__(self, slots: Iterable[TimeSlot]) -> None:
+        spans = sorted((s.start_minutes, s.end_minutes) for s in slots if s.is_valid())
+        self._starts = [start for start, _ in spans]
+        self._max_ends: list[int] = []
+        reach = -1
+        for _, end in spans:
+            reach = max(reach, end)
+            self._max_ends.append(reach)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def is_free(self, slot: TimeSlot) -> bool:
+        if not slot.is_valid():
+            return True
+        i = bisect_left(self._starts, slot.end_minutes)
+        return i == 0 or self._max_ends[i - 1] <= slot.start_minutes
+
+    def free_slots(self, slots: Iterable[TimeSlot]) -> list[TimeSlot]:
+        return [s for s in slots if self.is_free(s)]
+
+
+class DisjointSchedule(Generic[K]):
+    """Non-overlapping keyed intervals per weekday; add() refuses clashes."""
+
+    __slots__ = ("_days", "_where")
+
+    def __init__(self) -> None:
+        self._days: dict[WeekDay, list[tuple[int, int, K]]] = {}
+        self._where: dict[K, tuple[WeekDay, int, int]] = {}
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._where
+
+    def clash(self, day: WeekDay, slot: TimeSlot) -> K | None:
+        """The key of the interval *slot* would overlap on *day*, if any."""
+        if not slot.is_valid():
+            return None
+        spans = self._days.get(day)
+        if not spans:
+            return None
+        i = bisect_left(spans, slot.end_minutes, key=_start)
+        if i and spans[i - 1][1] > slot.start_minutes:
+            return spans[i - 1][2]
+        return None
+
+    def add(self, day: WeekDay, slot: TimeSlot, key: K) -> K | None:
+        """Insert unless it clashes; returns the clashing key (and inserts nothing) if it does."""
+        other = self.clash(day, slot)
+        if other is not None or not slot.is_valid():
+            return other
+        span = (slot.start_minutes, slot.end_minutes, key)
+        insort(self._days.setdefault(day, []), span, key=_bounds)
+        self._where[key] = (day, slot.start_minutes, slot.end_minutes)
+        return None
+
+    def remove(self, key: K) -> None:
+        where = self._where.pop(key, None)
+        if where is None:
+            return
+        day, start, end = where
+        spans = self._days[day]
+        i = bisect_left(spans, (start, end), key=_bounds)
+        while spans[i][2] != key:
+            i += 1
+        del spans[i]
+
+
+def _start(span: tuple[int, int, object]) -> int:
+    return span[0]
+
+
+def _bounds(span: tuple[int, int, object]) -> tuple[int, int]:
+    return span[0], span[1]
@@ -5,23 +5,61 @@ Pure domain services — no I/O, fully testable without mocks.
 """
 from __future__ import annotations
 
+import re
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterable
+from uuid import UUID, uuid5
+
+from src.shared_kernel.domain.identity import DepartmentId, RoomId
 from src.contexts.timetable.domain.entities import TimetableEntry
 from src.contexts.timetable.domain.value_objects import TimeSlot, WeekDay
 
+# Fixed namespace so scraped labels map to the same IDs in every process.
+_MANAS_NAMESPACE = UUID("6f1c3a52-8e0b-4d7a-9c55-2b9f0d1e7a43")
+
+
+def department_id_for(printer_id: int) -> DepartmentId:
+    """Stable DepartmentId for a department-printer page number."""
+    return DepartmentId(uuid5(_MANAS_NAMESPACE, f"department-printer/{printer_id}"))
+
+
+def room_id_for(label: str) -> RoomId:
+    """Stable RoomId for a room label as printed on the timetable."""
+    return RoomId(uuid5(_MANAS_NAMESPACE, f"room/{label.strip()}"))
+
+
+# Manas periods are 45 minutes with 10-minute breaks; anything longer (the
+# lunch hour, a free period) separates two lessons.
+DEFAULT_BREAK_TOLERANCE = 15
+
+
+def coalesce_time_slots(slots: Iterable[TimeSlot], break_tolerance: int = DEFAULT_BREAK_TOLERANCE) -> list[TimeSlot]:
+    """Merge overlapping slots and slots at most *break_tolerance* minutes apart.
 
-def merge_time_slots(slots: list[TimeSlot]) -> str:
-    """Collapse multiple time slots into one HH:MM-HH:MM span."""
-    valid = [s for s in slots if s.is_valid()]
-    if not valid:
-        return ""
-    return f"{min(s.start() for s in valid)}-{max(s.end() for s in valid)}"
+    08:00-08:45 + 08:55-09:40 → 08:00-09:40, but 08:00-08:45 + 14:00-14:45
+    stay two slots. Malformed slots are dropped; the result is sorted.
+    """
+    spans = sorted((s.start_minutes, s.end_minutes) for s in slots if s.is_valid())
+    merged: list[list[int]] = []
+    for start, end in spans:
+        if merged and start - merged[-1][1] <= break_tolerance:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [TimeSlot.from_minutes(start, end) for start, end in merged]
+
+
+def merge_time_slots(slots: list[TimeSlot], break_tolerance: int = DEFAULT_BREAK_TOLERANCE) -> str:
+    """Collapse time slots into "HH:MM-HH:MM" blocks, comma-separated."""
+    return ", ".join(s.raw for s in coalesce_time_slots(slots, break_tolerance))
 
 
 def deduplicate_entries(entries: list[TimetableEntry]) -> list[TimetableEntry]:
     """Remove duplicate entries keeping the most recently scraped."""
     seen: dict[tuple, TimetableEntry] = {}
     for e in entries:
-        key = (str(e.course_code), e.day, str(e.time_slot), str(e.room_id), e.teacher_name)
+        key = e.natural_key()
         if key not in seen or e.scraped_at > seen[key].scraped_at:
             seen[key] = e
     return list(seen.values())
@@ -42,16 +80,146 @@ def find_free_room_ids(
     return sorted(all_room_ids - busy_ids)
 
 
+# str.lower() turns "İ" into "i" + U+0307 and leaves "ı" alone, so "İsmail"
+# never matches "ismail". Fold the Turkish letters first, then drop their
+# diacritics so a student typing on an ASCII keyboard still finds "Şükrü".
+# (Chained str.replace is ~15x faster than str.translate with a dict table.)
+_TURKISH_FOLD = (
+    ("İ", "i"), ("I", "i"), ("ı", "i"),
+    ("Ç", "c"), ("ç", "c"), ("Ş", "s"), ("ş", "s"), ("Ğ", "g"), ("ğ", "g"),
+    ("Ö", "o"), ("ö", "o"), ("Ü", "u"), ("ü", "u"),
+)
+
+
+def fold_search_text(text: str) -> str:
+    """Case- and diacritic-insensitive form of *text* for search (Turkish/Kyrgyz aware)."""
+    for letter, folded in _TURKISH_FOLD:
+        text = text.replace(letter, folded)
+    return text.casefold()
+
+
+# Kyrgyz/Russian Cyrillic → the Latin spelling students actually type.
+_CYRILLIC_TO_LATIN = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo", "ж": "j",
+    "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "ң": "ng",
+    "о": "o", "ө": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u", "ү": "u",
+    "ф": "f", "х": "h", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sh", "ъ": "", "ы": "i",
+    "ь": "", "э": "e", "ю": "yu", "я": "ya",
+}
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9 ]+")
+
+
+def transliteration_key(text: str) -> str:
+    """Script-independent key: "Асанов", "ASANOV" and "Asanov" all give "asanov"."""
+    folded = fold_search_text(text)
+    latin = "".join(_CYRILLIC_TO_LATIN.get(ch, ch) for ch in folded).replace("w", "v")
+    return " ".join(_NON_ALNUM_RE.sub(" ", latin).split())
+
+
 def matches_search_query(entry: TimetableEntry, query: str) -> bool:
     """Case-insensitive substring search across key fields."""
-    q = query.lower().strip()
+    q = fold_search_text(query).strip()
     if not q:
         return True
-    haystack = " ".join([
+    haystack = fold_search_text(" ".join([
         str(entry.course_code),
         entry.course_name,
         entry.teacher_name,
         str(entry.room_id),
         entry.day.turkish,
-    ]).lower()
+    ]))
     return q in haystack
+
+
+# ---------------------------------------------------------------------------
+# Scrape-to-scrape diff
+# ---------------------------------------------------------------------------
+
+class ChangeKind(Enum):
+    ADDED = "added"
+    REMOVED = "removed"
+    MOVED = "moved"        # same course and teacher, different room and/or time
+    RENAMED = "renamed"    # same natural key, course name or room label changed
+
+
+@dataclass(frozen=True)
+class EntryChange:
+    kind: ChangeKind
+    before: TimetableEntry | None
+    after: TimetableEntry | None
+
+    def room_ids(self) -> set[RoomId]:
+        return {e.room_id for e in (self.before, self.after) if e is not None}
+
+
+def diff_entries(previous: list[TimetableEntry], current: list[TimetableEntry]) -> list[EntryChange]:
+    """Classify how one department's rows changed between two scrapes.
+
+    Rows are matched by ID (= natural key). A row that disappeared and a row
+    that appeared for the same course and teacher are paired up as a move,
+    in (day, start time, room) order; whatever is left is added or removed.
+    """
+    before = {e.id: e for e in previous}
+    after = {e.id: e for e in current}
+    changes = [
+        EntryChange(ChangeKind.RENAMED, before[i], e)
+        for i, e in after.items()
+        if i in before and not before[i].same_content(e)
+    ]
+
+    gone: dict[tuple[str, str], list[TimetableEntry]] = {}
+    for i, e in before.items():
+        if i not in after:
+            gone.setdefault((str(e.course_code), e.teacher_name), []).append(e)
+    new: dict[tuple[str, str], list[TimetableEntry]] = {}
+    for i, e in after.items():
+        if i not in before:
+            new.setdefault((str(e.course_code), e.teacher_name), []).append(e)
+
+    for lesson in gone.keys() | new.keys():
+        old_rows = sorted(gone.get(lesson, []), key=_slot_order)
+        new_rows = sorted(new.get(lesson, []), key=_slot_order)
+        paired = min(len(old_rows), len(new_rows))
+        changes += [EntryChange(ChangeKind.MOVED, o, n) for o, n in zip(old_rows, new_rows)]
+        changes += [EntryChange(ChangeKind.REMOVED, o, None) for o in old_rows[paired:]]
+        changes += [EntryChange(ChangeKind.ADDED, None, n) for n in new_rows[paired:]]
+    return changes
+
+
+def shared_row_changes(
+    changes: list[EntryChange], existed: set[UUID], remains: set[UUID],
+) -> list[EntryChange]:
+    """Restate several departments' changes for the timetable as a whole.
+
+    An entry ID is stored once per department that lists the row (a UNS
+    course many departments share), so adding it to one more department is
+    no addition if it *existed* elsewhere already, and dropping it from one
+    is no removal if it *remains* elsewhere. Each ID is reported once: a
+    move keeps whichever half is still news, moves are considered first,
+    and a row renamed in N departments is one rename.
+    """
+    existed, remains, renamed = set(existed), set(remains), set()
+    out = []
+    for c in sorted(changes, key=lambda c: c.kind is not ChangeKind.MOVED):
+        if c.kind is ChangeKind.RENAMED:
+            if c.after.id not in renamed:
+                renamed.add(c.after.id)
+                out.append(c)
+            continue
+        added = c.after is not None and c.after.id not in existed
+        removed = c.before is not None and c.before.id not in remains
+        if added and removed:
+            out.append(c)
+        elif added:
+            out.append(EntryChange(ChangeKind.ADDED, None, c.after))
+        elif removed:
+            out.append(EntryChange(ChangeKind.REMOVED, c.before, None))
+        if c.after is not None:
+            existed.add(c.after.id)
+        if c.before is not None:
+            remains.add(c.before.id)
+    return out
+
+
+def _slot_order(e: TimetableEntry) -> tuple:
+    return (e.day.order, e.time_slot.start_minutes, str(e.room_id))
@@ -2,39 +2,68 @@
 src/contexts/timetable/domain/value_objects.py
 """
 from __future__ import annotations
+import hashlib
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 
 _TIME_RE = re.compile(r"^(\d{2}:\d{2})-(\d{2}:\d{2})$")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TimeSlot:
+    """An "HH:MM-HH:MM" slot as printed on the timetable.
+
+    Parsed once at construction: bounds are kept as minutes since midnight
+    (-1 when *raw* is malformed), so overlaps() is two integer compares
+    instead of up to six regex matches. Equality and hashing use *raw*.
+    """
     raw: str
+    _start: int = field(init=False, repr=False, compare=False)
+    _end: int = field(init=False, repr=False, compare=False)
 
-    def start(self) -> str:
+    def __post_init__(self) -> None:
         m = _TIME_RE.match(self.raw.strip())
-        return m.group(1) if m else ""
+        start, end = (_minutes(m.group(1)), _minutes(m.group(2))) if m else (-1, -1)
+        object.__setattr__(self, "_start", start)
+        object.__setattr__(self, "_end", end)
+
+    @classmethod
+    def from_minutes(cls, start: int, end: int) -> "TimeSlot":
+        return cls(f"{start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}")
+
+    @property
+    def start_minutes(self) -> int:
+        return self._start
+
+    @property
+    def end_minutes(self) -> int:
+        return self._end
+
+    def start(self) -> str:
+        return self.raw.strip()[:5] if self._start >= 0 else ""
 
     def end(self) -> str:
-        m = _TIME_RE.match(self.raw.strip())
-        return m.group(2) if m else ""
+        return self.raw.strip()[6:] if self._start >= 0 else ""
 
     def is_valid(self) -> bool:
-        return bool(_TIME_RE.match(self.raw.strip()))
+        return self._start >= 0
 
     def overlaps(self, other: "TimeSlot") -> bool:
         """Return True if self and other share any time."""
-        if not (self.is_valid() and other.is_valid()):
+        if self._start < 0 or other._start < 0:
             return False
-        return self.start() < other.end() and other.start() < self.end()
+        return self._start < other._end and other._start < self._end
 
     def __str__(self) -> str:
         return self.raw
 
 
+def _minutes(hhmm: str) -> int:
+    return int(hhmm[:2]) * 60 + int(hhmm[3:])
+
+
 class WeekDay(Enum):
     MONDAY = ("Pazartesi", 1)
     TUESDAY = ("Salı", 2)
@@ -88,3 +117,51 @@ class DepartmentRange:
 
     def ids(self) -> list[int]:
         return list(range(self.start, self.end + 1))
+
+
+class DegreeLevel(Enum):
+    """Department-printer ID blocks per degree (see data_schema.md)."""
+    FIRST = ("first", 1, 47)
+    SECOND = ("second", 48, 94)
+    THIRD = ("third", 95, 141)
+    FIFTH = ("fifth", 142, 188)
+
+    def __init__(self, key: str, start: int, end: int) -> None:
+        self.key = key
+        self.department_range = DepartmentRange(start, end)
+
+    @classmethod
+    def from_key(cls, key: str) -> "DegreeLevel":
+        for member in cls:
+            if member.key == key:
+                return member
+        raise ValueError(f"Unknown degree level: {key!r}")
+
+    @classmethod
+    def of(cls, department_id: int) -> "DegreeLevel | None":
+        for member in cls:
+            r = member.department_range
+            if r.start <= department_id <= r.end:
+                return member
+        return None
+
+
+@dataclass(frozen=True)
+class PageFingerprint:
+    """What we remember about a department page between scrape cycles.
+
+    etag / last_modified are echoed back as conditional request headers when
+    the server provided them; content_hash catches unchanged pages from
+    servers that ignore conditional requests and always answer 200.
+    """
+    etag: str = ""
+    last_modified: str = ""
+    content_hash: str = ""
+
+    @classmethod
+    def of(cls, body: str, etag: str = "", last_modified: str = "") -> "PageFingerprint":
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+        return cls(etag=etag, last_modified=last_modified, content_hash=digest)
+
+    def same_content(self, other: "PageFingerprint | None") -> bool:
+        return other is not None and bool(self.content_hash) and self.content_hash == other.content_hash
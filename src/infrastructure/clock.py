@@ -0,0 +1,13 @@
+"""
+src/infrastructure/clock.py
+=============================
+SystemClock — the production Clock (src/shared_kernel/ports/system.py).
+"""
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+
+class SystemClock:
+    def now(self) -> datetime:
+        return datetime.now(UTC)
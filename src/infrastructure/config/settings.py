@@ -31,14 +31,75 @@ class AuthSettings:
     token_ttl_minutes: int = 60 * 24
 
 
+@dataclass(frozen=True)
+class HttpClientSettings:
+    """The shared outbound connection pool (src/infrastructure/http_client)."""
+    max_connections: int = 100
+    max_connections_per_host: int = 20     # requests in flight per host, all adapters together
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0         # seconds an idle connection is kept
+    http2: bool = False                    # needs the optional h2 package
+    verify_tls: bool = True
+    user_agent: str = "manas-assistant/0.1"
+    connect_timeout: float = 5.0
+    default_timeout: float = 10.0
+    # per adapter, whole-request seconds; the timetable scraper uses TimetableSettings.timeout
+    timeouts: dict[str, float] = field(default_factory=lambda: {
+        "cafeteria": 10.0,
+        "sso": 10.0,
+        "llm": 120.0,
+    })
+    # RFC 9111 response cache for GETs (http_client/cache.py); "" disables
+    cache_dir: str = "./data/http_cache"
+    cache_max_bytes: int = 256 * 1024 * 1024
+    cache_max_entry_bytes: int = 4 * 1024 * 1024
+    # URL prefix → freshness seconds, overriding the origin's headers
+    cache_ttls: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class EventBusSettings:
+    """The in-process event bus (src/infrastructure/messaging)."""
+    queue_size: int = 1024                 # per subscriber
+    workers: int = 1                       # per subscriber; >1 gives up per-subscriber ordering
+    backpressure: str = "block"            # block | drop_newest | drop_oldest
+    # SQLite transactional outbox in front of the bus (messaging/outbox.py); "" disables
+    outbox_path: str = ""
+    outbox_batch_size: int = 500           # rows relayed per batch
+    outbox_poll_seconds: float = 1.0       # relay poll between wakeups
+    outbox_relay: bool = True              # False: this process writes, another one relays
+    # cross-process fan-out over Unix sockets (messaging/unix_socket_bus.py); "" disables
+    socket_dir: str = ""
+    socket_name: str = "proc"              # this process's role: api, jobs, scheduler, ...
+    socket_queue_size: int = 10_000        # events queued per peer before the oldest drop
+
+
 @dataclass(frozen=True)
 class TimetableSettings:
     base_url: str = "http://timetable.manas.edu.kg/department-printer"
-    start_id: int = 95
+    start_id: int = 95                     # explicit range used when no degree shard is given
     end_id: int = 141
-    concurrency: int = 20
+    degree_levels: tuple[str, ...] = ("first", "second", "third", "fifth")
+    dead_after_empty_scrapes: int = 2
+    dead_probe_interval_hours: int = 72
+    registry_path: str = "./data/timetable/registry.json"   # live/dead printer IDs; "" keeps them in memory
+    concurrency: int = 20                  # upper bound for the adaptive in-flight limit
+    min_concurrency: int = 2
+    target_latency_seconds: float = 2.0    # slower responses shrink the in-flight limit
+    max_retries: int = 3                   # per department, per scrape cycle
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 10.0
     timeout: float = 20.0
     scrape_interval_hours: int = 6
+    incremental: bool = True               # conditional GET + skip parse of unchanged pages
+    snapshot_dir: str = "./data/timetable/pages"   # raw HTML per scrape; "" disables
+    parse_workers: int = field(default_factory=lambda: os.cpu_count() or 1)  # 0 = parse inline on the event loop
+    pipeline_queue_size: int = 16          # pages / parsed departments buffered between scrape stages
+    persist_batch_size: int = 500          # entries per repository write
+    mapped_snapshot_path: str = "./data/timetable/snapshot.mtts"   # shared by uvicorn workers; "" disables
+    scrape_owner: bool = True              # False in API workers: they only read the mapped snapshot
+    mapped_snapshot_check_seconds: float = 1.0                     # how often workers look for a newer file
+    lesson_break_tolerance_minutes: int = 15   # periods this close apart render as one lesson block
 
 
 @dataclass(frozen=True)
@@ -77,6 +138,13 @@ class CafeteriaSettings:
 @dataclass(frozen=True)
 class SchedulerSettings:
     timetable_scrape_cron: str = "0 */6 * * *"
+    # One cron per degree shard, staggered so shards never crawl at once.
+    timetable_shard_crons: dict[str, str] = field(default_factory=lambda: {
+        "first": "0 */6 * * *",
+        "second": "15 */6 * * *",
+        "third": "30 */6 * * *",
+        "fifth": "45 */6 * * *",
+    })
     assignment_check_cron: str = "*/15 * * * *"
     exam_reminder_cron: str = "*/30 * * * *"
     cafeteria_refresh_cron: str = "0 7 * * *"
@@ -87,6 +155,8 @@ class Settings:
     server: ServerSettings = field(default_factory=ServerSettings)
     database: DatabaseSettings = field(default_factory=DatabaseSettings)
     auth: AuthSettings = field(default_factory=AuthSettings)
+    http: HttpClientSettings = field(default_factory=HttpClientSettings)
+    events: EventBusSettings = field(default_factory=EventBusSettings)
     timetable: TimetableSettings = field(default_factory=TimetableSettings)
     notifications: NotificationSettings = field(default_factory=NotificationSettings)
     documents: DocumentSettings = field(default_factory=DocumentSettings)
@@ -109,12 +179,62 @@ class Settings:
                 jwt_secret=os.environ.get("JWT_SECRET", "CHANGE_ME_IN_PRODUCTION"),
                 token_ttl_minutes=int(os.environ.get("TOKEN_TTL_MINUTES", 1440)),
             ),
+            http=HttpClientSettings(
+                max_connections=int(os.environ.get("HTTP_MAX_CONNECTIONS", 100)),
+                max_connections_per_host=int(os.environ.get("HTTP_MAX_CONNECTIONS_PER_HOST", 20)),
+                max_keepalive_connections=int(os.environ.get("HTTP_MAX_KEEPALIVE", 20)),
+                keepalive_expiry=float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", 30.0)),
+                http2=os.environ.get("HTTP2", "false").lower() == "true",
+                verify_tls=os.environ.get("HTTP_VERIFY_TLS", "true").lower() == "true",
+                connect_timeout=float(os.environ.get("HTTP_CONNECT_TIMEOUT", 5.0)),
+                default_timeout=float(os.environ.get("HTTP_TIMEOUT", 10.0)),
+                timeouts={
+                    **HttpClientSettings().timeouts,
+                    **_parse_timeouts(os.environ.get("HTTP_TIMEOUTS", "")),   # "llm=300,sso=5"
+                },
+                cache_dir=os.environ.get("HTTP_CACHE_DIR", "./data/http_cache"),
+                cache_max_bytes=int(os.environ.get("HTTP_CACHE_MAX_MB", 256)) * 1024 * 1024,
+                cache_max_entry_bytes=int(os.environ.get("HTTP_CACHE_MAX_ENTRY_MB", 4)) * 1024 * 1024,
+                cache_ttls=_parse_ttls(os.environ.get("HTTP_CACHE_TTLS", "")),   # "https://x/api=600,..."
+            ),
+            events=EventBusSettings(
+                queue_size=int(os.environ.get("EVENT_BUS_QUEUE_SIZE", 1024)),
+                workers=int(os.environ.get("EVENT_BUS_WORKERS", 1)),
+                backpressure=os.environ.get("EVENT_BUS_BACKPRESSURE", "block"),
+                outbox_path=os.environ.get("EVENT_OUTBOX_PATH", ""),
+                outbox_batch_size=int(os.environ.get("EVENT_OUTBOX_BATCH_SIZE", 500)),
+                outbox_poll_seconds=float(os.environ.get("EVENT_OUTBOX_POLL_SECONDS", 1.0)),
+                outbox_relay=os.environ.get("EVENT_OUTBOX_RELAY", "true").lower() == "true",
+                socket_dir=os.environ.get("EVENT_SOCKET_DIR", ""),
+                socket_name=os.environ.get("EVENT_SOCKET_NAME", "proc"),
+                socket_queue_size=int(os.environ.get("EVENT_SOCKET_QUEUE_SIZE", 10_000)),
+            ),
             timetable=TimetableSettings(
                 base_url=os.environ.get("TIMETABLE_BASE_URL", "http://timetable.manas.edu.kg/department-printer"),
                 start_id=int(os.environ.get("TIMETABLE_START_ID", 95)),
                 end_id=int(os.environ.get("TIMETABLE_END_ID", 141)),
+                degree_levels=tuple(
+                    os.environ.get("TIMETABLE_DEGREE_LEVELS", "first,second,third,fifth").split(",")
+                ),
+                dead_after_empty_scrapes=int(os.environ.get("TIMETABLE_DEAD_AFTER", 2)),
+                dead_probe_interval_hours=int(os.environ.get("TIMETABLE_DEAD_PROBE_HOURS", 72)),
+                registry_path=os.environ.get("TIMETABLE_REGISTRY_PATH", "./data/timetable/registry.json"),
                 concurrency=int(os.environ.get("TIMETABLE_CONCURRENCY", 20)),
+                min_concurrency=int(os.environ.get("TIMETABLE_MIN_CONCURRENCY", 2)),
+                target_latency_seconds=float(os.environ.get("TIMETABLE_TARGET_LATENCY", 2.0)),
+                max_retries=int(os.environ.get("TIMETABLE_MAX_RETRIES", 3)),
+                retry_base_delay=float(os.environ.get("TIMETABLE_RETRY_BASE_DELAY", 0.5)),
+                retry_max_delay=float(os.environ.get("TIMETABLE_RETRY_MAX_DELAY", 10.0)),
                 timeout=float(os.environ.get("TIMETABLE_TIMEOUT", 20.0)),
+                incremental=os.environ.get("TIMETABLE_INCREMENTAL", "true").lower() == "true",
+                snapshot_dir=os.environ.get("TIMETABLE_SNAPSHOT_DIR", "./data/timetable/pages"),
+                parse_workers=int(os.environ.get("TIMETABLE_PARSE_WORKERS", os.cpu_count() or 1)),
+                pipeline_queue_size=int(os.environ.get("TIMETABLE_QUEUE_SIZE", 16)),
+                persist_batch_size=int(os.environ.get("TIMETABLE_BATCH_SIZE", 500)),
+                mapped_snapshot_path=os.environ.get("TIMETABLE_MAPPED_SNAPSHOT", "./data/timetable/snapshot.mtts"),
+                scrape_owner=os.environ.get("TIMETABLE_SCRAPE_OWNER", "true").lower() == "true",
+                mapped_snapshot_check_seconds=float(os.environ.get("TIMETABLE_MAPPED_SNAPSHOT_CHECK", 1.0)),
+                lesson_break_tolerance_minutes=int(os.environ.get("TIMETABLE_BREAK_TOLERANCE", 15)),
             ),
             notifications=NotificationSettings(
                 telegram_bot_token=os.environ.get("TELEGRAM_BOT_TOKEN", ""),
@@ -142,7 +262,28 @@ class Settings:
             ),
             scheduler=SchedulerSettings(
                 timetable_scrape_cron=os.environ.get("CRON_TIMETABLE", "0 */6 * * *"),
+                timetable_shard_crons=(
+                    _parse_crons(os.environ.get("CRON_TIMETABLE_SHARDS", ""))   # "first=0 */6 * * *;second=..."
+                    or SchedulerSettings().timetable_shard_crons
+                ),
                 assignment_check_cron=os.environ.get("CRON_ASSIGNMENTS", "*/15 * * * *"),
                 exam_reminder_cron=os.environ.get("CRON_EXAMS", "*/30 * * * *"),
             ),
         )
+
+
+def _parse_timeouts(spec: str) -> dict[str, float]:
+    pairs = (item.split("=", 1) for item in spec.split(",") if "=" in item)
+    return {name.strip(): float(seconds) for name, seconds in pairs}
+
+
+def _parse_crons(spec: str) -> dict[str, str]:
+    # cron fields may contain ",", so entries are separated by ";"
+    pairs = (item.split("=", 1) for item in spec.split(";") if "=" in item)
+    return {name.strip(): cron.strip() for name, cron in pairs}
+
+
+def _parse_ttls(spec: str) -> dict[str, float]:
+    # URLs may contain "=", the TTL never does
+    pairs = (item.rpartition("=") for item in spec.split(",") if "=" in item)
+    return {prefix.strip(): float(seconds) for prefix, _, seconds in pairs}
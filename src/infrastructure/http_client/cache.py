@@ -0,0 +1,280 @@
+"""
+src/infrastructure/http_client/cache.py
+=========================================
+CachingTransport — an RFC 9111 shared cache in front of the pooled transport.
+
+The university endpoints (department-printer pages, the cafeteria API,
+portal pages) change a few times a day but are fetched far more often.
+This transport sits between an HttpClientFactory client and its
+TimedTransport, so every context gets it without touching its adapter.
+
+What it implements, for GET:
+
+  freshness   s-maxage > max-age > Expires − Date > heuristic (10% of
+              Date − Last-Modified, at most a day) — unless a per-endpoint
+              TTL override (longest URL prefix) applies, which wins
+  age         Age / Date corrected, plus time spent in the store
+  serving     fresh → from disk, no request ("hit"); the caller's own
+              If-None-Match / If-Modified-Since is answered with a 304
+  validation  stale with an ETag / Last-Modified → conditional request;
+              a 304 refreshes the stored headers and the stored body is
+              returned as 200 ("revalidated")
+  directives  request no-store / no-cache / max-age; response no-store,
+              private (this is a shared cache), no-cache and
+              must-revalidate (always revalidate), Vary (one variant per
+              URL; Vary: * is not stored)
+  safety      requests with Authorization are not cached; a successful
+              POST / PUT / PATCH / DELETE invalidates the URL's entry
+
+A request that sends its own conditional headers is forwarded unchanged
+when the stored entry is stale, so an adapter that tracks ETags itself
+(ManasDepartmentPrinterClient) still sees the origin's 304s.
+
+Responses carry extensions["cache_status"]: "hit", "miss", "revalidated"
+or "bypass". Counters are on the store's CacheStats.
+"""
+from __future__ import annotations
+
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Mapping
+
+import httpx
+
+from src.infrastructure.http_client.cache_store import CachedResponse, CacheStats, DiskCacheStore
+
+_STORABLE = frozenset({200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501})
+_UNSAFE = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+_HEURISTIC_FRACTION = 0.1
+_HEURISTIC_MAX = 24 * 3600.0
+_NOT_MERGED = frozenset({"content-length", "content-encoding", "transfer-encoding"})
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        inner: httpx.AsyncBaseTransport,
+        store: DiskCacheStore,
+        ttl_overrides: Mapping[str, float] | None = None,
+        max_entry_bytes: int = 4 * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._inner = inner
+        self._store = store
+        # longest prefix first, so the most specific override wins
+        self._ttls = sorted((ttl_overrides or {}).items(), key=lambda kv: len(kv[0]), reverse=True)
+        self._max_entry = max_entry_bytes
+        self._clock = clock
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._store.stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        if request.method != "GET":
+            response = await self._inner.handle_async_request(request)
+            if request.method in _UNSAFE and response.status_code < 400:
+                self._store.delete(url)
+            return response
+
+        directives = _directives(request.headers.get_list("cache-control"))
+        if "no-store" in directives or "authorization" in request.headers:
+            self.stats.bypassed += 1
+            return _tagged(await self._inner.handle_async_request(request), "bypass")
+        if "no-cache" in request.headers.get("pragma", "").lower():
+            directives.setdefault("no-cache", "")
+
+        entry = self._store.get(url)
+        if entry is not None and not _vary_matches(entry, request):
+            entry = None
+        now = self._clock()
+        if entry is not None and self._fresh(entry, directives, now):
+            self.stats.hits += 1
+            return self._serve(entry, request, now, "hit")
+
+        conditional = _has_conditionals(request)
+        if entry is not None and not conditional and (entry.header("etag") or entry.header("last-modified")):
+            return await self._revalidate(entry, request, now)
+
+        self.stats.misses += 1
+        response = await self._inner.handle_async_request(request)
+        if response.status_code == 304 and entry is not None and _same_validator(entry, response):
+            self._refresh(entry, response, request, now)
+        elif response.status_code in _STORABLE:
+            return await self._maybe_store(response, request, now)
+        return _tagged(response, "miss")
+
+    # ── freshness ───────────────────────────────────────────────────────
+
+    def _fresh(self, entry: CachedResponse, request_directives: dict[str, str], now: float) -> bool:
+        response_directives = _directives([entry.header("cache-control")])
+        if "no-cache" in request_directives or "no-cache" in response_directives:
+            return False
+        age = _current_age(entry, now)
+        max_age = _seconds(request_directives.get("max-age"))
+        if max_age is not None and age > max_age:
+            return False
+        return age < self._lifetime(entry.url, entry)
+
+    def _lifetime(self, url: str, entry: CachedResponse) -> float:
+        for prefix, ttl in self._ttls:
+            if url.startswith(prefix):
+                return ttl
+        directives = _directives([entry.header("cache-control")])
+        for name in ("s-maxage", "max-age"):
+            seconds = _seconds(directives.get(name))
+            if seconds is not None:
+                return seconds
+        date = _http_date(entry.header("date")) or entry.stored_at
+        if entry.header("expires"):
+            expires = _http_date(entry.header("expires"))
+            return max(0.0, expires - date) if expires is not None else 0.0   # invalid Expires = stale
+        last_modified = _http_date(entry.header("last-modified"))
+        if last_modified is not None:
+            return min(_HEURISTIC_MAX, max(0.0, date - last_modified) * _HEURISTIC_FRACTION)
+        return 0.0
+
+    # ── responses ───────────────────────────────────────────────────────
+
+    def _serve(self, entry: CachedResponse, request: httpx.Request, now: float, status: str) -> httpx.Response:
+        headers = [(k, v) for k, v in entry.headers if k.lower() != "age"]
+        headers.append(("Age", str(int(_current_age(entry, now)))))
+        if _matches_conditionals(entry, request):
+            kept = [(k, v) for k, v in headers if k.lower() not in _NOT_MERGED]
+            return httpx.Response(304, headers=kept, extensions={"cache_status": status})
+        return httpx.Response(entry.status, headers=headers, content=entry.body, extensions={"cache_status": status})
+
+    async def _revalidate(self, entry: CachedResponse, request: httpx.Request, now: float) -> httpx.Response:
+        headers = request.headers.copy()
+        if entry.header("etag"):
+            headers["If-None-Match"] = entry.header("etag")
+        if entry.header("last-modified"):
+            headers["If-Modified-Since"] = entry.header("last-modified")
+        conditional = httpx.Request(request.method, request.url, headers=headers, extensions=request.extensions)
+        response = await self._inner.handle_async_request(conditional)
+        if response.status_code == 304:
+            await response.aclose()
+            entry = self._refresh(entry, response, request, now)
+            self.stats.revalidated += 1
+            return self._serve(entry, request, now, "revalidated")
+        self.stats.misses += 1
+        if response.status_code in _STORABLE:
+            return await self._maybe_store(response, request, now)
+        return _tagged(response, "miss")
+
+    def _refresh(
+        self, entry: CachedResponse, response: httpx.Response, request: httpx.Request, now: float,
+    ) -> CachedResponse:
+        updated = {k.lower() for k in response.headers if k.lower() not in _NOT_MERGED}
+        headers = [(k, v) for k, v in entry.headers if k.lower() not in updated]
+        headers += [(k, v) for k, v in response.headers.multi_items() if k.lower() in updated]
+        entry.headers, entry.stored_at, entry.initial_age = headers, now, _initial_age(response.headers, now)
+        self._store.update(entry.url, headers, now, entry.initial_age)
+        return entry
+
+    async def _maybe_store(self, response: httpx.Response, request: httpx.Request, now: float) -> httpx.Response:
+        directives = _directives(response.headers.get_list("cache-control"))
+        vary = [h.strip().lower() for h in ",".join(response.headers.get_list("vary")).split(",") if h.strip()]
+        length = response.headers.get("content-length", "")
+        if (
+            "no-store" in directives
+            or "private" in directives
+            or "*" in vary
+            or (length.isdigit() and int(length) > self._max_entry)
+        ):
+            self.stats.bypassed += 1
+            return _tagged(response, "miss")
+
+        body = b"".join([chunk async for chunk in response.stream])   # raw: still content-encoded
+        await response.aclose()
+        if len(body) <= self._max_entry:
+            self._store.put(CachedResponse(
+                url=str(request.url),
+                status=response.status_code,
+                headers=response.headers.multi_items(),
+                stored_at=now,
+                initial_age=_initial_age(response.headers, now),
+                vary={h: request.headers.get(h, "") for h in vary},
+                body=body,
+            ))
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=httpx.ByteStream(body),
+            extensions={**response.extensions, "cache_status": "miss"},
+        )
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+# ── header helpers ──────────────────────────────────────────────────────
+
+
+def _directives(values: list[str]) -> dict[str, str]:
+    """Cache-Control header values → {directive: argument} (lower-cased names)."""
+    out: dict[str, str] = {}
+    for value in values:
+        for part in value.split(","):
+            name, _, arg = part.strip().partition("=")
+            if name:
+                out[name.lower()] = arg.strip().strip('"')
+    return out
+
+
+def _seconds(value: str | None) -> float | None:
+    return float(value) if value is not None and value.isdigit() else None
+
+
+def _http_date(value: str) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _initial_age(headers: httpx.Headers, response_time: float) -> float:
+    age = _seconds(headers.get("age")) or 0.0
+    date = _http_date(headers.get("date", ""))
+    apparent = max(0.0, response_time - date) if date is not None else 0.0
+    return max(age, apparent)
+
+
+def _current_age(entry: CachedResponse, now: float) -> float:
+    return entry.initial_age + max(0.0, now - entry.stored_at)
+
+
+def _vary_matches(entry: CachedResponse, request: httpx.Request) -> bool:
+    return all(request.headers.get(h, "") == v for h, v in entry.vary.items())
+
+
+def _has_conditionals(request: httpx.Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def _matches_conditionals(entry: CachedResponse, request: httpx.Request) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = _weak(entry.header("etag"))
+        return bool(etag) and any(t.strip() in ("*", etag) for t in map(_weak, if_none_match.split(",")))
+    since = _http_date(request.headers.get("if-modified-since", ""))
+    modified = _http_date(entry.header("last-modified"))
+    return since is not None and modified is not None and modified <= since
+
+
+def _same_validator(entry: CachedResponse, response: httpx.Response) -> bool:
+    etag = response.headers.get("etag")
+    return etag is None or _weak(etag) == _weak(entry.header("etag"))
+
+
+def _weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _tagged(response: httpx.Response, status: str) -> httpx.Response:
+    response.extensions = {**response.extensions, "cache_status": status}
+    return response
@@ -0,0 +1,279 @@
+"""
+src/infrastructure/http_client/cache_store.py
+===============================================
+DiskCacheStore — the on-disk, size-bounded LRU behind CachingTransport.
+
+    <directory>/index.sqlite3    entries(key, url, status, headers, …,
+                                 body file, size, last use)
+    <directory>/bodies/<key>.<n> one file per stored response body
+
+Every uvicorn worker and the scrape process open the same directory, so the
+index is an SQLite table rather than a file each process rewrites from its
+own memory: each put, update and delete is one transaction, and a process
+sees what the others stored. A body is written inside the transaction that
+indexes it (BEGIN IMMEDIATE, the database's single writer lock), so while a
+process holds that lock no other one is half way through writing — any
+body file the index does not list is a crash leftover. Those are removed
+when a store opens, under the lock; nothing another process may still be
+writing is ever deleted.
+
+Each put writes a new body file and the index row names it, so a reader
+racing a replacement gets the old metadata with the old body or a miss,
+never a mix. Last-use times of hits are written every `flush_every` hits
+and on close() rather than per hit.
+
+When a put() takes the total body size over `max_bytes`, least recently
+used entries are evicted until it fits. A body larger than the whole bound
+is not stored.
+
+No httpx import here: the wiring can build the store without loading it.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from hashlib import sha256
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key         TEXT PRIMARY KEY,
+    url         TEXT    NOT NULL,
+    status      INTEGER NOT NULL,
+    headers     TEXT    NOT NULL,
+    stored_at   REAL    NOT NULL,
+    initial_age REAL    NOT NULL,
+    vary        TEXT    NOT NULL,
+    size        INTEGER NOT NULL,
+    body        TEXT    NOT NULL,
+    used        INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_by_use ON entries (used);
+"""
+_COLUMNS = "url, status, headers, stored_at, initial_age, vary, size, body"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0            # served from the store without contacting the origin
+    misses: int = 0          # nothing usable stored; full request sent
+    revalidated: int = 0     # stale entry confirmed by a 304 and served
+    stored: int = 0
+    bypassed: int = 0        # not cacheable (method, no-store, Authorization, size)
+    evictions: int = 0
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    status: int
+    headers: list[tuple[str, str]]
+    stored_at: float                     # when the response was received (epoch seconds)
+    initial_age: float                   # its age at that moment (Age / Date correction)
+    vary: dict[str, str] = field(default_factory=dict)   # request header → value it was stored for
+    size: int = 0
+    body: bytes | None = None            # loaded on get(), never kept in the index
+
+    def header(self, name: str) -> str:
+        name = name.lower()
+        return next((v for k, v in self.headers if k.lower() == name), "")
+
+
+def cache_key(url: str) -> str:
+    return sha256(url.encode("utf-8")).hexdigest()[:32]
+
+
+class DiskCacheStore:
+    def __init__(self, directory: str | Path, max_bytes: int, flush_every: int = 32) -> None:
+        self._dir = Path(directory)
+        self._bodies = self._dir / "bodies"
+        self._index_path = self._dir / "index.sqlite3"
+        self._max_bytes = max_bytes
+        self._flush_every = flush_every
+        self._used: dict[str, int] = {}          # key → last hit not yet written
+        self.stats = CacheStats()
+        self._bodies.mkdir(parents=True, exist_ok=True)
+        self._connection: sqlite3.Connection | None = self._open()
+        self._repair()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @property
+    def size(self) -> int:
+        return self._db.execute("SELECT TOTAL(size) FROM entries").fetchone()[0]
+
+    # ── entries ─────────────────────────────────────────────────────────
+
+    def get(self, url: str) -> CachedResponse | None:
+        key = cache_key(url)
+        row = self._db.execute(f"SELECT {_COLUMNS} FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None or row[0] != url:
+            return None
+        try:
+            body = (self._bodies / row[7]).read_bytes()
+        except FileNotFoundError:                 # replaced or evicted since the SELECT
+            return None
+        self._used[key] = time.time_ns()
+        if len(self._used) >= self._flush_every:
+            self.flush()
+        return _entry(row, body)
+
+    def put(self, entry: CachedResponse) -> bool:
+        """Store *entry* (with body); False if it can never fit."""
+        assert entry.body is not None
+        if len(entry.body) > self._max_bytes:
+            return False
+        key = cache_key(entry.url)
+        with self._writing():
+            name = _write_new(self._bodies, key, entry.body)
+            self._drop(key)
+            self._db.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, entry.url, entry.status, json.dumps(entry.headers), entry.stored_at,
+                 entry.initial_age, json.dumps(entry.vary), len(entry.body), name, time.time_ns()),
+            )
+            self._used.pop(key, None)
+            self.stats.stored += 1
+            self.stats.evictions += self._evict()
+        return True
+
+    def update(self, url: str, headers: list[tuple[str, str]], stored_at: float, initial_age: float) -> None:
+        """Refresh an entry's metadata after a 304, keeping its body."""
+        self._db.execute(
+            "UPDATE entries SET headers = ?, stored_at = ?, initial_age = ?, used = ? WHERE key = ? AND url = ?",
+            (json.dumps(headers), stored_at, initial_age, time.time_ns(), cache_key(url), url),
+        )
+
+    def delete(self, url: str) -> None:
+        key = cache_key(url)
+        with self._writing():
+            self._drop(key)
+        self._used.pop(key, None)
+
+    def _drop(self, key: str) -> None:
+        """Remove *key*'s row and body file; inside _writing()."""
+        row = self._db.execute("SELECT body FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            (self._bodies / row[0]).unlink(missing_ok=True)
+
+    def _evict(self) -> int:
+        """Drop least recently used entries until the bound holds; inside _writing()."""
+        over = self._db.execute("SELECT TOTAL(size) FROM entries").fetchone()[0] - self._max_bytes
+        evicted = 0
+        if over > 0:
+            for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY used").fetchall():
+                self._drop(key)
+                evicted += 1
+                over -= size
+                if over <= 0:
+                    break
+        return evicted
+
+    # ── index ───────────────────────────────────────────────────────────
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """One write transaction holding the database lock; pending last-use times go first."""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._write_used()
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def _write_used(self) -> None:
+        if self._used:
+            self._db.executemany(
+                "UPDATE entries SET used = MAX(used, ?) WHERE key = ?",
+                [(used, key) for key, used in self._used.items()],
+            )
+            self._used.clear()
+
+    def flush(self) -> None:
+        """Write pending last-use times."""
+        if self._used:
+            with self._writing():
+                pass
+
+    def close(self) -> None:
+        """Flush and release the database; the next call reopens it."""
+        if self._connection is not None:
+            self.flush()
+            self._connection.close()
+            self._connection = None
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = self._open()
+        return self._connection
+
+    def _open(self) -> sqlite3.Connection:
+        try:
+            return _connect(self._index_path)
+        except sqlite3.DatabaseError as exc:
+            logger.warning("discarding HTTP cache index %s: %s", self._index_path, exc)
+            self._index_path.unlink(missing_ok=True)
+            return _connect(self._index_path)
+
+    def _repair(self) -> None:
+        """Make the index and the body files agree — under the write lock, so no
+        other process is writing: unlisted files are crash leftovers."""
+        with self._writing():
+            listed = dict(self._db.execute("SELECT body, size FROM entries").fetchall())
+            broken = []
+            for path in self._bodies.iterdir():
+                size = listed.pop(path.name, None)
+                if size is None or path.stat().st_size != size:     # unlisted, .tmp or truncated
+                    path.unlink(missing_ok=True)
+                    if size is not None:
+                        broken.append(path.name)
+            broken += listed                                          # listed, but the file is gone
+            self._db.executemany("DELETE FROM entries WHERE body = ?", [(name,) for name in broken])
+            self._evict()
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    db = sqlite3.connect(path, isolation_level=None, timeout=30)
+    try:
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(_SCHEMA)
+    except BaseException:
+        db.close()
+        raise
+    return db
+
+
+def _entry(row: tuple, body: bytes | None = None) -> CachedResponse:
+    url, status, headers, stored_at, initial_age, vary, size, _ = row
+    return CachedResponse(
+        url, status, [tuple(h) for h in json.loads(headers)], stored_at, initial_age, json.loads(vary), size, body,
+    )
+
+
+def _write_new(directory: Path, key: str, data: bytes) -> str:
+    """Write *data* to a new file named after *key*; returns its name."""
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f"{key}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        name = Path(tmp).name.removesuffix(".tmp")
+        os.replace(tmp, directory / name)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return name
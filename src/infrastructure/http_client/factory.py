@@ -0,0 +1,141 @@
+"""
+src/infrastructure/http_client/factory.py
+===========================================
+HttpClientFactory — every outbound HTTP adapter's httpx.AsyncClient.
+
+One process-wide connection pool (httpx.AsyncHTTPTransport), shared by
+per-adapter clients that differ only in timeout, headers and name:
+
+    http = shared.http
+    client = http.client("cafeteria")                    # timeout from Settings
+    client = http.client("timetable", timeout=cfg.timeout)
+
+The timetable scraper, the cafeteria and SSO adapters and the LLM client
+then reuse warm keep-alive connections instead of paying a TCP (and TLS)
+handshake per call, and the pool's limits hold for all of them together:
+
+    max_connections            pool-wide
+    max_connections_per_host   requests in flight per host (HostLimiter)
+    max_keepalive_connections  idle connections kept, closed after
+    keepalive_expiry           seconds
+    http2                      needs the optional `h2` package; without it
+                               the factory logs a warning and speaks HTTP/1.1
+
+Every request that reaches the network emits a RequestTiming to the
+factory's hooks (HttpMetrics in production, see timing.py). GETs go through
+CachingTransport first when `cache_dir` is set (cache.py): one on-disk
+store for all clients, TTL overrides from `cache_ttls` plus the ones the
+wiring passes in; `client(name, cache=False)` opts an adapter out.
+
+Constructing the factory is free: httpx is imported and the pool opened on
+the first client() call, so a command that makes no HTTP call never loads
+httpx. Close the pool and flush the cache index with `await factory.aclose()`
+at shutdown; clients handed out must not be used after that (their own
+aclose() is harmless).
+"""
+from __future__ import annotations
+
+import logging
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any
+
+from src.infrastructure.config.settings import HttpClientSettings
+from src.infrastructure.http_client.cache_store import CacheStats, DiskCacheStore
+from src.infrastructure.http_client.timing import TimingHook
+
+if TYPE_CHECKING:
+    import httpx
+
+    from src.infrastructure.http_client.transport import HostLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClientFactory:
+    def __init__(
+        self,
+        settings: HttpClientSettings,
+        hooks: list[TimingHook] | None = None,
+        cache_ttls: dict[str, float] | None = None,
+    ) -> None:
+        self._settings = settings
+        self._hooks: list[TimingHook] = list(hooks or ())
+        self._cache_ttls = {**(cache_ttls or {}), **settings.cache_ttls}
+        self._pool: httpx.AsyncHTTPTransport | None = None
+        self._limiter: HostLimiter | None = None
+        self._cache: DiskCacheStore | None = None
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def add_hook(self, hook: TimingHook) -> None:
+        self._hooks.append(hook)
+
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        """Hit / miss / revalidation counters, None until the cache is opened or when disabled."""
+        return self._cache.stats if self._cache is not None else None
+
+    def timeout_for(self, name: str) -> float:
+        return self._settings.timeouts.get(name, self._settings.default_timeout)
+
+    def client(
+        self, name: str, timeout: float | None = None, cache: bool = True, **kwargs: Any,
+    ) -> "httpx.AsyncClient":
+        """The client for adapter *name*; the same object on every call with that name.
+
+        *timeout* (seconds, whole request) overrides Settings; extra keyword
+        arguments (base_url, headers, ...) go to httpx.AsyncClient on first use.
+        """
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+
+        import httpx
+
+        from src.infrastructure.http_client.cache import CachingTransport
+        from src.infrastructure.http_client.transport import TimedTransport
+
+        cfg = self._settings
+        total = timeout if timeout is not None else self.timeout_for(name)
+        headers = {"User-Agent": cfg.user_agent, **kwargs.pop("headers", {})}
+        transport: httpx.AsyncBaseTransport = TimedTransport(self._shared_pool(), name, self._hooks, self._limiter)
+        if cache and self._cache is not None:
+            transport = CachingTransport(transport, self._cache, self._cache_ttls, cfg.cache_max_entry_bytes)
+        client = self._clients[name] = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(total, connect=min(cfg.connect_timeout, total)),
+            headers=headers,
+            **kwargs,
+        )
+        return client
+
+    def _shared_pool(self) -> "httpx.AsyncHTTPTransport":
+        if self._pool is None:
+            import httpx
+
+            from src.infrastructure.http_client.transport import HostLimiter
+
+            cfg = self._settings
+            http2 = cfg.http2 and find_spec("h2") is not None
+            if cfg.http2 and not http2:
+                logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+            self._pool = httpx.AsyncHTTPTransport(
+                verify=cfg.verify_tls,
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=cfg.max_connections,
+                    max_keepalive_connections=cfg.max_keepalive_connections,
+                    keepalive_expiry=cfg.keepalive_expiry,
+                ),
+            )
+            self._limiter = HostLimiter(cfg.max_connections_per_host)
+            if cfg.cache_dir and self._cache is None:
+                self._cache = DiskCacheStore(cfg.cache_dir, cfg.cache_max_bytes)
+        return self._pool
+
+    async def aclose(self) -> None:
+        """Close the shared pool; a later client() call opens a new one."""
+        pool, self._pool, self._clients = self._pool, None, {}
+        if self._cache is not None:
+            self._cache.close()
+        if pool is not None:
+            await pool.aclose()
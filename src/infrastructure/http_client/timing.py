@@ -0,0 +1,100 @@
+"""
+src/infrastructure/http_client/timing.py
+==========================================
+Per-request timing records and the in-process metrics they feed.
+
+Every request sent through an HttpClientFactory client produces one
+RequestTiming, handed to each registered hook once the response is closed
+(or the request failed). Phases are seconds, None when the phase did not
+happen — a request on a reused keep-alive connection has no connect and no
+TLS phase, which is the whole point of pooling:
+
+    connect  DNS resolution + TCP handshake (httpcore resolves inside its
+             connect call, so the two are not separable)
+    tls      TLS handshake
+    ttfb     request start → response headers received
+    total    request start → response body read and closed
+
+HttpMetrics is the default hook: counters and latency sums per (client,
+host), cheap enough to run on every request.
+
+No httpx import here — see factory.py.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True, slots=True)
+class RequestTiming:
+    client: str                # the adapter's name, as passed to HttpClientFactory.client()
+    method: str
+    host: str
+    status: int | None         # None when no response arrived
+    connect: float | None
+    tls: float | None
+    ttfb: float | None
+    total: float
+    error: str = ""            # exception type name when the request failed
+
+    @property
+    def reused_connection(self) -> bool:
+        return self.connect is None and self.status is not None
+
+
+TimingHook = Callable[[RequestTiming], None]
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    errors: int = 0
+    new_connections: int = 0
+    connect_seconds: float = 0.0
+    tls_seconds: float = 0.0
+    ttfb_seconds: float = 0.0
+    total_seconds: float = 0.0
+    max_total_seconds: float = 0.0
+
+    @property
+    def mean_total(self) -> float:
+        return self.total_seconds / self.requests if self.requests else 0.0
+
+    @property
+    def mean_ttfb(self) -> float:
+        return self.ttfb_seconds / self.requests if self.requests else 0.0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of requests that did not open a connection."""
+        return 1 - self.new_connections / self.requests if self.requests else 0.0
+
+
+class HttpMetrics:
+    """TimingHook aggregating RequestTimings per (client, host)."""
+
+    def __init__(self) -> None:
+        self._stats: dict[tuple[str, str], HostStats] = {}
+
+    def __call__(self, timing: RequestTiming) -> None:
+        stats = self._stats.get((timing.client, timing.host))
+        if stats is None:
+            stats = self._stats[(timing.client, timing.host)] = HostStats()
+        stats.requests += 1
+        if timing.error or timing.status is None or timing.status >= 500:
+            stats.errors += 1
+        if timing.connect is not None:
+            stats.new_connections += 1
+            stats.connect_seconds += timing.connect
+        stats.tls_seconds += timing.tls or 0.0
+        stats.ttfb_seconds += timing.ttfb or 0.0
+        stats.total_seconds += timing.total
+        stats.max_total_seconds = max(stats.max_total_seconds, timing.total)
+
+    def stats(self, client: str, host: str) -> HostStats:
+        return self._stats.get((client, host), HostStats())
+
+    def snapshot(self) -> dict[tuple[str, str], HostStats]:
+        """A copy of every (client, host) → stats, for a metrics endpoint or log line."""
+        return {key: HostStats(**vars(stats)) for key, stats in self._stats.items()}
@@ -0,0 +1,153 @@
+"""
+src/infrastructure/http_client/transport.py
+=============================================
+TimedTransport — one adapter's view of the shared connection pool.
+
+Wraps the factory's httpx.AsyncHTTPTransport. Per request it
+
+  - waits for a slot of the per-host limiter, so one busy adapter cannot
+    take every pooled connection to a host;
+  - attaches an httpcore trace callback that timestamps the connect, TLS
+    and response-header events;
+  - wraps the response stream, so the slot is released and the
+    RequestTiming emitted when the caller has read and closed the body.
+
+aclose() is a no-op: the pool belongs to HttpClientFactory and outlives
+any one client.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import AsyncIterator, Callable, Sequence
+
+import httpx
+
+from src.infrastructure.http_client.timing import RequestTiming, TimingHook
+
+
+class HostLimiter:
+    """At most *per_host* requests in flight per host, across all clients."""
+
+    def __init__(self, per_host: int) -> None:
+        self._per_host = per_host
+        self._slots: dict[str, asyncio.Semaphore] = {}
+
+    def slot(self, host: str) -> asyncio.Semaphore:
+        sem = self._slots.get(host)
+        if sem is None:
+            sem = self._slots[host] = asyncio.Semaphore(self._per_host)
+        return sem
+
+
+class _Trace:
+    """Collects httpcore trace events of one request."""
+
+    __slots__ = ("_clock", "_chained", "marks")
+
+    def __init__(self, clock: Callable[[], float], chained: Callable | None) -> None:
+        self._clock = clock
+        self._chained = chained
+        self.marks: dict[str, float] = {}
+
+    async def __call__(self, event: str, info: dict) -> None:
+        self.marks[event] = self._clock()
+        if self._chained is not None:
+            await self._chained(event, info)
+
+    def span(self, started: str, complete: str) -> float | None:
+        start, end = self.marks.get(started), self.marks.get(complete)
+        return end - start if start is not None and end is not None else None
+
+    def first(self, *events: str) -> float | None:
+        return next((self.marks[e] for e in events if e in self.marks), None)
+
+
+class _TimedStream(httpx.AsyncByteStream):
+    def __init__(self, inner: httpx.AsyncByteStream, on_close: Callable[[str], None]) -> None:
+        self._inner = inner
+        self._on_close = on_close
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._inner:
+                yield chunk
+        except Exception as exc:
+            self._finish(type(exc).__name__)
+            raise
+
+    async def aclose(self) -> None:
+        try:
+            await self._inner.aclose()
+        finally:
+            self._finish("")
+
+    def _finish(self, error: str) -> None:
+        if not self._closed:
+            self._closed = True
+            self._on_close(error)
+
+
+class TimedTransport(httpx.AsyncBaseTransport):
+    def __init__(
+        self,
+        pool: httpx.AsyncBaseTransport,
+        client: str,
+        hooks: Sequence[TimingHook],
+        limiter: HostLimiter,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._pool = pool
+        self._client = client
+        self._hooks = hooks
+        self._limiter = limiter
+        self._clock = clock
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        slot = self._limiter.slot(host)
+        await slot.acquire()
+        trace = _Trace(self._clock, request.extensions.get("trace"))
+        request.extensions["trace"] = trace
+        started = self._clock()
+
+        def finish(status: int | None, error: str) -> None:
+            slot.release()
+            self._emit(RequestTiming(
+                client=self._client,
+                method=request.method,
+                host=host,
+                status=status,
+                connect=trace.span("connection.connect_tcp.started", "connection.connect_tcp.complete"),
+                tls=trace.span("connection.start_tls.started", "connection.start_tls.complete"),
+                ttfb=_since(started, trace.first(
+                    "http11.receive_response_headers.complete", "http2.receive_response_headers.complete",
+                )),
+                total=self._clock() - started,
+                error=error,
+            ))
+
+        try:
+            response = await self._pool.handle_async_request(request)
+        except BaseException as exc:
+            finish(None, type(exc).__name__)
+            raise
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_TimedStream(response.stream, lambda error: finish(response.status_code, error)),
+            extensions=response.extensions,
+        )
+
+    def _emit(self, timing: RequestTiming) -> None:
+        for hook in self._hooks:
+            hook(timing)
+
+    async def aclose(self) -> None:
+        pass
+
+
+def _since(start: float, mark: float | None) -> float | None:
+    return mark - start if mark is not None else None
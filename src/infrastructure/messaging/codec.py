@@ -0,0 +1,222 @@
+"""
+src/infrastructure/messaging/codec.py
+=======================================
+EventCodec — DomainEvent subclasses to compact bytes and back.
+
+Events leave the process (the SQLite outbox, the Unix-socket bus), so they
+need a wire form. JSON with field names costs ~3× the bytes and a dict per
+event; this codec writes the dataclass fields positionally, one tag byte
+per value:
+
+    N None   T/F bool   i int (zigzag varint)   f float (8 bytes)
+    s str / b bytes (varint length + data)      u UUID (16 bytes)
+    D datetime / d date (ISO text)              l tuple or list (count + values)
+
+Identity value objects (StudentId, RoomId, ...) are written as their UUID
+and Enums as their value; on decode, field type hints turn them back
+into the declared class. A typical event — event_id, occurred_at and a
+few short fields — encodes to 70–90 bytes.
+
+The event class travels separately as "module:QualName" (type_name()), so
+the outbox can store it in its own column and the socket bus can send it
+once per frame. resolve() imports it and refuses anything that is not a
+DomainEvent subclass.
+
+Schema evolution is positional: add fields at the end with a default
+(dataclass inheritance already appends). A payload with fewer values than
+the class has fields decodes with the defaults; extra trailing values —
+written by a newer version — are ignored.
+"""
+from __future__ import annotations
+
+import dataclasses
+import struct
+import types
+import typing
+from datetime import date, datetime
+from enum import Enum
+from importlib import import_module
+from uuid import UUID
+
+from src.shared_kernel.domain.events import DomainEvent
+
+_DOUBLE = struct.Struct("<d")
+
+
+class EventCodecError(ValueError):
+    """A payload or type name that does not decode to a known DomainEvent."""
+
+
+class EventCodec:
+    def __init__(self) -> None:
+        self._types: dict[str, type[DomainEvent]] = {}
+        self._fields: dict[type, tuple[tuple[str, object], ...]] = {}
+
+    # ── type names ──────────────────────────────────────────────────────
+
+    @staticmethod
+    def type_name(event_type: type[DomainEvent]) -> str:
+        return f"{event_type.__module__}:{event_type.__qualname__}"
+
+    def resolve(self, name: str) -> type[DomainEvent]:
+        cls = self._types.get(name)
+        if cls is None:
+            module, _, qualname = name.partition(":")
+            try:
+                obj: object = import_module(module)
+                for part in qualname.split("."):
+                    obj = getattr(obj, part)
+            except (ImportError, AttributeError, ValueError) as exc:
+                raise EventCodecError(f"unknown event type {name!r}") from exc
+            if not (isinstance(obj, type) and issubclass(obj, DomainEvent)):
+                raise EventCodecError(f"{name!r} is not a DomainEvent")
+            cls = self._types[name] = obj
+        return cls
+
+    # ── events ──────────────────────────────────────────────────────────
+
+    def encode(self, event: DomainEvent) -> bytes:
+        out = bytearray()
+        for name, _ in self._schema(type(event)):
+            _write(out, getattr(event, name))
+        return bytes(out)
+
+    def decode(self, type_name: str, payload: bytes | memoryview) -> DomainEvent:
+        cls = self.resolve(type_name)
+        schema = self._schema(cls)
+        data = memoryview(payload)
+        values: dict[str, object] = {}
+        pos = 0
+        try:
+            for name, hint in schema:
+                if pos >= len(data):
+                    break
+                value, pos = _read(data, pos)
+                values[name] = _coerce(hint, value)
+            return cls(**values)
+        except (IndexError, KeyError, ValueError, TypeError, struct.error) as exc:
+            raise EventCodecError(f"corrupt {type_name} payload: {exc}") from exc
+
+    def _schema(self, cls: type) -> tuple[tuple[str, object], ...]:
+        schema = self._fields.get(cls)
+        if schema is None:
+            hints = typing.get_type_hints(cls)
+            schema = self._fields[cls] = tuple(
+                (f.name, _concrete(hints.get(f.name))) for f in dataclasses.fields(cls) if f.init
+            )
+        return schema
+
+
+# ── values ──────────────────────────────────────────────────────────────
+
+
+def _write(out: bytearray, value: object) -> None:
+    if value is None:
+        out += b"N"
+    elif value is True:
+        out += b"T"
+    elif value is False:
+        out += b"F"
+    elif isinstance(value, Enum):
+        _write(out, value.value)
+    elif isinstance(value, int):
+        out += b"i"
+        _varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+    elif isinstance(value, float):
+        out += b"f" + _DOUBLE.pack(value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        out += b"s"
+        _varint(out, len(data))
+        out += data
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        out += b"b"
+        _varint(out, len(value))
+        out += value
+    elif isinstance(value, UUID):
+        out += b"u" + value.bytes
+    elif isinstance(value, datetime):
+        data = value.isoformat().encode("ascii")
+        out += b"D" + bytes((len(data),)) + data
+    elif isinstance(value, date):
+        out += b"d" + value.isoformat().encode("ascii")
+    elif isinstance(value, (tuple, list, frozenset)):
+        out += b"l"
+        _varint(out, len(value))
+        for item in value:
+            _write(out, item)
+    elif dataclasses.is_dataclass(value) and len(fields := dataclasses.fields(value)) == 1:
+        _write(out, getattr(value, fields[0].name))      # EntityId and other single-value objects
+    else:
+        raise EventCodecError(f"cannot encode {type(value).__name__}")
+
+
+def _read(data: memoryview, pos: int) -> tuple[object, int]:
+    tag = data[pos]
+    pos += 1
+    if tag == 0x4E:         # N
+        return None, pos
+    if tag == 0x54:         # T
+        return True, pos
+    if tag == 0x46:         # F
+        return False, pos
+    if tag == 0x69:         # i
+        n, pos = _read_varint(data, pos)
+        return (n >> 1) ^ -(n & 1), pos
+    if tag == 0x66:         # f
+        return _DOUBLE.unpack_from(data, pos)[0], pos + 8
+    if tag == 0x73:         # s
+        n, pos = _read_varint(data, pos)
+        return str(data[pos:pos + n], "utf-8"), pos + n
+    if tag == 0x62:         # b
+        n, pos = _read_varint(data, pos)
+        return bytes(data[pos:pos + n]), pos + n
+    if tag == 0x75:         # u
+        return UUID(bytes=bytes(data[pos:pos + 16])), pos + 16
+    if tag == 0x44:         # D
+        n = data[pos]
+        return datetime.fromisoformat(str(data[pos + 1:pos + 1 + n], "ascii")), pos + 1 + n
+    if tag == 0x64:         # d
+        return date.fromisoformat(str(data[pos:pos + 10], "ascii")), pos + 10
+    if tag == 0x6C:         # l
+        n, pos = _read_varint(data, pos)
+        items = []
+        for _ in range(n):
+            item, pos = _read(data, pos)
+            items.append(item)
+        return tuple(items), pos
+    raise ValueError(f"unknown tag {tag:#x} at {pos - 1}")
+
+
+def _varint(out: bytearray, n: int) -> None:
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(data: memoryview, pos: int) -> tuple[int, int]:
+    n = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _concrete(hint: object) -> object:
+    """`X | None` → X; anything that is not a single class → None (no coercion)."""
+    if isinstance(hint, types.UnionType) or typing.get_origin(hint) is typing.Union:
+        args = [a for a in typing.get_args(hint) if a is not type(None)]
+        hint = args[0] if len(args) == 1 else None
+    return hint if isinstance(hint, type) else None
+
+
+def _coerce(hint: object, value: object) -> object:
+    if hint is None or value is None or isinstance(value, hint):
+        return value
+    if issubclass(hint, Enum) or dataclasses.is_dataclass(hint):
+        return hint(value)
+    return value
@@ -0,0 +1,221 @@
+"""
+src/infrastructure/messaging/in_memory_bus.py
+===============================================
+InMemoryEventBus — the production in-process EventBus.
+
+publish() never runs a handler itself. Every subscription owns a bounded
+asyncio.Queue and `workers` tasks draining it, so a slow notification
+handler delays only its own queue, not the use case that published:
+
+    publish(e) ─▶ dispatch table[type(e)] ─▶ [queue] ─▶ worker ×W ─▶ handler
+                                          ─▶ [queue] ─▶ worker ×W ─▶ handler
+
+Dispatch follows the MRO: a handler subscribed to a base class (DomainEvent
+for an audit log, say) receives every subclass. The subscriptions for a
+concrete event type are resolved once, on its first publish, and kept in a
+table that subscribe() invalidates; publish() is then one dict lookup plus
+one put per subscriber.
+
+When a queue is full the subscription's Backpressure policy applies:
+
+    block        publish() waits for room (default; nothing is lost)
+    drop_newest  the new event is not queued for that subscriber
+    drop_oldest  the oldest queued event makes room for the new one
+
+Drops are counted per subscriber (SubscriberStats). With workers=1 a
+subscriber sees events in publish order; more workers trade that order for
+parallelism. A handler that raises is logged and counted and its worker
+moves on — it never reaches the publisher or the other subscribers. A
+handler that publishes into its own full `block` queue waits for itself:
+give such subscriptions a drop policy or more workers.
+
+Workers start on the first publish, inside the running loop. `await
+bus.drain()` waits until every queued event has been handled (jobs call it
+before exiting); `await bus.aclose()` drains and stops the workers.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from enum import Enum
+from typing import Awaitable, Callable, TypeVar
+
+from src.shared_kernel.domain.events import DomainEvent
+from src.shared_kernel.ports.event_bus import EventHandler
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=DomainEvent)
+
+
+class Backpressure(str, Enum):
+    BLOCK = "block"
+    DROP_NEWEST = "drop_newest"
+    DROP_OLDEST = "drop_oldest"
+
+
+@dataclass
+class SubscriberStats:
+    delivered: int = 0      # handler returned
+    failed: int = 0         # handler raised
+    dropped: int = 0        # discarded by the backpressure policy
+    high_water: int = 0     # deepest the queue has been
+
+
+class _Subscription:
+    __slots__ = ("name", "event_type", "handler", "queue_size", "workers", "policy",
+                 "stats", "queue", "tasks")
+
+    def __init__(
+        self, event_type: type[DomainEvent], handler: EventHandler,
+        queue_size: int, workers: int, policy: Backpressure,
+    ) -> None:
+        self.name = f"{event_type.__name__}:{getattr(handler, '__qualname__', repr(handler))}"
+        self.event_type = event_type
+        self.handler = handler
+        self.queue_size = queue_size
+        self.workers = workers
+        self.policy = policy
+        self.stats = SubscriberStats()
+        self.queue: asyncio.Queue[DomainEvent] | None = None
+        self.tasks: list[asyncio.Task] = []
+
+
+class InMemoryEventBus:
+    def __init__(
+        self,
+        queue_size: int = 1024,
+        workers: int = 1,
+        backpressure: Backpressure | str = Backpressure.BLOCK,
+    ) -> None:
+        if queue_size < 1 or workers < 1:
+            raise ValueError("queue_size and workers must be at least 1")
+        self._queue_size = queue_size
+        self._workers = workers
+        self._policy = Backpressure(backpressure)
+        self._subscriptions: list[_Subscription] = []
+        self._table: dict[type, tuple[_Subscription, ...]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._idle: asyncio.Event | None = None
+        self._pending = 0       # events queued or being handled, all subscribers
+
+    def subscribe(
+        self,
+        event_type: type[T],
+        handler: Callable[[T], Awaitable[None]],
+        *,
+        queue_size: int | None = None,
+        workers: int | None = None,
+        backpressure: Backpressure | str | None = None,
+    ) -> None:
+        """Register *handler* for *event_type* and its subclasses; keyword
+        arguments override the bus defaults for this subscription only."""
+        self._subscriptions.append(_Subscription(
+            event_type,
+            handler,
+            queue_size or self._queue_size,
+            workers or self._workers,
+            Backpressure(backpressure) if backpressure is not None else self._policy,
+        ))
+        self._table.clear()
+
+    def subscriptions_for(self, event_type: type[DomainEvent]) -> tuple[_Subscription, ...]:
+        subs = self._table.get(event_type)
+        if subs is None:
+            mro = event_type.__mro__
+            subs = self._table[event_type] = tuple(
+                s for s in self._subscriptions if s.event_type in mro
+            )
+        return subs
+
+    async def publish(self, event: DomainEvent) -> None:
+        subs = self._table.get(type(event)) or self.subscriptions_for(type(event))
+        if not subs:
+            return
+        if self._loop is not asyncio.get_running_loop():
+            self._bind_loop()
+        self._idle.clear()
+        for sub in subs:
+            queue = sub.queue
+            if queue is None:
+                queue = self._start(sub)
+            self._pending += 1          # counted before a blocking put, so drain() cannot miss it
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                if sub.policy is Backpressure.DROP_NEWEST:
+                    self._done(sub, dropped=True)
+                    continue
+                if sub.policy is Backpressure.DROP_OLDEST:
+                    queue.get_nowait()
+                    self._done(sub, dropped=True)
+                    queue.put_nowait(event)
+                else:
+                    await queue.put(event)
+            depth = queue.qsize()
+            if depth > sub.stats.high_water:
+                sub.stats.high_water = depth
+
+    def stats(self) -> dict[str, SubscriberStats]:
+        return {s.name: s.stats for s in self._subscriptions}
+
+    async def drain(self) -> None:
+        """Wait until every published event has been handled, including
+        events that handlers publish while the bus drains."""
+        while self._pending:
+            await self._idle.wait()
+
+    async def aclose(self) -> None:
+        """Drain, then stop the workers; a later publish() starts new ones."""
+        await self.drain()
+        tasks = [t for s in self._subscriptions for t in s.tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for sub in self._subscriptions:
+            sub.queue, sub.tasks = None, []
+
+    # ── workers ─────────────────────────────────────────────────────────
+
+    def _bind_loop(self) -> None:
+        # Queues and tasks belong to one loop; events still queued on a
+        # closed loop can never be handled, so they are forgotten.
+        self._loop = asyncio.get_running_loop()
+        self._idle = asyncio.Event()
+        self._pending = 0
+        for sub in self._subscriptions:
+            sub.queue, sub.tasks = None, []
+
+    def _start(self, sub: _Subscription) -> asyncio.Queue[DomainEvent]:
+        sub.queue = asyncio.Queue(maxsize=sub.queue_size)
+        sub.tasks = [
+            asyncio.create_task(self._work(sub, sub.queue), name=f"event-bus:{sub.name}")
+            for _ in range(sub.workers)
+        ]
+        return sub.queue
+
+    async def _work(self, sub: _Subscription, queue: asyncio.Queue[DomainEvent]) -> None:
+        handler, stats = sub.handler, sub.stats
+        while True:
+            event = await queue.get()
+            while True:                 # take the backlog without a wakeup per event
+                try:
+                    await handler(event)
+                    stats.delivered += 1
+                except Exception:
+                    stats.failed += 1
+                    logger.exception("event handler %s failed on %s %s", sub.name, type(event).__name__, event.event_id)
+                finally:
+                    self._done(sub)
+                try:
+                    event = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+
+    def _done(self, sub: _Subscription, dropped: bool = False) -> None:
+        if dropped:
+            sub.stats.dropped += 1
+        self._pending -= 1
+        if not self._pending:
+            self._idle.set()
@@ -0,0 +1,335 @@
+"""
+src/infrastructure/messaging/outbox.py
+========================================
+SqliteOutbox — durable domain events without a broker.
+
+An event published straight to the in-memory bus after the aggregate is
+committed is lost if the process dies in between. With the outbox the
+event is a row in the same SQLite transaction as the aggregate, so both
+are stored or neither is:
+
+    async with outbox.transaction() as tx:
+        await tx.db.execute("INSERT INTO exams ...", row)
+        tx.add(ExamScheduled(exam_id=exam.id, ...))
+    # committed together; the relay is woken
+
+publish(event) is the same as a single autocommitted row, so SqliteOutbox
+is an EventBus and drops in wherever the in-memory bus was; subscribe()
+registers on the downstream bus (normally InMemoryEventBus). Called inside
+transaction() — say by a use case that only knows the EventBus port —
+publish() adds the event to the open transaction instead (a context
+variable tracks it), so it commits or rolls back with the aggregate. A
+transaction() inside another one of the same outbox raises RuntimeError:
+the connection has one transaction at a time.
+
+    event_outbox(seq, event_id, event_type, payload)   pending, in seq order
+    event_outbox_dead(...)                             rows that no longer decode
+    event_inbox(consumer, event_id, processed_at)      see idempotent()
+
+Payloads are EventCodec bytes (codec.py), ~80 bytes an event.
+
+The relay starts with the first publish in the running loop; a process
+built with relay=False only writes, and another one (or an explicit
+drain()) delivers.
+It reads up to `batch_size` rows, publishes them downstream, waits for the
+downstream bus to drain, and only then deletes them. A crash before that
+delete delivers the batch again: delivery is at-least-once, and
+redelivered events keep their event_id. Wrap handlers with side effects
+in idempotent(consumer, handler); it skips event_ids the consumer has
+already handled. A handler that raises is not retried — the downstream
+bus logs and counts it.
+
+Between wakeups the relay polls every `poll_interval` seconds, which also
+picks up rows left by a process that died. One relay per database file is
+the intended setup; a second one only causes duplicates, which
+idempotent() absorbs.
+
+The database runs in WAL mode with synchronous=NORMAL: a committed event
+survives the process dying, though not necessarily a power cut.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, TypeVar
+
+from src.infrastructure.messaging.codec import EventCodec, EventCodecError
+from src.shared_kernel.domain.events import DomainEvent
+from src.shared_kernel.ports.event_bus import EventBus
+
+if TYPE_CHECKING:
+    import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=DomainEvent)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS event_outbox (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id   BLOB    NOT NULL UNIQUE,
+    event_type TEXT    NOT NULL,
+    payload    BLOB    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS event_outbox_dead (
+    seq        INTEGER PRIMARY KEY,
+    event_id   BLOB    NOT NULL,
+    event_type TEXT    NOT NULL,
+    payload    BLOB    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS event_inbox (
+    consumer     TEXT NOT NULL,
+    event_id     BLOB NOT NULL,
+    processed_at REAL NOT NULL,
+    PRIMARY KEY (consumer, event_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS event_inbox_age ON event_inbox (processed_at);
+"""
+# the same event twice (a retried producer transaction) is stored once
+_INSERT = "INSERT OR IGNORE INTO event_outbox (event_id, event_type, payload) VALUES (?, ?, ?)"
+_BATCH = "SELECT seq, event_type, payload FROM event_outbox ORDER BY seq LIMIT ?"
+
+# the transaction() the current task runs in, per outbox
+_open_transactions: ContextVar[dict["SqliteOutbox", "OutboxTransaction"]] = ContextVar("outbox_transactions")
+
+
+@dataclass
+class OutboxStats:
+    written: int = 0            # events committed to the outbox
+    relayed: int = 0            # events handed to the downstream bus
+    batches: int = 0
+    dead: int = 0               # rows moved to event_outbox_dead
+    duplicates: int = 0         # skipped by idempotent()
+    relay_seconds: float = 0.0  # time spent relaying, downstream handlers included
+    last_batch_size: int = 0
+    last_batch_seconds: float = 0.0
+
+    @property
+    def events_per_second(self) -> float:
+        return self.relayed / self.relay_seconds if self.relay_seconds else 0.0
+
+
+class OutboxTransaction:
+    """The open transaction: run the aggregate's SQL on `db`, add() its events."""
+
+    def __init__(self, db: "aiosqlite.Connection", codec: EventCodec) -> None:
+        self.db = db
+        self._codec = codec
+        self.rows: list[tuple[bytes, str, bytes]] = []
+        self.open = True
+
+    def add(self, event: DomainEvent) -> None:
+        self.rows.append((event.event_id.bytes, self._codec.type_name(type(event)), self._codec.encode(event)))
+
+
+class SqliteOutbox:
+    def __init__(
+        self,
+        path: str | Path,
+        bus: EventBus,
+        codec: EventCodec | None = None,
+        batch_size: int = 500,
+        poll_interval: float = 1.0,
+        inbox_retention: float = 7 * 24 * 3600.0,
+        relay: bool = True,
+    ) -> None:
+        self._path = Path(path)
+        self._bus = bus
+        self._codec = codec or EventCodec()
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._inbox_retention = inbox_retention
+        self._auto_relay = relay
+        self.stats = OutboxStats()
+        self._opening: asyncio.Future[aiosqlite.Connection] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._write_lock: asyncio.Lock | None = None     # one transaction at a time on the connection
+        self._relay_lock: asyncio.Lock | None = None     # one batch in flight
+        self._wakeup: asyncio.Event | None = None
+        self._relay: asyncio.Task | None = None
+
+    # ── writing ─────────────────────────────────────────────────────────
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[OutboxTransaction]:
+        if self._open_transaction() is not None:
+            raise RuntimeError("already inside a transaction() of this outbox")
+        db = await self._connect()
+        async with self._write_lock:
+            await db.execute("BEGIN IMMEDIATE")
+            tx = OutboxTransaction(db, self._codec)
+            token = _open_transactions.set({**_open_transactions.get({}), self: tx})
+            try:
+                yield tx
+                if tx.rows:
+                    await db.executemany(_INSERT, tx.rows)
+                await db.execute("COMMIT")
+            except BaseException:
+                await db.execute("ROLLBACK")
+                raise
+            finally:
+                tx.open = False
+                _open_transactions.reset(token)
+        if tx.rows:
+            self.stats.written += len(tx.rows)
+            self._wake()
+
+    # ── EventBus ────────────────────────────────────────────────────────
+
+    async def publish(self, event: DomainEvent) -> None:
+        tx = self._open_transaction()
+        if tx is not None:
+            tx.add(event)                           # commits with the transaction
+            return
+        row = (event.event_id.bytes, self._codec.type_name(type(event)), self._codec.encode(event))
+        db = await self._connect()
+        async with self._write_lock:
+            await db.execute(_INSERT, row)          # autocommit: one statement, one round trip
+        self.stats.written += 1
+        self._wake()
+
+    def _open_transaction(self) -> OutboxTransaction | None:
+        tx = _open_transactions.get({}).get(self)
+        return tx if tx is not None and tx.open else None
+
+    def subscribe(self, event_type: type[T], handler: Callable[[T], Awaitable[None]], **options) -> None:
+        """Subscribe on the downstream bus; *options* go to it unchanged."""
+        self._bus.subscribe(event_type, handler, **options)
+
+    def idempotent(self, consumer: str, handler: Callable[[T], Awaitable[None]]) -> Callable[[T], Awaitable[None]]:
+        """*handler*, skipping events *consumer* has already handled.
+
+        The event_id is recorded after the handler returns, so a crash in
+        between still repeats it — keep the handler's own effects idempotent
+        where that matters.
+        """
+        async def once(event: T) -> None:
+            db = await self._connect()
+            key = event.event_id.bytes
+            async with db.execute(
+                "SELECT 1 FROM event_inbox WHERE consumer = ? AND event_id = ?", (consumer, key),
+            ) as cursor:
+                if await cursor.fetchone() is not None:
+                    self.stats.duplicates += 1
+                    return
+            await handler(event)
+            async with self._write_lock:
+                await db.execute(
+                    "INSERT OR IGNORE INTO event_inbox VALUES (?, ?, ?)", (consumer, key, time.time()),
+                )
+
+        once.__qualname__ = getattr(handler, "__qualname__", consumer)
+        return once
+
+    # ── relay ───────────────────────────────────────────────────────────
+
+    async def relay_once(self) -> int:
+        """Deliver one batch downstream and delete it; the number of rows taken."""
+        db = await self._connect()
+        async with self._relay_lock:
+            rows = await db.execute_fetchall(_BATCH, (self._batch_size,))
+            if not rows:
+                return 0
+            started = time.perf_counter()
+            dead: list[int] = []
+            for seq, event_type, payload in rows:
+                try:
+                    event = self._codec.decode(event_type, payload)
+                except EventCodecError as exc:
+                    logger.error("outbox row %d moved to event_outbox_dead: %s", seq, exc)
+                    dead.append(seq)
+                    continue
+                await self._bus.publish(event)
+            drain = getattr(self._bus, "drain", None)
+            if drain is not None:
+                await drain()                       # handled before it is forgotten
+
+            async with self._write_lock:
+                await db.execute("BEGIN IMMEDIATE")
+                try:
+                    if dead:
+                        marks = ",".join("?" * len(dead))
+                        await db.execute(f"INSERT OR IGNORE INTO event_outbox_dead SELECT * FROM event_outbox WHERE seq IN ({marks})", dead)
+                    await db.execute("DELETE FROM event_outbox WHERE seq <= ?", (rows[-1][0],))
+                    await db.execute("DELETE FROM event_inbox WHERE processed_at < ?", (time.time() - self._inbox_retention,))
+                    await db.execute("COMMIT")
+                except BaseException:
+                    await db.execute("ROLLBACK")
+                    raise
+
+            elapsed = time.perf_counter() - started
+            s = self.stats
+            s.relayed += len(rows) - len(dead)
+            s.dead += len(dead)
+            s.batches += 1
+            s.relay_seconds += elapsed
+            s.last_batch_size, s.last_batch_seconds = len(rows), elapsed
+            return len(rows)
+
+    async def pending(self) -> int:
+        db = await self._connect()
+        [(count,)] = await db.execute_fetchall("SELECT count(*) FROM event_outbox")
+        return count
+
+    async def drain(self) -> None:
+        """Relay until the outbox is empty and the downstream bus idle."""
+        while await self.relay_once():
+            pass
+
+    async def aclose(self) -> None:
+        """Stop the relay and close the database; pending rows stay for the next start."""
+        relay, self._relay = self._relay, None
+        if relay is not None:
+            relay.cancel()
+            await asyncio.gather(relay, return_exceptions=True)
+        opening, self._opening, self._loop = self._opening, None, None
+        if opening is not None:
+            await (await opening).close()
+
+    def _wake(self) -> None:
+        if not self._auto_relay:
+            return
+        if self._relay is None or self._relay.done():
+            self._relay = asyncio.create_task(self._run_relay(), name="outbox-relay")
+        self._wakeup.set()
+
+    async def _run_relay(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                taken = await self.relay_once()
+            except Exception:
+                logger.exception("outbox relay batch failed; retrying in %.1fs", self._poll_interval)
+                taken = 0
+            if taken < self._batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+                except TimeoutError:
+                    pass
+
+    # ── connection ──────────────────────────────────────────────────────
+
+    async def _connect(self) -> "aiosqlite.Connection":
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # locks, the relay and the connection's futures belong to one loop
+            self._loop = loop
+            self._write_lock, self._relay_lock, self._wakeup = asyncio.Lock(), asyncio.Lock(), asyncio.Event()
+            self._relay = None
+            self._opening = asyncio.ensure_future(self._open())
+        return await self._opening
+
+    async def _open(self) -> "aiosqlite.Connection":
+        import aiosqlite
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        db = await aiosqlite.connect(self._path, isolation_level=None)
+        await db.execute("PRAGMA journal_mode=WAL")
+        await db.execute("PRAGMA synchronous=NORMAL")
+        await db.executescript(_SCHEMA)
+        return db
@@ -0,0 +1,265 @@
+"""
+src/infrastructure/messaging/unix_socket_bus.py
+=================================================
+UnixSocketEventBus — domain events between local processes, no broker.
+
+The scrape job, the scheduler and every API worker are separate processes;
+TimetableScraped published by the job must reach the API workers so they
+swap their read models. Each process's bus listens on its own socket in a
+shared directory and connects to every other socket it finds there:
+
+    <socket_dir>/jobs-4120.sock    ◀──▶   <socket_dir>/api-4188.sock
+                        ▲                      ▲
+                        └──▶ api-4189.sock ◀───┘
+
+publish(event) hands the event to the local bus (normally InMemoryEventBus,
+so local subscribers behave as before) and appends it to every peer's
+outgoing queue — it never waits for a peer. A writer task per peer sends
+whatever is queued in one write. Events received from a peer go to the
+local bus only, never on to other peers, so nothing loops.
+
+Framing, little-endian:
+
+    u32 length   u8 kind   body (length bytes)
+    kind 1  DEFINE  u16 type id, "module:QualName"     once per type per connection
+    kind 2  EVENT   u16 type id, EventCodec payload
+
+A connection announces each event type once and then refers to it by id,
+so a typical frame is about 85 bytes.
+
+Failure handling: a peer whose socket disappears, or refuses connections
+because its process died, is forgotten (a refused socket file is removed).
+Other connection errors are retried with exponential backoff and the
+unsent frames stay queued. Each peer queue holds `queue_size` events; past
+that the oldest are dropped and counted, so a stuck peer costs bounded
+memory. Peers are rediscovered every `discovery_interval` seconds, so a
+restarted API worker is picked up without anyone restarting.
+
+A process that only subscribes must call `await bus.start()` at startup so
+its socket exists; publishing starts the bus too. Unix socket paths are
+limited to ~100 bytes, so keep socket_dir short.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import struct
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, TypeVar
+
+from src.infrastructure.messaging.codec import EventCodec, EventCodecError
+from src.shared_kernel.domain.events import DomainEvent
+from src.shared_kernel.ports.event_bus import EventBus
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=DomainEvent)
+
+_HEADER = struct.Struct("<IB")
+_TYPE_ID = struct.Struct("<H")
+_DEFINE = 1
+_EVENT = 2
+_MAX_FRAME = 16 * 1024 * 1024
+_MIN_BACKOFF = 0.05
+_MAX_BACKOFF = 2.0
+
+
+@dataclass
+class SocketBusStats:
+    sent: int = 0               # events written to peers
+    received: int = 0           # events read from peers
+    dropped: int = 0            # discarded from a full peer queue
+    connects: int = 0
+    decode_errors: int = 0
+
+
+def _frame(kind: int, type_id: int, data: bytes) -> bytes:
+    body = _TYPE_ID.pack(type_id) + data
+    return _HEADER.pack(len(body), kind) + body
+
+
+class _Peer:
+    __slots__ = ("path", "frames", "ready", "task")
+
+    def __init__(self, path: Path, queue_size: int) -> None:
+        self.path = path
+        self.frames: deque[tuple[str, bytes]] = deque(maxlen=queue_size)
+        self.ready = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+
+class UnixSocketEventBus:
+    def __init__(
+        self,
+        socket_dir: str | Path,
+        local: EventBus,
+        name: str = "proc",
+        codec: EventCodec | None = None,
+        queue_size: int = 10_000,
+        discovery_interval: float = 1.0,
+    ) -> None:
+        self._dir = Path(socket_dir)
+        self._local = local
+        self._path = self._dir / f"{name}-{os.getpid()}.sock"
+        self._codec = codec or EventCodec()
+        self._queue_size = queue_size
+        self._discovery_interval = discovery_interval
+        self.stats = SocketBusStats()
+        self._peers: dict[Path, _Peer] = {}
+        self._server: asyncio.AbstractServer | None = None
+        self._discovery: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def peers(self) -> list[Path]:
+        return sorted(self._peers)
+
+    # ── EventBus ────────────────────────────────────────────────────────
+
+    async def publish(self, event: DomainEvent) -> None:
+        if self._loop is not asyncio.get_running_loop():
+            await self.start()
+        if self._peers:
+            frame = (self._codec.type_name(type(event)), self._codec.encode(event))
+            for peer in self._peers.values():
+                if len(peer.frames) == self._queue_size:
+                    self.stats.dropped += 1           # deque(maxlen) drops the oldest
+                peer.frames.append(frame)
+                peer.ready.set()
+        await self._local.publish(event)
+
+    def subscribe(self, event_type: type[T], handler: Callable[[T], Awaitable[None]], **options) -> None:
+        """Subscribe on the local bus; events from peers arrive there too."""
+        self._local.subscribe(event_type, handler, **options)
+
+    async def drain(self) -> None:
+        drain = getattr(self._local, "drain", None)
+        if drain is not None:
+            await drain()
+
+    # ── lifecycle ───────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Listen on this process's socket and connect to the peers present."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop, self._peers = loop, {}
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._path.unlink(missing_ok=True)          # left by an earlier process with our pid
+        self._server = await asyncio.start_unix_server(self._serve, path=str(self._path))
+        self._discover()
+        self._discovery = asyncio.create_task(self._rediscover(), name="socket-bus-discovery")
+
+    async def aclose(self) -> None:
+        """Stop listening and sending; queued frames for peers are discarded."""
+        tasks = [p.task for p in self._peers.values() if p.task is not None]
+        if self._discovery is not None:
+            tasks.append(self._discovery)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            self._server.close_clients()            # peers keep their connections open
+            await self._server.wait_closed()
+        self._path.unlink(missing_ok=True)
+        self._server, self._discovery, self._loop, self._peers = None, None, None, {}
+
+    # ── peers ───────────────────────────────────────────────────────────
+
+    def _discover(self) -> None:
+        for path in self._dir.glob("*.sock"):
+            if path != self._path and path not in self._peers:
+                peer = self._peers[path] = _Peer(path, self._queue_size)
+                peer.task = asyncio.create_task(self._send_to(peer), name=f"socket-bus:{path.name}")
+
+    async def _rediscover(self) -> None:
+        while True:
+            await asyncio.sleep(self._discovery_interval)
+            self._discover()
+
+    async def _send_to(self, peer: _Peer) -> None:
+        delay = _MIN_BACKOFF
+        while True:
+            try:
+                _, writer = await asyncio.open_unix_connection(str(peer.path))
+            except (FileNotFoundError, ConnectionRefusedError) as exc:
+                if isinstance(exc, ConnectionRefusedError):
+                    peer.path.unlink(missing_ok=True)   # nobody listens: its process is gone
+                self._peers.pop(peer.path, None)
+                return
+            except OSError as exc:
+                logger.warning("event socket %s: %s; retrying in %.2fs", peer.path.name, exc, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _MAX_BACKOFF)
+                continue
+
+            self.stats.connects += 1
+            delay = _MIN_BACKOFF
+            type_ids: dict[str, int] = {}           # per connection: the peer's reader keeps the same table
+            batch: list[tuple[str, bytes]] = []
+            try:
+                while True:
+                    if not peer.frames:
+                        peer.ready.clear()
+                        await peer.ready.wait()
+                        continue
+                    batch = list(peer.frames)
+                    peer.frames.clear()
+                    out = bytearray()
+                    for type_name, payload in batch:
+                        type_id = type_ids.get(type_name)
+                        if type_id is None:
+                            type_id = type_ids[type_name] = len(type_ids)
+                            out += _frame(_DEFINE, type_id, type_name.encode("utf-8"))
+                        out += _frame(_EVENT, type_id, payload)
+                    writer.write(out)
+                    await writer.drain()
+                    self.stats.sent += len(batch)
+                    batch = []
+            except (ConnectionError, OSError) as exc:
+                logger.info("event socket %s lost: %s", peer.path.name, exc)
+                overflow = len(peer.frames) + len(batch) - self._queue_size
+                if overflow > 0:
+                    self.stats.dropped += overflow          # extendleft drops the newest
+                peer.frames.extendleft(reversed(batch))    # resend on the next connection
+                await asyncio.sleep(delay)
+            finally:
+                writer.close()
+
+    # ── receiving ───────────────────────────────────────────────────────
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        types: dict[int, str] = {}
+        try:
+            while True:
+                length, kind = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+                if length > _MAX_FRAME or length < _TYPE_ID.size:
+                    logger.error("event socket: bad frame length %d, closing connection", length)
+                    return
+                body = await reader.readexactly(length)
+                (type_id,) = _TYPE_ID.unpack_from(body)
+                if kind == _DEFINE:
+                    types[type_id] = body[_TYPE_ID.size:].decode("utf-8")
+                    continue
+                if kind != _EVENT:
+                    continue                          # a newer peer's frame kind
+                try:
+                    event = self._codec.decode(types[type_id], memoryview(body)[_TYPE_ID.size:])
+                except (KeyError, EventCodecError) as exc:
+                    self.stats.decode_errors += 1
+                    logger.warning("event socket: dropping undecodable event: %s", exc)
+                    continue
+                self.stats.received += 1
+                await self._local.publish(event)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
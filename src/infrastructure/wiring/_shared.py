@@ -4,28 +4,85 @@ src/infrastructure/wiring/_shared.py
 Shared infrastructure: singletons used by all contexts.
 
 Implementation checklist (fill in as you build each piece):
-  [ ] SystemClock
-  [ ] InMemoryEventBus → swap for RedisEventBus in production
+  [x] SystemClock
+  [x] InMemoryEventBus (concurrent, bounded per-subscriber queues)
+  [x] SqliteOutbox in front of it when EVENT_OUTBOX_PATH is set
+  [x] UnixSocketEventBus fan-out between processes when EVENT_SOCKET_DIR is set
   [ ] SQLAlchemy async engine + session factory
-  [ ] httpx.AsyncClient with connection pool
+  [x] httpx.AsyncClient with connection pool (HttpClientFactory, lazy)
 """
 from __future__ import annotations
 
 from dataclasses import dataclass
 
+from src.infrastructure.clock import SystemClock
 from src.infrastructure.config.settings import Settings
+from src.infrastructure.http_client.factory import HttpClientFactory
+from src.infrastructure.http_client.timing import HttpMetrics
+from src.infrastructure.messaging.in_memory_bus import InMemoryEventBus
+from src.infrastructure.messaging.outbox import SqliteOutbox
+from src.infrastructure.messaging.unix_socket_bus import UnixSocketEventBus
+from src.shared_kernel.ports.event_bus import EventBus
+from src.shared_kernel.ports.system import Clock
 
 
 @dataclass
 class SharedInfrastructure:
     """
-    event_bus:           InMemoryEventBus | RedisEventBus
+    event_bus:           InMemoryEventBus — handlers run on their own
+                         queues; processes that exit call drain() first.
+                         With an outbox path: SqliteOutbox relaying to it
+    event_socket:        UnixSocketEventBus between event_bus and the local
+                         bus when a socket dir is set, else None. Processes
+                         that only subscribe `await event_socket.start()`
     clock:               SystemClock
     db_session_factory:  SQLAlchemy async session factory
-    http_client:         httpx.AsyncClient (shared, connection-pooled)
+    http:                HttpClientFactory — per-adapter httpx.AsyncClients
+                         over one shared, connection-pooled transport
+    http_metrics:        HttpMetrics fed by every outbound request
+
+    Built for every process, so keep it cheap: anything that imports a
+    heavy library belongs in the context container that needs it.
     """
-    pass  # fields added as implemented
+    clock: Clock
+    event_bus: EventBus
+    http: HttpClientFactory
+    http_metrics: HttpMetrics
+    event_socket: UnixSocketEventBus | None = None  # further fields added as implemented
 
 
 def build_shared(settings: Settings) -> SharedInfrastructure:
-    return SharedInfrastructure()
+    http_metrics = HttpMetrics()
+    events = settings.events
+    event_bus: EventBus = InMemoryEventBus(
+        queue_size=events.queue_size,
+        workers=events.workers,
+        backpressure=events.backpressure,
+    )
+    event_socket = None
+    if events.socket_dir:
+        event_bus = event_socket = UnixSocketEventBus(
+            events.socket_dir,
+            event_bus,
+            name=events.socket_name,
+            queue_size=events.socket_queue_size,
+        )
+    if events.outbox_path:
+        event_bus = SqliteOutbox(
+            events.outbox_path,
+            event_bus,
+            batch_size=events.outbox_batch_size,
+            poll_interval=events.outbox_poll_seconds,
+            relay=events.outbox_relay,
+        )
+    return SharedInfrastructure(
+        clock=SystemClock(),
+        event_bus=event_bus,
+        http=HttpClientFactory(
+            settings.http,
+            hooks=[http_metrics],
+            cache_ttls={settings.cafeteria.api_url: settings.cafeteria.cache_ttl_hours * 3600.0},
+        ),
+        http_metrics=http_metrics,
+        event_socket=event_socket,
+    )
@@ -8,40 +8,196 @@ No other wiring file needs to change when this context is implemented.
 Zero merge conflicts with other context teams.
 
 Implementation checklist:
-  [ ] Instantiate outbound adapters (DB repos, HTTP clients, notification adapters)
-  [ ] Inject into use-case constructors via their outbound port Protocols
-  [ ] Return populated TimetableContainer
+  [~] Instantiate outbound adapters (DB repos, HTTP clients, notification adapters)
+  [x] Inject into use-case constructors via their outbound port Protocols
+  [x] Return populated TimetableContainer
+
+Read side:
+  snapshots       — the scrape owner's TimetableSnapshotPublisher. Warm-
+                    started from the persisted snapshot file, refreshed on
+                    TimetableScraped from the shared event bus, and rewrites
+                    that file after every refresh. None in API workers
+                    (TIMETABLE_SCRAPE_OWNER=false): their repository is never
+                    written, so a refresh there would publish an empty
+                    timetable over the owner's file.
+  repo            — in memory, so the owner seeds it from the snapshot it
+                    warm-started on first access: the first scrape after a
+                    restart diffs against what is being served, and a
+                    department that fails in it keeps its entries.
+  shared_snapshot — a read-only handle on the same file; what workers serve.
+                    In a worker it remaps on the owner's
+                    TimetableSnapshotPublished, between its periodic checks.
+
+Scrape side (scrape owner only):
+  scrape_job      — TimetableScrapeJob over ScrapeTimetableUseCase: the
+                    department printer on the shared "timetable" httpx
+                    client behind AdaptiveFetchController, the parse
+                    executor, the raw page store, and `repo` — the one the
+                    publisher reads. Built on first access: its adapters
+                    import httpx and bs4, which a read-only command or an
+                    API worker never needs. The department registry is
+                    kept in TIMETABLE_REGISTRY_PATH across restarts; the
+                    page fingerprints deliberately are not — the repository
+                    is re-seeded from the snapshot, which can lag the last
+                    fingerprints written, so the first scrape after a
+                    restart fetches every live page unconditionally.
+  schedule        — one ScheduledJob per degree shard that has a cron in
+                    SchedulerSettings.timetable_shard_crons, or a single
+                    job over the explicit start_id..end_id range on
+                    timetable_scrape_cron when none has. The process's
+                    scheduler registers them; a job builds scrape_job on
+                    its first run.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import timedelta
+from functools import cached_property, partial
+from typing import TYPE_CHECKING, Awaitable, Callable
 
-from src.infrastructure.config.settings import Settings
+from src.contexts.timetable.adapters.outbound.db.department_registry import FileDepartmentRegistryStore
+from src.contexts.timetable.adapters.outbound.db.in_memory import (
+    InMemoryDepartmentRegistryStore,
+    InMemoryFingerprintStore,
+    InMemoryTimetableRepository,
+)
+from src.contexts.timetable.adapters.outbound.db.mapped_snapshot import (
+    MappedSnapshotExporter,
+    MappedSnapshotReader,
+    load_snapshot,
+)
+from src.contexts.timetable.application.ports.outbound import DepartmentRegistryStore, TimetableRepository
+from src.contexts.timetable.application.read_models.snapshot import TimetableSnapshotPublisher
+from src.contexts.timetable.domain.entities import DepartmentRegistry
+from src.contexts.timetable.domain.events import TimetableScraped
+from src.contexts.timetable.domain.value_objects import DegreeLevel
+from src.infrastructure.config.settings import Settings, TimetableSettings
 from src.infrastructure.wiring._shared import SharedInfrastructure
 
+if TYPE_CHECKING:
+    from src.contexts.timetable.adapters.inbound.jobs.scrape_timetable import TimetableScrapeJob
+
+
+@dataclass(frozen=True)
+class ScheduledJob:
+    name: str
+    cron: str
+    run: Callable[[], Awaitable[TimetableScraped]]
+
 
 @dataclass
 class TimetableContainer:
     """
     Holds wired use-case instances for the Timetable context.
     Members added here as use cases are implemented.
-
-    Example (fill in when implementing):
-        create_assignment: CreateAssignmentUseCase
-        list_assignments:  ListAssignmentsUseCase
-        check_deadlines:   CheckDeadlinesUseCase
     """
-    pass
+    repo: TimetableRepository
+    snapshots: TimetableSnapshotPublisher | None
+    shared_snapshot: MappedSnapshotReader | None
+    build_scrape_job: Callable[[], TimetableScrapeJob] | None = field(default=None, repr=False)
+    schedule: list[ScheduledJob] = field(default_factory=list)
+
+    @cached_property
+    def scrape_job(self) -> TimetableScrapeJob:
+        if self.build_scrape_job is None:
+            raise RuntimeError("this process does not own the timetable scrape (TIMETABLE_SCRAPE_OWNER)")
+        return self.build_scrape_job()
 
 
 def build_timetable(settings: Settings, shared: SharedInfrastructure) -> TimetableContainer:
-    """
-    Wire all adapters and use cases for the Timetable bounded context.
+    """Wire all adapters and use cases for the Timetable bounded context."""
+    cfg = settings.timetable
+    path = cfg.mapped_snapshot_path
+    snapshots = None
+    repo = InMemoryTimetableRepository(
+        seed=(lambda: snapshots.current.rows.entries_by_department()) if cfg.scrape_owner else None,
+    )
+    if cfg.scrape_owner:
+        snapshots = TimetableSnapshotPublisher(
+            repo,
+            shared.clock,
+            warm_start=(lambda: load_snapshot(path)) if path else None,
+            break_tolerance=cfg.lesson_break_tolerance_minutes,
+        )
+        snapshots.register(shared.event_bus)
+        if path:
+            snapshots.add_listener(MappedSnapshotExporter(path).on_snapshot)
+    reader = None
+    if path:
+        reader = MappedSnapshotReader(path, check_interval=cfg.mapped_snapshot_check_seconds)
+        if not cfg.scrape_owner:
+            reader.register(shared.event_bus)
 
-    Example implementation (uncomment as you build):
-        repo = SqlTimetableRepository(shared.db_session_factory)
-        notifier = TelegramNotificationAdapter(settings.notifications)
-        use_case = CreateTimetableUseCase(repo=repo, notifier=notifier, clock=shared.clock)
-        return TimetableContainer(create_timetable=use_case)
-    """
-    return TimetableContainer()
+    container = TimetableContainer(
+        repo=repo,
+        snapshots=snapshots,
+        shared_snapshot=reader,
+        build_scrape_job=(lambda: _build_scrape_job(settings, shared, repo)) if cfg.scrape_owner else None,
+    )
+    if cfg.scrape_owner:
+        container.schedule = _scrape_schedule(settings, container)
+    return container
+
+
+def _scrape_schedule(settings: Settings, container: TimetableContainer) -> list[ScheduledJob]:
+    crons = settings.scheduler.timetable_shard_crons
+    shards = [key for key in settings.timetable.degree_levels if key in crons]
+    if not shards:
+        return [ScheduledJob("timetable-scrape", settings.scheduler.timetable_scrape_cron, partial(_scrape, container))]
+    return [
+        ScheduledJob(f"timetable-scrape-{key}", crons[key], partial(_scrape, container, DegreeLevel.from_key(key)))
+        for key in shards
+    ]
+
+
+async def _scrape(container: TimetableContainer, shard: DegreeLevel | None = None) -> TimetableScraped:
+    return await container.scrape_job.run(shard)
+
+
+def _build_scrape_job(settings: Settings, shared: SharedInfrastructure, repo: TimetableRepository) -> TimetableScrapeJob:
+    from src.contexts.timetable.adapters.inbound.jobs.scrape_timetable import TimetableScrapeJob
+    from src.contexts.timetable.adapters.outbound.db.page_snapshots import FileSystemPageSnapshotStore
+    from src.contexts.timetable.adapters.outbound.http.department_printer import ManasDepartmentPrinterClient
+    from src.contexts.timetable.adapters.outbound.http.fetch_controller import (
+        AdaptiveFetchController,
+        AimdLimiter,
+        RetryPolicy,
+    )
+    from src.contexts.timetable.adapters.outbound.http.parse_executor import build_parse_executor
+    from src.contexts.timetable.application.use_cases.scrape_timetable import ScrapeTimetableUseCase
+
+    cfg = settings.timetable
+    # conditional GETs come from the stored fingerprints, so the HTTP cache stays out of the way
+    client = shared.http.client("timetable", timeout=cfg.timeout, cache=False)
+    source = AdaptiveFetchController(
+        ManasDepartmentPrinterClient(client, cfg.base_url),
+        AimdLimiter(
+            initial=cfg.concurrency,
+            minimum=cfg.min_concurrency,
+            maximum=cfg.concurrency,
+            target_latency=cfg.target_latency_seconds,
+        ),
+        RetryPolicy(max_retries=cfg.max_retries, base_delay=cfg.retry_base_delay, max_delay=cfg.retry_max_delay),
+    )
+    use_case = ScrapeTimetableUseCase(
+        source=source,
+        parser=build_parse_executor(cfg.parse_workers),
+        repo=repo,
+        fingerprints=InMemoryFingerprintStore(),
+        bus=shared.event_bus,
+        clock=shared.clock,
+        registry=_registry_store(cfg),
+        snapshots=FileSystemPageSnapshotStore(cfg.snapshot_dir) if cfg.snapshot_dir else None,
+        fetch_workers=cfg.concurrency,                  # the limiter decides how many are in flight
+        parse_workers=max(1, cfg.parse_workers),        # one per parse process keeps the pool busy
+        queue_size=cfg.pipeline_queue_size,
+        batch_size=cfg.persist_batch_size,
+    )
+    return TimetableScrapeJob(use_case, cfg)
+
+
+def _registry_store(cfg: TimetableSettings) -> DepartmentRegistryStore:
+    dead_after, probe_interval = cfg.dead_after_empty_scrapes, timedelta(hours=cfg.dead_probe_interval_hours)
+    if not cfg.registry_path:
+        return InMemoryDepartmentRegistryStore(DepartmentRegistry(dead_after=dead_after, probe_interval=probe_interval))
+    return FileDepartmentRegistryStore(cfg.registry_path, dead_after=dead_after, probe_interval=probe_interval)
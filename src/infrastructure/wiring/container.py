@@ -19,61 +19,92 @@ Why: At 5+ developers, a single 2000-line container.py becomes a merge
 conflict machine. Each developer owns one _<context>.py file. This file
 just assembles the result. No merge conflicts on feature work.
 
+Lazy contexts: a context's wiring module is imported and its container
+built on first attribute access, then cached on the instance. A timetable
+CLI command or a single cron job pays for the timetable context only —
+never for the documents context's LLM and storage adapters.
+
+    platform = build_platform()
+    platform.timetable.snapshots        # imports and wires _timetable.py now
+    platform.built()                    # → ("timetable",)
+
 Rules:
-  1. This file only imports from the _<context>.py wiring modules.
+  1. This file only imports from the _<context>.py wiring modules — by
+     name, through _LazyContext, so nothing is imported before it is used.
   2. No concrete adapter class is ever imported here directly.
   3. Tests bypass this entirely and build their own fake containers.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
+from importlib import import_module
+from typing import TYPE_CHECKING, Generic, TypeVar
 
 from src.infrastructure.config.settings import Settings
 from src.infrastructure.wiring._shared import SharedInfrastructure, build_shared
-from src.infrastructure.wiring._identity import IdentityContainer, build_identity
-from src.infrastructure.wiring._timetable import TimetableContainer, build_timetable
-from src.infrastructure.wiring._credits import CreditsContainer, build_credits
-from src.infrastructure.wiring._assignments import AssignmentsContainer, build_assignments
-from src.infrastructure.wiring._exams import ExamsContainer, build_exams
-from src.infrastructure.wiring._documents import DocumentsContainer, build_documents
-from src.infrastructure.wiring._grades import GradesContainer, build_grades
-from src.infrastructure.wiring._attendance import AttendanceContainer, build_attendance
-from src.infrastructure.wiring._cafeteria import CafeteriaContainer, build_cafeteria
-
-
-@dataclass
+
+if TYPE_CHECKING:
+    from src.infrastructure.wiring._assignments import AssignmentsContainer
+    from src.infrastructure.wiring._attendance import AttendanceContainer
+    from src.infrastructure.wiring._cafeteria import CafeteriaContainer
+    from src.infrastructure.wiring._credits import CreditsContainer
+    from src.infrastructure.wiring._documents import DocumentsContainer
+    from src.infrastructure.wiring._exams import ExamsContainer
+    from src.infrastructure.wiring._grades import GradesContainer
+    from src.infrastructure.wiring._identity import IdentityContainer
+    from src.infrastructure.wiring._timetable import TimetableContainer
+
+C = TypeVar("C")
+
+
+class _LazyContext(Generic[C]):
+    """Builds `build_<name>(settings, shared)` from `_<name>.py` on first access."""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+    def __get__(self, platform: "PlatformContainer | None", owner: type | None = None) -> C:
+        if platform is None:
+            return self  # type: ignore[return-value]
+        module = import_module(f"src.infrastructure.wiring._{self._name}")
+        container = getattr(module, f"build_{self._name}")(platform.settings, platform.shared)
+        platform.__dict__[self._name] = container   # later reads skip the descriptor
+        return container
+
+
 class PlatformContainer:
     """Single root object. Injected into FastAPI lifespan + CLI entry points."""
-    settings: Settings
-    shared: SharedInfrastructure
-    identity: IdentityContainer
-    timetable: TimetableContainer
-    credits: CreditsContainer
-    assignments: AssignmentsContainer
-    exams: ExamsContainer
-    documents: DocumentsContainer
-    grades: GradesContainer
-    attendance: AttendanceContainer
-    cafeteria: CafeteriaContainer
+
+    identity: _LazyContext[IdentityContainer] = _LazyContext()
+    timetable: _LazyContext[TimetableContainer] = _LazyContext()
+    credits: _LazyContext[CreditsContainer] = _LazyContext()
+    assignments: _LazyContext[AssignmentsContainer] = _LazyContext()
+    exams: _LazyContext[ExamsContainer] = _LazyContext()
+    documents: _LazyContext[DocumentsContainer] = _LazyContext()
+    grades: _LazyContext[GradesContainer] = _LazyContext()
+    attendance: _LazyContext[AttendanceContainer] = _LazyContext()
+    cafeteria: _LazyContext[CafeteriaContainer] = _LazyContext()
+
+    def __init__(self, settings: Settings, shared: SharedInfrastructure) -> None:
+        self.settings = settings
+        self.shared = shared
+
+    def built(self) -> tuple[str, ...]:
+        """Names of the contexts wired so far, in access order."""
+        return tuple(name for name in vars(self) if name not in ("settings", "shared"))
+
+    def build_all(self) -> "PlatformContainer":
+        """Wire every context now — for the API process, where all are served."""
+        for name, attr in vars(type(self)).items():
+            if isinstance(attr, _LazyContext):
+                getattr(self, name)
+        return self
 
 
 def build_platform(settings: Settings | None = None) -> PlatformContainer:
-    """Single composition root call. Called once at application startup."""
+    """Single composition root call. Called once at application startup.
+
+    Cheap: contexts are wired on first access (see module docstring).
+    """
     if settings is None:
         settings = Settings.from_env()
-
-    shared = build_shared(settings)
-
-    return PlatformContainer(
-        settings=settings,
-        shared=shared,
-        identity=build_identity(settings, shared),
-        timetable=build_timetable(settings, shared),
-        credits=build_credits(settings, shared),
-        assignments=build_assignments(settings, shared),
-        exams=build_exams(settings, shared),
-        documents=build_documents(settings, shared),
-        grades=build_grades(settings, shared),
-        attendance=build_attendance(settings, shared),
-        cafeteria=build_cafeteria(settings, shared),
-    )
+    return PlatformContainer(settings=settings, shared=build_shared(settings))
@@ -0,0 +1,118 @@
+"""
+tests/contexts/timetable/integration/test_adaptive_fetch.py
+=============================================================
+AdaptiveFetchController + ManasDepartmentPrinterClient against a real local
+HTTP server with injected latency and errors.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.contexts.timetable.adapters.outbound.db.in_memory import (
+    InMemoryFingerprintStore, InMemoryTimetableRepository,
+)
+from src.contexts.timetable.adapters.outbound.http.department_printer import ManasDepartmentPrinterClient
+from src.contexts.timetable.adapters.outbound.http.fetch_controller import (
+    AdaptiveFetchController, AimdLimiter, RetryPolicy,
+)
+from src.contexts.timetable.adapters.outbound.http.parse_executor import InlineParseExecutor
+from src.contexts.timetable.application.use_cases.scrape_timetable import (
+    ScrapeTimetableCommand, ScrapeTimetableUseCase,
+)
+from src.contexts.timetable.domain.errors import ScrapeFailure
+from src.contexts.timetable.domain.value_objects import DepartmentRange
+from tests.shared.fakes.http_origin import FakeHttpOrigin
+from tests.shared.fakes.infrastructure import FakeClock, FakeEventBus
+
+_PAGE = (
+    "<table><tr><td></td><td>Pazartesi</td></tr>"
+    "<tr><td>08:00-08:45</td><td><div>UNS-301 Calculus<br>Dr. Asanov<br>B-204</div></td></tr></table>"
+)
+
+
+async def _no_sleep(_: float) -> None:
+    pass
+
+
+def _controller(http: httpx.AsyncClient, origin: FakeHttpOrigin, limiter: AimdLimiter | None = None,
+                max_retries: int = 3) -> AdaptiveFetchController:
+    return AdaptiveFetchController(
+        ManasDepartmentPrinterClient(http, f"{origin.url}/department-printer"),
+        limiter or AimdLimiter(initial=4, minimum=1, maximum=8, target_latency=1.0),
+        RetryPolicy(max_retries=max_retries),
+        sleep=_no_sleep,
+    )
+
+
+def _run(origin: FakeHttpOrigin, body):
+    async def main():
+        async with origin, httpx.AsyncClient(timeout=2.0) as http:
+            return await body(http)
+    return asyncio.run(main())
+
+
+class TestAdaptiveFetchController:
+    def test_transient_errors_are_retried(self):
+        origin = FakeHttpOrigin()
+        origin.route("/department-printer/5", body=_PAGE)
+        origin.fail("/department-printer/5", status=503, times=2)
+
+        page = _run(origin, lambda http: _controller(http, origin).fetch(5, None))
+
+        assert page.body == _PAGE
+        assert origin.hits["/department-printer/5"] == 3
+
+    def test_retry_budget_exhausted_raises(self):
+        origin = FakeHttpOrigin()
+        origin.route("/department-printer/5", body=_PAGE)
+        origin.fail("/department-printer/5", status=502, times=10)
+
+        with pytest.raises(ScrapeFailure, match="gave up after 3 attempts"):
+            _run(origin, lambda http: _controller(http, origin, max_retries=2).fetch(5, None))
+        assert origin.hits["/department-printer/5"] == 3
+
+    def test_permanent_error_is_not_retried(self):
+        origin = FakeHttpOrigin()
+
+        with pytest.raises(ScrapeFailure, match="HTTP 404"):
+            _run(origin, lambda http: _controller(http, origin).fetch(111, None))
+        assert origin.hits["/department-printer/111"] == 1
+
+    def test_in_flight_requests_respect_limit_and_shrink_when_slow(self):
+        origin = FakeHttpOrigin()
+        origin.delay(seconds=0.05)
+        for i in range(1, 31):
+            origin.route(f"/department-printer/{i}", body=_PAGE)
+        limiter = AimdLimiter(initial=6, minimum=1, maximum=6, target_latency=0.01)
+
+        async def body(http):
+            ctl = _controller(http, origin, limiter)
+            await asyncio.gather(*(ctl.fetch(i, None) for i in range(1, 31)))
+
+        _run(origin, body)
+        assert origin.max_concurrent <= 6
+        assert limiter.limit < 6
+
+    def test_use_case_reports_failed_departments(self):
+        origin = FakeHttpOrigin()
+        for i in (1, 2, 3):
+            origin.route(f"/department-printer/{i}", body=_PAGE)
+        origin.fail("/department-printer/2", status=500, times=99)
+
+        async def body(http):
+            uc = ScrapeTimetableUseCase(
+                source=_controller(http, origin, max_retries=1),
+                parser=InlineParseExecutor(),
+                repo=InMemoryTimetableRepository(),
+                fingerprints=InMemoryFingerprintStore(),
+                bus=FakeEventBus(),
+                clock=FakeClock(),
+            )
+            return await uc.execute(ScrapeTimetableCommand(DepartmentRange(1, 3)))
+
+        event = _run(origin, body)
+        assert event.failed_department_ids == (2,)
+        assert (event.fetched_count, event.changed_count, event.course_count) == (2, 2, 1)   # both pages list the same row
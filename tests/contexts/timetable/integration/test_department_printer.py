@@ -0,0 +1,49 @@
+"""
+tests/contexts/timetable/integration/test_department_printer.py
+=================================================================
+ManasDepartmentPrinterClient against an httpx.MockTransport origin.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.contexts.timetable.adapters.outbound.http.department_printer import ManasDepartmentPrinterClient
+from src.contexts.timetable.domain.errors import ScrapeFailure
+
+
+def _client(handler) -> ManasDepartmentPrinterClient:
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return ManasDepartmentPrinterClient(http, "http://timetable.test/department-printer/")
+
+
+def _etag_origin(seen: list[httpx.Request]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text="<table></table>", headers={"ETag": '"v1"'})
+    return handler
+
+
+class TestDepartmentPrinterClient:
+    def test_conditional_request_returns_not_modified(self):
+        seen: list[httpx.Request] = []
+        client = _client(_etag_origin(seen))
+
+        first = asyncio.run(client.fetch(7, None))
+        second = asyncio.run(client.fetch(7, first.fingerprint))
+
+        assert seen[0].url.path == "/department-printer/7"
+        assert "If-None-Match" not in seen[0].headers
+        assert first.fingerprint.etag == '"v1"'
+        assert first.fingerprint.content_hash
+        assert second.not_modified
+        assert second.fingerprint == first.fingerprint
+
+    def test_server_error_raises_scrape_failure(self):
+        client = _client(lambda request: httpx.Response(502))
+        with pytest.raises(ScrapeFailure):
+            asyncio.run(client.fetch(7, None))
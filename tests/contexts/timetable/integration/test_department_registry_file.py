@@ -0,0 +1,34 @@
+"""
+tests/contexts/timetable/integration/test_department_registry_file.py
+=======================================================================
+FileDepartmentRegistryStore on a temp dir.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from src.contexts.timetable.adapters.outbound.db.department_registry import FileDepartmentRegistryStore
+
+T0 = datetime(2024, 9, 1, 6, 0, tzinfo=timezone.utc)
+
+
+class TestFileDepartmentRegistryStore:
+    def test_a_new_store_remembers_what_the_last_one_saved(self, tmp_path):
+        path = tmp_path / "timetable" / "registry.json"
+        registry = asyncio.run(FileDepartmentRegistryStore(path, dead_after=1).load())
+        registry.record_alive(5, T0)
+        registry.record_empty(111, T0)
+        asyncio.run(FileDepartmentRegistryStore(path, dead_after=1).save(registry))
+
+        reloaded = asyncio.run(FileDepartmentRegistryStore(path, dead_after=1, probe_interval=timedelta(hours=1)).load())
+        assert reloaded.departments == registry.departments
+        assert reloaded.probe_interval == timedelta(hours=1)       # from the settings, not the file
+        assert reloaded.due([5, 111], T0) == [5]
+        assert list(path.parent.iterdir()) == [path]
+
+    def test_missing_or_unreadable_file_loads_empty(self, tmp_path):
+        path = tmp_path / "registry.json"
+        assert asyncio.run(FileDepartmentRegistryStore(path).load()).departments == {}
+        path.write_text('{"departments": {"5": {"empty_streak": "x"}}}')
+        assert asyncio.run(FileDepartmentRegistryStore(path).load()).departments == {}
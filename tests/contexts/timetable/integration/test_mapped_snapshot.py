@@ -0,0 +1,295 @@
+"""
+tests/contexts/timetable/integration/test_mapped_snapshot.py
+==============================================================
+The mapped snapshot file on a real filesystem: a mapped snapshot answers
+exactly like the in-process one, readers remap when the file is replaced, and
+a damaged file is refused so the publisher rebuilds instead.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+from datetime import datetime
+
+import pytest
+
+from src.contexts.timetable.adapters.outbound.db.in_memory import InMemoryTimetableRepository
+from src.contexts.timetable.adapters.outbound.db import mapped_snapshot
+from src.contexts.timetable.adapters.outbound.db.mapped_snapshot import (
+    MappedSnapshotError,
+    MappedSnapshotExporter,
+    MappedSnapshotReader,
+    load_snapshot,
+    map_snapshot,
+    write_mapped_snapshot,
+)
+from src.contexts.timetable.application.read_models.columnar_search import ColumnarSearchIndex
+from src.contexts.timetable.application.read_models.snapshot import (
+    TimetableSnapshot,
+    TimetableSnapshotPublisher,
+)
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.services import department_id_for, room_id_for
+from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot, WeekDay
+from tests.shared.fakes.infrastructure import FakeClock
+
+_TEACHERS = ["Nurlan Asanov", "Dr. İsmail Şahin", "Aigerim Tokonova", "Bakyt Ömürov"]
+_COURSES = ["Calculus", "Türk Dili", "Data Structures", "Fizik"]
+_SLOTS = ["08:00-08:45", "08:55-09:40", "10:00-11:30", "13:30-15:00", "Online"]
+
+
+def _entries(n: int, seed: int = 7) -> list[TimetableEntry]:
+    rng = random.Random(seed)
+    entries = []
+    for i in range(n):
+        room = f"B-{rng.randint(100, 120)}" if i % 9 else ""
+        entries.append(TimetableEntry.create(
+            course_code=CourseCode(f"UNS-{rng.randint(100, 130)}"),
+            course_name=rng.choice(_COURSES),
+            day=rng.choice(list(WeekDay)),
+            time_slot=TimeSlot(rng.choice(_SLOTS)),
+            room_id=room_id_for(room or f"R{i % 3}"),
+            teacher_name=rng.choice(_TEACHERS),
+            department_id=department_id_for(95 + i % 4),
+            scraped_at=datetime(2024, 9, 1 + i % 2),
+            room_name=room,
+        ))
+    return list({e.id: e for e in reversed(entries)}.values())[::-1]   # one row per ID, as list_all() reads them
+
+
+@pytest.fixture
+def snapshot() -> TimetableSnapshot:
+    return TimetableSnapshot.build(4, datetime(2024, 9, 2, 6), _entries(300))
+
+
+class TestMappedSnapshot:
+    def test_round_trips_rows(self, tmp_path, snapshot):
+        write_mapped_snapshot(tmp_path / "t.mtts", snapshot)
+        mapped = map_snapshot(tmp_path / "t.mtts")
+        assert mapped.version == 4
+        assert mapped.etag == snapshot.etag
+        assert mapped.built_at == snapshot.built_at
+        assert mapped.rows.to_entries() == snapshot.rows.to_entries()
+
+    def test_shared_rows_stay_listed_under_every_department(self, tmp_path):
+        entries = _entries(40)
+        other = department_id_for(99)
+        memberships = {e.id: {e.department_id, other} for e in entries[:5]}
+        write_mapped_snapshot(tmp_path / "t.mtts", TimetableSnapshot.build(
+            1, datetime(2024, 9, 2), entries, memberships=memberships))
+        mapped = map_snapshot(tmp_path / "t.mtts")
+        assert {r.id for r in mapped.rows.rows_for_department(other)} == \
+            {e.id for e in entries[:5]} | {e.id for e in entries if e.department_id == other}
+        own = entries[0].department_id
+        assert {r.id for r in mapped.rows.rows_for_department(own)} == {e.id for e in entries if e.department_id == own}
+
+    def test_round_trips_a_patched_snapshot(self, tmp_path):
+        entries = _entries(200)
+        department = entries[0].department_id
+        kept = [e for e in entries if e.department_id == department][3:]
+        previous = TimetableSnapshot.build(1, datetime(2024, 9, 2), entries)
+        patched = TimetableSnapshot.patch(previous, 2, datetime(2024, 9, 3), {department: kept + _entries(5, seed=8)})
+        write_mapped_snapshot(tmp_path / "t.mtts", patched)
+        mapped = map_snapshot(tmp_path / "t.mtts")
+        assert mapped.rows.to_entries() == patched.rows.to_entries()
+        assert list(mapped.blocks) == list(patched.blocks)
+        assert {r.id for r in mapped.rows.rows_for_department(department)} == \
+            {r.id for r in patched.rows.rows_for_department(department)}
+
+    def test_columns_are_views_over_the_mapping(self, tmp_path, snapshot):
+        write_mapped_snapshot(tmp_path / "t.mtts", snapshot)
+        mapped = map_snapshot(tmp_path / "t.mtts")
+        column = mapped.rows.column("teacher")
+        assert isinstance(column, memoryview) and column.readonly
+
+    @pytest.mark.parametrize("query", ["asanov", "ismail", "UNS-11", "b-1", "pazartesi", "ca", "türk dili", "fizik b", "zzz"])
+    def test_search_matches_in_process_index(self, tmp_path, snapshot, query):
+        write_mapped_snapshot(tmp_path / "t.mtts", snapshot)
+        mapped = map_snapshot(tmp_path / "t.mtts")
+        assert {e.id for e in mapped.search.search(query)} == {e.id for e in snapshot.search.search(query)}
+
+    def test_search_limit_and_suggest(self, tmp_path, snapshot):
+        write_mapped_snapshot(tmp_path / "t.mtts", snapshot)
+        mapped = map_snapshot(tmp_path / "t.mtts")
+        assert len(mapped.search.search("calculus", limit=3)) == 3
+        assert mapped.search.suggest("asa") == snapshot.search.suggest("asa")
+
+    def test_occupancy_matches_in_process_index(self, tmp_path, snapshot):
+        write_mapped_snapshot(tmp_path / "t.mtts", snapshot)
+        mapped = map_snapshot(tmp_path / "t.mtts")
+        for day in WeekDay:
+            for slot in ("08:00-08:45", "10:15-10:45", "14:00-16:00"):
+                assert mapped.occupancy.free_rooms(day, TimeSlot(slot)) == \
+                    snapshot.occupancy.free_rooms(day, TimeSlot(slot))
+        room = snapshot.rows[0].room_id
+        assert mapped.occupancy.is_free(room, snapshot.rows[0].day, snapshot.rows[0].time_slot) == \
+            snapshot.occupancy.is_free(room, snapshot.rows[0].day, snapshot.rows[0].time_slot)
+
+    def test_lesson_blocks_match_in_process_index(self, tmp_path, snapshot):
+        write_mapped_snapshot(tmp_path / "t.mtts", snapshot)
+        mapped = map_snapshot(tmp_path / "t.mtts")
+        assert mapped.blocks.break_tolerance == snapshot.blocks.break_tolerance
+        assert list(mapped.blocks) == list(snapshot.blocks)
+        assert mapped.blocks.for_day(WeekDay.MONDAY) == snapshot.blocks.for_day(WeekDay.MONDAY)
+
+    def test_fuzzy_indexes_are_built_on_first_use(self, tmp_path, snapshot):
+        write_mapped_snapshot(tmp_path / "t.mtts", snapshot)
+        mapped = map_snapshot(tmp_path / "t.mtts")
+        assert mapped._teachers is None
+        assert mapped.teachers.lookup("asanow") == snapshot.teachers.lookup("asanow")
+        assert mapped.courses.names() == snapshot.courses.names()
+
+    def test_rejects_foreign_files(self, tmp_path):
+        (tmp_path / "t.mtts").write_bytes(b"not a snapshot at all, not even close")
+        with pytest.raises(MappedSnapshotError):
+            map_snapshot(tmp_path / "t.mtts")
+
+    def test_rejects_a_corrupted_file(self, tmp_path, snapshot):
+        path = tmp_path / "t.mtts"
+        write_mapped_snapshot(path, snapshot)
+        data = bytearray(path.read_bytes())
+        data[-100] ^= 0xFF
+        path.write_bytes(bytes(data))
+        with pytest.raises(MappedSnapshotError, match="checksum"):
+            map_snapshot(path)
+        assert load_snapshot(path) is None
+
+    def test_load_snapshot_of_a_missing_or_empty_file(self, tmp_path):
+        assert load_snapshot(tmp_path / "missing.mtts") is None
+        (tmp_path / "empty.mtts").write_bytes(b"")
+        assert load_snapshot(tmp_path / "empty.mtts") is None
+
+    def test_empty_snapshot(self, tmp_path):
+        write_mapped_snapshot(tmp_path / "t.mtts", TimetableSnapshot.empty(datetime(2024, 9, 1)))
+        mapped = map_snapshot(tmp_path / "t.mtts")
+        assert len(mapped.rows) == 0
+        assert mapped.search.search("x") == []
+
+
+class TestColumnarSearchIndex:
+    def test_build_in_process(self, snapshot):
+        index = ColumnarSearchIndex.build(snapshot.rows)
+        assert {e.id for e in index.search("asanov calculus")} == \
+            {e.id for e in snapshot.search.search("asanov calculus")}
+
+
+class TestMappedSnapshotReader:
+    def test_none_until_a_file_exists(self, tmp_path):
+        assert MappedSnapshotReader(tmp_path / "t.mtts").current is None
+
+    def test_remaps_when_a_newer_version_lands(self, tmp_path):
+        now = [0.0]
+        path = tmp_path / "t.mtts"
+        reader = MappedSnapshotReader(path, check_interval=1.0, monotonic=lambda: now[0])
+        write_mapped_snapshot(path, TimetableSnapshot.build(1, datetime(2024, 9, 1), _entries(10, seed=1)))
+        first = reader.current
+        assert first.version == 1
+
+        write_mapped_snapshot(path, TimetableSnapshot.build(2, datetime(2024, 9, 2), _entries(20, seed=2)))
+        assert reader.current is first              # not checked again yet
+        now[0] = 1.0
+        second = reader.current
+        assert second.version == 2 and len(second.rows) == 20
+        assert len(first.rows) == 10                # old mapping still readable
+        assert first.rows.to_entries() == _entries(10, seed=1)
+
+    def test_remaps_a_replaced_file_with_a_lower_version(self, tmp_path):
+        now = [0.0]
+        path = tmp_path / "t.mtts"
+        reader = MappedSnapshotReader(path, check_interval=1.0, monotonic=lambda: now[0])
+        write_mapped_snapshot(path, TimetableSnapshot.build(7, datetime(2024, 9, 1), _entries(10, seed=1)))
+        assert reader.current.version == 7
+
+        # the scrape owner restarted without its data directory and numbers from 1 again
+        write_mapped_snapshot(path, TimetableSnapshot.build(1, datetime(2024, 9, 2), _entries(20, seed=2)))
+        now[0] = 1.0
+        assert (reader.current.version, len(reader.current.rows)) == (1, 20)
+
+    def test_periodic_remap_runs_off_the_event_loop(self, tmp_path, monkeypatch):
+        now = [0.0]
+        path = tmp_path / "t.mtts"
+        reader = MappedSnapshotReader(path, check_interval=1.0, monotonic=lambda: now[0])
+        write_mapped_snapshot(path, TimetableSnapshot.build(1, datetime(2024, 9, 1), _entries(10, seed=1)))
+        first = reader.current
+        threads = []
+
+        def load(p):
+            threads.append(threading.current_thread())
+            return load_snapshot(p)
+
+        monkeypatch.setattr(mapped_snapshot, "load_snapshot", load)
+        write_mapped_snapshot(path, TimetableSnapshot.build(2, datetime(2024, 9, 2), _entries(20, seed=2)))
+        now[0] = 1.0
+
+        async def run():
+            assert reader.current is first              # the remap was only started
+            for _ in range(200):
+                if reader.current.version == 2:
+                    break
+                await asyncio.sleep(0.01)
+            return reader.current
+
+        assert asyncio.run(run()).version == 2
+        assert threads and threading.main_thread() not in threads
+
+    def test_publisher_exports_each_refresh(self, tmp_path):
+        async def run():
+            repo = InMemoryTimetableRepository()
+            entries = _entries(50)
+            await repo.replace_departments({
+                d: [e for e in entries if e.department_id == d] for d in {e.department_id for e in entries}
+            })
+            publisher = TimetableSnapshotPublisher(repo, FakeClock())
+            publisher.add_listener(MappedSnapshotExporter(tmp_path / "t.mtts").on_snapshot)
+            await publisher.refresh()
+            await publisher.refresh()
+
+        asyncio.run(run())
+        mapped = MappedSnapshotReader(tmp_path / "t.mtts").current
+        assert mapped.version == 2
+        assert len(mapped.rows) == 50
+
+
+class TestWarmStart:
+    def _repo(self, entries: list[TimetableEntry]) -> InMemoryTimetableRepository:
+        repo = InMemoryTimetableRepository()
+        asyncio.run(repo.replace_departments({
+            d: [e for e in entries if e.department_id == d] for d in {e.department_id for e in entries}
+        }))
+        return repo
+
+    def test_loads_lazily_on_first_access(self, tmp_path, snapshot):
+        write_mapped_snapshot(tmp_path / "t.mtts", snapshot)
+        calls = []
+
+        def load():
+            calls.append(1)
+            return load_snapshot(tmp_path / "t.mtts")
+
+        publisher = TimetableSnapshotPublisher(InMemoryTimetableRepository(), FakeClock(), warm_start=load)
+        assert calls == []
+        assert publisher.current.version == 4
+        assert publisher.current is publisher.current
+        assert calls == [1]
+
+    def test_versions_continue_from_the_persisted_snapshot(self, tmp_path, snapshot):
+        write_mapped_snapshot(tmp_path / "t.mtts", snapshot)
+        publisher = TimetableSnapshotPublisher(
+            self._repo(_entries(20)), FakeClock(), warm_start=lambda: load_snapshot(tmp_path / "t.mtts"),
+        )
+
+        async def run():
+            assert (await publisher.ready()).version == 4     # no rebuild needed
+            return await publisher.refresh()
+
+        assert asyncio.run(run()).version == 5
+
+    def test_falls_back_to_a_rebuild(self, tmp_path):
+        (tmp_path / "t.mtts").write_bytes(b"MTTS garbage")
+        publisher = TimetableSnapshotPublisher(
+            self._repo(_entries(20)), FakeClock(), warm_start=lambda: load_snapshot(tmp_path / "t.mtts"),
+        )
+        snap = asyncio.run(publisher.ready())
+        assert snap.version == 1
+        assert len(snap.rows) == 20
@@ -0,0 +1,184 @@
+"""
+tests/contexts/timetable/integration/test_page_snapshots.py
+=============================================================
+FileSystemPageSnapshotStore on a temp dir + offline rebuild and publish.
+"""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from datetime import UTC, datetime, timedelta, timezone
+
+from src.contexts.timetable.adapters.inbound.cli.rebuild_timetable import main as rebuild_main
+from src.contexts.timetable.adapters.outbound.db.in_memory import (
+    InMemoryFingerprintStore, InMemoryTimetableRepository,
+)
+from src.contexts.timetable.adapters.outbound.db.mapped_snapshot import load_snapshot
+from src.contexts.timetable.adapters.outbound.db.page_snapshots import FileSystemPageSnapshotStore
+from src.contexts.timetable.adapters.outbound.http.parse_executor import InlineParseExecutor
+from src.contexts.timetable.application.ports.outbound import DepartmentPage, PageSnapshotRef
+from src.contexts.timetable.application.use_cases.rebuild_from_snapshots import (
+    RebuildTimetableFromSnapshotsUseCase,
+)
+from src.contexts.timetable.application.use_cases.scrape_timetable import (
+    ScrapeTimetableCommand, ScrapeTimetableUseCase,
+)
+from src.contexts.timetable.domain.errors import DepartmentPageMissing
+from src.contexts.timetable.domain.value_objects import DepartmentRange, PageFingerprint
+from tests.shared.fakes.infrastructure import FakeClock, FakeEventBus
+
+T1 = datetime(2024, 9, 1, 6, 0, tzinfo=UTC)
+T2 = datetime(2024, 9, 1, 12, 0, tzinfo=UTC)
+T3 = datetime(2024, 9, 1, 18, 0, tzinfo=UTC)
+
+
+def _page(*courses: str) -> str:
+    cells = "".join(f"<div>{c}<br>Dr. Asanov<br>B-204</div>" for c in courses)
+    return f"<table><tr><td></td><td>Pazartesi</td></tr><tr><td>08:00-08:45</td><td>{cells}</td></tr></table>"
+
+
+class TestFileSystemPageSnapshotStore:
+    def test_identical_pages_stored_once(self, tmp_path):
+        store = FileSystemPageSnapshotStore(tmp_path)
+        a = asyncio.run(store.put(1, T1, _page("UNS-301 A")))
+        b = asyncio.run(store.put(2, T1, _page("UNS-301 A")))
+
+        assert a.content_hash == b.content_hash
+        assert len(list((tmp_path / "blobs").rglob("*.gz"))) == 1
+        assert asyncio.run(store.load(a.content_hash)) == _page("UNS-301 A")
+
+    def test_latest_as_of(self, tmp_path):
+        store = FileSystemPageSnapshotStore(tmp_path)
+        old = asyncio.run(store.put(1, T1, _page("UNS-301 Old")))
+        new = asyncio.run(store.put(1, T2, _page("UNS-301 New")))
+        other = asyncio.run(store.put(2, T1, _page("UNS-302 Other")))
+
+        assert asyncio.run(store.latest()) == [new, other]
+        assert asyncio.run(store.latest(as_of=T1)) == [old, other]
+        assert asyncio.run(store.history(1)) == [old, new]
+
+    def test_index_survives_reopen(self, tmp_path):
+        ref = asyncio.run(FileSystemPageSnapshotStore(tmp_path).put(1, T1, _page("UNS-301 A")))
+        assert asyncio.run(FileSystemPageSnapshotStore(tmp_path).latest()) == [ref]
+
+    def test_times_from_different_zones_order_by_instant(self, tmp_path):
+        store = FileSystemPageSnapshotStore(tmp_path)
+        bishkek = timezone(timedelta(hours=6))
+        asyncio.run(store.put(1, datetime(2024, 9, 1, 12, 0, tzinfo=bishkek), _page("UNS-301 Old")))  # 06:00Z
+        new = asyncio.run(store.put(1, datetime(2024, 9, 1, 8, 0), _page("UNS-301 New")))           # naive: UTC
+
+        assert new.scraped_at == datetime(2024, 9, 1, 8, 0, tzinfo=UTC)
+        assert asyncio.run(store.latest()) == [new]
+        assert [r.scraped_at for r in asyncio.run(store.latest(as_of=datetime(2024, 9, 1, 13, 0, tzinfo=bishkek)))] \
+            == [T1]
+
+    def test_missing_page_hides_the_department_until_it_returns(self, tmp_path):
+        store = FileSystemPageSnapshotStore(tmp_path)
+        old = asyncio.run(store.put(1, T1, _page("UNS-301 A")))
+        other = asyncio.run(store.put(2, T1, _page("UNS-302 B")))
+        asyncio.run(store.put_missing(1, T2))
+        asyncio.run(store.put_missing(3, T2))              # never stored: nothing to hide
+
+        assert asyncio.run(store.latest()) == [other]
+        assert asyncio.run(store.latest(as_of=T1)) == [old, other]
+        assert asyncio.run(store.history(1)) == [old]
+        back = asyncio.run(store.put(1, T3, _page("UNS-301 A")))
+        assert asyncio.run(store.latest()) == [back, other]
+
+    def test_converts_an_index_with_iso_times(self, tmp_path):
+        with sqlite3.connect(tmp_path / "index.sqlite3") as db:
+            db.execute("CREATE TABLE pages (department_id INTEGER NOT NULL, scraped_at TEXT NOT NULL,"
+                       " content_hash TEXT NOT NULL, PRIMARY KEY (department_id, scraped_at))")
+            db.executemany("INSERT INTO pages VALUES (?, ?, ?)", [
+                (1, "2024-09-01T12:00:00+06:00", "a" * 64),
+                (1, "2024-09-01T08:00:00", "b" * 64),
+            ])
+        db.close()
+
+        store = FileSystemPageSnapshotStore(tmp_path)
+        assert asyncio.run(store.latest()) == [PageSnapshotRef(1, datetime(2024, 9, 1, 8, 0, tzinfo=UTC), "b" * 64)]
+        assert [r.scraped_at for r in asyncio.run(FileSystemPageSnapshotStore(tmp_path).history(1))] \
+            == [T1, datetime(2024, 9, 1, 8, 0, tzinfo=UTC)]
+
+
+class _Source:
+    def __init__(self, pages: dict[int, str | None]) -> None:
+        self.pages = pages
+
+    async def fetch(self, department_id: int, previous: PageFingerprint | None) -> DepartmentPage:
+        body = self.pages[department_id]
+        if body is None:
+            raise DepartmentPageMissing(department_id, "HTTP 404")
+        return DepartmentPage(department_id, body, PageFingerprint.of(body))
+
+
+class TestOfflineRebuild:
+    def test_rebuild_matches_live_scrape(self, tmp_path):
+        store = FileSystemPageSnapshotStore(tmp_path)
+        live_repo = InMemoryTimetableRepository()
+
+        def third_year(entry):
+            return str(entry.course_code).startswith("UNS-3")
+
+        scrape = ScrapeTimetableUseCase(
+            source=_Source({
+                1: _page("UNS-301 A", "UNS-302 B", "UNS-301 A", "UNS-101 Intro"),   # a repeat and a 1st-year course
+                2: _page("UNS-303 C"),
+            }),
+            parser=InlineParseExecutor(), repo=live_repo, fingerprints=InMemoryFingerprintStore(),
+            bus=FakeEventBus(), clock=FakeClock(T1), entry_filter=third_year, snapshots=store,
+        )
+        asyncio.run(scrape.execute(ScrapeTimetableCommand(DepartmentRange(1, 2))))
+
+        rebuilt_repo = InMemoryTimetableRepository()
+        result = asyncio.run(RebuildTimetableFromSnapshotsUseCase(
+            store, InlineParseExecutor(), rebuilt_repo, entry_filter=third_year,
+        ).execute())
+
+        def keys(entries):
+            return sorted((str(e.course_code), e.department_id.value.hex, e.scraped_at) for e in entries)
+
+        assert (result.department_count, result.course_count) == (2, 3)
+        assert keys(asyncio.run(rebuilt_repo.list_all())) == keys(asyncio.run(live_repo.list_all()))
+
+    def test_rebuild_leaves_out_a_department_that_went_missing(self, tmp_path):
+        store = FileSystemPageSnapshotStore(tmp_path)
+        source = _Source({1: _page("UNS-301 A"), 2: _page("UNS-303 C")})
+        clock = FakeClock(T1)
+        scrape = ScrapeTimetableUseCase(
+            source=source, parser=InlineParseExecutor(), repo=InMemoryTimetableRepository(),
+            fingerprints=InMemoryFingerprintStore(), bus=FakeEventBus(), clock=clock, snapshots=store,
+        )
+        asyncio.run(scrape.execute(ScrapeTimetableCommand(DepartmentRange(1, 2))))
+        source.pages[2] = None
+        clock.advance_hours(6)
+        asyncio.run(scrape.execute(ScrapeTimetableCommand(DepartmentRange(1, 2))))
+
+        def rebuilt(as_of=None):
+            repo = InMemoryTimetableRepository()
+            asyncio.run(RebuildTimetableFromSnapshotsUseCase(store, InlineParseExecutor(), repo).execute(as_of))
+            return sorted(str(e.course_code) for e in asyncio.run(repo.list_all()))
+
+        assert rebuilt() == ["UNS-301"]
+        assert rebuilt(as_of=T1) == ["UNS-301", "UNS-303"]
+
+    def test_cli_reports_counts(self, tmp_path, capsys):
+        asyncio.run(FileSystemPageSnapshotStore(tmp_path).put(7, T1, _page("UNS-301 A")))
+        rebuild_main(["--snapshot-dir", str(tmp_path), "--workers", "0", "--mapped-snapshot", ""])
+        out = capsys.readouterr().out
+        assert "Rebuilt 1 entries from 1 department pages" in out
+        assert "Published" not in out
+
+    def test_cli_publishes_the_next_mapped_snapshot(self, tmp_path, capsys):
+        pages, mapped = tmp_path / "pages", tmp_path / "snapshot.mtts"
+        asyncio.run(FileSystemPageSnapshotStore(pages).put(7, T1, _page("UNS-301 A", "UNS-302 B")))
+        argv = ["--snapshot-dir", str(pages), "--workers", "0", "--mapped-snapshot", str(mapped)]
+
+        rebuild_main(argv)
+        first = load_snapshot(mapped)
+        rebuild_main(argv)
+        second = load_snapshot(mapped)
+
+        assert (first.version, second.version) == (1, 2)
+        assert sorted(str(e.course_code) for e in second.rows) == ["UNS-301", "UNS-302"]
+        assert f"Published snapshot version 2 to {mapped}" in capsys.readouterr().out
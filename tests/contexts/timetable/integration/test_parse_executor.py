@@ -0,0 +1,99 @@
+"""
+tests/contexts/timetable/integration/test_parse_executor.py
+=============================================================
+Process-pool parsing returns the same entries as inline parsing.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.contexts.timetable.adapters.outbound.http.manas_parser import ManasParser
+from src.contexts.timetable.adapters.outbound.http.parse_executor import (
+    InlineParseExecutor, ProcessPoolParseExecutor, build_parse_executor,
+)
+
+_PAGE = (
+    "<table><tr><td></td><td>Pazartesi</td><td>Salı</td></tr>"
+    "<tr><td>08:00-08:45</td><td><div>UNS-301 Calculus<br>Dr. Asanov<br>B-204</div></td>"
+    "<td><div>UNS-302 Fizik<br>Prof. İvanova<br>A-12</div></td></tr></table>"
+)
+
+
+class _DiesOnce:
+    """Kills its worker process on the first parse, as an OOM kill would."""
+
+    def parse_rows(self, html: str):
+        marker = Path(os.environ["PARSE_EXECUTOR_TEST_MARKER"])
+        if not marker.exists():
+            marker.touch()
+            os._exit(1)
+        return ManasParser().parse_rows(html)
+
+
+class _AlwaysDies:
+    def parse_rows(self, html: str):
+        os._exit(1)
+
+
+def _key(e):
+    return (str(e.course_code), e.course_name, e.day, str(e.time_slot), e.room_name, e.teacher_name, e.department_id)
+
+
+class TestParseExecutors:
+    def test_pool_matches_inline(self):
+        at = datetime(2024, 9, 1, 10, 0)
+        pool = ProcessPoolParseExecutor(max_workers=2)
+
+        async def run():
+            return await asyncio.gather(*(pool.parse(_PAGE, i, at) for i in range(4)))
+
+        try:
+            pooled = asyncio.run(run())
+        finally:
+            pool.close()
+        inline = [asyncio.run(InlineParseExecutor().parse(_PAGE, i, at)) for i in range(4)]
+
+        assert [[_key(e) for e in r] for r in pooled] == [[_key(e) for e in r] for r in inline]
+        assert len(pooled[0]) == 2
+
+    def test_pool_accepts_bs4_parser(self):
+        pool = ProcessPoolParseExecutor(max_workers=1, parser_cls=ManasParser)
+        try:
+            entries = asyncio.run(pool.parse(_PAGE, 1, datetime(2024, 9, 1)))
+        finally:
+            pool.close()
+        assert {e.room_name for e in entries} == {"B-204", "A-12"}
+
+    def test_zero_workers_falls_back_to_inline(self):
+        assert isinstance(build_parse_executor(0), InlineParseExecutor)
+        assert isinstance(build_parse_executor(3), ProcessPoolParseExecutor)
+
+    def test_pool_is_rebuilt_after_a_worker_dies(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PARSE_EXECUTOR_TEST_MARKER", str(tmp_path / "died"))
+        pool = ProcessPoolParseExecutor(max_workers=2, parser_cls=_DiesOnce)
+
+        async def run():
+            return await asyncio.gather(*(pool.parse(_PAGE, i, datetime(2024, 9, 1)) for i in range(4)))
+
+        try:
+            results = asyncio.run(run())
+            again = asyncio.run(pool.parse(_PAGE, 5, datetime(2024, 9, 1)))
+        finally:
+            pool.close()
+        assert (tmp_path / "died").exists()
+        assert [len(r) for r in results] == [2, 2, 2, 2] and len(again) == 2
+
+    def test_a_page_that_breaks_the_pool_twice_raises(self):
+        pool = ProcessPoolParseExecutor(max_workers=1, parser_cls=_AlwaysDies)
+        try:
+            with pytest.raises(BrokenProcessPool):
+                asyncio.run(pool.parse(_PAGE, 1, datetime(2024, 9, 1)))
+            assert pool._pool is None                   # the next call starts a fresh pool
+        finally:
+            pool.close()
@@ -0,0 +1,83 @@
+"""
+tests/contexts/timetable/unit/test_compact_timetable.py
+=========================================================
+CompactTimetable must round-trip TimetableEntry losslessly.
+"""
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from src.contexts.timetable.application.read_models.compact_timetable import CompactTimetable
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.services import room_id_for
+from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot, WeekDay
+from src.shared_kernel.domain.identity import DepartmentId
+
+_DEPT = DepartmentId(uuid4())
+
+
+def _entry(**kwargs) -> TimetableEntry:
+    defaults = dict(
+        course_code=CourseCode("UNS-301"), course_name="Calculus", day=WeekDay.MONDAY,
+        time_slot=TimeSlot("08:00-08:45"), room_id=room_id_for("B-101"), teacher_name="Dr. Smith",
+        department_id=_DEPT, scraped_at=datetime(2024, 9, 1, 10, 0), room_name="B-101",
+    )
+    defaults.update(kwargs)
+    return TimetableEntry.create(**defaults)
+
+
+class TestCompactTimetable:
+    def test_round_trip_is_lossless(self):
+        entries = [
+            _entry(),
+            _entry(course_name="Fizik", teacher_name="İsmail Yıldız", day=WeekDay.SUNDAY),
+            _entry(time_slot=TimeSlot(" BADTIME "), room_name="", room_id=room_id_for("")),
+            _entry(scraped_at=datetime(2024, 9, 1, tzinfo=timezone.utc), department_id=DepartmentId(uuid4())),
+        ]
+        assert CompactTimetable.from_entries(entries).to_entries() == entries
+
+    def test_repeated_values_are_stored_once(self):
+        table = CompactTimetable.from_entries(_entry(day=d) for d in WeekDay)
+        assert len(table) == 7
+        assert len(table._strings) == 3          # course name, teacher, room label
+        assert len(table._course_codes) == len(table._scraped_ats) == 1
+
+    def test_row_view_fields(self):
+        e = _entry(teacher_name="Ayşe Kaya")
+        row = CompactTimetable.from_entries([_entry(), e])[-1]
+        assert (row.id, row.teacher_name, row.course_code, row.time_slot) == (
+            e.id, "Ayşe Kaya", CourseCode("UNS-301"), TimeSlot("08:00-08:45"))
+        with pytest.raises(AttributeError):
+            row.extra = 1
+
+    def test_index_out_of_range(self):
+        with pytest.raises(IndexError):
+            CompactTimetable.from_entries([_entry()])[1]
+
+    def test_column_scans(self):
+        a = _entry(teacher_name="Ayşe Kaya", room_name="A-1", room_id=room_id_for("A-1"))
+        b = _entry()
+        table = CompactTimetable.from_entries([a, b])
+        assert [r.id for r in table.rows_for_teacher("Ayşe Kaya")] == [a.id]
+        assert [r.id for r in table.rows_for_room(room_id_for("B-101"))] == [b.id]
+        assert len(table.rows_for_department(_DEPT)) == 2
+        assert table.rows_for_teacher("Nobody") == []
+
+    def test_shared_row_is_stored_once_and_listed_under_each_department(self):
+        other = DepartmentId(uuid4())
+        shared, own = _entry(), _entry(teacher_name="Ayşe Kaya")
+        table = CompactTimetable.from_entries([shared, own], {shared.id: {_DEPT, other}})
+        assert len(table) == 2
+        assert [r.id for r in table.rows_for_department(other)] == [shared.id]
+        assert [r.id for r in table.rows_for_department(_DEPT)] == [shared.id, own.id]
+        assert table[0].department_id == _DEPT
+
+        assert table.entries_by_department() == {_DEPT: [shared, own], other: [replace(shared, department_id=other)]}
+
+        dictionaries, columns, ids = table.export()
+        copy = CompactTimetable.from_export(dictionaries, columns, ids, table.department_index())
+        assert [r.id for r in copy.rows_for_department(other)] == [shared.id]
@@ -0,0 +1,118 @@
+"""
+tests/contexts/timetable/unit/test_department_registry.py
+===========================================================
+DepartmentRegistry liveness rules and DegreeLevel shards.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.contexts.timetable.adapters.outbound.db.in_memory import (
+    InMemoryDepartmentRegistryStore, InMemoryFingerprintStore, InMemoryTimetableRepository,
+)
+from src.contexts.timetable.adapters.outbound.http.parse_executor import InlineParseExecutor
+from src.contexts.timetable.application.ports.outbound import DepartmentPage
+from src.contexts.timetable.application.use_cases.scrape_timetable import (
+    ScrapeTimetableCommand, ScrapeTimetableUseCase,
+)
+from src.contexts.timetable.domain.entities import DepartmentRegistry
+from src.contexts.timetable.domain.errors import DepartmentPageMissing
+from src.contexts.timetable.domain.value_objects import DegreeLevel, DepartmentRange, PageFingerprint
+from tests.shared.fakes.infrastructure import FakeClock, FakeEventBus
+
+T0 = datetime(2024, 9, 1, 12, 0)
+
+_PAGE = (
+    "<table><tr><td></td><td>Pazartesi</td></tr>"
+    "<tr><td>08:00-08:45</td><td><div>UNS-301 Calculus<br>Dr. Asanov<br>B-204</div></td></tr></table>"
+)
+
+
+class TestDepartmentRegistry:
+    def test_unknown_ids_are_due(self):
+        assert DepartmentRegistry().due([1, 2, 3], T0) == [1, 2, 3]
+
+    def test_dead_after_consecutive_empty_scrapes(self):
+        reg = DepartmentRegistry(dead_after=2)
+        reg.record_empty(111, T0)
+        assert not reg.is_dead(111)
+        reg.record_empty(111, T0)
+        assert reg.is_dead(111)
+        assert reg.due([110, 111, 112], T0 + timedelta(hours=6)) == [110, 112]
+
+    def test_dead_id_probed_after_interval(self):
+        reg = DepartmentRegistry(dead_after=1, probe_interval=timedelta(hours=72))
+        reg.record_empty(111, T0)
+        assert reg.due([111], T0 + timedelta(hours=71)) == []
+        assert reg.due([111], T0 + timedelta(hours=72)) == [111]
+
+    def test_alive_page_revives_and_stamps_last_seen(self):
+        reg = DepartmentRegistry(dead_after=1)
+        reg.record_empty(5, T0)
+        reg.record_alive(5, T0 + timedelta(days=3))
+        assert not reg.is_dead(5)
+        assert reg.departments[5].last_seen_alive == T0 + timedelta(days=3)
+
+    def test_unchanged_empty_page_still_counts_towards_dead(self):
+        reg = DepartmentRegistry(dead_after=2)
+        reg.record_empty(9, T0)
+        reg.record_unchanged(9, T0 + timedelta(hours=6))
+        assert reg.is_dead(9)
+
+    def test_live_ids(self):
+        reg = DepartmentRegistry(dead_after=1)
+        reg.record_empty(2, T0)
+        assert reg.live_ids([1, 2, 3]) == [1, 3]
+
+
+class TestDegreeLevel:
+    def test_ranges_cover_all_printer_ids(self):
+        ids = [i for level in DegreeLevel for i in level.department_range.ids()]
+        assert ids == list(range(1, 189))
+
+    def test_lookup(self):
+        assert DegreeLevel.of(111) is DegreeLevel.THIRD
+        assert DegreeLevel.of(500) is None
+        assert DegreeLevel.from_key("fifth") is DegreeLevel.FIFTH
+        with pytest.raises(ValueError):
+            DegreeLevel.from_key("fourth")
+
+
+class _Source:
+    def __init__(self, live: set[int], missing: set[int]) -> None:
+        self.live, self.missing = live, missing
+        self.requested: list[int] = []
+
+    async def fetch(self, department_id: int, previous: PageFingerprint | None) -> DepartmentPage:
+        self.requested.append(department_id)
+        if department_id in self.missing:
+            raise DepartmentPageMissing(department_id, "HTTP 404")
+        body = _PAGE if department_id in self.live else ""
+        return DepartmentPage(department_id, body, PageFingerprint.of(body))
+
+
+class TestScrapeWithRegistry:
+    def test_dead_departments_stop_being_requested(self):
+        source = _Source(live={1, 2}, missing={3})
+        clock = FakeClock(T0)
+        uc = ScrapeTimetableUseCase(
+            source=source, parser=InlineParseExecutor(),
+            repo=InMemoryTimetableRepository(), fingerprints=InMemoryFingerprintStore(),
+            bus=FakeEventBus(), clock=clock,
+            registry=InMemoryDepartmentRegistryStore(DepartmentRegistry(dead_after=2)),
+        )
+        cmd = ScrapeTimetableCommand(DepartmentRange(1, 4))
+
+        for _ in range(2):
+            asyncio.run(uc.execute(cmd))
+            clock.advance_hours(6)
+        source.requested.clear()
+
+        event = asyncio.run(uc.execute(cmd))
+
+        assert sorted(source.requested) == [1, 2]
+        assert (event.department_count, event.dead_count) == (2, 2)
+        assert event.failed_department_ids == ()
@@ -22,8 +22,10 @@ from src.contexts.timetable.domain.entities import (
     TimetableEntry, StudentSavedTimetable, TeacherSavedTimetable, RoomScheduleView,
 )
 from src.contexts.timetable.domain.services import (
-    merge_time_slots, deduplicate_entries, find_free_room_ids, matches_search_query,
+    merge_time_slots, coalesce_time_slots, deduplicate_entries, find_free_room_ids, matches_search_query,
+    ChangeKind, diff_entries, shared_row_changes,
 )
+from src.contexts.timetable.domain.errors import TimetableClash
 from src.shared_kernel.domain.identity import StudentId, TeacherId
 from tests.shared.fakes.infrastructure import FakeClock, FakeEventBus
 
@@ -75,9 +77,49 @@ class TestTimeSlot:
         b = TimeSlot("10:00-11:00")
         assert not a.overlaps(b)
 
+    def test_bounds_parsed_to_minutes_once(self):
+        s = TimeSlot(" 10:45-11:30 ")
+        assert (s.start_minutes, s.end_minutes) == (645, 690)
+        assert (s.start(), s.end()) == ("10:45", "11:30")
+        assert not hasattr(s, "__dict__")
+
+    def test_malformed_never_overlaps(self):
+        assert not TimeSlot("BAD").overlaps(TimeSlot("08:00-09:00"))
+        assert TimeSlot("BAD").start_minutes == -1
+
+    def test_from_minutes_round_trips(self):
+        assert TimeSlot.from_minutes(480, 525) == TimeSlot("08:00-08:45")
+
+    def test_equality_ignores_cached_bounds(self):
+        assert TimeSlot("08:00-08:45") == TimeSlot("08:00-08:45")
+        assert len({TimeSlot("08:00-08:45"), TimeSlot("08:00-08:45")}) == 1
+
 
 # ── DepartmentRange value object ──────────────────────────────────────────────
 
+class TestTimetableEntryIdentity:
+    def test_id_derived_from_natural_key(self):
+        room = RoomId(uuid4())
+        a = _entry(room_id=room, scraped_at=datetime(2024, 9, 1))
+        b = _entry(room_id=room, scraped_at=datetime(2024, 9, 8), department_id=DepartmentId(uuid4()))
+        assert a.id == b.id
+
+    def test_any_key_field_changes_id(self):
+        room = RoomId(uuid4())
+        base = _entry(room_id=room)
+        for change in (dict(course_code=CourseCode("UNS-302")), dict(day=WeekDay.TUESDAY),
+                       dict(time_slot=TimeSlot("08:55-09:40")), dict(room_id=RoomId(uuid4())),
+                       dict(teacher_name="Dr. Jones")):
+            assert _entry(**{"room_id": room, **change}).id != base.id
+
+    def test_same_content_ignores_scraped_at(self):
+        room = RoomId(uuid4())
+        dept = DepartmentId(uuid4())
+        a = _entry(room_id=room, department_id=dept, scraped_at=datetime(2024, 9, 1))
+        assert a.same_content(_entry(room_id=room, department_id=dept, scraped_at=datetime(2024, 9, 8)))
+        assert not a.same_content(_entry(room_id=room, department_id=dept, course_name="Calculus II"))
+
+
 class TestDepartmentRange:
     def test_ids_inclusive(self):
         r = DepartmentRange(start=3, end=5)
@@ -115,6 +157,43 @@ class TestStudentSavedTimetable:
         saved.pin(eid)
         assert saved.entry_ids.count(eid) == 1
 
+    def test_pin_rejects_an_overlapping_entry(self):
+        saved = StudentSavedTimetable.create(StudentId(uuid4()))
+        first, second = uuid4(), uuid4()
+        saved.pin(first, WeekDay.MONDAY, TimeSlot("10:00-11:30"))
+        with pytest.raises(TimetableClash) as exc:
+            saved.pin(second, WeekDay.MONDAY, TimeSlot("11:00-12:00"))
+        assert exc.value.clashes_with == first
+        assert saved.entry_ids == [first]
+
+    def test_adjacent_and_other_day_entries_do_not_clash(self):
+        saved = StudentSavedTimetable.create(StudentId(uuid4()))
+        saved.pin(uuid4(), WeekDay.MONDAY, TimeSlot("10:00-10:45"))
+        saved.pin(uuid4(), WeekDay.MONDAY, TimeSlot("10:45-11:30"))
+        saved.pin(uuid4(), WeekDay.TUESDAY, TimeSlot("10:00-10:45"))
+        saved.pin(uuid4(), WeekDay.MONDAY, TimeSlot("Online"))
+        assert len(saved.entry_ids) == 4
+
+    def test_unpin_frees_the_slot(self):
+        saved = StudentSavedTimetable.create(StudentId(uuid4()))
+        first = uuid4()
+        saved.pin(first, WeekDay.MONDAY, TimeSlot("10:00-11:30"))
+        saved.unpin(first)
+        assert saved.clash(WeekDay.MONDAY, TimeSlot("10:00-11:30")) is None
+        saved.pin(uuid4(), WeekDay.MONDAY, TimeSlot("10:30-11:00"))
+
+    def test_clash_check_survives_a_reload(self):
+        saved = StudentSavedTimetable.create(StudentId(uuid4()))
+        first = uuid4()
+        saved.pin(first, WeekDay.FRIDAY, TimeSlot("13:30-15:00"))
+        reloaded = StudentSavedTimetable(
+            id=saved.id, student_id=saved.student_id, label=saved.label,
+            entry_ids=list(saved.entry_ids), saved_at=saved.saved_at,
+            pinned_slots=dict(saved.pinned_slots),
+        )
+        assert reloaded == saved
+        assert reloaded.clash(WeekDay.FRIDAY, TimeSlot("14:00-14:45")) == first
+
 
 class TestTeacherSavedTimetable:
     """FIX 3B: Teacher aggregate is completely separate — no shared base needed."""
@@ -125,6 +204,27 @@ class TestTeacherSavedTimetable:
         assert saved.teacher_id == tid
         assert saved.label == "My Spring Classes"
 
+    def test_pin_rejects_an_overlapping_entry(self):
+        saved = TeacherSavedTimetable.create(TeacherId(uuid4()))
+        saved.pin(uuid4(), WeekDay.MONDAY, TimeSlot("08:00-09:40"))
+        with pytest.raises(TimetableClash):
+            saved.pin(uuid4(), WeekDay.MONDAY, TimeSlot("08:55-09:40"))
+
+    def test_unpin_in_any_order_keeps_the_rest(self):
+        saved = TeacherSavedTimetable.create(TeacherId(uuid4()))
+        ids = [uuid4() for _ in range(5)]
+        for hour, entry_id in zip(range(8, 13), ids):
+            saved.pin(entry_id, WeekDay.MONDAY, TimeSlot(f"{hour:02d}:00-{hour:02d}:45"))
+        for entry_id in (ids[1], ids[4], ids[0]):
+            saved.unpin(entry_id)
+        saved.unpin(ids[0])                                 # already gone
+        assert sorted(saved.entry_ids) == sorted([ids[2], ids[3]])
+        assert set(saved.pinned_slots) == {ids[2], ids[3]}
+        assert saved.clash(WeekDay.MONDAY, TimeSlot("08:30-09:30")) is None
+        assert saved.clash(WeekDay.MONDAY, TimeSlot("10:30-10:40")) == ids[2]
+        saved.unpin(ids[3])
+        assert saved.entry_ids == [ids[2]]
+
 
 class TestRoomScheduleView:
     """FIX 3C: Rooms are a read model — never persisted."""
@@ -143,6 +243,19 @@ class TestRoomScheduleView:
         view = RoomScheduleView(room_id=entry.room_id, entries=(entry,))
         assert view.is_free_at(WeekDay.TUESDAY, TimeSlot("10:00-11:00"))
 
+    def test_free_slots_with_a_double_booked_room(self):
+        room = RoomId(uuid4())
+        entries = tuple(
+            _entry(room_id=room, time_slot=TimeSlot(raw))
+            for raw in ("08:00-11:30", "08:55-09:40", "13:30-14:15", "Online")
+        )
+        view = RoomScheduleView(room_id=room, entries=entries)
+        candidates = [TimeSlot(raw) for raw in
+                      ("08:00-08:45", "10:45-11:30", "11:30-12:15", "12:30-13:15", "13:00-13:45", "14:15-15:00")]
+        assert [s.raw for s in view.free_slots(WeekDay.MONDAY, candidates)] == \
+            ["11:30-12:15", "12:30-13:15", "14:15-15:00"]
+        assert view.free_slots(WeekDay.TUESDAY, candidates) == candidates
+
 
 # ── Domain services ───────────────────────────────────────────────────────────
 
@@ -161,6 +274,30 @@ class TestMergeTimeSlots:
         result = merge_time_slots([TimeSlot("BAD"), TimeSlot("08:00-08:45")])
         assert result == "08:00-08:45"
 
+    def test_distant_lessons_stay_separate(self):
+        result = merge_time_slots([TimeSlot("14:00-14:45"), TimeSlot("08:00-08:45"), TimeSlot("08:55-09:40")])
+        assert result == "08:00-09:40, 14:00-14:45"
+
+    def test_break_tolerance_is_configurable(self):
+        slots = [TimeSlot("08:00-08:45"), TimeSlot("09:05-09:50")]
+        assert merge_time_slots(slots) == "08:00-08:45, 09:05-09:50"
+        assert merge_time_slots(slots, break_tolerance=20) == "08:00-09:50"
+
+
+class TestCoalesceTimeSlots:
+    def test_overlapping_and_duplicate_slots_merge(self):
+        slots = [TimeSlot("10:00-11:30"), TimeSlot("10:00-11:30"), TimeSlot("11:00-12:25")]
+        assert coalesce_time_slots(slots) == [TimeSlot("10:00-12:25")]
+
+    def test_contained_slot_does_not_shrink_the_block(self):
+        slots = [TimeSlot("08:00-10:00"), TimeSlot("08:30-09:00"), TimeSlot("10:10-10:55")]
+        assert coalesce_time_slots(slots) == [TimeSlot("08:00-10:55")]
+
+    def test_zero_tolerance_merges_only_touching_slots(self):
+        slots = [TimeSlot("08:00-08:45"), TimeSlot("08:45-09:30"), TimeSlot("09:40-10:25")]
+        assert coalesce_time_slots(slots, break_tolerance=0) == \
+            [TimeSlot("08:00-09:30"), TimeSlot("09:40-10:25")]
+
 
 class TestDeduplicateEntries:
     def test_keeps_most_recent(self):
@@ -189,6 +326,72 @@ class TestDeduplicateEntries:
         assert len(result) == 2
 
 
+class TestDiffEntries:
+    ROOM_A, ROOM_B = RoomId(uuid4()), RoomId(uuid4())
+    DEPT = DepartmentId(uuid4())
+
+    def _row(self, **kwargs) -> TimetableEntry:
+        return _entry(**{"room_id": self.ROOM_A, "department_id": self.DEPT, **kwargs})
+
+    def _kinds(self, changes) -> list[ChangeKind]:
+        return sorted((c.kind for c in changes), key=lambda k: k.value)
+
+    def test_identical_scrape_has_no_changes(self):
+        rows = [self._row(), self._row(day=WeekDay.FRIDAY)]
+        rescraped = [self._row(scraped_at=datetime(2024, 9, 8)), self._row(day=WeekDay.FRIDAY)]
+        assert diff_entries(rows, rescraped) == []
+
+    def test_added_and_removed(self):
+        calc, phys = self._row(), self._row(course_code=CourseCode("UNS-302"), teacher_name="Dr. Jones")
+        changes = diff_entries([calc], [phys])
+        assert self._kinds(changes) == [ChangeKind.ADDED, ChangeKind.REMOVED]
+
+    def test_room_or_time_change_is_a_move(self):
+        old = self._row()
+        new = self._row(room_id=self.ROOM_B, time_slot=TimeSlot("10:00-10:45"))
+        [change] = diff_entries([old], [new])
+        assert (change.kind, change.before, change.after) == (ChangeKind.MOVED, old, new)
+        assert change.room_ids() == {self.ROOM_A, self.ROOM_B}
+
+    def test_moves_pair_in_slot_order(self):
+        old = [self._row(time_slot=TimeSlot("08:00-08:45")), self._row(time_slot=TimeSlot("08:55-09:40"))]
+        new = [self._row(room_id=self.ROOM_B, time_slot=TimeSlot("08:55-09:40")),
+               self._row(room_id=self.ROOM_B, time_slot=TimeSlot("08:00-08:45"))]
+        changes = diff_entries(old, new)
+        assert {(c.before.time_slot.raw, c.after.time_slot.raw) for c in changes} == {
+            ("08:00-08:45", "08:00-08:45"), ("08:55-09:40", "08:55-09:40")}
+
+    def test_name_change_is_a_rename(self):
+        [change] = diff_entries([self._row()], [self._row(course_name="Calculus I")])
+        assert change.kind is ChangeKind.RENAMED
+        assert change.before.id == change.after.id
+
+    def test_extra_section_is_added_not_moved(self):
+        old = [self._row()]
+        new = [self._row(), self._row(day=WeekDay.THURSDAY)]
+        assert self._kinds(diff_entries(old, new)) == [ChangeKind.ADDED]
+
+
+class TestSharedRowChanges:
+    def test_shared_row_changed_in_every_department_is_one_change(self):
+        depts = [DepartmentId(uuid4()) for _ in range(3)]
+        old = [_entry(department_id=d, room_id=TestDiffEntries.ROOM_A) for d in depts]
+        new = [_entry(department_id=d, room_id=TestDiffEntries.ROOM_B) for d in depts]
+        changes = [c for o, n in zip(old, new) for c in diff_entries([o], [n])]
+        [change] = shared_row_changes(changes, existed=set(), remains=set())
+        assert change.kind is ChangeKind.MOVED
+
+    def test_row_still_listed_elsewhere_is_not_removed_or_added(self):
+        row = _entry()
+        assert shared_row_changes(diff_entries([row], []), existed=set(), remains={row.id}) == []
+        assert shared_row_changes(diff_entries([], [row]), existed={row.id}, remains=set()) == []
+
+    def test_move_onto_a_row_that_already_existed_is_a_removal(self):
+        old, new = _entry(), _entry(time_slot=TimeSlot("10:00-10:45"))
+        [change] = shared_row_changes(diff_entries([old], [new]), existed={new.id}, remains=set())
+        assert (change.kind, change.before, change.after) == (ChangeKind.REMOVED, old, None)
+
+
 class TestFindFreeRooms:
     def test_busy_room_excluded(self):
         room_id = RoomId(uuid4())
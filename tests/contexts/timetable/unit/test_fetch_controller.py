@@ -0,0 +1,79 @@
+"""
+tests/contexts/timetable/unit/test_fetch_controller.py
+========================================================
+AimdLimiter and RetryPolicy — pure control logic, fake clock.
+"""
+from __future__ import annotations
+
+import pytest
+
+from src.contexts.timetable.adapters.outbound.http.fetch_controller import AimdLimiter, RetryPolicy
+
+
+class _Ticks:
+    def __init__(self) -> None:
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def _limiter(initial=4, ticks=None) -> AimdLimiter:
+    return AimdLimiter(initial=initial, minimum=1, maximum=8, target_latency=1.0, monotonic=ticks or _Ticks())
+
+
+class TestAimdLimiter:
+    def test_fast_successes_grow_additively(self):
+        lim = _limiter(initial=4)
+        for _ in range(4):
+            lim.on_success(0.1)
+        assert lim.limit == 4           # +1/limit per success: one window is not quite enough
+        lim.on_success(0.1)
+        assert lim.limit == 5
+
+    def test_growth_capped_at_maximum(self):
+        lim = _limiter(initial=8)
+        for _ in range(100):
+            lim.on_success(0.1)
+        assert lim.limit == 8
+
+    def test_failure_halves(self):
+        lim = _limiter(initial=8)
+        lim.on_failure()
+        assert lim.limit == 4
+
+    def test_slow_response_counts_as_congestion(self):
+        lim = _limiter(initial=8)
+        lim.on_success(5.0)
+        assert lim.limit == 4
+
+    def test_burst_of_failures_backs_off_once_per_window(self):
+        ticks = _Ticks()
+        lim = _limiter(initial=8, ticks=ticks)
+        for _ in range(5):
+            lim.on_failure()
+        assert lim.limit == 4
+        ticks.t = 1.5
+        lim.on_failure()
+        assert lim.limit == 2
+
+    def test_never_below_minimum(self):
+        ticks = _Ticks()
+        lim = _limiter(initial=2, ticks=ticks)
+        for i in range(10):
+            ticks.t = i * 2.0
+            lim.on_failure()
+        assert lim.limit == 1
+
+    def test_invalid_bounds_rejected(self):
+        with pytest.raises(ValueError):
+            AimdLimiter(initial=1, minimum=5, maximum=2, target_latency=1.0)
+
+
+class TestRetryPolicy:
+    def test_delay_is_jittered_exponential_and_capped(self):
+        p = RetryPolicy(max_retries=10, base_delay=0.5, max_delay=3.0)
+        assert p.delay(1, lambda: 1.0) == 0.5
+        assert p.delay(3, lambda: 1.0) == 2.0
+        assert p.delay(8, lambda: 1.0) == 3.0
+        assert p.delay(3, lambda: 0.25) == 0.5
@@ -0,0 +1,97 @@
+"""
+tests/contexts/timetable/unit/test_fuzzy_lookup.py
+====================================================
+Typo- and script-tolerant name lookup.
+"""
+from __future__ import annotations
+
+import random
+
+from src.contexts.timetable.application.read_models.fuzzy_lookup import (
+    DeletionNeighbourhoodIndex,
+    FuzzyMatch,
+    FuzzyNameIndex,
+    _Pattern,
+)
+from src.contexts.timetable.domain.services import transliteration_key
+
+
+def _levenshtein(a: str, b: str) -> int:
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def _index(*names: str) -> FuzzyNameIndex:
+    index = FuzzyNameIndex()
+    index.rebuild(names)
+    return index
+
+
+class TestTransliterationKey:
+    def test_scripts_agree(self):
+        assert transliteration_key("Асанов") == transliteration_key("ASANOV") == "asanov"
+
+    def test_turkish_letters_and_punctuation(self):
+        assert transliteration_key("Dr. Şükrü Öztürk") == "dr sukru ozturk"
+
+    def test_kyrgyz_letters(self):
+        assert transliteration_key("Төлөгөн Үсөнов") == "tologon usonov"
+
+
+class TestEditDistance:
+    def test_matches_dynamic_programming(self):
+        rng = random.Random(5)
+        for _ in range(2000):
+            a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 9)))
+            b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 9)))
+            assert _Pattern(a).distance(b) == _levenshtein(a, b), (a, b)
+
+    def test_neighbourhood_finds_everything_within_k(self):
+        rng = random.Random(6)
+        words = {"".join(rng.choice("abcd") for _ in range(rng.randint(1, 7))) for _ in range(300)}
+        index = DeletionNeighbourhoodIndex(max_distance=2)
+        for w in words:
+            index.add(w)
+        for query in ("abca", "dd", "bcdab", "a"):
+            for k in (0, 1, 2):
+                expected = {(_levenshtein(query, w), w) for w in words if _levenshtein(query, w) <= k}
+                assert set(index.within(query, k)) == expected
+
+
+class TestFuzzyNameIndex:
+    def test_one_typo(self):
+        assert _index("Nurlan Asanov", "Ayşe Kaya").lookup("Asanow") == [FuzzyMatch("Nurlan Asanov", 0)]
+        assert _index("Nurlan Asanov").lookup("Asnaov")[0].name == "Nurlan Asanov"
+
+    def test_cyrillic_query_finds_latin_name(self):
+        assert _index("Nurlan Asanov").lookup("Нурлан")[0].name == "Nurlan Asanov"
+
+    def test_every_query_word_must_match(self):
+        index = _index("Nurlan Asanov", "Nurlan Toktogulov")
+        assert [m.name for m in index.lookup("nurlan toktogulv")] == ["Nurlan Toktogulov"]
+
+    def test_ranked_by_distance_then_usage(self):
+        index = _index("Kaya", "Kaya", "Kaye", "Kara")
+        assert [m.name for m in index.lookup("kaya", max_distance=1)] == ["Kaya", "Kara", "Kaye"]
+
+    def test_short_words_need_exact_match(self):
+        assert _index("Ali Veli").lookup("Alu") == []
+
+    def test_nothing_within_distance(self):
+        assert _index("Nurlan Asanov").lookup("Mirbek") == []
+
+    def test_remove_undoes_one_add_and_leaves_the_copy_source_alone(self):
+        index = _index("Nurlan Asanov", "Nurlan Asanov", "Ayşe Kaya")
+        patched = index.copy()
+        patched.remove("Nurlan Asanov")
+        assert patched.lookup("Asanow") == [FuzzyMatch("Nurlan Asanov", 0)]
+        patched.remove("Nurlan Asanov")
+        patched.add("Nurlan Toktogulov")
+        assert patched.lookup("Asanow") == [] and patched.names() == {"Ayşe Kaya", "Nurlan Toktogulov"}
+        assert index.lookup("Asanow") == [FuzzyMatch("Nurlan Asanov", 0)]
+        assert index.lookup("Toktogulov") == []
@@ -0,0 +1,123 @@
+"""
+tests/contexts/timetable/unit/test_lesson_blocks.py
+=====================================================
+LessonBlockIndex: consecutive periods of one lesson become one block,
+separate lessons of the same course stay separate, and every row lands in
+exactly one block.
+"""
+from __future__ import annotations
+
+import random
+from datetime import datetime
+from uuid import uuid4
+
+from src.contexts.timetable.application.read_models.compact_timetable import CompactTimetable
+from src.contexts.timetable.application.read_models.lesson_blocks import LessonBlockIndex
+from src.contexts.timetable.application.read_models.snapshot import TimetableSnapshot
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.services import coalesce_time_slots, room_id_for
+from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot, WeekDay
+from src.shared_kernel.domain.identity import DepartmentId
+
+_DEPT = DepartmentId(uuid4())
+
+
+def _entry(
+    slot: str,
+    code: str = "UNS-301",
+    day: WeekDay = WeekDay.MONDAY,
+    teacher: str = "Nurlan Asanov",
+    room: str = "B-101",
+    dept: DepartmentId = _DEPT,
+) -> TimetableEntry:
+    return TimetableEntry.create(
+        course_code=CourseCode(code), course_name="Calculus", day=day,
+        time_slot=TimeSlot(slot), room_id=room_id_for(room), teacher_name=teacher,
+        department_id=dept, scraped_at=datetime(2024, 9, 1), room_name=room,
+    )
+
+
+def _blocks(entries: list[TimetableEntry], **kwargs) -> LessonBlockIndex:
+    return LessonBlockIndex.build(CompactTimetable.from_entries(entries), **kwargs)
+
+
+class TestLessonBlockIndex:
+    def test_consecutive_periods_form_one_block(self):
+        entries = [_entry("08:55-09:40"), _entry("08:00-08:45"), _entry("09:50-10:35")]
+        [block] = _blocks(entries)
+        assert block.time_slot == TimeSlot("08:00-10:35")
+        assert block.entry_ids == (entries[1].id, entries[0].id, entries[2].id)
+        assert block.teacher_name == "Nurlan Asanov" and block.room_name == "B-101"
+
+    def test_morning_and_afternoon_lessons_stay_apart(self):
+        blocks = _blocks([_entry("08:00-08:45"), _entry("14:00-14:45"), _entry("08:55-09:40")])
+        assert [b.time_slot.raw for b in blocks] == ["08:00-09:40", "14:00-14:45"]
+
+    def test_break_tolerance(self):
+        entries = [_entry("08:00-08:45"), _entry("09:05-09:50")]
+        assert len(_blocks(entries)) == 2
+        assert len(_blocks(entries, break_tolerance=20)) == 1
+
+    def test_groups_by_course_teacher_and_room(self):
+        blocks = _blocks([
+            _entry("08:00-08:45"),
+            _entry("08:55-09:40", teacher="Aigerim Tokonova"),
+            _entry("08:55-09:40", room="B-102"),
+            _entry("08:55-09:40", code="UNS-302"),
+        ])
+        assert len(blocks) == 4
+
+    def test_same_lesson_in_two_departments_is_one_block(self):
+        other = DepartmentId(uuid4())
+        blocks = _blocks([_entry("08:00-08:45"), _entry("08:00-08:45", dept=other), _entry("08:55-09:40", dept=other)])
+        [block] = blocks
+        assert block.time_slot == TimeSlot("08:00-09:40")
+        assert len(block.entry_ids) == 3
+
+    def test_untimed_rows_are_kept_per_time_text_and_sorted_last(self):
+        blocks = _blocks([_entry("Online"), _entry("Online"), _entry("08:00-08:45"), _entry("")])
+        assert [b.time_slot.raw for b in blocks] == ["08:00-08:45", "Online", ""]
+        assert len(blocks.for_day(WeekDay.MONDAY)[1].entry_ids) == 2
+
+    def test_views(self):
+        entries = [
+            _entry("10:00-10:45", day=WeekDay.TUESDAY),
+            _entry("08:00-08:45", code="UNS-302", day=WeekDay.TUESDAY, teacher="Bakyt Ömürov"),
+            _entry("08:00-08:45", day=WeekDay.FRIDAY, room="A-1"),
+        ]
+        blocks = _blocks(entries)
+        assert blocks.for_day(WeekDay.MONDAY) == []
+        assert [b.course_code.value for b in blocks.for_day(WeekDay.TUESDAY)] == ["UNS-302", "UNS-301"]
+        assert [b.day for b in blocks.for_teacher("Nurlan Asanov")] == [WeekDay.TUESDAY, WeekDay.FRIDAY]
+        assert [b.day for b in blocks.for_room(room_id_for("A-1"))] == [WeekDay.FRIDAY]
+        assert len(blocks.for_course(CourseCode("UNS-302"))) == 1
+        assert blocks.for_teacher("Nobody") == []
+
+    def test_matches_coalesce_time_slots_on_random_timetables(self):
+        rng = random.Random(3)
+        starts = list(range(8 * 60, 18 * 60, 55))
+        entries = [
+            _entry(
+                str(TimeSlot.from_minutes(s, s + rng.choice((45, 90)))),
+                code=f"UNS-{rng.randint(300, 303)}",
+                day=rng.choice(list(WeekDay)[:5]),
+                room=rng.choice(("B-101", "B-102")),
+            )
+            for s in (rng.choice(starts) for _ in range(300))
+        ]
+        blocks = _blocks(entries)
+        assert sorted(i for b in blocks for i in b.entry_ids) == sorted(e.id for e in entries)
+        for day in WeekDay:
+            for b in blocks.for_day(day):
+                assert b.day == day
+                group = [
+                    e.time_slot for e in entries
+                    if (e.day, e.course_code, e.teacher_name, e.room_id) == (b.day, b.course_code, b.teacher_name, b.room_id)
+                ]
+                assert b.time_slot in coalesce_time_slots(group)
+
+    def test_snapshot_carries_blocks(self):
+        snap = TimetableSnapshot.build(1, datetime(2024, 9, 1), [_entry("08:00-08:45"), _entry("08:55-09:40")],
+                                       break_tolerance=5)
+        assert [b.time_slot.raw for b in snap.blocks] == ["08:00-08:45", "08:55-09:40"]
+        assert snap.blocks.break_tolerance == 5
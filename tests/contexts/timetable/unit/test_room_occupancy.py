@@ -0,0 +1,99 @@
+"""
+tests/contexts/timetable/unit/test_room_occupancy.py
+======================================================
+RoomOccupancyIndex must answer exactly what find_free_room_ids answers.
+"""
+from __future__ import annotations
+
+import random
+from datetime import datetime
+from uuid import uuid4
+
+from src.contexts.timetable.application.read_models.room_occupancy import RoomOccupancyIndex
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.services import find_free_room_ids
+from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot, WeekDay
+from src.shared_kernel.domain.identity import DepartmentId, RoomId
+
+_DEPT = DepartmentId(uuid4())
+
+
+def _entry(room: RoomId, slot: str, day: WeekDay = WeekDay.MONDAY, dept: DepartmentId = _DEPT) -> TimetableEntry:
+    return TimetableEntry.create(
+        course_code=CourseCode("UNS-301"), course_name="Calculus", day=day,
+        time_slot=TimeSlot(slot), room_id=room, teacher_name="Dr. Smith",
+        department_id=dept, scraped_at=datetime(2024, 9, 1),
+    )
+
+
+class TestRoomOccupancyIndex:
+    def test_busy_room_is_not_free(self):
+        a, b = RoomId(uuid4()), RoomId(uuid4())
+        index = RoomOccupancyIndex()
+        index.rebuild([_entry(a, "08:00-08:45"), _entry(b, "10:00-10:45")])
+        assert index.free_rooms(WeekDay.MONDAY, TimeSlot("08:30-09:00")) == [str(b)]
+        assert not index.is_free(a, WeekDay.MONDAY, TimeSlot("08:30-09:00"))
+
+    def test_adjacent_slots_do_not_overlap(self):
+        a = RoomId(uuid4())
+        index = RoomOccupancyIndex()
+        index.rebuild([_entry(a, "08:00-08:45")])
+        assert index.free_rooms(WeekDay.MONDAY, TimeSlot("08:45-09:30")) == [str(a)]
+
+    def test_other_day_is_free(self):
+        a = RoomId(uuid4())
+        index = RoomOccupancyIndex()
+        index.rebuild([_entry(a, "08:00-08:45")])
+        assert index.free_rooms(WeekDay.TUESDAY, TimeSlot("08:00-08:45")) == [str(a)]
+
+    def test_whole_range_query(self):
+        a, b = RoomId(uuid4()), RoomId(uuid4())
+        index = RoomOccupancyIndex()
+        index.rebuild([_entry(a, "13:30-14:15"), _entry(b, "14:00-14:45")])
+        assert index.free_rooms_between(WeekDay.MONDAY, 10 * 60 + 45, 14 * 60) == [str(b)]
+
+    def test_patch_room_moves_occupancy(self):
+        a, b = RoomId(uuid4()), RoomId(uuid4())
+        index = RoomOccupancyIndex()
+        index.rebuild([_entry(a, "08:00-08:45"), _entry(b, "12:00-12:45")])
+        index.patch_room(a, [_entry(a, "12:00-12:45")])
+        assert index.free_rooms(WeekDay.MONDAY, TimeSlot("08:00-08:45")) == sorted([str(a), str(b)])
+        assert index.free_rooms(WeekDay.MONDAY, TimeSlot("12:00-12:45")) == []
+
+    def test_patch_adds_unknown_room(self):
+        a, b = RoomId(uuid4()), RoomId(uuid4())
+        index = RoomOccupancyIndex()
+        index.rebuild([_entry(a, "08:00-08:45")])
+        index.patch_room(b, [_entry(b, "09:00-09:45")])
+        assert index.free_rooms(WeekDay.MONDAY, TimeSlot("07:00-07:30")) == sorted([str(a), str(b)])
+
+    def test_apply_moves_single_entries_and_leaves_the_copy_source_alone(self):
+        a, b = RoomId(uuid4()), RoomId(uuid4())
+        early, also_early = _entry(a, "08:00-08:45"), _entry(a, "08:00-08:40")
+        index = RoomOccupancyIndex()
+        index.rebuild([early, also_early, _entry(b, "12:00-12:45")])
+        patched = index.copy()
+        patched.apply(removed=[early], added=[_entry(b, "08:00-08:45")])
+        assert patched.free_rooms(WeekDay.MONDAY, TimeSlot("08:00-08:45")) == []   # a: also_early remains
+        patched.apply(removed=[also_early], added=[])
+        assert patched.free_rooms(WeekDay.MONDAY, TimeSlot("08:00-08:45")) == [str(a)]
+        assert index.free_rooms(WeekDay.MONDAY, TimeSlot("08:00-08:45")) == [str(b)]
+
+    def test_matches_find_free_room_ids(self):
+        rng = random.Random(7)
+        rooms = [RoomId(uuid4()) for _ in range(40)]
+        days = list(WeekDay)
+        entries = []
+        for _ in range(600):
+            start = rng.randrange(8 * 60, 18 * 60, 5)
+            end = start + rng.choice((45, 90, 135))
+            slot = f"{start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}"
+            entries.append(_entry(rng.choice(rooms), slot, rng.choice(days)))
+        index = RoomOccupancyIndex()
+        index.rebuild(entries)
+        for _ in range(200):
+            start = rng.randrange(8 * 60, 19 * 60, 5)
+            end = start + rng.choice((5, 45, 200))
+            slot = TimeSlot.from_minutes(start, end)
+            day = rng.choice(days)
+            assert index.free_rooms(day, slot) == find_free_room_ids(entries, day, slot)
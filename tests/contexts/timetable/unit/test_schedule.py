@@ -0,0 +1,50 @@
+"""
+tests/contexts/timetable/unit/test_schedule.py
+================================================
+DaySchedule and DisjointSchedule answer exactly like a scan with
+TimeSlot.overlaps() over the same slots.
+"""
+from __future__ import annotations
+
+import random
+
+from src.contexts.timetable.domain.schedule import DaySchedule, DisjointSchedule
+from src.contexts.timetable.domain.value_objects import TimeSlot, WeekDay
+
+
+def _random_slot(rng: random.Random) -> TimeSlot:
+    if rng.random() < 0.05:
+        return TimeSlot("Online")
+    start = rng.randrange(8 * 60, 18 * 60, 5)
+    return TimeSlot.from_minutes(start, start + rng.choice((0, 45, 90, 135)))
+
+
+class TestDaySchedule:
+    def test_matches_a_linear_scan(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            busy = [_random_slot(rng) for _ in range(rng.randint(0, 12))]
+            schedule = DaySchedule(busy)
+            for query in (_random_slot(rng) for _ in range(20)):
+                assert schedule.is_free(query) == (not any(b.overlaps(query) for b in busy))
+
+
+class TestDisjointSchedule:
+    def test_matches_a_linear_scan(self):
+        rng = random.Random(5)
+        schedule: DisjointSchedule[int] = DisjointSchedule()
+        held: dict[int, tuple[WeekDay, TimeSlot]] = {}
+        for key in range(2000):
+            if held and rng.random() < 0.3:
+                gone = rng.choice(list(held))
+                schedule.remove(gone)
+                del held[gone]
+            day, slot = rng.choice(list(WeekDay)[:2]), _random_slot(rng)
+            clashing = {k for k, (d, s) in held.items() if d == day and s.overlaps(slot)}
+            other = schedule.add(day, slot, key)
+            if clashing:
+                assert other in clashing and key not in schedule
+            else:
+                assert other is None
+                if slot.is_valid():
+                    held[key] = (day, slot)
@@ -0,0 +1,401 @@
+"""
+tests/contexts/timetable/unit/test_scrape_timetable.py
+========================================================
+ScrapeTimetableUseCase — incremental mode with fake page source and parser.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+from src.contexts.timetable.adapters.outbound.db.in_memory import (
+    InMemoryFingerprintStore, InMemoryTimetableRepository,
+)
+from src.contexts.timetable.adapters.outbound.http.manas_parser import ParsedRow, rows_to_entries
+from src.contexts.timetable.application.ports.outbound import DepartmentPage
+from src.contexts.timetable.application.use_cases.scrape_timetable import (
+    ScrapeTimetableCommand, ScrapeTimetableUseCase,
+)
+from src.contexts.timetable.domain.errors import DepartmentPageMissing, ScrapeFailure
+from src.contexts.timetable.domain.events import (
+    RoomScheduleUpdated,
+    TimetableEntryChanged,
+    TimetableScraped,
+)
+from src.contexts.timetable.domain.value_objects import DepartmentRange, PageFingerprint
+from tests.shared.fakes.infrastructure import FakeClock, FakeEventBus
+
+
+# ── Fakes ────────────────────────────────────────────────────────────────────
+
+class FakePageSource:
+    """Serves body strings per department; honours ETags like a real server."""
+
+    def __init__(self, pages: dict[int, str], etags: bool = False) -> None:
+        self.pages = pages
+        self.etags = etags
+        self.failing: set[int] = set()
+        self.missing: set[int] = set()
+        self.fetches = 0
+
+    async def fetch(self, department_id: int, previous: PageFingerprint | None) -> DepartmentPage:
+        self.fetches += 1
+        if department_id in self.failing:
+            raise ScrapeFailure(department_id, "boom")
+        if department_id in self.missing:
+            raise DepartmentPageMissing(department_id, "HTTP 404")
+        body = self.pages[department_id]
+        etag = f'"{hash(body)}"' if self.etags else ""
+        if previous is not None and etag and previous.etag == etag:
+            return DepartmentPage(department_id, "", previous, not_modified=True)
+        return DepartmentPage(department_id, body, PageFingerprint.of(body, etag=etag))
+
+
+class CountingParser:
+    """Each body is 'CODE;N' → N entries for that course code."""
+
+    def __init__(self) -> None:
+        self.calls: list[int] = []
+
+    async def parse(self, html: str, department_id: int, scraped_at: datetime):
+        self.calls.append(department_id)
+        code, n = html.split(";")
+        rows = [ParsedRow("Pazartesi", f"0{h}:00-0{h}:45", code, "Course", "Teacher", "A-101") for h in range(int(n))]
+        return rows_to_entries(rows, department_id, scraped_at)
+
+
+def _use_case(source, parser, repo=None, fingerprints=None):
+    bus = FakeEventBus()
+    uc = ScrapeTimetableUseCase(
+        source=source,
+        parser=parser,
+        repo=repo or InMemoryTimetableRepository(),
+        fingerprints=fingerprints or InMemoryFingerprintStore(),
+        bus=bus,
+        clock=FakeClock(),
+    )
+    return uc, bus
+
+
+_CMD = ScrapeTimetableCommand(DepartmentRange(1, 3))
+
+
+# ── Tests ────────────────────────────────────────────────────────────────────
+
+class TestIncrementalScrape:
+    def test_first_cycle_parses_everything(self):
+        parser = CountingParser()
+        uc, bus = _use_case(FakePageSource({1: "A;2", 2: "B;1", 3: "C;3"}), parser)
+
+        event = asyncio.run(uc.execute(_CMD))
+
+        assert sorted(parser.calls) == [1, 2, 3]
+        assert (event.fetched_count, event.skipped_count, event.changed_count) == (3, 0, 3)
+        assert event.course_count == 6
+        assert bus.events_of(TimetableScraped) == [event]
+
+    def test_unchanged_body_skips_parse(self):
+        parser = CountingParser()
+        uc, _ = _use_case(FakePageSource({1: "A;2", 2: "B;1", 3: "C;3"}), parser)
+        asyncio.run(uc.execute(_CMD))
+        parser.calls.clear()
+
+        event = asyncio.run(uc.execute(_CMD))
+
+        assert parser.calls == []
+        assert (event.fetched_count, event.skipped_count, event.changed_count) == (3, 3, 0)
+        assert event.course_count == 6
+
+    def test_not_modified_response_skips_parse(self):
+        parser = CountingParser()
+        uc, _ = _use_case(FakePageSource({1: "A;1", 2: "B;1", 3: "C;1"}, etags=True), parser)
+        asyncio.run(uc.execute(_CMD))
+        parser.calls.clear()
+
+        event = asyncio.run(uc.execute(_CMD))
+
+        assert parser.calls == []
+        assert event.skipped_count == 3
+
+    def test_only_changed_department_is_reparsed(self):
+        source = FakePageSource({1: "A;1", 2: "B;1", 3: "C;1"})
+        parser = CountingParser()
+        uc, _ = _use_case(source, parser)
+        asyncio.run(uc.execute(_CMD))
+        parser.calls.clear()
+
+        source.pages[2] = "B;4"
+        event = asyncio.run(uc.execute(_CMD))
+
+        assert parser.calls == [2]
+        assert (event.skipped_count, event.changed_count, event.changed_department_ids) == (2, 1, (2,))
+        assert event.course_count == 6
+
+    def test_full_mode_always_parses(self):
+        parser = CountingParser()
+        uc, _ = _use_case(FakePageSource({1: "A;1", 2: "B;1", 3: "C;1"}), parser)
+        full = ScrapeTimetableCommand(DepartmentRange(1, 3), incremental=False)
+        asyncio.run(uc.execute(full))
+        parser.calls.clear()
+
+        event = asyncio.run(uc.execute(full))
+
+        assert sorted(parser.calls) == [1, 2, 3]
+        assert event.skipped_count == 0
+
+    def test_failed_department_keeps_previous_entries(self):
+        source = FakePageSource({1: "A;1", 2: "B;2", 3: "C;1"})
+        repo = InMemoryTimetableRepository()
+        uc, _ = _use_case(source, CountingParser(), repo=repo)
+        asyncio.run(uc.execute(_CMD))
+
+        source.failing.add(2)
+        event = asyncio.run(uc.execute(_CMD))
+
+        assert event.fetched_count == 2
+        assert event.course_count == 4
+
+    def test_parse_error_fails_only_that_department(self):
+        class BrokenParser(CountingParser):
+            async def parse(self, html, department_id, scraped_at):
+                if html.startswith("BAD"):
+                    raise ValueError("unexpected markup")
+                return await super().parse(html, department_id, scraped_at)
+
+        source = FakePageSource({1: "A;1", 2: "B;2", 3: "C;1"})
+        repo, fingerprints = InMemoryTimetableRepository(), InMemoryFingerprintStore()
+        uc, _ = _use_case(source, BrokenParser(), repo=repo, fingerprints=fingerprints)
+        asyncio.run(uc.execute(_CMD))
+        stored = asyncio.run(fingerprints.get(2))
+
+        source.pages = {1: "A;3", 2: "BAD;1", 3: "C;2"}
+        event = asyncio.run(uc.execute(_CMD))
+
+        assert event.failed_department_ids == (2,)
+        assert event.changed_count == 2
+        assert event.course_count == 3 + 2 + 2          # department 2 keeps its old rows
+        assert asyncio.run(fingerprints.get(2)) == stored
+
+
+class GatedPageSource(FakePageSource):
+    """Department *gate_id* blocks until the test opens the gate."""
+
+    def __init__(self, pages: dict[int, str], gate_id: int) -> None:
+        super().__init__(pages)
+        self.gate_id = gate_id
+        self.gate = asyncio.Event()
+
+    async def fetch(self, department_id: int, previous: PageFingerprint | None) -> DepartmentPage:
+        if department_id == self.gate_id:
+            await self.gate.wait()
+        return await super().fetch(department_id, previous)
+
+
+class RecordingRepository(InMemoryTimetableRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[int] = []
+
+    async def replace_departments(self, batch) -> int:
+        self.batches.append(len(batch))
+        return await super().replace_departments(batch)
+
+
+class TestScrapePipeline:
+    def test_entries_readable_before_slowest_department_finishes(self):
+        source = GatedPageSource({i: f"C{i};1" for i in range(1, 6)}, gate_id=3)
+        repo = InMemoryTimetableRepository()
+        uc, _ = _use_case(source, CountingParser(), repo=repo)
+
+        async def main():
+            task = asyncio.create_task(uc.execute(ScrapeTimetableCommand(DepartmentRange(1, 5))))
+            for _ in range(50):
+                await asyncio.sleep(0)
+            partial = await repo.count()
+            source.gate.set()
+            event = await task
+            return partial, event
+
+        partial, event = asyncio.run(main())
+        assert partial == 4
+        assert event.course_count == 5
+
+    def test_slow_parser_back_pressures_fetchers(self):
+        source = FakePageSource({i: f"C{i};1" for i in range(1, 41)})
+        outstanding: list[int] = []
+
+        class SlowParser(CountingParser):
+            async def parse(self, html, department_id, scraped_at):
+                outstanding.append(source.fetches - len(self.calls))
+                await asyncio.sleep(0.001)
+                return await super().parse(html, department_id, scraped_at)
+
+        uc = ScrapeTimetableUseCase(
+            source=source, parser=SlowParser(), repo=InMemoryTimetableRepository(),
+            fingerprints=InMemoryFingerprintStore(), bus=FakeEventBus(), clock=FakeClock(),
+            fetch_workers=4, parse_workers=2, queue_size=3,
+        )
+        event = asyncio.run(uc.execute(ScrapeTimetableCommand(DepartmentRange(1, 40))))
+
+        assert event.changed_count == 40
+        # queued pages + pages held by fetchers + pages being parsed
+        assert max(outstanding) <= 3 + 4 + 2
+
+    def test_persists_in_batches(self):
+        repo = RecordingRepository()
+        uc = ScrapeTimetableUseCase(
+            source=FakePageSource({i: f"C{i};5" for i in range(1, 11)}), parser=CountingParser(),
+            repo=repo, fingerprints=InMemoryFingerprintStore(), bus=FakeEventBus(), clock=FakeClock(),
+            batch_size=10,
+        )
+        event = asyncio.run(uc.execute(ScrapeTimetableCommand(DepartmentRange(1, 10))))
+
+        assert sum(repo.batches) == 10
+        assert max(repo.batches) <= 2
+        assert event.course_count == 50
+
+    def test_duplicate_rows_within_a_page_are_dropped(self):
+        class DoublingParser(CountingParser):
+            async def parse(self, html, department_id, scraped_at):
+                entries = await super().parse(html, department_id, scraped_at)
+                return entries + await super().parse(html, department_id, scraped_at)
+
+        uc, _ = _use_case(FakePageSource({1: "A;3"}), DoublingParser())
+        event = asyncio.run(uc.execute(ScrapeTimetableCommand(DepartmentRange(1, 1))))
+        assert event.course_count == 3
+
+
+class TestStableEntryIdentity:
+    def test_full_rescrape_keeps_ids_and_stored_rows(self):
+        source = FakePageSource({1: "A;2", 2: "B;1", 3: "C;1"})
+        repo = InMemoryTimetableRepository()
+        uc, _ = _use_case(source, CountingParser(), repo=repo)
+        full = ScrapeTimetableCommand(DepartmentRange(1, 3), incremental=False)
+        asyncio.run(uc.execute(full))
+        before = {e.id: e for e in asyncio.run(repo.list_all())}
+
+        source.pages[1] = "A;3"
+        asyncio.run(uc.execute(full))
+        after = {e.id: e for e in asyncio.run(repo.list_all())}
+
+        assert set(before) < set(after)
+        assert all(after[i] is before[i] for i in before)
+
+    def test_upsert_counts_only_changed_rows(self):
+        entries = asyncio.run(CountingParser().parse("A;3", 1, datetime(2024, 9, 1)))
+        rescraped = asyncio.run(CountingParser().parse("A;2", 1, datetime(2024, 9, 8)))
+        repo = InMemoryTimetableRepository()
+        dept = entries[0].department_id
+
+        assert asyncio.run(repo.replace_department(dept, entries)) == 3
+        assert asyncio.run(repo.replace_department(dept, rescraped)) == 1      # one row deleted
+        assert asyncio.run(repo.replace_department(dept, [])) == 2
+        assert asyncio.run(repo.count()) == 0
+
+    def test_list_by_ids_skips_dead_rows(self):
+        entries = asyncio.run(CountingParser().parse("A;2", 1, datetime(2024, 9, 1)))
+        repo = InMemoryTimetableRepository()
+        asyncio.run(repo.replace_department(entries[0].department_id, entries[:1]))
+        ids = [entries[1].id, entries[0].id]
+        assert asyncio.run(repo.list_by_ids(ids)) == [entries[0]]
+
+
+class LessonParser:
+    """Body is '|'-separated 'CODE,HH,ROOM,NAME' lessons on Monday."""
+
+    async def parse(self, html: str, department_id: int, scraped_at: datetime):
+        rows = []
+        for lesson in filter(None, html.split("|")):
+            code, h, room, name = lesson.split(",")
+            rows.append(ParsedRow("Pazartesi", f"{h}:00-{h}:45", code, name, "Teacher", room))
+        return rows_to_entries(rows, department_id, scraped_at)
+
+
+class TestChangeEvents:
+    def _scrape_twice(self, first: dict[int, str], second: dict[int, str]):
+        source = FakePageSource(dict(first))
+        uc, bus = _use_case(source, LessonParser())
+        asyncio.run(uc.execute(_CMD))
+        bus.clear()
+        source.pages.update(second)
+        event = asyncio.run(uc.execute(_CMD))
+        return event, bus
+
+    def test_first_scrape_reports_every_row_added(self):
+        uc, bus = _use_case(FakePageSource({1: "A,08,R1,Calc|B,09,R2,Phys", 2: "", 3: ""}), LessonParser())
+        event = asyncio.run(uc.execute(_CMD))
+        assert event.added_count == 2
+        assert {e.change for e in bus.events_of(TimetableEntryChanged)} == {"added"}
+        assert len(bus.events_of(RoomScheduleUpdated)) == 2
+
+    def test_moved_renamed_and_removed(self):
+        event, bus = self._scrape_twice(
+            {1: "A,08,R1,Calc|B,09,R2,Phys|C,10,R3,Chem", 2: "", 3: ""},
+            {1: "A,11,R1,Calc|B,09,R2,Physics"},
+        )
+        assert (event.added_count, event.removed_count, event.moved_count, event.renamed_count) == (0, 1, 1, 1)
+        changes = {e.change: e for e in bus.events_of(TimetableEntryChanged)}
+        moved = changes["moved"]
+        assert (moved.time_slot, moved.previous_time_slot) == ("11:00-11:45", "08:00-08:45")
+        assert moved.entry_id != moved.previous_entry_id
+        assert changes["renamed"].course_name == "Physics"
+        assert changes["removed"].previous_entry_id == ""
+
+    def test_one_room_update_per_affected_room(self):
+        _, bus = self._scrape_twice(
+            {1: "A,08,R1,Calc|B,09,R1,Phys", 2: "C,10,R2,Chem", 3: ""},
+            {1: "A,12,R1,Calc|B,13,R1,Phys"},
+        )
+        updates = bus.events_of(RoomScheduleUpdated)
+        assert [u.affected_entry_count for u in updates] == [2]
+        assert bus.published[-1] == bus.events_of(TimetableScraped)[0]
+
+    def test_unchanged_scrape_publishes_no_changes(self):
+        event, bus = self._scrape_twice({1: "A,08,R1,Calc", 2: "", 3: ""}, {})
+        assert bus.events_of(TimetableEntryChanged) == []
+        assert bus.events_of(RoomScheduleUpdated) == []
+
+    def test_course_shared_by_departments_is_one_row_and_one_change(self):
+        uns = "UNS,08,R1,Elective"
+        source = FakePageSource({1: uns, 2: uns + "|B,09,R2,Phys", 3: uns})
+        repo = InMemoryTimetableRepository()
+        uc, bus = _use_case(source, LessonParser(), repo=repo)
+        event = asyncio.run(uc.execute(_CMD))
+        assert event.added_count == 2 and event.course_count == 2
+        assert len(asyncio.run(repo.list_all())) == 2
+        assert len(asyncio.run(repo.list_by_room(asyncio.run(repo.list_all())[0].room_id))) == 1
+
+        bus.clear()
+        source.pages.update({1: "UNS,10,R1,Elective", 2: "UNS,10,R1,Elective|B,09,R2,Phys", 3: ""})
+        event = asyncio.run(uc.execute(_CMD))
+        assert [e.change for e in bus.events_of(TimetableEntryChanged)] == ["moved"]
+        assert event.course_count == 2
+
+        bus.clear()
+        source.pages.update({2: "B,09,R2,Phys"})          # one department drops it, another still lists it
+        event = asyncio.run(uc.execute(_CMD))
+        assert bus.events_of(TimetableEntryChanged) == []
+        memberships = asyncio.run(repo.memberships())
+        assert sorted(len(m) for m in memberships.values()) == [1, 1]   # the elective, by dept 1 only; Phys
+        source.pages.update({1: ""})
+        event = asyncio.run(uc.execute(_CMD))
+        assert [e.change for e in bus.events_of(TimetableEntryChanged)] == ["removed"]
+        assert event.course_count == 1
+
+    def test_missing_department_loses_its_rows(self):
+        source = FakePageSource({1: "A,08,R1,Calc|B,09,R2,Phys", 2: "C,10,R3,Chem", 3: ""}, etags=True)
+        repo, fingerprints = InMemoryTimetableRepository(), InMemoryFingerprintStore()
+        uc, bus = _use_case(source, LessonParser(), repo=repo, fingerprints=fingerprints)
+        asyncio.run(uc.execute(_CMD))
+        bus.clear()
+
+        source.missing = {1, 3}
+        event = asyncio.run(uc.execute(_CMD))
+        assert [e.change for e in bus.events_of(TimetableEntryChanged)] == ["removed", "removed"]
+        assert (event.removed_count, event.course_count) == (2, 1)
+        assert event.changed_department_ids == (1,)          # 3 had nothing to remove
+        assert asyncio.run(fingerprints.get(1)) is None
+
+        source.missing = set()                                # back with the same page: parsed again
+        event = asyncio.run(uc.execute(_CMD))
+        assert (event.added_count, event.course_count) == (2, 3)
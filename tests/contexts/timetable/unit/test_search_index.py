@@ -0,0 +1,146 @@
+"""
+tests/contexts/timetable/unit/test_search_index.py
+====================================================
+TimetableSearchIndex: Turkish folding, substring/prefix search, ranked
+autocomplete and incremental per-department re-indexing.
+"""
+from __future__ import annotations
+
+import random
+from datetime import datetime
+from uuid import uuid4
+
+from src.contexts.timetable.application.read_models.search_index import TimetableSearchIndex
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.services import fold_search_text, matches_search_query, room_id_for
+from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot, WeekDay
+from src.shared_kernel.domain.identity import DepartmentId, RoomId
+
+_DEPT = DepartmentId(uuid4())
+
+
+def _entry(code="UNS-301", name="Calculus", teacher="Dr. Smith", room="B-101",
+           day=WeekDay.MONDAY, slot="08:00-08:45", dept=_DEPT) -> TimetableEntry:
+    return TimetableEntry.create(
+        course_code=CourseCode(code), course_name=name, day=day, time_slot=TimeSlot(slot),
+        room_id=room_id_for(room), teacher_name=teacher, department_id=dept,
+        scraped_at=datetime(2024, 9, 1), room_name=room,
+    )
+
+
+def _index(*entries: TimetableEntry) -> TimetableSearchIndex:
+    index = TimetableSearchIndex()
+    index.rebuild(list(entries))
+    return index
+
+
+class TestFolding:
+    def test_dotted_and_dotless_i(self):
+        assert fold_search_text("İSMAİL") == fold_search_text("Ismail") == "ismail"
+
+    def test_turkish_diacritics(self):
+        assert fold_search_text("ŞÜKRÜ Çağlar Öz") == "sukru caglar oz"
+
+    def test_kyrgyz_cyrillic(self):
+        assert fold_search_text("АЙБЕК Өмүрбеков") == "айбек өмүрбеков"
+
+    def test_matches_search_query_uses_folding(self):
+        assert matches_search_query(_entry(teacher="İsmail Yıldız"), "ismail yildiz")
+
+
+class TestSearch:
+    def test_substring_in_any_field(self):
+        calc, phys = _entry(name="Calculus"), _entry(name="Physics", teacher="Dr. Jones", room="A-2")
+        index = _index(calc, phys)
+        assert index.search("alcul") == [calc]
+        assert index.search("jones") == [phys]
+        assert index.search("A-2") == [phys]
+
+    def test_all_terms_must_match(self):
+        a, b = _entry(teacher="Ayşe Kaya"), _entry(teacher="Ayşe Demir")
+        index = _index(a, b)
+        assert {e.id for e in index.search("ayse")} == {a.id, b.id}
+        assert index.search("ayse demir") == [b]
+
+    def test_short_terms_match_word_prefixes(self):
+        a, b = _entry(teacher="Ömer Ak"), _entry(teacher="Ali Veli")
+        index = _index(a, b)
+        assert index.search("om") == [a]
+        assert index.search("v") == [b]
+
+    def test_turkish_query_folding(self):
+        e = _entry(teacher="İbrahim Şahin", day=WeekDay.WEDNESDAY)
+        index = _index(e)
+        assert index.search("IBRAHIM sahin") == [e]
+        assert index.search("çarşamba") == [e]
+
+    def test_limit(self):
+        index = _index(*[_entry(slot=f"{h:02d}:00-{h:02d}:45") for h in range(8, 18)])
+        assert len(index.search("calculus", limit=3)) == 3
+
+    def test_empty_query_returns_everything(self):
+        assert len(_index(_entry(), _entry(teacher="Dr. Jones")).search("  ")) == 2
+
+    def test_agrees_with_matches_search_query(self):
+        rng = random.Random(3)
+        names = ["Calculus", "Fizik", "Kimya", "Türk Dili", "Кыргыз тили", "İşletme"]
+        teachers = ["Ayşe Kaya", "İsmail Öz", "Айбек Токтогулов", "Çağrı Ünal"]
+        entries = [
+            TimetableEntry.create(
+                course_code=CourseCode(f"UNS-{rng.randint(100, 120)}"), course_name=rng.choice(names),
+                day=rng.choice(list(WeekDay)), time_slot=TimeSlot("08:00-08:45"),
+                room_id=RoomId(uuid4()), teacher_name=rng.choice(teachers),
+                department_id=_DEPT, scraped_at=datetime(2024, 9, 1),
+            )
+            for _ in range(300)
+        ]
+        index = _index(*entries)
+        for query in ("uns-11", "fizik", "TÜRK", "ismail", "тили", "kaya", "pazartesi", "isletme"):
+            expected = {e.id for e in entries if matches_search_query(e, query)}
+            assert {e.id for e in index.search(query)} == expected, query
+
+
+class TestSuggest:
+    def test_ranked_by_frequency(self):
+        index = _index(
+            _entry(name="Calculus I"), _entry(name="Calculus I", teacher="Dr. Jones"),
+            _entry(name="Calculus II", teacher="Dr. Kaya"), _entry(name="Chemistry", teacher="Dr. Demir"),
+        )
+        assert index.suggest("calc", k=2) == ["Calculus I", "Calculus II"]
+
+    def test_prefix_of_any_word(self):
+        index = _index(_entry(teacher="Dr. Ayşe Kaya"))
+        assert index.suggest("kay") == ["Dr. Ayşe Kaya"]
+        assert index.suggest("dr ays") == ["Dr. Ayşe Kaya"]
+
+    def test_empty_prefix(self):
+        assert _index(_entry()).suggest("") == []
+
+
+class TestIncremental:
+    def test_replacing_a_department_drops_its_old_postings(self):
+        index = _index(_entry(teacher="Dr. Smith"))
+        assert index.replace_department(_DEPT, [_entry(teacher="Dr. Jones")])
+        assert index.search("smith") == []
+        assert index.suggest("smi") == []
+        assert len(index.search("jones")) == 1
+
+    def test_shared_row_is_one_document_until_every_department_drops_it(self):
+        other = DepartmentId(uuid4())
+        index = TimetableSearchIndex()
+        index.replace_department(_DEPT, [_entry()])
+        index.replace_department(other, [_entry(dept=other), _entry(teacher="Dr. Jones", dept=other)])
+        assert len(index) == 2
+        assert len(index.search("calculus smith")) == 1
+
+        index.replace_department(_DEPT, [])
+        assert len(index.search("calculus smith")) == 1
+        index.replace_department(other, [_entry(teacher="Dr. Jones", dept=other)])
+        assert index.search("smith") == [] and index.suggest("smi") == []
+
+    def test_unchanged_department_only_swaps_entries(self):
+        old = _entry()
+        index = _index(old)
+        new = _entry()
+        assert not index.replace_department(_DEPT, [new])
+        assert index.search("calculus") == [new]
@@ -0,0 +1,258 @@
+"""
+tests/contexts/timetable/unit/test_snapshot.py
+================================================
+TimetableSnapshotPublisher: readers keep a consistent version while the
+next one is built, and versions/ETags only move forward.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+from dataclasses import replace
+from datetime import datetime
+from uuid import uuid4
+
+from src.contexts.timetable.adapters.outbound.db.in_memory import InMemoryTimetableRepository
+from src.contexts.timetable.application.read_models.lesson_blocks import LessonBlockIndex
+from src.contexts.timetable.application.read_models.snapshot import (
+    TimetableSnapshot,
+    TimetableSnapshotPublisher,
+)
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.events import TimetableScraped, TimetableSnapshotPublished
+from src.contexts.timetable.domain.services import department_id_for, room_id_for
+from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot, WeekDay
+from src.shared_kernel.domain.identity import DepartmentId
+from tests.shared.fakes.infrastructure import FakeClock, FakeEventBus
+
+_DEPT = DepartmentId(uuid4())
+
+
+def _entry(teacher: str, room: str = "B-101") -> TimetableEntry:
+    return TimetableEntry.create(
+        course_code=CourseCode("UNS-301"), course_name="Calculus", day=WeekDay.MONDAY,
+        time_slot=TimeSlot("08:00-08:45"), room_id=room_id_for(room), teacher_name=teacher,
+        department_id=_DEPT, scraped_at=datetime(2024, 9, 1), room_name=room,
+    )
+
+
+def _view(snap: TimetableSnapshot, departments: list[DepartmentId]) -> dict:
+    """What readers can observe, minus row numbering and which department a shared row is stored under.
+
+    A patched version still lists a room that lost its last lesson (as free);
+    a full build does not know it, so only rooms with lessons are compared.
+    """
+    rooms = {str(r.room_id) for r in snap.rows}
+    slots = [TimeSlot(s) for s in ("08:00-08:45", "09:00-10:30", "13:00-13:45", "15:00-16:00")]
+    return {
+        "rows": {r.id: (r.course_code, r.course_name, r.day, r.time_slot, r.room_id, r.teacher_name) for r in snap.rows},
+        "departments": [frozenset(r.id for r in snap.rows.rows_for_department(d)) for d in departments],
+        "blocks": sorted(
+            (b.day.order, b.time_slot.raw, str(b.course_code), b.teacher_name, str(b.room_id), frozenset(b.entry_ids))
+            for b in snap.blocks
+        ),
+        "by_day": [[(b.time_slot.start_minutes, str(b.course_code)) for b in snap.blocks.for_day(d)] for d in WeekDay],
+        "by_teacher": [len(snap.blocks.for_teacher(t)) for t in ("T0", "T1", "T2")],
+        "search": [frozenset(e.id for e in snap.search.search(q)) for q in ("", "fiz", "t1", "c-2", "sal", "ma")],
+        "suggest": [snap.search.suggest(q) for q in ("c", "t", "kurs")],
+        "free": [
+            sorted(set(snap.occupancy.free_rooms(d, s)) & rooms) for d in (WeekDay.MONDAY, WeekDay.TUESDAY) for s in slots
+        ],
+        "fuzzy": (snap.teachers.names(), snap.courses.names(), snap.teachers.lookup("t1"), snap.courses.lookup("kurs 3")),
+    }
+
+
+def _lesson(n: int, department_id: DepartmentId, name: str) -> TimetableEntry:
+    start = 8 * 60 + (n % 4) * 55
+    return TimetableEntry.create(
+        course_code=CourseCode(f"C-{n % 5}"), course_name=name,
+        day=(WeekDay.MONDAY, WeekDay.TUESDAY)[n // 4 % 2],
+        time_slot=TimeSlot.from_minutes(start, start + 45) if n % 7 else TimeSlot("Online"),
+        room_id=room_id_for(f"R-{n % 6}"), teacher_name=f"T{n % 3}", department_id=department_id,
+        scraped_at=datetime(2024, 9, 1), room_name=f"R-{n % 6}",
+    )
+
+
+class TestTimetableSnapshot:
+    def test_build_indexes_every_read_model(self):
+        snap = TimetableSnapshot.build(3, datetime(2024, 9, 1), [_entry("Nurlan Asanov")])
+        assert snap.etag == '"timetable-3"'
+        assert len(snap.rows) == 1
+        assert snap.search.search("asanov")[0].teacher_name == "Nurlan Asanov"
+        assert snap.teachers.lookup("asanow")[0].name == "Nurlan Asanov"
+        assert snap.occupancy.free_rooms(WeekDay.MONDAY, TimeSlot("08:00-08:45")) == []
+
+    def test_shared_row_is_listed_under_every_department(self):
+        async def run():
+            other = DepartmentId(uuid4())
+            shared = _entry("Nurlan Asanov")
+            repo = InMemoryTimetableRepository()
+            await repo.replace_department(_DEPT, [shared])
+            await repo.replace_department(other, [replace(shared, department_id=other), _entry("Dr. Jones", "A-1")])
+            publisher = TimetableSnapshotPublisher(repo, FakeClock())
+
+            snap = await publisher.refresh()
+            assert len(snap.rows) == 2 and len(snap.search.search("asanov")) == 1
+            assert [r.id for r in snap.rows.rows_for_department(_DEPT)] == [shared.id]
+            assert shared.id in {r.id for r in snap.rows.rows_for_department(other)}
+
+            await repo.replace_department(_DEPT, [])
+            snap = await publisher.refresh()
+            assert snap.rows.rows_for_department(_DEPT) == []
+            assert shared.id in {r.id for r in snap.rows.rows_for_department(other)}
+            assert len(snap.search.search("asanov")) == 1
+
+        asyncio.run(run())
+
+    def test_patching_changed_departments_matches_a_full_build(self):
+        departments = [department_id_for(i) for i in range(6)]
+
+        async def run(seed: int) -> None:
+            rng = random.Random(seed)
+            repo = InMemoryTimetableRepository()
+            names = {n: f"Kurs {n}" for n in range(40)}
+            content: dict[DepartmentId, set[int]] = {d: set(rng.sample(range(40), 8)) for d in departments}
+            for d, lessons in content.items():
+                await repo.replace_department(d, [_lesson(n, d, names[n]) for n in lessons])
+            publisher = TimetableSnapshotPublisher(repo, FakeClock(), rebuild_every=100)
+            await publisher.refresh()
+
+            for _ in range(12):
+                changed = rng.sample(departments, rng.randint(1, 3))
+                kept = {n for d in departments if d not in changed for n in content[d]}
+                for d in changed:
+                    content[d] = set(rng.sample(range(40), rng.choice((0, 3, 8, 12))))
+                for n in set().union(*(content[d] for d in changed)) - kept:
+                    if rng.random() < 0.3:
+                        names[n] = f"Kurs {n} {rng.choice(('Fizik', 'Salı', 'Matematik'))}"
+                for d in changed:
+                    await repo.replace_department(d, [_lesson(n, d, names[n]) for n in content[d]])
+
+                previous = publisher.current
+                before = _view(previous, departments)
+                patched = await publisher.patch(changed)
+                built = TimetableSnapshot.build(
+                    0, datetime(2024, 9, 1), await repo.list_all(), memberships=await repo.memberships(),
+                )
+                assert patched.patches == previous.patches + 1
+                assert _view(patched, departments) == _view(built, departments)
+                assert _view(previous, departments) == before        # the old version is untouched
+                exported = LessonBlockIndex(patched.rows, *patched.blocks.export())
+                assert list(exported) == list(patched.blocks)              # export() compacts the rows
+
+        for seed in range(5):
+            asyncio.run(run(seed))
+
+
+
+class TestTimetableSnapshotPublisher:
+    def test_starts_empty_at_version_zero(self):
+        publisher = TimetableSnapshotPublisher(InMemoryTimetableRepository(), FakeClock())
+        assert publisher.current.version == 0
+        assert len(publisher.current.rows) == 0
+
+    def test_reader_keeps_its_version_across_a_refresh(self):
+        async def run():
+            repo = InMemoryTimetableRepository()
+            await repo.replace_department(_DEPT, [_entry("Dr. Smith")])
+            publisher = TimetableSnapshotPublisher(repo, FakeClock())
+            await publisher.refresh()
+            held = publisher.current
+
+            await repo.replace_department(_DEPT, [_entry("Dr. Jones")])
+            await publisher.refresh()
+
+            assert held.search.search("smith") and not held.search.search("jones")
+            assert publisher.current.search.search("jones")
+            assert publisher.current.version == held.version + 1
+
+        asyncio.run(run())
+
+    def test_readers_served_while_next_version_builds(self):
+        async def run():
+            repo = InMemoryTimetableRepository()
+            await repo.replace_department(_DEPT, [_entry(f"Teacher {i}", f"R-{i}") for i in range(3000)])
+            publisher = TimetableSnapshotPublisher(repo, FakeClock())
+            seen: list[int] = []
+
+            async def reader():
+                while publisher.current.version < 1:
+                    seen.append(publisher.current.version)
+                    await asyncio.sleep(0)
+
+            await asyncio.gather(publisher.refresh(), reader())
+            assert seen and set(seen) == {0}
+
+        asyncio.run(run())
+
+    def test_refreshes_on_changed_scrape_only(self):
+        async def run():
+            repo = InMemoryTimetableRepository()
+            publisher = TimetableSnapshotPublisher(repo, FakeClock())
+            bus = FakeEventBus()
+            publisher.register(bus)
+
+            await bus.publish(TimetableScraped())                 # first scrape always builds
+            await bus.publish(TimetableScraped(changed_count=0))
+            assert publisher.current.version == 1
+            await bus.publish(TimetableScraped(changed_count=2))
+            assert publisher.current.version == 2
+
+        asyncio.run(run())
+
+    def test_patches_the_departments_a_scrape_changed(self):
+        class _Repo(InMemoryTimetableRepository):
+            full_reads = 0
+
+            async def list_all(self):
+                self.full_reads += 1
+                return await super().list_all()
+
+        async def run():
+            repo = _Repo()
+            fizik, kimya = department_id_for(5), department_id_for(6)
+            await repo.replace_department(fizik, [_lesson(1, fizik, "Fizik")])
+            await repo.replace_department(kimya, [_lesson(2, kimya, "Kimya")])
+            publisher = TimetableSnapshotPublisher(repo, FakeClock(), rebuild_every=2)
+            bus = FakeEventBus()
+            publisher.register(bus)
+
+            await bus.publish(TimetableScraped(changed_count=2, changed_department_ids=(5, 6)))  # first: full build
+            await repo.replace_department(fizik, [_lesson(3, fizik, "Biyoloji")])
+            scraped = TimetableScraped(changed_count=1, changed_department_ids=(5,))
+            await bus.publish(scraped)
+            snap = publisher.current
+            assert (snap.version, snap.patches, repo.full_reads) == (2, 1, 1)
+            assert {r.course_name for r in snap.rows} == {"Biyoloji", "Kimya"}
+
+            await bus.publish(scraped)
+            await bus.publish(scraped)                              # two patches in a row → compacted
+            assert (publisher.current.version, publisher.current.patches, repo.full_reads) == (4, 0, 2)
+
+        asyncio.run(run())
+
+    def test_announces_each_version_after_its_listeners(self):
+        async def run():
+            publisher = TimetableSnapshotPublisher(InMemoryTimetableRepository(), FakeClock())
+            bus = FakeEventBus()
+            exported: list[int] = []
+
+            async def export(snapshot: TimetableSnapshot) -> None:
+                announced = [e.version for e in bus.events_of(TimetableSnapshotPublished)]
+                assert announced == exported                # not yet announced while exporting
+                exported.append(snapshot.version)
+
+            publisher.add_listener(export)
+            publisher.register(bus)
+            await publisher.refresh()
+            await publisher.refresh()
+            return exported, [e.version for e in bus.events_of(TimetableSnapshotPublished)]
+
+        assert asyncio.run(run()) == ([1, 2], [1, 2])
+
+    def test_publish_ignores_older_versions(self):
+        publisher = TimetableSnapshotPublisher(InMemoryTimetableRepository(), FakeClock())
+        newer = TimetableSnapshot.build(5, datetime(2024, 9, 1), [])
+        publisher.publish(newer)
+        publisher.publish(TimetableSnapshot.build(4, datetime(2024, 9, 1), []))
+        assert publisher.current is newer
@@ -0,0 +1,163 @@
+"""
+tests/contexts/timetable/unit/test_timetable_parsers.py
+=========================================================
+ManasParser (bs4) and StreamingManasParser must produce identical output,
+malformed and nested markup included.
+"""
+from __future__ import annotations
+
+import random
+from datetime import datetime
+
+import pytest
+
+from src.contexts.timetable.adapters.outbound.http.manas_parser import ManasParser, ParsedRow
+from src.contexts.timetable.adapters.outbound.http.streaming_parser import StreamingManasParser, iter_rows
+from src.contexts.timetable.domain.value_objects import WeekDay
+
+
+_PAGE = """<!DOCTYPE html>
+<html><head><style>td { color: red }</style></head>
+<body>
+<h1>Bilgisayar Mühendisliği</h1>
+<table border="1">
+  <tr><td></td><td>Pazartesi</td><td>Salı</td><td>Çarşamba</td></tr>
+  <tr>
+    <td> 08:00-08:45 </td>
+    <td><div>UNS-301 Calculus &amp; Analysis<br>Dr. Asanov<br>B-204</div></td>
+    <td></td>
+    <td><div>UNS-302 Fizik<br/>Prof. İvanova</div><div>KGZ-101 Kırgız Dili<br>A. Şükürova<br>İİBF-12</div></td>
+  </tr>
+  <tr>
+    <td>08:55-09:40</td>
+    <td><div>UNS-301<br>Dr. Asanov<br>B-204</div></td>
+    <td><div><!-- moved --> UNS-310 Ağ Güvenliği <br> <span>M. Çelik</span><br>Lab&#32;3</div></td>
+    <td><div></div></td>
+    <td><div>EXTRA-1 Beyond last day<br>Nobody<br>X</div></td>
+  </tr>
+</table>
+<table><tr><td>only one header cell</td></tr><tr><td>10:00-10:45</td><td><div>NOPE</div></td></tr></table>
+<table>
+  <thead><tr><td>Saat</td><td>Cuma</td></tr></thead>
+  <tbody><tr><td>13:30-14:15</td><td><div>UNS-401 Seminer<br>T. Bek<br>Konferans&nbsp;Salonu<script>var x = 1;</script></div></td></tr></tbody>
+</table>
+</body></html>
+"""
+
+
+# markup bs4 treats specially: text boundaries that are not text, CDATA text, template text
+_NOISE = (
+    "<!-- note -->", "<?php echo 1 ?>", "<!DOCTYPE html>", "<![if !IE]>", "<![CDATA[ cd ]]>",
+    "<template>hidden</template>", "<template><div>T-1 Hidden<br>T<br>R</div></template>",
+    "<template><![CDATA[shown]]></template>",
+)
+
+
+def _noisy(rng: random.Random, text: str) -> str:
+    if rng.random() < 0.15:
+        cut = rng.randint(0, len(text))
+        text = text[:cut] + rng.choice(_NOISE) + text[cut:]
+    return text
+
+
+def _random_page(rng: random.Random) -> str:
+    days = [d.turkish for d in WeekDay][: rng.randint(1, 7)]
+    out = ["<table><tr><td></td>", *(f"<td>{d}</td>" for d in days), "</tr>"]
+    for h in range(rng.randint(0, 10)):
+        out.append(f"<tr><td>{8 + h:02d}:00-{8 + h:02d}:45</td>")
+        for _ in range(rng.randint(0, len(days) + 1)):
+            out.append("<td>")
+            for _ in range(rng.randint(0, 3)):
+                parts = [f"UNS-{rng.randint(100, 499)} Ders {rng.randint(1, 9)}", "Dr. Öğretmen", f"B-{rng.randint(1, 300)}"]
+                out.append("<div>" + "<br>".join(_noisy(rng, p) for p in parts[: rng.randint(1, 3)]) + "</div>")
+            out.append(_noisy(rng, "") + "</td>")
+        out.append("</tr>")
+        if rng.random() < 0.1:
+            out.append("<template><tr><td>00:00-00:45</td><td><div>T-2 Template row</div></td></tr></template>")
+    out.append("</table>")
+    return "\n".join(out)
+
+
+_MALFORMED = {
+    "unclosed_header_tr": (
+        "<table><tr><td></td><td>Pazartesi</td>"
+        "<tr><td>08:00-08:45</td><td><div>A-1 X<br>T<br>R</div></td></tr></table>"
+    ),
+    "unclosed_td": (
+        "<table><tr><td><td>Pazartesi<td>Salı</tr>"
+        "<tr><td>08:00-08:45<td><div>A-1 X<br>T<br>R</div><td><div>B-1 Y<br>T<br>R</div></tr></table>"
+    ),
+    "nothing_closed": "<table><tr><td><td>Pazartesi<tr><td>08:00-08:45<td><div>A-1 X<br>T<br>R</div>",
+    "nested_table_in_cell": (
+        "<table><tr><td></td><td>Pazartesi</td></tr>"
+        "<tr><td>08:00-08:45</td><td><div>A-1 X<br>T<br>R</div>"
+        "<table><tr><td>a</td><td>b</td></tr><tr><td>c</td><td><div>N-1 Z<br>T<br>R</div></td></tr></table>"
+        "</td></tr><tr><td>09:00-09:45</td><td><div>B-1 Y<br>T<br>R</div></td></tr></table>"
+    ),
+    "nested_table_before_header": (
+        "<table><tr><td><table><tr><td></td><td>Salı</td></tr>"
+        "<tr><td>10:00-10:45</td><td><div>I-1 In<br>T<br>R</div></td></tr></table></td>"
+        "<td>Pazartesi</td></tr><tr><td>08:00-08:45</td><td><div>O-1 Out<br>T<br>R</div></td></tr></table>"
+    ),
+    "stray_end_tags": "</tr></td><table></div><tr><td></td><td>Cuma</td></tr></span><tr><td>1</td><td><div>A</div></td></tr>",
+}
+
+
+def _random_malformed_page(rng: random.Random) -> str:
+    """_random_page with closing tags left out and tables nested in cells."""
+    out = []
+    for token in _random_page(rng).replace("<", "\0<").split("\0"):
+        if token.startswith("</") and rng.random() < 0.3:
+            token = token[token.index(">") + 1:]
+        elif token.startswith("<td>") and rng.random() < 0.1:
+            token = "<td>" + _random_page(rng) + token[4:]
+        out.append(token)
+    return "".join(out)
+
+
+class TestStreamingParserParity:
+    def test_rows_match_bs4_on_reference_page(self):
+        expected = ManasParser().parse_rows(_PAGE)
+        assert StreamingManasParser().parse_rows(_PAGE) == expected
+        assert ParsedRow("Pazartesi", "08:00-08:45", "UNS-301", "Calculus & Analysis", "Dr. Asanov", "B-204") in expected
+        assert any(r.room == "Konferans\xa0Salonu" for r in expected)
+
+    @pytest.mark.parametrize("seed", range(25))
+    def test_rows_match_bs4_on_random_pages(self, seed):
+        page = _random_page(random.Random(seed))
+        assert StreamingManasParser().parse_rows(page) == ManasParser().parse_rows(page)
+
+    @pytest.mark.parametrize("name", sorted(_MALFORMED))
+    def test_rows_match_bs4_on_malformed_pages(self, name):
+        page = _MALFORMED[name]
+        expected = ManasParser().parse_rows(page)
+        assert StreamingManasParser().parse_rows(page) == expected
+        assert expected
+
+    @pytest.mark.parametrize("seed", range(100))
+    def test_rows_match_bs4_on_random_malformed_pages(self, seed):
+        page = _random_malformed_page(random.Random(seed))
+        expected = ManasParser().parse_rows(page)
+        assert StreamingManasParser().parse_rows(page) == expected
+        assert list(iter_rows(page[i:i + 29] for i in range(0, len(page), 29))) == expected
+
+    def test_rows_stream_out_before_the_table_closes(self):
+        head, tail = _PAGE.split("<tr>\n    <td>08:55-09:40</td>")
+        rows = iter_rows([head, "<tr>" + tail])
+        first = next(rows)
+        assert first.time_slot == "08:00-08:45"
+
+    def test_entries_match_bs4(self):
+        at = datetime(2024, 9, 1, 10, 0)
+        old = ManasParser().parse(_PAGE, 97, at)
+        new = StreamingManasParser().parse(_PAGE, 97, at)
+
+        def strip_id(e):
+            return (e.course_code, e.course_name, e.day, e.time_slot, e.room_id, e.room_name,
+                    e.teacher_name, e.department_id, e.scraped_at)
+
+        assert [strip_id(e) for e in new] == [strip_id(e) for e in old]
+
+    def test_chunked_feed_matches_whole_page(self):
+        chunks = [_PAGE[i:i + 17] for i in range(0, len(_PAGE), 17)]
+        assert list(iter_rows(chunks)) == StreamingManasParser().parse_rows(_PAGE)
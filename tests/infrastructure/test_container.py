@@ -0,0 +1,237 @@
+"""
+tests/infrastructure/test_container.py
+========================================
+PlatformContainer wires each context on first access, exactly once.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from datetime import timedelta
+
+import pytest
+
+from src.contexts.timetable.adapters.inbound.jobs.scrape_timetable import TimetableScrapeJob
+from src.contexts.timetable.adapters.outbound.db.mapped_snapshot import load_snapshot
+from src.contexts.timetable.adapters.outbound.http.fetch_controller import RetryPolicy
+from src.infrastructure.config.settings import Settings
+from src.contexts.timetable.adapters.outbound.db.in_memory import InMemoryDepartmentRegistryStore
+from src.infrastructure.messaging.in_memory_bus import InMemoryEventBus
+from src.contexts.timetable.domain.events import TimetableScraped, TimetableSnapshotPublished
+from src.contexts.timetable.domain.value_objects import DegreeLevel
+from src.infrastructure.wiring._timetable import TimetableContainer
+from src.infrastructure.wiring.container import build_platform
+from tests.shared.fakes.http_origin import FakeHttpOrigin
+
+_PAGE = (
+    "<table><tr><td></td><td>Pazartesi</td></tr>"
+    "<tr><td>08:00-08:45</td><td><div>UNS-301 Calculus<br>Dr. Asanov<br>B-204</div></td></tr></table>"
+)
+
+
+def _settings(tmp_path, **timetable) -> Settings:
+    settings = Settings()
+    return replace(
+        settings,
+        http=replace(settings.http, cache_dir=str(tmp_path / "http_cache")),
+        timetable=replace(
+            settings.timetable,
+            mapped_snapshot_path=str(tmp_path / "timetable.mtts"),
+            snapshot_dir=str(tmp_path / "pages"),
+            **{"registry_path": str(tmp_path / "registry.json"), **timetable},
+        ),
+    )
+
+
+class TestPlatformContainer:
+    def test_builds_nothing_up_front(self, tmp_path):
+        assert build_platform(_settings(tmp_path)).built() == ()
+
+    def test_builds_a_context_on_first_access_and_caches_it(self, tmp_path):
+        platform = build_platform(_settings(tmp_path))
+        timetable = platform.timetable
+        assert isinstance(timetable, TimetableContainer)
+        assert platform.timetable is timetable
+        assert platform.built() == ("timetable",)
+
+    def test_build_all(self, tmp_path):
+        platform = build_platform(_settings(tmp_path)).build_all()
+        assert set(platform.built()) == {
+            "identity", "timetable", "credits", "assignments", "exams",
+            "documents", "grades", "attendance", "cafeteria",
+        }
+
+    def test_timetable_warm_starts_from_the_configured_file(self, tmp_path):
+        platform = build_platform(_settings(tmp_path))
+        assert platform.timetable.snapshots.current.version == 0     # no file yet
+        assert platform.timetable.shared_snapshot.current is None
+
+    def test_shared_http_factory_feeds_metrics_and_opens_nothing_up_front(self, tmp_path):
+        shared = build_platform(_settings(tmp_path)).shared
+        assert shared.http._pool is None
+        assert shared.http._hooks == [shared.http_metrics]
+
+    def test_timetable_snapshots_refresh_from_the_shared_bus(self, tmp_path):
+        platform = build_platform(_settings(tmp_path))
+        bus = platform.shared.event_bus
+        assert isinstance(bus, InMemoryEventBus)
+        platform.timetable
+        [sub] = bus.subscriptions_for(TimetableScraped)
+        assert sub.handler == platform.timetable.snapshots.on_timetable_scraped
+
+    def test_api_worker_never_refreshes_or_exports(self, tmp_path):
+        platform = build_platform(_settings(tmp_path, scrape_owner=False))
+        timetable = platform.timetable
+        assert timetable.snapshots is None
+        assert platform.shared.event_bus.subscriptions_for(TimetableScraped) == ()
+        [sub] = platform.shared.event_bus.subscriptions_for(TimetableSnapshotPublished)
+        assert sub.handler == timetable.shared_snapshot.on_snapshot_published
+
+    def test_scrape_job_is_built_on_first_use_over_the_shared_repository(self, tmp_path):
+        timetable = build_platform(_settings(tmp_path, parse_workers=0)).timetable
+        assert "scrape_job" not in vars(timetable)
+        job = timetable.scrape_job
+        assert isinstance(job, TimetableScrapeJob)
+        assert timetable.scrape_job is job
+        assert job._use_case._repo is timetable.repo
+
+    def test_api_worker_has_no_scrape_job(self, tmp_path):
+        with pytest.raises(RuntimeError, match="does not own the timetable scrape"):
+            build_platform(_settings(tmp_path, scrape_owner=False)).timetable.scrape_job
+
+    def test_scrape_job_publishes_what_it_fetched(self, tmp_path):
+        origin = FakeHttpOrigin()
+        origin.route("/department-printer/5", body=_PAGE)
+
+        async def run():
+            async with origin:
+                platform = build_platform(_settings(
+                    tmp_path, base_url=f"{origin.url}/department-printer", start_id=5, end_id=5, parse_workers=0,
+                ))
+                event = await platform.timetable.scrape_job.run()
+                await platform.shared.http.aclose()         # the origin waits for pooled connections
+            await platform.shared.event_bus.drain()
+            return event, platform.timetable.snapshots.current
+
+        event, current = asyncio.run(run())
+        assert (event.changed_count, event.course_count) == (1, 1)
+        assert current.version == 1 and len(current.rows) == 1
+        assert load_snapshot(tmp_path / "timetable.mtts").version == 1
+        assert list((tmp_path / "pages").rglob("*.gz"))
+
+    def test_restarted_owner_keeps_a_department_that_fails_in_its_first_scrape(self, tmp_path):
+        origin = FakeHttpOrigin()
+        origin.route("/department-printer/5", body=_PAGE)
+        origin.route("/department-printer/6", body=_PAGE.replace("UNS-301 Calculus", "FIZ-101 Fizik"))
+
+        async def scrape_in_a_new_process():
+            platform = build_platform(_settings(
+                tmp_path, base_url=f"{origin.url}/department-printer", start_id=5, end_id=6,
+                parse_workers=0, max_retries=0,
+            ))
+            event = await platform.timetable.scrape_job.run()
+            await platform.shared.http.aclose()
+            await platform.shared.event_bus.drain()
+            return event
+
+        async def run():
+            async with origin:
+                first = await scrape_in_a_new_process()
+                origin.fail("/department-printer/6", status=503)
+                return first, await scrape_in_a_new_process()
+
+        first, second = asyncio.run(run())
+        assert first.course_count == 2
+        assert second.failed_department_ids == (6,)
+        assert (second.course_count, second.added_count, second.removed_count) == (2, 0, 0)
+        published = load_snapshot(tmp_path / "timetable.mtts")
+        assert published.version == 2 and len(published.rows) == 2
+
+    def test_fetch_control_comes_from_the_settings(self, tmp_path, monkeypatch):
+        for name, value in {
+            "TIMETABLE_CONCURRENCY": "12", "TIMETABLE_MIN_CONCURRENCY": "3", "TIMETABLE_TARGET_LATENCY": "1.5",
+            "TIMETABLE_MAX_RETRIES": "5", "TIMETABLE_RETRY_BASE_DELAY": "0.25", "TIMETABLE_RETRY_MAX_DELAY": "4",
+            "TIMETABLE_TIMEOUT": "7",
+        }.items():
+            monkeypatch.setenv(name, value)
+        env = Settings.from_env()
+        settings = _settings(tmp_path, **{
+            name: getattr(env.timetable, name) for name in (
+                "concurrency", "min_concurrency", "target_latency_seconds",
+                "max_retries", "retry_base_delay", "retry_max_delay", "timeout",
+            )
+        })
+        platform = build_platform(settings)
+        source = platform.timetable.scrape_job._use_case._source
+        limiter = source._limiter
+        assert (limiter.limit, limiter._min, limiter._max, limiter._target) == (12, 3, 12, 1.5)
+        assert source._retry == RetryPolicy(max_retries=5, base_delay=0.25, max_delay=4.0)
+        assert platform.shared.http.client("timetable").timeout.read == 7.0
+
+    def test_department_registry_comes_from_the_settings(self, tmp_path):
+        settings = _settings(tmp_path, parse_workers=0, dead_after_empty_scrapes=4, dead_probe_interval_hours=24)
+        store = build_platform(settings).timetable.scrape_job._use_case._registry_store
+        registry = asyncio.run(store.load())
+        assert (registry.dead_after, registry.probe_interval) == (4, timedelta(hours=24))
+        in_memory = build_platform(_settings(tmp_path, parse_workers=0, registry_path="")).timetable
+        assert isinstance(in_memory.scrape_job._use_case._registry_store, InMemoryDepartmentRegistryStore)
+
+    def test_restarted_owner_still_skips_dead_departments(self, tmp_path):
+        origin = FakeHttpOrigin()
+        origin.route("/department-printer/5", body=_PAGE)
+
+        async def scrape_in_a_new_process():
+            platform = build_platform(_settings(
+                tmp_path, base_url=f"{origin.url}/department-printer", start_id=5, end_id=6,
+                parse_workers=0, dead_after_empty_scrapes=1,
+            ))
+            event = await platform.timetable.scrape_job.run()
+            await platform.shared.http.aclose()
+            await platform.shared.event_bus.drain()
+            return event
+
+        async def run():
+            async with origin:
+                return await scrape_in_a_new_process(), await scrape_in_a_new_process()
+
+        first, second = asyncio.run(run())
+        assert (first.department_count, first.dead_count) == (2, 0)
+        assert (second.department_count, second.dead_count) == (1, 1)
+
+    def test_one_scheduled_scrape_per_shard_cron(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("CRON_TIMETABLE_SHARDS", "third=30 1,13 * * *; fifth=45 */6 * * *")
+        settings = _settings(tmp_path, degree_levels=("first", "third", "fifth"))
+        settings = replace(settings, scheduler=Settings.from_env().scheduler)
+        timetable = build_platform(settings).timetable
+        assert [(j.name, j.cron) for j in timetable.schedule] == [
+            ("timetable-scrape-third", "30 1,13 * * *"),
+            ("timetable-scrape-fifth", "45 */6 * * *"),
+        ]
+
+        class _Job:
+            def __init__(self) -> None:
+                self.shards: list[DegreeLevel | None] = []
+
+            async def run(self, shard=None):
+                self.shards.append(shard)
+                return TimetableScraped()
+
+        vars(timetable)["scrape_job"] = job = _Job()      # stands in for the cached pipeline
+        for scheduled in timetable.schedule:
+            asyncio.run(scheduled.run())
+        assert job.shards == [DegreeLevel.THIRD, DegreeLevel.FIFTH]
+
+    def test_without_shard_crons_the_range_is_scheduled(self, tmp_path):
+        settings = _settings(tmp_path)
+        settings = replace(settings, scheduler=replace(settings.scheduler, timetable_shard_crons={}))
+        [job] = build_platform(settings).timetable.schedule
+        assert (job.name, job.cron) == ("timetable-scrape", settings.scheduler.timetable_scrape_cron)
+        assert build_platform(_settings(tmp_path, scrape_owner=False)).timetable.schedule == []
+
+    def test_pipeline_sizes_come_from_the_settings(self, tmp_path):
+        settings = _settings(
+            tmp_path, concurrency=30, parse_workers=3, pipeline_queue_size=8, persist_batch_size=200,
+        )
+        use_case = build_platform(settings).timetable.scrape_job._use_case
+        assert (use_case._fetch_workers, use_case._parse_workers) == (30, 3)
+        assert (use_case._queue_size, use_case._batch_size) == (8, 200)
@@ -0,0 +1,251 @@
+"""
+tests/infrastructure/test_event_bus.py
+========================================
+InMemoryEventBus: MRO dispatch, handlers off the publisher's path, bounded
+queues under each backpressure policy, and handler errors kept to the
+subscriber that raised them.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from src.infrastructure.messaging.in_memory_bus import Backpressure, InMemoryEventBus
+from src.shared_kernel.domain.events import DomainEvent
+
+
+@dataclass(frozen=True)
+class Scraped(DomainEvent):
+    n: int = 0
+
+
+@dataclass(frozen=True)
+class ShardScraped(Scraped):
+    shard: str = ""
+
+
+@dataclass(frozen=True)
+class Other(DomainEvent):
+    pass
+
+
+class TestDispatch:
+    def test_handlers_receive_subclasses_through_the_mro(self):
+        bus = InMemoryEventBus()
+        seen: dict[str, list] = {"all": [], "scraped": [], "shard": [], "other": []}
+
+        def into(key):
+            async def handler(event):
+                seen[key].append(type(event).__name__)
+            return handler
+
+        bus.subscribe(DomainEvent, into("all"))
+        bus.subscribe(Scraped, into("scraped"))
+        bus.subscribe(ShardScraped, into("shard"))
+        bus.subscribe(Other, into("other"))
+
+        async def run():
+            for event in (Scraped(), ShardScraped(), Other()):
+                await bus.publish(event)
+            await bus.aclose()
+
+        asyncio.run(run())
+        assert seen == {
+            "all": ["Scraped", "ShardScraped", "Other"],
+            "scraped": ["Scraped", "ShardScraped"],
+            "shard": ["ShardScraped"],
+            "other": ["Other"],
+        }
+
+    def test_subscribe_invalidates_the_dispatch_table(self):
+        bus = InMemoryEventBus()
+
+        async def handler(event):
+            pass
+
+        bus.subscribe(Scraped, handler)
+        assert len(bus.subscriptions_for(ShardScraped)) == 1
+        bus.subscribe(DomainEvent, handler)
+        assert len(bus.subscriptions_for(ShardScraped)) == 2
+
+    def test_publish_without_subscribers_is_a_no_op(self):
+        asyncio.run(InMemoryEventBus().publish(Scraped()))
+
+
+class TestConcurrency:
+    def test_slow_handler_does_not_block_the_publisher_or_others(self):
+        bus = InMemoryEventBus()
+        fast: list[int] = []
+
+        async def run():
+            gate = asyncio.Event()
+
+            async def slow(event):
+                await gate.wait()
+
+            async def quick(event):
+                fast.append(event.n)
+
+            bus.subscribe(Scraped, slow)
+            bus.subscribe(Scraped, quick)
+            for n in range(5):
+                await asyncio.wait_for(bus.publish(Scraped(n=n)), timeout=1)
+            await asyncio.sleep(0)
+            assert fast == [0, 1, 2, 3, 4]
+            gate.set()
+            await bus.aclose()
+
+        asyncio.run(run())
+
+    def test_workers_run_one_subscriber_in_parallel(self):
+        bus = InMemoryEventBus(workers=4)
+        running = peak = 0
+
+        async def handler(event):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        bus.subscribe(Scraped, handler)
+
+        async def run():
+            for n in range(8):
+                await bus.publish(Scraped(n=n))
+            await bus.drain()
+
+        asyncio.run(run())
+        assert peak == 4
+        assert bus.stats()[next(iter(bus.stats()))].delivered == 8
+
+    def test_drain_waits_for_events_published_by_handlers(self):
+        bus = InMemoryEventBus()
+        seen: list[str] = []
+
+        async def on_scraped(event):
+            await bus.publish(Other())
+
+        async def on_other(event):
+            seen.append("other")
+
+        bus.subscribe(Scraped, on_scraped)
+        bus.subscribe(Other, on_other)
+
+        async def run():
+            await bus.publish(Scraped())
+            await bus.drain()
+
+        asyncio.run(run())
+        assert seen == ["other"]
+
+    def test_bus_survives_a_new_event_loop(self):
+        bus = InMemoryEventBus()
+        seen: list[int] = []
+
+        async def handler(event):
+            seen.append(event.n)
+
+        bus.subscribe(Scraped, handler)
+
+        async def publish(n):
+            await bus.publish(Scraped(n=n))
+            await bus.drain()
+
+        asyncio.run(publish(1))
+        asyncio.run(publish(2))
+        assert seen == [1, 2]
+
+
+class TestBackpressure:
+    def _run(self, policy: Backpressure) -> tuple[list[int], InMemoryEventBus, bool]:
+        bus = InMemoryEventBus(queue_size=2, backpressure=policy)
+        seen: list[int] = []
+        blocked = False
+
+        async def run():
+            nonlocal blocked
+            gate = asyncio.Event()
+
+            async def handler(event):
+                await gate.wait()
+                seen.append(event.n)
+
+            bus.subscribe(Scraped, handler)
+            await bus.publish(Scraped(n=0))
+            await asyncio.sleep(0)                 # worker takes 0 and waits on the gate
+            for n in (1, 2):
+                await bus.publish(Scraped(n=n))    # queue now full
+            publishing = asyncio.create_task(bus.publish(Scraped(n=3)))
+            await asyncio.sleep(0.01)
+            blocked = not publishing.done()
+            gate.set()
+            await publishing
+            await bus.aclose()
+
+        asyncio.run(run())
+        return seen, bus, blocked
+
+    def test_block_waits_for_room_and_loses_nothing(self):
+        seen, bus, blocked = self._run(Backpressure.BLOCK)
+        assert blocked
+        assert seen == [0, 1, 2, 3]
+        [stats] = bus.stats().values()
+        assert stats.dropped == 0 and stats.high_water == 2
+
+    def test_drop_newest_discards_the_incoming_event(self):
+        seen, bus, blocked = self._run(Backpressure.DROP_NEWEST)
+        assert not blocked
+        assert seen == [0, 1, 2]
+        assert next(iter(bus.stats().values())).dropped == 1
+
+    def test_drop_oldest_makes_room(self):
+        seen, bus, blocked = self._run(Backpressure.DROP_OLDEST)
+        assert not blocked
+        assert seen == [0, 2, 3]
+        assert next(iter(bus.stats().values())).dropped == 1
+
+    def test_policy_per_subscription(self):
+        bus = InMemoryEventBus(backpressure="block")
+
+        async def handler(event):
+            pass
+
+        bus.subscribe(Scraped, handler, backpressure="drop_oldest", queue_size=8)
+        [sub] = bus.subscriptions_for(Scraped)
+        assert sub.policy is Backpressure.DROP_OLDEST and sub.queue_size == 8
+
+    def test_rejects_empty_queues(self):
+        with pytest.raises(ValueError):
+            InMemoryEventBus(queue_size=0)
+
+
+class TestErrorIsolation:
+    def test_failing_handler_is_logged_and_counted(self, caplog):
+        bus = InMemoryEventBus()
+        seen: list[int] = []
+
+        async def broken(event):
+            if event.n == 1:
+                raise RuntimeError("boom")
+            seen.append(event.n)
+
+        async def healthy(event):
+            seen.append(event.n * 10)
+
+        bus.subscribe(Scraped, broken)
+        bus.subscribe(Scraped, healthy)
+
+        async def run():
+            for n in range(3):
+                await bus.publish(Scraped(n=n))
+            await bus.aclose()
+
+        asyncio.run(run())
+        assert sorted(seen) == [0, 0, 2, 10, 20]
+        stats = bus.stats()
+        assert stats["Scraped:TestErrorIsolation.test_failing_handler_is_logged_and_counted.<locals>.broken"].failed == 1
+        assert sum(s.delivered for s in stats.values()) == 5
+        assert "boom" in caplog.text
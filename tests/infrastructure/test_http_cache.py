@@ -0,0 +1,317 @@
+"""
+tests/infrastructure/test_http_cache.py
+=========================================
+CachingTransport's RFC 9111 behaviour over an httpx.MockTransport origin
+with a controllable clock, DiskCacheStore's LRU bound and restart
+survival, and the cache behind HttpClientFactory against a real origin.
+"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+from dataclasses import replace
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from src.infrastructure.config.settings import HttpClientSettings, _parse_ttls
+from src.infrastructure.http_client.cache import CachingTransport
+from src.infrastructure.http_client.cache_store import CachedResponse, DiskCacheStore, cache_key
+from src.infrastructure.http_client.factory import HttpClientFactory
+from tests.shared.fakes.http_origin import FakeHttpOrigin
+
+T0 = 1_700_000_000.0
+URL = "http://manas.test/api/yemek"
+
+
+class Origin:
+    """MockTransport handler answering from a mutable response template."""
+
+    def __init__(self, now: list[float]) -> None:
+        self.now = now
+        self.requests: list[httpx.Request] = []
+        self.body = b"menu v1"
+        self.headers: dict[str, str] = {}
+        self.status = 200
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {"Date": formatdate(self.now[0], usegmt=True), **self.headers}
+        etag = headers.get("ETag")
+        if etag and request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(self.status, headers=headers, content=self.body)
+
+
+@pytest.fixture
+def env(tmp_path):
+    now = [T0]
+    origin = Origin(now)
+    store = DiskCacheStore(tmp_path / "cache", max_bytes=1024)
+
+    def client(**kwargs) -> httpx.AsyncClient:
+        transport = CachingTransport(httpx.MockTransport(origin), store, clock=lambda: now[0], **kwargs)
+        return httpx.AsyncClient(transport=transport)
+
+    return now, origin, store, client
+
+
+def _get(client: httpx.AsyncClient, url: str = URL, **kwargs) -> httpx.Response:
+    return asyncio.run(client.get(url, **kwargs))
+
+
+class TestFreshness:
+    def test_fresh_response_is_served_from_the_store(self, env):
+        now, origin, store, client = env
+        origin.headers = {"Cache-Control": "max-age=60"}
+        c = client()
+        assert _get(c).extensions["cache_status"] == "miss"
+        now[0] += 30
+        resp = _get(c)
+        assert resp.text == "menu v1" and resp.extensions["cache_status"] == "hit"
+        assert resp.headers["Age"] == "30"
+        assert len(origin.requests) == 1
+        assert (store.stats.hits, store.stats.misses, store.stats.stored) == (1, 1, 1)
+
+    def test_stale_entry_is_revalidated_with_its_etag(self, env):
+        now, origin, store, client = env
+        origin.headers = {"Cache-Control": "max-age=60", "ETag": '"v1"'}
+        c = client()
+        _get(c)
+        now[0] += 61
+        origin.headers = {"Cache-Control": "max-age=600", "ETag": '"v1"'}
+        resp = _get(c)
+        assert resp.status_code == 200 and resp.text == "menu v1"
+        assert resp.extensions["cache_status"] == "revalidated"
+        assert origin.requests[-1].headers["if-none-match"] == '"v1"'
+        now[0] += 300                                   # the 304's max-age=600 now applies
+        assert _get(c).extensions["cache_status"] == "hit"
+        assert store.stats.revalidated == 1 and len(origin.requests) == 2
+
+    def test_changed_resource_replaces_the_entry(self, env):
+        now, origin, _, client = env
+        origin.headers = {"Cache-Control": "max-age=60", "ETag": '"v1"'}
+        c = client()
+        _get(c)
+        now[0] += 61
+        origin.headers = {"Cache-Control": "max-age=60", "ETag": '"v2"'}
+        origin.body = b"menu v2"
+        assert _get(c).text == "menu v2"
+        assert _get(c).extensions["cache_status"] == "hit"
+
+    def test_stale_without_validators_is_refetched(self, env):
+        now, origin, _, client = env
+        origin.headers = {"Cache-Control": "max-age=1"}
+        c = client()
+        _get(c)
+        now[0] += 5
+        assert _get(c).extensions["cache_status"] == "miss"
+        assert "if-none-match" not in origin.requests[-1].headers
+
+    def test_expires_and_heuristic_freshness(self, env):
+        now, origin, _, client = env
+        c = client()
+        origin.headers = {"Expires": formatdate(T0 + 100, usegmt=True)}
+        _get(c, URL + "/a")
+        origin.headers = {"Last-Modified": formatdate(T0 - 1000, usegmt=True)}   # 10% → 100 s
+        _get(c, URL + "/b")
+        now[0] += 99
+        assert {_get(c, URL + p).extensions["cache_status"] for p in ("/a", "/b")} == {"hit"}
+        now[0] += 2
+        assert _get(c, URL + "/a").extensions["cache_status"] == "miss"
+        _get(c, URL + "/b")
+        assert "if-modified-since" in origin.requests[-1].headers
+
+    def test_ttl_override_longest_prefix_wins(self, env):
+        now, origin, _, client = env
+        c = client(ttl_overrides={"http://manas.test/": 10, URL: 3600})
+        _get(c)                                          # no caching headers at all
+        _get(c, "http://manas.test/other")
+        now[0] += 600
+        assert _get(c).extensions["cache_status"] == "hit"
+        assert _get(c, "http://manas.test/other").extensions["cache_status"] == "miss"
+
+    def test_age_header_counts_against_freshness(self, env):
+        _, origin, _, client = env
+        origin.headers = {"Cache-Control": "max-age=60", "Age": "60"}
+        c = client()
+        _get(c)
+        assert _get(c).extensions["cache_status"] == "miss"
+
+
+class TestDirectives:
+    def test_no_store_and_private_are_not_stored(self, env):
+        _, origin, store, client = env
+        c = client()
+        for directive in ("no-store", "private, max-age=60"):
+            origin.headers = {"Cache-Control": directive}
+            _get(c)
+            _get(c)
+        assert len(store) == 0 and len(origin.requests) == 4
+
+    def test_no_cache_response_is_always_revalidated(self, env):
+        _, origin, store, client = env
+        origin.headers = {"Cache-Control": "no-cache, max-age=600", "ETag": '"v1"'}
+        c = client()
+        _get(c)
+        assert _get(c).extensions["cache_status"] == "revalidated"
+
+    def test_request_no_cache_and_max_age(self, env):
+        now, origin, _, client = env
+        origin.headers = {"Cache-Control": "max-age=600", "ETag": '"v1"'}
+        c = client()
+        _get(c)
+        assert _get(c, headers={"Cache-Control": "no-cache"}).extensions["cache_status"] == "revalidated"
+        now[0] += 100
+        assert _get(c, headers={"Cache-Control": "max-age=50"}).extensions["cache_status"] == "revalidated"
+        assert _get(c, headers={"Cache-Control": "no-store"}).extensions["cache_status"] == "bypass"
+
+    def test_authorized_requests_bypass(self, env):
+        _, origin, store, client = env
+        origin.headers = {"Cache-Control": "max-age=600"}
+        _get(client(), headers={"Authorization": "Bearer x"})
+        assert len(store) == 0 and store.stats.bypassed == 1
+
+    def test_vary(self, env):
+        _, origin, _, client = env
+        origin.headers = {"Cache-Control": "max-age=600", "Vary": "Accept-Language"}
+        c = client()
+        _get(c, headers={"Accept-Language": "tr"})
+        assert _get(c, headers={"Accept-Language": "tr"}).extensions["cache_status"] == "hit"
+        assert _get(c, headers={"Accept-Language": "ky"}).extensions["cache_status"] == "miss"
+        origin.headers = {"Cache-Control": "max-age=600", "Vary": "*"}
+        _get(c, URL + "/star")
+        assert _get(c, URL + "/star").extensions["cache_status"] == "miss"
+
+    def test_callers_conditional_request_gets_a_304_from_a_fresh_entry(self, env):
+        _, origin, _, client = env
+        origin.headers = {"Cache-Control": "max-age=600", "ETag": '"v1"'}
+        c = client()
+        _get(c)
+        resp = _get(c, headers={"If-None-Match": 'W/"v1"'})
+        assert resp.status_code == 304 and resp.extensions["cache_status"] == "hit"
+        assert _get(c, headers={"If-None-Match": '"v0"'}).status_code == 200
+        assert len(origin.requests) == 1
+
+    def test_callers_conditional_request_is_forwarded_when_stale(self, env):
+        now, origin, _, client = env
+        origin.headers = {"Cache-Control": "max-age=60", "ETag": '"v1"'}
+        c = client()
+        _get(c)
+        now[0] += 61
+        assert _get(c, headers={"If-None-Match": '"v1"'}).status_code == 304
+        assert origin.requests[-1].headers["if-none-match"] == '"v1"'
+        assert _get(c).extensions["cache_status"] == "hit"    # the 304 refreshed the entry
+
+    def test_unsafe_method_invalidates(self, env):
+        _, origin, store, client = env
+        origin.headers = {"Cache-Control": "max-age=600"}
+        c = client()
+        _get(c)
+        asyncio.run(c.post(URL, content=b"x"))
+        assert len(store) == 0
+
+    def test_content_encoding_is_kept_raw(self, env):
+        _, origin, _, client = env
+        origin.headers = {"Cache-Control": "max-age=600", "Content-Encoding": "gzip"}
+        origin.body = gzip.compress(b"compressed menu")
+        c = client()
+        assert _get(c).text == "compressed menu"
+        assert _get(c).text == "compressed menu"
+
+
+class TestDiskCacheStore:
+    def _entry(self, url: str, size: int) -> CachedResponse:
+        return CachedResponse(url, 200, [("Cache-Control", "max-age=60")], T0, 0.0, body=b"x" * size)
+
+    def test_evicts_least_recently_used_over_the_bound(self, tmp_path):
+        store = DiskCacheStore(tmp_path, max_bytes=100)
+        store.put(self._entry("a", 40))
+        store.put(self._entry("b", 40))
+        store.get("a")
+        store.put(self._entry("c", 40))
+        assert store.get("b") is None and store.get("a") is not None
+        assert store.size == 80 and store.stats.evictions == 1
+        assert not list((tmp_path / "bodies").glob(f"{cache_key('b')}*"))
+
+    def test_oversized_body_is_refused(self, tmp_path):
+        store = DiskCacheStore(tmp_path, max_bytes=10)
+        assert not store.put(self._entry("a", 11))
+        assert len(store) == 0
+
+    def test_survives_a_restart_in_lru_order(self, tmp_path):
+        store = DiskCacheStore(tmp_path, max_bytes=100)
+        for url in "abc":
+            store.put(self._entry(url, 30))
+        store.get("a")
+        store.close()
+        reopened = DiskCacheStore(tmp_path, max_bytes=100)
+        assert reopened.get("b").body == b"x" * 30
+        reopened.put(self._entry("d", 30))            # evicts c: a and b were used since
+        assert reopened.get("c") is None and reopened.get("a") is not None
+
+    def test_crash_leftovers_are_repaired_on_load(self, tmp_path):
+        store = DiskCacheStore(tmp_path, max_bytes=100)
+        store.put(self._entry("a", 10))
+        store.put(self._entry("b", 10))
+        store.close()
+        bodies = tmp_path / "bodies"
+        [b] = bodies.glob(f"{cache_key('b')}*")
+        b.write_bytes(b"xx")                          # truncated by a crash
+        (bodies / f"{cache_key('c')}.x1").write_bytes(b"c")   # written, never indexed
+        (bodies / f"{cache_key('d')}.x2.tmp").write_bytes(b"d")
+        reopened = DiskCacheStore(tmp_path, max_bytes=100)
+        assert len(reopened) == 1 and reopened.get("a").body == b"x" * 10
+        assert [p.name.split(".")[0] for p in bodies.iterdir()] == [cache_key("a")]
+        reopened.close()
+
+        (tmp_path / "index.sqlite3").write_bytes(b"not a database" * 100)
+        assert len(DiskCacheStore(tmp_path, max_bytes=100)) == 0
+        assert list(bodies.iterdir()) == []
+
+    def test_processes_sharing_a_directory_keep_each_others_entries(self, tmp_path):
+        first = DiskCacheStore(tmp_path, max_bytes=100)
+        first.put(self._entry("a", 10))
+        second = DiskCacheStore(tmp_path, max_bytes=100)      # opens while first is running
+        second.put(self._entry("b", 10))
+        first.put(self._entry("c", 10))
+        first.close()
+        second.close()
+        for store in (first, second, DiskCacheStore(tmp_path, max_bytes=100)):
+            assert [store.get(url).body for url in "abc"] == [b"x" * 10] * 3
+        assert len(list((tmp_path / "bodies").iterdir())) == 3
+
+    def test_eviction_by_another_process_is_a_miss(self, tmp_path):
+        first = DiskCacheStore(tmp_path, max_bytes=30)
+        first.put(self._entry("a", 20))
+        second = DiskCacheStore(tmp_path, max_bytes=30)
+        second.put(self._entry("b", 20))                      # evicts a for both
+        assert first.get("a") is None and first.get("b").body == b"x" * 20
+
+
+class TestFactoryCache:
+    def test_shared_store_across_clients(self, tmp_path):
+        async def run():
+            origin = FakeHttpOrigin()
+            origin.route("/menu", body="plov", headers={"Cache-Control": "max-age=300"})
+            settings = replace(HttpClientSettings(), cache_dir=str(tmp_path))
+            factory = HttpClientFactory(settings)
+            async with origin:
+                await factory.client("cafeteria").get(f"{origin.url}/menu")
+                resp = await factory.client("portal").get(f"{origin.url}/menu")
+                uncached = await factory.client("llm", cache=False).get(f"{origin.url}/menu")
+                await factory.aclose()
+            return origin, factory, resp, uncached
+
+        origin, factory, resp, uncached = asyncio.run(run())
+        assert resp.text == "plov" and resp.extensions["cache_status"] == "hit"
+        assert "cache_status" not in uncached.extensions
+        assert origin.hits["/menu"] == 2
+        assert factory.cache_stats.hits == 1
+        assert (tmp_path / "index.sqlite3").exists()
+
+    def test_cafeteria_ttl_is_wired_from_settings(self):
+        assert _parse_ttls("https://a.kg/api?x=1=600,http://b/=5") == {
+            "https://a.kg/api?x=1": 600.0, "http://b/": 5.0,
+        }
@@ -0,0 +1,146 @@
+"""
+tests/infrastructure/test_http_client.py
+==========================================
+HttpClientFactory against a real local origin: adapters share warm
+connections, every request is timed, per-host limits and per-adapter
+timeouts hold.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+
+import httpx
+import pytest
+
+from src.infrastructure.config.settings import HttpClientSettings, Settings, _parse_timeouts
+from src.infrastructure.http_client import factory as factory_module
+from src.infrastructure.http_client.factory import HttpClientFactory
+from src.infrastructure.http_client.timing import HttpMetrics, RequestTiming
+from tests.shared.fakes.http_origin import FakeHttpOrigin
+
+
+def _factory(**overrides) -> tuple[HttpClientFactory, list[RequestTiming]]:
+    timings: list[RequestTiming] = []
+    settings = replace(HttpClientSettings(), **{"cache_dir": "", **overrides})
+    return HttpClientFactory(settings, hooks=[timings.append]), timings
+
+
+class TestHttpClientFactory:
+    def test_clients_share_one_warm_pool(self):
+        async def run():
+            origin = FakeHttpOrigin()
+            origin.route("/a", body="hello")
+            factory, timings = _factory()
+            async with origin:
+                for name in ("timetable", "cafeteria", "timetable"):
+                    resp = await factory.client(name).get(f"{origin.url}/a")
+                    assert resp.text == "hello"
+                await factory.aclose()
+            return timings
+
+        timings = asyncio.run(run())
+        assert [t.client for t in timings] == ["timetable", "cafeteria", "timetable"]
+        assert [t.reused_connection for t in timings] == [False, True, True]
+        first = timings[0]
+        assert first.connect is not None and first.tls is None    # plain http
+        assert first.status == 200 and first.method == "GET" and first.host == "127.0.0.1"
+        assert 0 < first.ttfb <= first.total
+
+    def test_same_name_same_client(self):
+        factory, _ = _factory()
+        assert factory.client("llm") is factory.client("llm")
+        assert factory.client("llm") is not factory.client("sso")
+
+    def test_timeouts_come_from_settings(self):
+        factory, _ = _factory(timeouts={"llm": 120.0}, default_timeout=7.0, connect_timeout=3.0)
+        assert factory.client("llm").timeout == httpx.Timeout(120.0, connect=3.0)
+        assert factory.client("sso").timeout == httpx.Timeout(7.0, connect=3.0)
+        assert factory.client("timetable", timeout=20.0).timeout == httpx.Timeout(20.0, connect=3.0)
+
+    def test_adapter_timeout_applies_and_is_recorded(self):
+        async def run():
+            origin = FakeHttpOrigin()
+            origin.route("/slow", body="late")
+            origin.delay("/slow", seconds=0.5)
+            factory, timings = _factory(timeouts={"sso": 0.1})
+            async with origin:
+                with pytest.raises(httpx.ReadTimeout):
+                    await factory.client("sso").get(f"{origin.url}/slow")
+                await factory.aclose()
+            return timings
+
+        [timing] = asyncio.run(run())
+        assert timing.error == "ReadTimeout" and timing.status is None
+
+    def test_per_host_limit_spans_all_clients(self):
+        async def run():
+            origin = FakeHttpOrigin()
+            origin.route("/a", body="x")
+            origin.delay(seconds=0.05)
+            factory, timings = _factory(max_connections_per_host=3)
+            async with origin:
+                await asyncio.gather(*(
+                    factory.client(f"adapter-{i % 2}").get(f"{origin.url}/a") for i in range(12)
+                ))
+                await factory.aclose()
+            return origin, timings
+
+        origin, timings = asyncio.run(run())
+        assert origin.max_concurrent == 3
+        assert len(timings) == 12
+
+    def test_closing_a_client_keeps_the_pool(self):
+        async def run():
+            origin = FakeHttpOrigin()
+            origin.route("/a", body="x")
+            factory, timings = _factory()
+            async with origin:
+                await factory.client("cafeteria").get(f"{origin.url}/a")
+                await factory.client("cafeteria").aclose()
+                await factory.client("sso").get(f"{origin.url}/a")
+                await factory.aclose()
+            return timings
+
+        assert [t.reused_connection for t in asyncio.run(run())] == [False, True]
+
+    def test_streamed_response_is_timed_when_closed(self):
+        async def run():
+            origin = FakeHttpOrigin()
+            origin.route("/a", body="x" * 10_000)
+            factory, timings = _factory()
+            async with origin:
+                async with factory.client("llm").stream("GET", f"{origin.url}/a") as resp:
+                    assert timings == []
+                    assert len(await resp.aread()) == 10_000
+                await factory.aclose()
+            return timings
+
+        assert len(asyncio.run(run())) == 1
+
+    def test_http2_without_h2_falls_back(self, caplog, monkeypatch):
+        monkeypatch.setattr(factory_module, "find_spec", lambda name: None)
+        factory, _ = _factory(http2=True)
+        assert isinstance(factory.client("timetable"), httpx.AsyncClient)
+        assert "h2 package is not installed" in caplog.text
+
+
+class TestHttpMetrics:
+    def test_aggregates_per_client_and_host(self):
+        metrics = HttpMetrics()
+        metrics(RequestTiming("sso", "GET", "a", 200, 0.01, 0.02, 0.05, 0.1))
+        metrics(RequestTiming("sso", "GET", "a", 200, None, None, 0.03, 0.3))
+        metrics(RequestTiming("sso", "GET", "a", None, None, None, None, 0.5, error="ConnectError"))
+        stats = metrics.stats("sso", "a")
+        assert stats.requests == 3 and stats.errors == 1 and stats.new_connections == 1
+        assert stats.max_total_seconds == 0.5
+        assert stats.mean_total == pytest.approx(0.3)
+        assert stats.reuse_ratio == pytest.approx(2 / 3)
+        assert metrics.stats("llm", "a").requests == 0
+        assert metrics.snapshot()[("sso", "a")] == stats
+
+
+class TestSettings:
+    def test_timeouts_from_env(self):
+        assert _parse_timeouts("llm=300, sso=5,bad") == {"llm": 300.0, "sso": 5.0}
+        assert Settings().http.timeouts["llm"] == 120.0
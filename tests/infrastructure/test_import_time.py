@@ -0,0 +1,55 @@
+"""
+tests/infrastructure/test_import_time.py
+==========================================
+Import-time budget for a CLI command or cron job that needs one context.
+
+Runs a fresh interpreter under `python -X importtime`, builds the platform
+and touches only the timetable context, then checks what got imported and
+how long it took. On failure the message is the slowest-imports report, so
+the regression is visible without rerunning anything.
+"""
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+BUDGET_US = 1_000_000      # a CLI query must start well under a second
+_SCRIPT = "from src.infrastructure.wiring.container import build_platform; build_platform().timetable"
+
+
+def import_time_report(script: str) -> list[tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for every module *script* imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def _slowest(rows: list[tuple[str, int, int]], n: int = 15) -> str:
+    top = sorted(rows, key=lambda r: r[2], reverse=True)[:n]
+    return "\n".join(f"{cum / 1000:8.1f} ms  {name}" for name, _, cum in top)
+
+
+class TestImportTime:
+    def test_timetable_command_imports_only_its_context(self):
+        names = {name for name, _, _ in import_time_report(_SCRIPT)}
+        other_contexts = {n for n in names if n.startswith("src.infrastructure.wiring._")} - {
+            "src.infrastructure.wiring._shared", "src.infrastructure.wiring._timetable",
+        }
+        assert other_contexts == set()
+        assert not {n for n in names if n.startswith("src.contexts.") and not n.startswith("src.contexts.timetable")}
+        assert not {n for n in names if n.split(".")[0] in ("httpx", "bs4", "fastapi")}
+
+    def test_timetable_command_fits_the_budget(self):
+        rows = import_time_report(_SCRIPT)
+        total = sum(self_us for _, self_us, _ in rows)
+        assert total < BUDGET_US, f"imports took {total / 1000:.0f} ms:\n{_slowest(rows)}"
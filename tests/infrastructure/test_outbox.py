@@ -0,0 +1,266 @@
+"""
+tests/infrastructure/test_outbox.py
+=====================================
+EventCodec round trips, and SqliteOutbox: events commit or roll back with
+the aggregate, survive a restart, reach subscribers in batches at least
+once, and idempotent() handlers see each event_id once.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timezone
+from enum import Enum
+from uuid import uuid4
+
+import pytest
+
+from src.contexts.exams.domain.events import ExamScheduled
+from src.contexts.timetable.domain.events import TimetableScraped
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.messaging.codec import EventCodec, EventCodecError
+from src.infrastructure.messaging.in_memory_bus import InMemoryEventBus
+from src.infrastructure.messaging.outbox import SqliteOutbox
+from src.infrastructure.wiring._shared import build_shared
+from src.shared_kernel.domain.events import DomainEvent
+from src.shared_kernel.domain.identity import CourseId, ExamId
+
+
+class Level(Enum):
+    LOW = 1
+    HIGH = 2
+
+
+@dataclass(frozen=True)
+class Everything(DomainEvent):
+    flag: bool = False
+    count: int = 0
+    ratio: float = 0.0
+    name: str = ""
+    blob: bytes = b""
+    on: date | None = None
+    level: Level = Level.LOW
+    ids: tuple[int, ...] = ()
+
+
+class TestEventCodec:
+    def test_round_trips_every_supported_value(self):
+        codec = EventCodec()
+        event = Everything(
+            flag=True, count=-(1 << 70), ratio=0.25, name="Ağaç işleri", blob=b"\x00\xff",
+            on=date(2024, 9, 1), level=Level.HIGH, ids=(0, 1, -1, 300),
+            occurred_at=datetime(2024, 9, 1, 8, 30, tzinfo=timezone.utc),
+        )
+        assert codec.decode(codec.type_name(Everything), codec.encode(event)) == event
+
+    def test_restores_identity_value_objects_from_type_hints(self):
+        codec = EventCodec()
+        event = ExamScheduled(exam_id=ExamId(uuid4()), course_id=CourseId(uuid4()), scheduled_at=datetime(2024, 6, 1, 9))
+        payload = codec.encode(event)
+        decoded = codec.decode(codec.type_name(ExamScheduled), payload)
+        assert decoded == event and type(decoded.exam_id) is ExamId
+        assert len(payload) < 110
+
+    def test_missing_trailing_fields_take_their_defaults(self):
+        codec = EventCodec()
+        event = TimetableScraped(department_count=3)
+        payload = codec.encode(event)
+        short = codec.decode(codec.type_name(TimetableScraped), payload[:len(payload) - 2])   # drop renamed_count
+        assert short.department_count == 3 and short.renamed_count == 0
+
+    def test_rejects_unknown_and_non_event_types(self):
+        codec = EventCodec()
+        with pytest.raises(EventCodecError):
+            codec.resolve("src.contexts.exams.domain.events:NoSuchEvent")
+        with pytest.raises(EventCodecError):
+            codec.resolve("os:system")
+        with pytest.raises(EventCodecError):
+            codec.decode(codec.type_name(ExamScheduled), b"\xee")
+
+
+def _outbox(tmp_path, **kwargs) -> tuple[SqliteOutbox, InMemoryEventBus]:
+    bus = InMemoryEventBus()
+    return SqliteOutbox(tmp_path / "outbox.sqlite3", bus, **kwargs), bus
+
+
+async def _aggregate_table(outbox: SqliteOutbox) -> None:
+    async with outbox.transaction() as tx:
+        await tx.db.execute("CREATE TABLE IF NOT EXISTS exams (id TEXT PRIMARY KEY)")
+
+
+class TestSqliteOutbox:
+    def test_events_commit_with_the_aggregate_and_reach_subscribers(self, tmp_path):
+        outbox, _ = _outbox(tmp_path)
+        seen: list[ExamScheduled] = []
+
+        async def handler(event):
+            seen.append(event)
+
+        outbox.subscribe(ExamScheduled, handler)
+        event = ExamScheduled(exam_id=ExamId(uuid4()))
+
+        async def run():
+            await _aggregate_table(outbox)
+            async with outbox.transaction() as tx:
+                await tx.db.execute("INSERT INTO exams VALUES (?)", (str(event.exam_id),))
+                tx.add(event)
+            await outbox.drain()
+            [(count,)] = await (await outbox._connect()).execute_fetchall("SELECT count(*) FROM exams")
+            pending = await outbox.pending()
+            await outbox.aclose()
+            return count, pending
+
+        assert asyncio.run(run()) == (1, 0)
+        assert seen == [event]
+        assert outbox.stats.written == 1 and outbox.stats.relayed == 1
+
+    def test_rolled_back_transaction_stores_no_event(self, tmp_path):
+        outbox, _ = _outbox(tmp_path)
+
+        async def run():
+            await _aggregate_table(outbox)
+            with pytest.raises(RuntimeError):
+                async with outbox.transaction() as tx:
+                    await tx.db.execute("INSERT INTO exams VALUES ('a')")
+                    tx.add(ExamScheduled())
+                    raise RuntimeError("aggregate invariant violated")
+            rows = await (await outbox._connect()).execute_fetchall("SELECT count(*) FROM exams")
+            pending = await outbox.pending()
+            await outbox.aclose()
+            return rows[0][0], pending
+
+        assert asyncio.run(run()) == (0, 0)
+
+    def test_publish_inside_a_transaction_joins_it(self, tmp_path):
+        outbox, _ = _outbox(tmp_path, relay=False)
+
+        async def scenario():
+            await _aggregate_table(outbox)
+            async with outbox.transaction() as tx:
+                await tx.db.execute("INSERT INTO exams VALUES ('a')")
+                await outbox.publish(ExamScheduled())           # would wait on its own write lock
+            with pytest.raises(ValueError):
+                async with outbox.transaction():
+                    await outbox.publish(ExamScheduled())
+                    raise ValueError("rolled back")
+            with pytest.raises(RuntimeError, match="already inside"):
+                async with outbox.transaction():
+                    async with outbox.transaction():
+                        pass
+            await outbox.publish(ExamScheduled())                # outside again: autocommitted
+            return await outbox.pending()
+
+        async def run():
+            try:
+                return await asyncio.wait_for(scenario(), timeout=5)
+            finally:
+                await outbox.aclose()
+
+        assert asyncio.run(run()) == 2
+        assert outbox.stats.written == 2
+
+    def test_undelivered_events_survive_a_restart(self, tmp_path):
+        first, _ = _outbox(tmp_path, relay=False)     # dies before anything is relayed
+        events = [TimetableScraped(department_count=i) for i in range(5)]
+
+        async def write():
+            async with first.transaction() as tx:
+                for event in events:
+                    tx.add(event)
+            await first.aclose()
+
+        asyncio.run(write())
+
+        second, _ = _outbox(tmp_path, batch_size=2)
+        seen: list[TimetableScraped] = []
+
+        async def handler(event):
+            seen.append(event)
+
+        second.subscribe(TimetableScraped, handler)
+
+        async def restart():
+            await second.drain()
+            await second.aclose()
+
+        asyncio.run(restart())
+        assert seen == events
+        assert second.stats.batches == 3 and second.stats.last_batch_size == 1
+        assert second.stats.events_per_second > 0
+
+    def test_the_same_event_is_stored_once(self, tmp_path):
+        outbox, _ = _outbox(tmp_path)
+        event = ExamScheduled()
+
+        async def run():
+            await outbox.publish(event)
+            await outbox.publish(event)     # a retried producer
+            pending = await outbox.pending()
+            await outbox.aclose()
+            return pending
+
+        assert asyncio.run(run()) == 1
+
+    def test_relay_runs_in_the_background(self, tmp_path):
+        outbox, _ = _outbox(tmp_path, poll_interval=5.0)
+
+        async def run():
+            done = asyncio.Event()
+
+            async def handler(event):
+                done.set()
+
+            outbox.subscribe(ExamScheduled, handler)
+            await outbox.publish(ExamScheduled())
+            await asyncio.wait_for(done.wait(), timeout=2)
+            await outbox.aclose()
+
+        asyncio.run(run())
+
+    def test_redelivery_is_absorbed_by_idempotent_handlers(self, tmp_path):
+        outbox, _ = _outbox(tmp_path)
+        calls: list[str] = []
+
+        async def remind(event):
+            calls.append(str(event.event_id))
+
+        outbox.subscribe(ExamScheduled, outbox.idempotent("exam-reminders", remind))
+        event = ExamScheduled()
+
+        async def run():
+            await outbox.publish(event)
+            await outbox.drain()
+            await outbox.publish(event)     # the row comes back, e.g. relay crashed before its delete
+            await outbox.drain()
+            await outbox.aclose()
+
+        asyncio.run(run())
+        assert calls == [str(event.event_id)]
+        assert outbox.stats.relayed == 2 and outbox.stats.duplicates == 1
+
+    def test_undecodable_rows_go_to_the_dead_letter_table(self, tmp_path):
+        outbox, _ = _outbox(tmp_path)
+
+        async def run():
+            async with outbox.transaction() as tx:
+                tx.rows.append((uuid4().bytes, "src.gone:Removed", b""))
+                tx.add(ExamScheduled())
+            await outbox.drain()
+            db = await outbox._connect()
+            dead = await db.execute_fetchall("SELECT event_type FROM event_outbox_dead")
+            await outbox.aclose()
+            return dead
+
+        assert asyncio.run(run()) == [("src.gone:Removed",)]
+        assert outbox.stats.dead == 1 and outbox.stats.relayed == 1
+
+
+class TestWiring:
+    def test_outbox_wraps_the_bus_when_configured(self, tmp_path):
+        settings = Settings()
+        shared = build_shared(replace(settings, events=replace(
+            settings.events, outbox_path=str(tmp_path / "o.sqlite3"), outbox_batch_size=50,
+        )))
+        assert isinstance(shared.event_bus, SqliteOutbox)
+        assert not (tmp_path / "o.sqlite3").exists()         # opened on first use
+        assert isinstance(build_shared(settings).event_bus, InMemoryEventBus)
@@ -0,0 +1,245 @@
+"""
+tests/infrastructure/test_unix_socket_bus.py
+==============================================
+UnixSocketEventBus between two buses in one process (distinct socket
+names stand in for distinct processes): fan-out, reconnection to a
+restarted peer, dead and stuck peers never blocking publish, and frames
+that do not decode. The wiring tests run a scrape-owner and an API-worker
+platform over one socket dir and one real mapped snapshot file.
+"""
+from __future__ import annotations
+
+import asyncio
+import shutil
+import socket
+import tempfile
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.contexts.timetable.domain.entities import TimetableEntry
+from src.contexts.timetable.domain.events import TimetableScraped
+from src.contexts.timetable.domain.services import department_id_for, room_id_for
+from src.contexts.timetable.domain.value_objects import CourseCode, TimeSlot, WeekDay
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.messaging.codec import EventCodec
+from src.infrastructure.messaging.in_memory_bus import InMemoryEventBus
+from src.infrastructure.messaging.outbox import SqliteOutbox
+from src.infrastructure.messaging.unix_socket_bus import UnixSocketEventBus, _frame
+from src.infrastructure.wiring._shared import build_shared
+from src.infrastructure.wiring.container import build_platform
+
+
+@pytest.fixture
+def socket_dir():
+    path = Path(tempfile.mkdtemp(prefix="ev", dir="/tmp"))     # socket paths must stay short
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _bus(socket_dir: Path, name: str, **kwargs) -> UnixSocketEventBus:
+    return UnixSocketEventBus(socket_dir, InMemoryEventBus(), name=name, discovery_interval=0.05, **kwargs)
+
+
+class _Inbox:
+    def __init__(self, bus: UnixSocketEventBus) -> None:
+        self.events: list[TimetableScraped] = []
+        self._arrived = asyncio.Event()
+        bus.subscribe(TimetableScraped, self)
+
+    async def __call__(self, event: TimetableScraped) -> None:
+        self.events.append(event)
+        self._arrived.set()
+
+    async def wait_for(self, count: int) -> list[TimetableScraped]:
+        while len(self.events) < count:
+            self._arrived.clear()
+            await asyncio.wait_for(self._arrived.wait(), timeout=2)
+        return self.events
+
+
+class TestUnixSocketEventBus:
+    def test_fans_out_to_peers_and_local_subscribers(self, socket_dir):
+        async def run():
+            api, jobs = _bus(socket_dir, "api"), _bus(socket_dir, "jobs")
+            remote, local = _Inbox(api), _Inbox(jobs)
+            await api.start()
+            await jobs.start()
+            events = [TimetableScraped(department_count=i) for i in range(3)]
+            for event in events:
+                await jobs.publish(event)
+            received = list(await remote.wait_for(3))
+            await local.wait_for(3)
+            await asyncio.sleep(0.1)                 # api has discovered jobs by now
+            await api.publish(TimetableScraped(department_count=99))
+            back = await local.wait_for(4)
+            stats = (jobs.stats, api.stats)
+            await api.aclose()
+            await jobs.aclose()
+            return events, received, back, stats
+
+        events, received, back, (jobs_stats, api_stats) = asyncio.run(run())
+        assert received == events                     # same event_ids, in order
+        assert back[-1].department_count == 99
+        assert jobs_stats.sent == 3 and api_stats.received == 3 and api_stats.sent == 1
+
+    def test_reconnects_to_a_restarted_peer(self, socket_dir):
+        async def run():
+            jobs = _bus(socket_dir, "jobs")
+            api = _bus(socket_dir, "api")
+            await api.start()
+            await jobs.start()
+            await jobs.publish(TimetableScraped(department_count=1))
+            await asyncio.sleep(0.05)
+            await api.aclose()                      # the API worker restarts
+
+            restarted = _bus(socket_dir, "api")
+            inbox = _Inbox(restarted)
+            await restarted.start()
+            await jobs.publish(TimetableScraped(department_count=2))
+            await asyncio.sleep(0.05)
+            await jobs.publish(TimetableScraped(department_count=3))
+            events = await inbox.wait_for(1)
+            connects = jobs.stats.connects
+            await restarted.aclose()
+            await jobs.aclose()
+            return [e.department_count for e in events], connects
+
+        counts, connects = asyncio.run(run())
+        assert counts[-1] == 3 and 1 not in counts
+        assert connects == 2
+
+    def test_dead_peer_is_forgotten_and_its_socket_removed(self, socket_dir):
+        stale = socket_dir / "api-1.sock"
+        sock = socket.socket(socket.AF_UNIX)
+        sock.bind(str(stale))                       # bound, never listening: a crashed process
+        sock.close()
+
+        async def run():
+            jobs = _bus(socket_dir, "jobs")
+            await jobs.start()
+            await asyncio.wait_for(jobs.publish(TimetableScraped()), timeout=0.5)
+            await asyncio.sleep(0.05)
+            peers = jobs.peers()
+            await jobs.aclose()
+            return peers
+
+        assert asyncio.run(run()) == []
+        assert not stale.exists()
+
+    def test_stuck_peer_never_blocks_publish_and_costs_bounded_memory(self, socket_dir):
+        async def run():
+            async def never_read(reader, writer):
+                await asyncio.sleep(10)
+
+            stuck = await asyncio.start_unix_server(never_read, path=str(socket_dir / "api-2.sock"))
+            jobs = _bus(socket_dir, "jobs", queue_size=100)
+            await jobs.start()
+            big = TimetableScraped(failed_department_ids=tuple(range(1000, 1300)))   # ~1 KB a frame
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            for _ in range(2000):                   # more than the socket buffer holds
+                await jobs.publish(big)
+            await asyncio.sleep(0.05)
+            for _ in range(200):
+                await jobs.publish(big)
+            elapsed = loop.time() - started
+            [peer] = jobs._peers.values()
+            queued = len(peer.frames)
+            await jobs.aclose()
+            stuck.close()
+            return elapsed, queued, jobs.stats
+
+        elapsed, queued, stats = asyncio.run(run())
+        assert elapsed < 2
+        assert queued <= 100
+        assert stats.dropped > 0
+
+    def test_skips_frames_it_cannot_decode(self, socket_dir):
+        async def run():
+            api = _bus(socket_dir, "api")
+            inbox = _Inbox(api)
+            await api.start()
+            codec = EventCodec()
+            good = TimetableScraped(department_count=5)
+            _, writer = await asyncio.open_unix_connection(str(api.path))
+            writer.write(
+                _frame(1, 0, b"src.gone:Removed")
+                + _frame(2, 0, b"")
+                + _frame(1, 1, codec.type_name(TimetableScraped).encode())
+                + _frame(2, 1, b"\xee")
+                + _frame(2, 1, codec.encode(good))
+            )
+            await writer.drain()
+            events = await inbox.wait_for(1)
+            writer.close()
+            await api.aclose()
+            return events, good, api.stats
+
+        events, good, stats = asyncio.run(run())
+        assert events == [good]
+        assert stats.decode_errors == 2 and stats.received == 1
+
+
+class TestWiring:
+    def test_outbox_relays_through_the_socket_bus(self, socket_dir):
+        settings = Settings()
+        shared = build_shared(replace(settings, events=replace(
+            settings.events, socket_dir=str(socket_dir), socket_name="jobs",
+            outbox_path=str(socket_dir / "outbox.sqlite3"),
+        )))
+        assert isinstance(shared.event_bus, SqliteOutbox)
+        assert shared.event_socket is not None and shared.event_socket.path.name.startswith("jobs-")
+        assert not list(socket_dir.iterdir())            # nothing opened until started
+        assert build_shared(settings).event_socket is None
+
+    def test_worker_serves_the_rows_the_scrape_owner_published(self, socket_dir):
+        def platform(name: str, owner: bool):
+            settings = Settings()
+            return build_platform(replace(
+                settings,
+                events=replace(settings.events, socket_dir=str(socket_dir), socket_name=name),
+                timetable=replace(
+                    settings.timetable, scrape_owner=owner,
+                    mapped_snapshot_path=str(socket_dir / "timetable.mtts"),
+                    mapped_snapshot_check_seconds=3600,       # only the event can trigger a remap
+                ),
+            ))
+
+        department = department_id_for(101)
+        rows = [
+            TimetableEntry.create(
+                course_code=CourseCode(code), course_name="Calculus", day=WeekDay.MONDAY,
+                time_slot=TimeSlot("08:00-08:45"), room_id=room_id_for(room), teacher_name="Dr. Asanov",
+                department_id=department, scraped_at=datetime(2024, 9, 1), room_name=room,
+            )
+            for code, room in (("UNS-301", "B-204"), ("UNS-302", "B-205"))
+        ]
+
+        async def run():
+            jobs, api = platform("jobs", owner=True), platform("api", owner=False)
+            reader = api.timetable.shared_snapshot
+            assert reader.current is None                   # no file yet; next periodic check in an hour
+            await jobs.shared.event_socket.start()
+            await api.shared.event_socket.start()
+            while not jobs.shared.event_socket.peers():
+                await asyncio.sleep(0.01)
+
+            await jobs.timetable.repo.replace_department(department, rows)
+            await jobs.shared.event_bus.publish(TimetableScraped(department_count=1, changed_count=1))
+            for _ in range(200):
+                if reader.current is not None:
+                    break
+                await asyncio.sleep(0.01)
+            served = reader.current
+            worker_rows = await api.timetable.repo.count()
+            await jobs.shared.event_socket.aclose()
+            await api.shared.event_socket.aclose()
+            return served, worker_rows
+
+        served, worker_rows = asyncio.run(run())
+        assert served is not None and served.version == 1
+        assert sorted(e.id for e in served.rows.to_entries()) == sorted(e.id for e in rows)
+        assert worker_rows == 0                             # the worker never wrote a repository
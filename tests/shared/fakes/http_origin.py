@@ -0,0 +1,128 @@
+"""
+tests/shared/fakes/http_origin.py
+===================================
+A real HTTP/1.1 server on 127.0.0.1 for adapter integration tests.
+
+Unlike httpx.MockTransport this exercises actual sockets, timeouts and
+connection handling, and lets a test inject latency and error responses.
+
+Usage:
+    origin = FakeHttpOrigin()
+    origin.route("/dept/7", body="<table>…</table>")
+    origin.fail("/dept/8", status=503, times=2)     # then falls through to the route
+    origin.delay("/dept/9", seconds=0.3)
+    async with origin:
+        ... httpx.AsyncClient().get(f"{origin.url}/dept/7") ...
+    assert origin.hits["/dept/8"] == 3
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+
+
+@dataclass
+class OriginResponse:
+    status: int = 200
+    body: str = ""
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+_REASONS = {200: "OK", 304: "Not Modified", 404: "Not Found", 429: "Too Many Requests",
+            500: "Internal Server Error", 502: "Bad Gateway", 503: "Service Unavailable"}
+
+
+class FakeHttpOrigin:
+    def __init__(self) -> None:
+        self.hits: Counter[str] = Counter()
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.max_concurrent = 0
+        self._routes: dict[str, OriginResponse] = {}
+        self._failures: dict[str, tuple[int, int]] = {}   # path → (status, remaining)
+        self._delays: dict[str, float] = {}
+        self._default_delay = 0.0
+        self._active = 0
+        self._server: asyncio.Server | None = None
+        self.url = ""
+
+    # ── configuration ───────────────────────────────────────────────────
+
+    def route(self, path: str, body: str = "", status: int = 200, headers: dict[str, str] | None = None) -> None:
+        self._routes[path] = OriginResponse(status, body, dict(headers or {}))
+
+    def fail(self, path: str, status: int = 503, times: int = 1) -> None:
+        self._failures[path] = (status, times)
+
+    def delay(self, path: str | None = None, seconds: float = 0.0) -> None:
+        if path is None:
+            self._default_delay = seconds
+        else:
+            self._delays[path] = seconds
+
+    # ── lifecycle ───────────────────────────────────────────────────────
+
+    async def __aenter__(self) -> "FakeHttpOrigin":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        self.url = f"http://{host}:{port}"
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    # ── request handling ────────────────────────────────────────────────
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                _, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if int(headers.get("content-length", 0)):
+                    await reader.readexactly(int(headers["content-length"]))
+
+                self.hits[path] += 1
+                self.requests.append((path, headers))
+                self._active += 1
+                self.max_concurrent = max(self.max_concurrent, self._active)
+                try:
+                    await asyncio.sleep(self._delays.get(path, self._default_delay))
+                    resp = self._respond(path, headers)
+                finally:
+                    self._active -= 1
+                writer.write(self._encode(resp))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _respond(self, path: str, headers: dict[str, str]) -> OriginResponse:
+        status, remaining = self._failures.get(path, (0, 0))
+        if remaining:
+            self._failures[path] = (status, remaining - 1)
+            return OriginResponse(status, "injected failure")
+        resp = self._routes.get(path)
+        if resp is None:
+            return OriginResponse(404, "not found")
+        etag = resp.headers.get("ETag")
+        if etag and headers.get("if-none-match") == etag:
+            return OriginResponse(304, "", {"ETag": etag})
+        return resp
+
+    @staticmethod
+    def _encode(resp: OriginResponse) -> bytes:
+        body = resp.body.encode("utf-8")
+        head = [f"HTTP/1.1 {resp.status} {_REASONS.get(resp.status, 'Status')}",
+                f"Content-Length: {len(body)}",
+                "Content-Type: text/html; charset=utf-8"]
+        head += [f"{k}: {v}" for k, v in resp.headers.items()]
+        return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body